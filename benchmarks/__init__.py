@@ -0,0 +1 @@
+"""Benchmark of SHOWROOM Podcast against fake SHOWROOM."""
@@ -0,0 +1,210 @@
+"""Benchmark of SHOWROOM Podcast against fake SHOWROOM.
+
+Usage:
+    python -m benchmarks.benchmark --number-room 1000 --live-probability 0.05 --seconds 120
+
+Runs SHOWROOM Podcast in child process against FakeShowroom, then reports:
+- Sweep time and rooms polled, scraped from metrics endpoint of SHOWROOM Podcast
+- Detection latency and dropped segment rate, observed by FakeShowroom
+- CPU time per recording and peak RSS of process tree, measured by resource usage of child processes
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+import click
+
+from benchmarks.fake_showroom import FakeShowroom
+from benchmarks.fake_showroom import Scenario
+
+PATH_PROJECT = Path(__file__).resolve().parents[1]
+SECONDS_TO_WAIT_SHUTDOWN = 30.0
+# Since ru_maxrss is in kilobytes on Linux, in bytes on macOS.
+BYTES_MAXRSS = 1 if sys.platform == "darwin" else 1024
+
+
+def find_free_port() -> int:
+    with socket.socket() as server_socket:
+        server_socket.bind(("127.0.0.1", 0))
+        port: int = server_socket.getsockname()[1]
+        return port
+
+
+def parse_metrics(text: str) -> dict[str, float]:
+    """Parses Prometheus text format, sums samples of same name over labels."""
+    metrics: dict[str, float] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name_with_labels, value = line.rsplit(" ", 1)
+        name = name_with_labels.split("{", 1)[0]
+        metrics[name] = metrics.get(name, 0.0) + float(value)
+    return metrics
+
+
+class Benchmark:
+    """Runs SHOWROOM Podcast against fake SHOWROOM."""
+
+    def __init__(self, scenario: Scenario, config: dict[str, Any], seconds: float) -> None:
+        self.scenario = scenario
+        self.config = config
+        self.seconds = seconds
+        self.port_metrics = find_free_port()
+
+    def run(self) -> dict[str, float]:
+        """Returns summary of fake SHOWROOM merged with metrics and resource usage of SHOWROOM Podcast."""
+        fake_showroom = FakeShowroom(self.scenario)
+        with fake_showroom.serve() as url, tempfile.TemporaryDirectory() as directory:
+            path_directory = Path(directory)
+            self.write_config(path_directory / "config.yml", url)
+            (path_directory / "output").mkdir()
+            time_start = time.monotonic()
+            metrics = self.run_showroom_podcast(path_directory)
+            seconds_elapsed = time.monotonic() - time_start
+            summary = fake_showroom.summarize()
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        seconds_cpu = usage.ru_utime + usage.ru_stime
+        number_recording = max(summary["lives_detected"], 1)
+        count_sweep = max(metrics.get("showroom_sweep_duration_seconds_count", 0.0), 1.0)
+        return {
+            **summary,
+            "sweeps": metrics.get("showroom_sweep_duration_seconds_count", 0.0),
+            "sweep_duration_mean_seconds": metrics.get("showroom_sweep_duration_seconds_sum", 0.0) / count_sweep,
+            "rooms_polled_per_second": metrics.get("showroom_rooms_polled_total", 0.0) / seconds_elapsed,
+            "temporary_network_issues": metrics.get("showroom_temporary_network_issues_total", 0.0),
+            "bytes_written": metrics.get("showroom_bytes_written_total", 0.0),
+            "cpu_seconds": seconds_cpu,
+            "cpu_seconds_per_recording": seconds_cpu / number_recording,
+            "peak_rss_bytes": usage.ru_maxrss * BYTES_MAXRSS,
+        }
+
+    def write_config(self, path: Path, url: str) -> None:
+        """Writes configuration as JSON, which is also YAML."""
+        config = {
+            **self.config,
+            "list_room_id": list(range(1, self.scenario.number_room + 1)),
+            "http": {**self.config.get("http", {}), "base_url": url},
+            "metrics": {"port": self.port_metrics, "host": "127.0.0.1"},
+        }
+        path.write_text(json.dumps(config), encoding="utf-8")
+
+    def run_showroom_podcast(self, path_directory: Path) -> dict[str, float]:
+        """Runs SHOWROOM Podcast for configured seconds, then stops it by SIGINT as same as Ctrl + C."""
+        with self.start_showroom_podcast(path_directory) as process:
+            try:
+                time.sleep(self.seconds)
+                metrics = self.scrape_metrics()
+            finally:
+                os.killpg(process.pid, signal.SIGINT)
+                try:
+                    process.wait(SECONDS_TO_WAIT_SHUTDOWN)
+                except subprocess.TimeoutExpired:
+                    os.killpg(process.pid, signal.SIGKILL)
+                    process.wait()
+        return metrics
+
+    @staticmethod
+    def start_showroom_podcast(path_directory: Path) -> subprocess.Popen[bytes]:
+        """Starts in new session to stop whole process tree including worker processes.
+
+        Log file can be closed once started since child process inherits it.
+        """
+        args = [sys.executable, "-c", "from showroompodcast.cli import showroom_podcast; showroom_podcast()"]
+        # To benchmark the working tree rather than installed package.
+        python_path = os.pathsep.join(filter(None, [str(PATH_PROJECT), os.environ.get("PYTHONPATH")]))
+        with (path_directory / "showroom_podcast.log").open("wb") as log:
+            # Reason: Arguments are fixed except for path in temporary directory.
+            return subprocess.Popen(  # noqa: S603
+                [*args, "--file", str(path_directory / "config.yml")],
+                cwd=path_directory,
+                env={**os.environ, "PYTHONPATH": python_path},
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+    def scrape_metrics(self) -> dict[str, float]:
+        url = f"http://127.0.0.1:{self.port_metrics}/metrics"
+        # Reason: URL is fixed to localhost.
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return parse_metrics(response.read().decode())
+
+
+@click.command()
+@click.option("--number-room", default=Scenario.number_room, show_default=True)
+@click.option("--live-probability", default=Scenario.live_probability, show_default=True)
+@click.option("--latency", default=Scenario.latency, show_default=True, help="Seconds to delay each API response.")
+@click.option("--error-rate", default=Scenario.error_rate, show_default=True, help="Probability of API 503.")
+@click.option("--seconds-live", default=Scenario.seconds_live, show_default=True)
+@click.option("--seconds-segment", default=Scenario.seconds_segment, show_default=True)
+@click.option("--bytes-segment", default=Scenario.bytes_segment, show_default=True)
+@click.option("--seed", default=Scenario.seed, show_default=True)
+@click.option("--seconds", default=60.0, show_default=True, help="Seconds to run SHOWROOM Podcast.")
+@click.option("--engine", default="hls", show_default=True, type=click.Choice(["hls", "ffmpeg"]))
+@click.option("--number-process", default=4, show_default=True)
+@click.option("--discovery/--no-discovery", default=False, show_default=True)
+@click.option("--requests-per-second", default=10.0, show_default=True)
+@click.option("--interval-minimum", default=5.0, show_default=True)
+@click.option("--interval-maximum", default=60.0, show_default=True)
+# Reason: Each option is parameter of benchmark.
+def benchmark(  # noqa: PLR0913  # pylint: disable=too-many-arguments,too-many-locals
+    *,
+    number_room: int,
+    live_probability: float,
+    latency: float,
+    error_rate: float,
+    seconds_live: float,
+    seconds_segment: float,
+    bytes_segment: int,
+    seed: int,
+    seconds: float,
+    engine: str,
+    number_process: int,
+    discovery: bool,
+    requests_per_second: float,
+    interval_minimum: float,
+    interval_maximum: float,
+) -> None:
+    """Benchmarks SHOWROOM Podcast against fake SHOWROOM, then prints results as JSON."""
+    scenario = Scenario(
+        number_room=number_room,
+        live_probability=live_probability,
+        # Lives start in first half so that most of them are detected and end while benchmarking.
+        seconds_live_start_within=seconds / 2,
+        seconds_live=seconds_live,
+        latency=latency,
+        error_rate=error_rate,
+        seconds_segment=seconds_segment,
+        bytes_segment=bytes_segment,
+        seed=seed,
+    )
+    config = {
+        "number_process": number_process,
+        "polling": {
+            "discovery": discovery,
+            "requests_per_second": requests_per_second,
+            "interval_minimum": interval_minimum,
+            "interval_maximum": interval_maximum,
+        },
+        # Keeps MPEG-TS not to depend on FFmpeg by "hls" engine.
+        "archiver": {"engine": engine, "remux": False},
+    }
+    results = Benchmark(scenario, config, seconds).run()
+    click.echo(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    # Reason: Click passes options. pylint: disable-next=missing-kwoa
+    benchmark()
@@ -0,0 +1,210 @@
+"""Fake SHOWROOM which serves API and HLS origin of synthetic lives on localhost."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+@dataclass
+# Reason: Each attribute is parameter of benchmark scenario. pylint: disable-next=too-many-instance-attributes
+class Scenario:
+    """Parameters of fake SHOWROOM."""
+
+    # Rooms are numbered from 1.
+    number_room: int = 100
+    # Probability that each room starts live once during benchmark.
+    live_probability: float = 0.1
+    # Lives start at random time between 0 and this seconds after fake SHOWROOM starts.
+    seconds_live_start_within: float = 30.0
+    seconds_live: float = 30.0
+    # Seconds to delay each response of API.
+    latency: float = 0.05
+    # Probability that each request to API fails by status 503.
+    error_rate: float = 0.01
+    seconds_segment: float = 2.0
+    bytes_segment: int = 64 * 1024
+    number_segment_in_playlist: int = 3
+    seed: int = 0
+
+
+@dataclass
+class Live:
+    """Live of room, times are in time.monotonic()."""
+
+    time_start: float
+    time_end: float
+    seconds_segment: float
+    time_first_playlist_request: float | None = None
+    set_sequence_requested: set[int] = field(default_factory=set)
+
+    def is_on_live(self, now: float) -> bool:
+        return self.time_start <= now < self.time_end
+
+    def count_segment_published(self, now: float) -> int:
+        """Segments are published when they are completed."""
+        return max(0, int((min(now, self.time_end) - self.time_start) / self.seconds_segment))
+
+    def count_segment_dropped(self, now: float) -> int:
+        """Counts segments published after recording started but never requested.
+
+        Segments after the last requested one are counted only when the live has ended,
+        since the recording may still be catching up.
+        """
+        if not self.set_sequence_requested:
+            return 0
+        first = min(self.set_sequence_requested)
+        last = self.count_segment_published(now) - 1 if now >= self.time_end else max(self.set_sequence_requested)
+        return last - first + 1 - len(self.set_sequence_requested)
+
+
+class FakeShowroom:
+    """Fake SHOWROOM API and HLS origin of synthetic lives, which records when lives are detected and archived."""
+
+    TEXT_NOT_ON_LIVE = '{"live_end":1,"invalid":1}'
+    TEXT_ON_LIVE = '{"is_login":true,"online_user_num":411,"live_watch_incentive":{}}'
+
+    def __init__(self, scenario: Scenario) -> None:
+        self.scenario = scenario
+        self.random = random.Random(scenario.seed)  # noqa: S311
+        self.lives: dict[int, Live] = {}
+        self.count_request_api = 0
+        self.count_error_api = 0
+        self.url = ""
+        self.application = web.Application()
+        self.application.router.add_get("/api/live/polling", self.handle_polling)
+        self.application.router.add_get("/api/live/onlives", self.handle_onlives)
+        self.application.router.add_get("/api/live/streaming_url", self.handle_streaming_url)
+        self.application.router.add_get("/live/{room_id}/playlist.m3u8", self.handle_playlist)
+        self.application.router.add_get("/live/{room_id}/{sequence}.ts", self.handle_segment)
+
+    def schedule(self, time_start: float) -> None:
+        """Decides which rooms go on live and when, reproducibly by seed."""
+        for room_id in range(1, self.scenario.number_room + 1):
+            if self.random.random() >= self.scenario.live_probability:
+                continue
+            time_live_start = time_start + self.random.uniform(0, self.scenario.seconds_live_start_within)
+            time_live_end = time_live_start + self.scenario.seconds_live
+            self.lives[room_id] = Live(time_live_start, time_live_end, self.scenario.seconds_segment)
+
+    def is_on_live(self, room_id: int) -> bool:
+        live = self.lives.get(room_id)
+        return live is not None and live.is_on_live(time.monotonic())
+
+    async def respond_api(self, text: str) -> web.Response:
+        self.count_request_api += 1
+        await asyncio.sleep(self.scenario.latency)
+        if self.random.random() < self.scenario.error_rate:
+            self.count_error_api += 1
+            return web.Response(status=503)
+        return web.Response(text=text, content_type="application/json")
+
+    async def handle_polling(self, request: web.Request) -> web.Response:
+        is_on_live = self.is_on_live(int(request.query["room_id"]))
+        return await self.respond_api(self.TEXT_ON_LIVE if is_on_live else self.TEXT_NOT_ON_LIVE)
+
+    async def handle_onlives(self, _request: web.Request) -> web.Response:
+        lives = [{"room_id": room_id} for room_id in self.lives if self.is_on_live(room_id)]
+        return await self.respond_api(json.dumps({"onlives": [{"genre_id": 0, "lives": lives}]}))
+
+    async def handle_streaming_url(self, request: web.Request) -> web.Response:
+        """Responds HLS playlist URL served by this fake while room is on live."""
+        room_id = int(request.query["room_id"])
+        list_streaming_url = (
+            [{"type": "hls", "quality": 1000, "url": f"{self.url}/live/{room_id}/playlist.m3u8"}]
+            if self.is_on_live(room_id)
+            else []
+        )
+        return await self.respond_api(json.dumps({"streaming_url_list": list_streaming_url}))
+
+    async def handle_playlist(self, request: web.Request) -> web.Response:
+        """Responds sliding window of segments published so far, ends list when live ended."""
+        live = self.lives.get(int(request.match_info["room_id"]))
+        now = time.monotonic()
+        if live is None or now < live.time_start:
+            return web.Response(status=404)
+        if live.time_first_playlist_request is None:
+            live.time_first_playlist_request = now
+        end = live.count_segment_published(now)
+        start = max(0, end - self.scenario.number_segment_in_playlist)
+        lines = [
+            "#EXTM3U",
+            f"#EXT-X-TARGETDURATION:{self.scenario.seconds_segment}",
+            f"#EXT-X-MEDIA-SEQUENCE:{start}",
+        ]
+        for sequence in range(start, end):
+            lines.extend([f"#EXTINF:{self.scenario.seconds_segment},", f"{sequence}.ts"])
+        if now >= live.time_end:
+            lines.append("#EXT-X-ENDLIST")
+        return web.Response(text="\n".join(lines), content_type="application/vnd.apple.mpegurl")
+
+    async def handle_segment(self, request: web.Request) -> web.Response:
+        live = self.lives.get(int(request.match_info["room_id"]))
+        sequence = int(request.match_info["sequence"])
+        if live is None or sequence >= live.count_segment_published(time.monotonic()):
+            return web.Response(status=404)
+        live.set_sequence_requested.add(sequence)
+        return web.Response(body=bytes(self.scenario.bytes_segment), content_type="video/mp2t")
+
+    def list_detection_latency(self) -> list[float]:
+        """Lists seconds from live start to the first request of its playlist."""
+        return [
+            live.time_first_playlist_request - live.time_start
+            for live in self.lives.values()
+            if live.time_first_playlist_request is not None
+        ]
+
+    def summarize(self) -> dict[str, float]:
+        now = time.monotonic()
+        list_detection_latency = sorted(self.list_detection_latency())
+        count_segment_requested = sum(len(live.set_sequence_requested) for live in self.lives.values())
+        count_segment_dropped = sum(live.count_segment_dropped(now) for live in self.lives.values())
+        count_segment_expected = count_segment_requested + count_segment_dropped
+        return {
+            "lives": len(self.lives),
+            "lives_detected": len(list_detection_latency),
+            "detection_latency_median_seconds": (
+                list_detection_latency[len(list_detection_latency) // 2] if list_detection_latency else 0.0
+            ),
+            "detection_latency_max_seconds": max(list_detection_latency, default=0.0),
+            "api_requests": self.count_request_api,
+            "api_errors": self.count_error_api,
+            "segments_requested": count_segment_requested,
+            "segments_dropped": count_segment_dropped,
+            "dropped_segment_rate": count_segment_dropped / count_segment_expected if count_segment_expected else 0.0,
+        }
+
+    @contextmanager
+    def serve(self) -> Generator[str, None, None]:
+        """Serves on another thread, and yields base URL.
+
+        The event loop is independent so that load of the process under benchmark doesn't affect the fake.
+        """
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.application)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", 0).start())
+        host, port = runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        self.schedule(time.monotonic())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield self.url
+        finally:
+            asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
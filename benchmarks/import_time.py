@@ -0,0 +1,112 @@
+"""Benchmark of import time of entry points against budget.
+
+Usage:
+    python -m benchmarks.import_time --repeat 5
+
+Imports each entry point in fresh interpreter with `python -X importtime`, then reports:
+- Median of cumulative import time of the entry point
+- Heavy dependencies imported although the entry point must not import them
+
+Exits with status 1 when any entry point exceeds its budget or imports dependency forbidden.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+from typing import NamedTuple
+
+import click
+
+PATH_PROJECT = Path(__file__).resolve().parents[1]
+
+
+class EntryPoint(NamedTuple):
+    """Module imported at start of process, with budget of cumulative import time in microseconds."""
+
+    module: str
+    budget: int
+    forbidden: tuple[str, ...]
+
+
+ENTRY_POINTS = [
+    # Imported by every command including --help.
+    EntryPoint(
+        "showroompodcast.cli",
+        150_000,
+        ("aiohttp", "asynccpu", "asyncffmpeg", "dataclasses_json", "ffmpeg", "requests", "slack_sdk"),
+    ),
+    # Imported by each worker process to unpickle its initializer and archiving function.
+    EntryPoint("showroompodcast.process_prewarmer", 300_000, ("aiohttp", "asynccpu", "slack_sdk")),
+]
+
+
+class ImportTime(NamedTuple):
+    """Result of `python -X importtime`."""
+
+    # Cumulative microseconds by module.
+    cumulative: dict[str, int]
+
+    def time(self, module: str) -> int:
+        return self.cumulative[module]
+
+    def list_imported(self, list_module: tuple[str, ...]) -> list[str]:
+        return [module for module in list_module if module in self.cumulative]
+
+
+def parse_import_time(text: str) -> ImportTime:
+    """Parses lines like "import time:       123 |       456 |   package.module" of stderr."""
+    cumulative = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, microseconds, module = line.split("|")
+        cumulative[module.strip()] = int(microseconds)
+    return ImportTime(cumulative)
+
+
+def measure(module: str) -> ImportTime:
+    """Imports module in fresh interpreter of the working tree."""
+    # To benchmark the working tree rather than installed package.
+    python_path = os.pathsep.join(filter(None, [str(PATH_PROJECT), os.environ.get("PYTHONPATH")]))
+    # Reason: Arguments are fixed except for module name defined in this file.
+    completed_process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, "PYTHONPATH": python_path},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_import_time(completed_process.stderr)
+
+
+def benchmark_entry_point(entry_point: EntryPoint, repeat: int) -> dict[str, Any]:
+    list_import_time = [measure(entry_point.module) for _ in range(repeat)]
+    median = statistics.median(import_time.time(entry_point.module) for import_time in list_import_time)
+    forbidden_imported = list_import_time[0].list_imported(entry_point.forbidden)
+    return {
+        "import_time_median_microseconds": median,
+        "budget_microseconds": entry_point.budget,
+        "forbidden_imported": forbidden_imported,
+        "passed": median <= entry_point.budget and not forbidden_imported,
+    }
+
+
+@click.command()
+@click.option("--repeat", default=5, show_default=True, help="Times to import each entry point.")
+def benchmark(*, repeat: int) -> None:
+    """Benchmarks import time of entry points, then prints results as JSON."""
+    results = {entry_point.module: benchmark_entry_point(entry_point, repeat) for entry_point in ENTRY_POINTS}
+    click.echo(json.dumps(results, indent=2))
+    if not all(result["passed"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # Reason: Click parses arguments from command line. pylint: disable-next=missing-kwoa
+    benchmark()
@@ -1,6 +1,12 @@
 """Top-level package for SHOWROOM Podcast."""
 
-from showroompodcast.config import Config
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from showroompodcast.config import Config
 
 __author__ = """Master"""
 __email__ = "roadmasternavi@gmail.com"
@@ -8,4 +14,18 @@ __version__ = "20260212035500"
 
 __all__: list[str] = []
 
-CONFIG: Config = Config()
+CONFIG: Config
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Creates CONFIG on first access.
+
+    Importing any submodule imports this package, so that configuration libraries are not imported until needed.
+    """
+    if name != "CONFIG":
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    # Reason: To defer importing dataclasses-json and YAML.
+    from showroompodcast.config import Config  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
+    return globals().setdefault("CONFIG", Config())
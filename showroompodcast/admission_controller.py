@@ -0,0 +1,126 @@
+"""Admission controller."""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import time
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from showroompodcast.api.streaming_url import Stream
+from showroompodcast.notification import EVENT_DISK_PRESSURE
+from showroompodcast.notification import notify
+
+if TYPE_CHECKING:
+    from showroompodcast.config import AdmissionConfig
+
+# Stream which URL is resolved by archiver since it couldn't be resolved in advance.
+STREAM_UNKNOWN = Stream("", 0)
+
+
+# Reason: Budget, measurement and counters exposed as metrics. pylint: disable-next=too-many-instance-attributes
+class AdmissionController:
+    """Admits new recordings within budget of free disk space and aggregate write throughput.
+
+    The bitrate of each recording is estimated by the quality of chosen streaming URL.
+    When the best quality exceeds the budget, lower quality is chosen instead.
+    When no quality fits, the recording is rejected, and it is tried again at next polling.
+    Aggregate write throughput is measured over fixed window by run(), apart from admission at irregular intervals.
+    """
+
+    SECONDS_WINDOW = 10.0
+
+    def __init__(self, admission_config: AdmissionConfig, directory: str = "./output") -> None:
+        self.minimum_free_bytes = admission_config.minimum_free_bytes
+        self.seconds_to_reserve = admission_config.seconds_to_reserve
+        self.maximum_bytes_per_second = admission_config.maximum_bytes_per_second
+        self.default_quality = admission_config.default_quality
+        self.directory = directory
+        self.dictionary_bytes_per_second: dict[int, float] = {}
+        self.bytes_free = 0
+        self.bytes_per_second_measured = 0.0
+        self.bytes_used_last: int | None = None
+        self.time_measured_last = 0.0
+        self.number_admitted = 0
+        self.number_downgraded = 0
+        self.number_rejected = 0
+        self.logger = getLogger(__name__)
+
+    def admit(self, room_id: int, list_stream: list[Stream]) -> Stream | None:
+        """Returns the best stream within budget, or None when rejected.
+
+        The list_stream is in order from best quality. When it's empty, returns STREAM_UNKNOWN if it's in budget.
+        """
+        self.measure_free()
+        for index, stream in enumerate(list_stream or [STREAM_UNKNOWN]):
+            bytes_per_second = self.estimate_bytes_per_second(stream)
+            if not self.is_in_budget(bytes_per_second):
+                continue
+            if index > 0:
+                self.number_downgraded += 1
+                self.logger.warning("Downgraded to %d kbps. room_id: %d", stream.quality, room_id)
+                notify(EVENT_DISK_PRESSURE, f"downgraded to {stream.quality} kbps", room_id=room_id)
+            self.dictionary_bytes_per_second[room_id] = bytes_per_second
+            self.number_admitted += 1
+            return stream
+        self.number_rejected += 1
+        self.logger.warning("Rejected since out of budget, retries at next polling. room_id: %d", room_id)
+        notify(EVENT_DISK_PRESSURE, "rejected since out of budget", room_id=room_id)
+        return None
+
+    def release(self, room_id: int, *_args: object) -> None:
+        """Releases budget of recording, arguments after room ID are ignored to use as done callback."""
+        self.dictionary_bytes_per_second.pop(room_id, None)
+
+    def estimate_bytes_per_second(self, stream: Stream) -> float:
+        return (stream.quality or self.default_quality) * 1000 / 8
+
+    @property
+    def bytes_per_second_reserved(self) -> float:
+        return sum(self.dictionary_bytes_per_second.values())
+
+    def is_in_budget(self, bytes_per_second: float) -> bool:
+        """Checks throughput including other processes writing into the same disk, and disk space to reserve."""
+        bytes_per_second_total = max(self.bytes_per_second_reserved, self.bytes_per_second_measured) + bytes_per_second
+        if self.maximum_bytes_per_second and bytes_per_second_total > self.maximum_bytes_per_second:
+            return False
+        if not self.minimum_free_bytes:
+            return True
+        bytes_to_reserve = (self.bytes_per_second_reserved + bytes_per_second) * self.seconds_to_reserve
+        return self.bytes_free - self.minimum_free_bytes >= bytes_to_reserve
+
+    async def run(self) -> None:
+        """Measures aggregate write throughput every window while recordings are admitted."""
+        if not self.maximum_bytes_per_second:
+            return
+        while True:
+            self.measure()
+            await asyncio.sleep(self.SECONDS_WINDOW)
+
+    def measure_free(self) -> None:
+        if self.minimum_free_bytes:
+            self.bytes_free = shutil.disk_usage(self.directory).free
+
+    def measure(self) -> None:
+        """Measures free disk space and aggregate write throughput by the increase of used disk space."""
+        disk_usage = shutil.disk_usage(self.directory)
+        now = time.monotonic()
+        if self.bytes_used_last is not None and now > self.time_measured_last:
+            increase = max(0, disk_usage.used - self.bytes_used_last)
+            self.bytes_per_second_measured = increase / (now - self.time_measured_last)
+        self.bytes_free = disk_usage.free
+        self.bytes_used_last = disk_usage.used
+        self.time_measured_last = now
+
+    def metrics(self) -> dict[str, float]:
+        """Returns numbers for monitoring."""
+        return {
+            "admission_bytes_free": self.bytes_free,
+            "admission_bytes_per_second_reserved": self.bytes_per_second_reserved,
+            "admission_bytes_per_second_measured": self.bytes_per_second_measured,
+            "admission_recordings": len(self.dictionary_bytes_per_second),
+            "admission_admitted_total": self.number_admitted,
+            "admission_downgraded_total": self.number_downgraded,
+            "admission_rejected_total": self.number_rejected,
+        }
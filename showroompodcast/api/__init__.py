@@ -1,12 +1,30 @@
 """SHOWROOM API."""
 
+from __future__ import annotations
+
+import asyncio
+import os
+import time
 from abc import abstractmethod
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import ClassVar
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from showroompodcast.config import HttpConfig
+from showroompodcast.exceptions import TemporaryNetworkIssuesError
+from showroompodcast.metrics import API_REQUEST_DURATION
+from showroompodcast.metrics import TEMPORARY_NETWORK_ISSUES
+from showroompodcast.raise_if import raise_if
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+LIST_STATUS_CODE_TEMPORARY = [500, 502, 503, 504]
+
 
 class ShowroomApi:
     """Base class of SHOWROOM API."""
@@ -15,6 +33,15 @@ class ShowroomApi:
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
         " AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     )
+    TIMEOUT = 20.0
+    http_config: ClassVar[HttpConfig] = HttpConfig()
+    _session: ClassVar[requests.Session | None] = None
+    _process_id_session: ClassVar[int | None] = None
+
+    @staticmethod
+    def configure(http_config: HttpConfig) -> None:
+        """Configures connection pooling, takes effect on sessions created after this."""
+        ShowroomApi.http_config = http_config
 
     @classmethod
     def request(cls, params: dict[str, Any]) -> dict[str, Any]:
@@ -26,6 +53,33 @@ class ShowroomApi:
         # pylint: disable=line-too-long
         see: https://stackoverflow.com/questions/8356517/permanent-temporary-failure-in-name-resolution-after-running-for-a-number-of-h/8376268#8376268
         """  # noqa: E501,RUF100
+        time_start = time.monotonic()
+        try:
+            response = cls.get_session().get(url=cls.url(), params=params, timeout=cls.TIMEOUT)
+        finally:
+            API_REQUEST_DURATION.observe(time.monotonic() - time_start, cls.__name__)
+        response.raise_for_status()
+        # Reason: Certainly returns dict.
+        return response.json()  # type: ignore[no-any-return]
+
+    @staticmethod
+    def get_session() -> requests.Session:
+        """Returns the session shared in current process.
+
+        The session is created again in child process of ProcessTaskPoolExecutor
+        since pooled sockets inherited over fork are shared with parent process.
+        The inherited session is just abandoned without closing
+        not to send TLS close notify on the connection parent process is using.
+        """
+        process_id = os.getpid()
+        if ShowroomApi._session is None or ShowroomApi._process_id_session != process_id:
+            ShowroomApi._session = ShowroomApi.create_session()
+            ShowroomApi._process_id_session = process_id
+        return ShowroomApi._session
+
+    @staticmethod
+    def create_session() -> requests.Session:
+        """Creates session which keeps connections alive in pool."""
         session = requests.Session()
         # To prevent following error:
         # 1: Max retries exceeded with url: /api/live/polling?room_id=xxxxxx
@@ -33,12 +87,66 @@ class ShowroomApi:
         # 2: ('Connection aborted.', RemoteDisconnected('Remote end closed connection without response'))
         # 3: Read timed out. (read timeout=20.0)
         retry = Retry(backoff_factor=0.1)
-        session.mount("https://", HTTPAdapter(max_retries=retry))
+        adapter = HTTPAdapter(
+            pool_connections=ShowroomApi.http_config.pool_connections,
+            pool_maxsize=ShowroomApi.http_config.pool_maxsize,
+            max_retries=retry,
+        )
+        session.mount("https://", adapter)
         session.headers.update({"User-Agent": ShowroomApi.USER_AGENT_WINDOWS_CHROME})
-        response = session.get(url=cls.url(), params=params, timeout=20.0)
-        response.raise_for_status()
-        # Reason: Certainly returns dict.
-        return response.json()  # type: ignore[no-any-return]
+        return session
+
+    @staticmethod
+    def close_session() -> None:
+        """Closes the session shared in current process if exists."""
+        if ShowroomApi._session is not None and ShowroomApi._process_id_session == os.getpid():
+            ShowroomApi._session.close()
+        ShowroomApi._session = None
+        ShowroomApi._process_id_session = None
+
+    @classmethod
+    async def request_async(cls, session: ClientSession, params: dict[str, Any]) -> dict[str, Any]:
+        """Requests without blocking event loop.
+
+        The session should be created by create_client_session() and shared between requests.
+        Raises TemporaryNetworkIssuesError when SHOWROOM or network is temporarily unavailable.
+        """
+        # Reason: Worker processes request only synchronously, aiohttp is imported only in main process.
+        from aiohttp import ClientConnectionError  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        from aiohttp import ClientResponseError  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
+        time_start = time.monotonic()
+        try:
+            async with session.get(cls.url(), params=params) as response:
+                response.raise_for_status()
+                # Reason: SHOWROOM API doesn't always respond Content-Type: application/json.
+                # Reason: Certainly returns dict.
+                return await response.json(content_type=None)  # type: ignore[no-any-return]
+        except ClientResponseError as error:
+            # Often returns 502, 503, 504 temporary, retry.
+            raise_if(condition=error.status not in LIST_STATUS_CODE_TEMPORARY)
+            TEMPORARY_NETWORK_ISSUES.inc(cls.__name__)
+            raise TemporaryNetworkIssuesError from error
+        # To avoid process down due to temporary DNS resolution error, refused connection, or timeout.
+        except (ClientConnectionError, asyncio.TimeoutError) as error:
+            TEMPORARY_NETWORK_ISSUES.inc(cls.__name__)
+            raise TemporaryNetworkIssuesError from error
+        finally:
+            API_REQUEST_DURATION.observe(time.monotonic() - time_start, cls.__name__)
+
+    @staticmethod
+    def create_client_session(*, limit: int) -> ClientSession:
+        """Creates asynchronous session which pools up to limit connections."""
+        # Reason: Worker processes request only synchronously, aiohttp is imported only in main process.
+        from aiohttp import ClientSession  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        from aiohttp import ClientTimeout  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        from aiohttp import TCPConnector  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
+        return ClientSession(
+            connector=TCPConnector(limit=limit, keepalive_timeout=ShowroomApi.http_config.keepalive_timeout),
+            headers={"User-Agent": ShowroomApi.USER_AGENT_WINDOWS_CHROME},
+            timeout=ClientTimeout(total=ShowroomApi.TIMEOUT),
+        )
 
     @staticmethod
     @abstractmethod
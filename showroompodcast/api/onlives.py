@@ -0,0 +1,25 @@
+"""API of lives on live."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from showroompodcast.api import ShowroomApi
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+class Onlives(ShowroomApi):
+    """API of lives on live in all genres of SHOWROOM."""
+
+    @classmethod
+    async def get_set_room_id_async(cls, session: ClientSession) -> set[int]:
+        """Returns room IDs on live by single request."""
+        response = await cls.request_async(session, {})
+        # Same live may be listed in multiple genres.
+        return {live["room_id"] for genre in response["onlives"] for live in genre.get("lives", [])}
+
+    @staticmethod
+    def url() -> str:
+        return f"{ShowroomApi.http_config.base_url}/api/live/onlives"
@@ -1,11 +1,21 @@
 """API of polling."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
 from requests import HTTPError
 
+from showroompodcast.api import LIST_STATUS_CODE_TEMPORARY
 from showroompodcast.api import ShowroomApi
 from showroompodcast.exceptions import TemporaryNetworkIssuesError
+from showroompodcast.metrics import TEMPORARY_NETWORK_ISSUES
 from showroompodcast.raise_if import raise_if
 
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
 
 class Polling(ShowroomApi):
     """API of polling."""
@@ -13,7 +23,15 @@ class Polling(ShowroomApi):
     @classmethod
     def poll(cls, room_id: int) -> bool:
         """Returns True when on live, otherwise returns False."""
-        response = cls._poll(room_id)
+        return cls.is_on_live(cls._poll(room_id))
+
+    @classmethod
+    async def poll_async(cls, session: ClientSession, room_id: int) -> bool:
+        """Returns True when on live, otherwise returns False."""
+        return cls.is_on_live(await cls.request_async(session, {"room_id": room_id}))
+
+    @staticmethod
+    def is_on_live(response: dict[str, Any]) -> bool:
         return "live_end" not in response or response["live_end"] != 1
 
     @classmethod
@@ -23,7 +41,8 @@ class Polling(ShowroomApi):
             return cls.request({"room_id": room_id})
         except HTTPError as error:
             # Often returns 502, 503, 504 temporary, retry.
-            raise_if(condition=error.response.status_code not in [500, 502, 503, 504])
+            raise_if(condition=error.response.status_code not in LIST_STATUS_CODE_TEMPORARY)
+            TEMPORARY_NETWORK_ISSUES.inc(cls.__name__)
             raise TemporaryNetworkIssuesError from error
         except ConnectionError as error:
             # To avoid process down due to temporary DNS resolution error.
@@ -33,8 +52,9 @@ class Polling(ShowroomApi):
             ]
             condition_retry = any(message in str(error) for message in list_error_message_retry)
             raise_if(condition=not condition_retry)
+            TEMPORARY_NETWORK_ISSUES.inc(cls.__name__)
             raise TemporaryNetworkIssuesError from error
 
     @staticmethod
     def url() -> str:
-        return "https://www.showroom-live.com/api/live/polling"
+        return f"{ShowroomApi.http_config.base_url}/api/live/polling"
@@ -1,9 +1,18 @@
 """API of Streaming URL."""
 
-from collections.abc import Callable
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
 
 from showroompodcast.api import ShowroomApi
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from aiohttp import ClientSession
+
 
 def itemgetter(key: str) -> Callable[[dict[str, int]], int]:
     """The key `quality` sometimes does not exist in latest specification in SHOWROOM."""
@@ -15,19 +24,62 @@ def itemgetter(key: str) -> Callable[[dict[str, int]], int]:
     return function
 
 
+class Stream(NamedTuple):
+    """Streaming URL and its quality in kbps, the quality is 0 when it's unknown."""
+
+    url: str
+    quality: int
+
+
 class StreamingUrl(ShowroomApi):
     """API of Streaming URL."""
 
     @classmethod
-    def get_url_for_best_quality(cls, room_id: int) -> str:
-        """Gets streaming URL for best quality."""
+    def get_url_for_best_quality(cls, room_id: int, quality_maximum: int = 0) -> str:
+        """Gets streaming URL for best quality not exceeding quality_maximum kbps, 0 means unlimited."""
         response = cls.request({"room_id": room_id})
+        return cls.select_stream(cls.list_stream_by_quality(response), quality_maximum).url
+
+    @classmethod
+    async def find_url_for_best_quality_async(
+        cls,
+        session: ClientSession,
+        room_id: int,
+        quality_maximum: int = 0,
+    ) -> str | None:
+        """Finds streaming URL same as get_url_for_best_quality(), returns None when no URL is available yet."""
+        list_stream = await cls.list_stream_by_quality_async(session, room_id)
+        return cls.select_stream(list_stream, quality_maximum).url if list_stream else None
+
+    @classmethod
+    async def list_stream_by_quality_async(cls, session: ClientSession, room_id: int) -> list[Stream]:
+        """Lists streams in order from best quality, returns empty list when no URL is available yet."""
+        response = await cls.request_async(session, {"room_id": room_id})
+        return cls.list_stream_by_quality(response)
+
+    @staticmethod
+    def select_stream(list_stream: list[Stream], quality_maximum: int = 0) -> Stream:
+        """Selects the best stream not exceeding quality_maximum kbps in list in order from best quality.
+
+        When every stream exceeds, selects the lowest quality, so that retries don't exceed quality admitted.
+        """
+        if not quality_maximum:
+            return list_stream[0]
+        return next((stream for stream in list_stream if stream.quality <= quality_maximum), list_stream[-1])
+
+    @staticmethod
+    def list_url_by_quality(response: dict[str, Any]) -> list[str]:
+        """Lists streaming URLs FFmpeg supports in order from best quality."""
+        return [stream.url for stream in StreamingUrl.list_stream_by_quality(response)]
+
+    @staticmethod
+    def list_stream_by_quality(response: dict[str, Any]) -> list[Stream]:
+        """Lists streams FFmpeg supports in order from best quality."""
         # WebRTC URLs are excluded since FFmpeg does not support the webrtc:// protocol.
-        urls = [u for u in response["streaming_url_list"] if not u["url"].startswith("webrtc://")]
+        urls = [u for u in response.get("streaming_url_list", []) if not u["url"].startswith("webrtc://")]
         # The key `quality` sometimes does not exist in latest specification in SHOWROOM.
-        # Reason: Certainly returns str.
-        return sorted(urls, key=itemgetter("quality"), reverse=True)[0]["url"]  # type: ignore[no-any-return]
+        return [Stream(u["url"], u.get("quality", 0)) for u in sorted(urls, key=itemgetter("quality"), reverse=True)]
 
     @staticmethod
     def url() -> str:
-        return "https://www.showroom-live.com/api/live/streaming_url"
+        return f"{ShowroomApi.http_config.base_url}/api/live/streaming_url"
@@ -0,0 +1,60 @@
+"""Archive concatenator."""
+
+from __future__ import annotations
+
+from logging import getLogger
+from pathlib import PurePath
+
+from anyio import Path
+from asyncffmpeg.exceptions import FFmpegProcessError
+
+from showroompodcast.remuxer import Remuxer
+
+
+class ArchiveConcatenator:
+    """Concatenates parts of archive broken by network issues into one archive without re-encoding.
+
+    The first part is written into the file name of archive,
+    following parts are written into file names with suffix, and they are merged into the first part at last.
+    """
+
+    def __init__(self, out_file_name: str) -> None:
+        self.out_file_name = out_file_name
+        self.list_part_file_name = [out_file_name]
+        self.remuxer = Remuxer()
+        self.logger = getLogger(__name__)
+
+    def create_part_file_name(self) -> str:
+        """Creates file name for next part."""
+        part_file_name = self.create_file_name_with_suffix(f".part{len(self.list_part_file_name)}")
+        self.list_part_file_name.append(part_file_name)
+        return part_file_name
+
+    async def concatenate(self) -> None:
+        """Concatenates parts into the file name of archive, keeps parts when failed."""
+        list_part_file_name = [
+            part_file_name
+            for part_file_name in self.list_part_file_name
+            if await Path(part_file_name).exists() and (await Path(part_file_name).stat()).st_size > 0
+        ]
+        if list_part_file_name in ([], [self.out_file_name]):
+            return
+        self.logger.info("Concatenate: %s", list_part_file_name)
+        concatenated_file_name = self.create_file_name_with_suffix(".concatenated")
+        try:
+            await self.remuxer.concatenate(list_part_file_name, concatenated_file_name)
+        except FFmpegProcessError as error:
+            self.logger.warning(
+                "Failed to concatenate, parts are kept. out_file_name: %s",
+                self.out_file_name,
+                exc_info=error,
+            )
+            return
+        await Path(concatenated_file_name).replace(self.out_file_name)
+        for part_file_name in list_part_file_name:
+            if part_file_name != self.out_file_name:
+                await Path(part_file_name).unlink()
+
+    def create_file_name_with_suffix(self, suffix: str) -> str:
+        extension = PurePath(self.out_file_name).suffix
+        return f"{self.out_file_name.removesuffix(extension)}{suffix}{extension}"
@@ -1,29 +1,105 @@
 """Archiving task manager."""
 
+from __future__ import annotations
+
 import asyncio
-from multiprocessing import Manager
+from logging import getLogger
 from typing import TYPE_CHECKING
 
-from showroompodcast.showroom_poller import ShowroomPoller
+from showroompodcast.metrics import SWEEP_DURATION
+from showroompodcast.polling_scheduler import PollingScheduler
+from showroompodcast.showroom_datetime import ShowroomDatetime
 
 if TYPE_CHECKING:
-    from threading import Lock
+    from showroompodcast.config import PollingConfig
+    from showroompodcast.showroom_poller import ShowroomPoller
 
 
 class ArchivingTaskManager:
     """Archiving task manager."""
 
-    def __init__(self, list_room_id: list[int]) -> None:
-        # To prevent "Lock objects should only be shared between processes through inheritance"
-        # see: https://stackoverflow.com/questions/25557686/python-sharing-a-lock-between-processes/25558333#25558333
-        self.manager = Manager()
-        self.dictionary_lock_archiving_task: dict[int, Lock] = {
-            # Reason: pylint's bug: https://github.com/PyCQA/pylint/issues/3313 pylint: disable=no-member
-            room_id: self.manager.Lock()
-            for room_id in list_room_id
-        }
-
-    async def poll_all_rooms(self, showroom_poller: ShowroomPoller) -> None:
-        for room_id, lock_archive_task in self.dictionary_lock_archiving_task.items():
-            showroom_poller.poll(room_id, lock_archive_task)
-            await asyncio.sleep(1)
+    def __init__(self, list_room_id: list[int], polling_config: PollingConfig) -> None:
+        self.list_room_id = list_room_id
+        self.polling_scheduler = PollingScheduler(list_room_id, polling_config)
+        self.interval_minimum = polling_config.interval_minimum
+        self.interval_maximum = polling_config.interval_maximum
+        self.discovery = polling_config.discovery
+        self.set_task_polling: set[asyncio.Task[None]] = set()
+        self.logger = getLogger(__name__)
+
+    def update_rooms(self, list_room_id: list[int]) -> None:
+        """Applies new list of rooms by difference, archiving in progress continues even if its room is removed."""
+        set_room_id_current = set(self.list_room_id)
+        set_room_id_new = set(list_room_id)
+        list_room_id_added = [room_id for room_id in list_room_id if room_id not in set_room_id_current]
+        set_room_id_removed = set_room_id_current - set_room_id_new
+        if not list_room_id_added and not set_room_id_removed:
+            return
+        self.polling_scheduler.add(list_room_id_added, asyncio.get_running_loop().time())
+        self.polling_scheduler.remove(set_room_id_removed)
+        self.list_room_id = list_room_id
+        self.logger.info("Rooms updated. added: %s, removed: %s", list_room_id_added, sorted(set_room_id_removed))
+
+    async def poll_rooms(self, showroom_poller: ShowroomPoller) -> None:
+        """Polls rooms by the mode in configuration."""
+        if self.discovery:
+            await self.discover_rooms_on_live(showroom_poller)
+        else:
+            await self.poll_due_rooms(showroom_poller)
+
+    async def discover_rooms_on_live(self, showroom_poller: ShowroomPoller) -> None:
+        """Finds rooms on live by single request, then polls only them to verify and start archiving.
+
+        The number of requests is constant regardless of the number of rooms unless they are on live.
+        """
+        loop = asyncio.get_running_loop()
+        time_start = loop.time()
+        set_room_id_on_live = await showroom_poller.discover()
+        if set_room_id_on_live is not None:
+            list_room_id = [
+                room_id
+                for room_id in self.list_room_id
+                if room_id in set_room_id_on_live and not showroom_poller.is_archiving(room_id)
+            ]
+            self.logger.debug("Rooms to verify: %s", list_room_id)
+            await asyncio.gather(*(showroom_poller.poll(room_id) for room_id in list_room_id))
+        SWEEP_DURATION.observe(loop.time() - time_start)
+        await asyncio.sleep(max(0.0, time_start + self.interval_minimum - loop.time()))
+
+    async def poll_due_rooms(self, showroom_poller: ShowroomPoller) -> None:
+        """Starts polling rooms which are due, then waits until next room is due or any polling finishes.
+
+        Polling runs concurrently, the pace is limited by the polling engine.
+        """
+        loop = asyncio.get_running_loop()
+        list_room_id = self.polling_scheduler.pop_due(loop.time())
+        if list_room_id:
+            self.set_task_polling.add(asyncio.create_task(self.sweep(showroom_poller, list_room_id)))
+        timeout = self.polling_scheduler.seconds_until_next_due(loop.time())
+        if not self.set_task_polling:
+            await asyncio.sleep(self.interval_maximum if timeout is None else timeout)
+            return
+        done, self.set_task_polling = await asyncio.wait(
+            self.set_task_polling,
+            timeout=timeout,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for task in done:
+            # To propagate unexpected error.
+            task.result()
+
+    async def sweep(self, showroom_poller: ShowroomPoller, list_room_id: list[int]) -> None:
+        """Polls rooms which are due at once."""
+        loop = asyncio.get_running_loop()
+        time_start = loop.time()
+        await asyncio.gather(*(self.poll(showroom_poller, room_id) for room_id in list_room_id))
+        SWEEP_DURATION.observe(loop.time() - time_start)
+
+    async def poll(self, showroom_poller: ShowroomPoller, room_id: int) -> None:
+        """Polls unless the room is being archived, then schedules next polling."""
+        loop = asyncio.get_running_loop()
+        if showroom_poller.is_archiving(room_id):
+            self.polling_scheduler.postpone(room_id, loop.time())
+            return
+        is_on_live = await showroom_poller.poll(room_id)
+        self.polling_scheduler.schedule(room_id, loop.time(), ShowroomDatetime.now_jst(), is_on_live=is_on_live)
@@ -0,0 +1,88 @@
+"""Archiving task registry."""
+
+from __future__ import annotations
+
+from functools import partial
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Union
+
+from showroompodcast.exceptions import MaxRetriesExceededError
+from showroompodcast.metrics import RECORDINGS_ACTIVE
+from showroompodcast.notification import EVENT_ARCHIVING_FAILED
+from showroompodcast.notification import EVENT_RECORDING_FINISHED
+from showroompodcast.notification import EVENT_RECORDING_STARTED
+from showroompodcast.notification import EVENT_RETRIES_EXHAUSTED
+from showroompodcast.notification import notify
+
+if TYPE_CHECKING:
+    import asyncio
+    import concurrent.futures
+
+    from showroompodcast.live_end_detector import StopEvent
+
+    FutureArchivingTask = Union[asyncio.Future[Any], concurrent.futures.Future[Any]]
+
+
+class ArchivingTaskRegistry:
+    """Registry of archiving tasks in flight keyed by room ID.
+
+    This lives in parent process and is updated by done callback of the future of task,
+    so it requires no inter-process communication,
+    and the room is never locked forever even if worker process dies.
+    """
+
+    def __init__(self) -> None:
+        self.dictionary_task: dict[int, FutureArchivingTask] = {}
+        # Events to request archiving to stop, only of tasks which support it and not requested yet.
+        self.dictionary_stop_event: dict[int, StopEvent] = {}
+        self.logger = getLogger(__name__)
+
+    def is_archiving(self, room_id: int) -> bool:
+        return room_id in self.dictionary_task
+
+    def register(self, room_id: int, task: FutureArchivingTask, stop_event: StopEvent | None = None) -> None:
+        """Registers task until it's done, with event which the task watches to stop if it supports."""
+        self.dictionary_task[room_id] = task
+        if stop_event is not None:
+            self.dictionary_stop_event[room_id] = stop_event
+        RECORDINGS_ACTIVE.inc()
+        notify(EVENT_RECORDING_STARTED, "started", room_id=room_id)
+        task.add_done_callback(partial(self.unregister, room_id))
+
+    def unregister(self, room_id: int, task: FutureArchivingTask) -> None:
+        """Unregisters task, and logs error since nobody awaits the task."""
+        if self.dictionary_task.get(room_id) is task:
+            del self.dictionary_task[room_id]
+            self.dictionary_stop_event.pop(room_id, None)
+        RECORDINGS_ACTIVE.dec()
+        if task.cancelled():
+            self.logger.debug("Archiving cancelled. room_id: %d", room_id)
+            return
+        exception = task.exception()
+        if exception is None:
+            notify(EVENT_RECORDING_FINISHED, "finished", room_id=room_id)
+            return
+        self.logger.error("Archiving failed. room_id: %d", room_id, exc_info=exception)
+        if isinstance(exception, MaxRetriesExceededError):
+            notify(EVENT_RETRIES_EXHAUSTED, "gave up retrying", room_id=room_id)
+        else:
+            notify(EVENT_ARCHIVING_FAILED, f"{exception.__class__.__name__}: {exception}", room_id=room_id)
+
+    def list_room_id_stoppable(self) -> list[int]:
+        return list(self.dictionary_stop_event)
+
+    def request_stop(self, room_id: int) -> None:
+        """Requests archiving to stop, then the task finishes after finalizing archive."""
+        stop_event = self.dictionary_stop_event.pop(room_id, None)
+        if stop_event is None:
+            return
+        try:
+            stop_event.set()
+        except OSError:
+            # When worker process already died, its task finishes by itself.
+            self.logger.warning("Failed to request stop. room_id: %d", room_id, exc_info=True)
+
+    def __len__(self) -> int:
+        return len(self.dictionary_task)
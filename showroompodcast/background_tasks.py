@@ -0,0 +1,56 @@
+"""Background tasks."""
+
+from __future__ import annotations
+
+import asyncio
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from types import TracebackType
+    from typing import Any
+
+    from typing_extensions import Self
+
+
+class BackgroundTasks:
+    """Tasks which run alongside polling rooms until it stops.
+
+    Holds references of tasks not to be garbage collected, and logs failure since nobody awaits them.
+    All of them are cancelled and awaited when exit.
+    """
+
+    def __init__(self) -> None:
+        self.set_task: set[asyncio.Task[None]] = set()
+        self.logger = getLogger(__name__)
+
+    def start(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        """Names task by the coroutine function to identify it in log."""
+        self.add(asyncio.create_task(coroutine, name=getattr(coroutine, "__qualname__", None)))
+
+    def add(self, task: asyncio.Task[None]) -> None:
+        self.set_task.add(task)
+        task.add_done_callback(self.on_done)
+
+    def on_done(self, task: asyncio.Task[None]) -> None:
+        self.set_task.discard(task)
+        if task.cancelled():
+            return
+        exception = task.exception()
+        if exception is not None:
+            self.logger.error("Background task failed. name: %s", task.get_name(), exc_info=exception)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        for task in self.set_task:
+            task.cancel()
+        # Failures are logged by done callback.
+        await asyncio.gather(*self.set_task, return_exceptions=True)
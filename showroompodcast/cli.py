@@ -4,24 +4,129 @@ from __future__ import annotations
 
 import asyncio
 import sys
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
-from showroompodcast.showroom_podcast import ShowroomPodcast
+import showroompodcast
+from showroompodcast.exceptions import RecordingIndexError
+from showroompodcast.recording_index import RecordingIndex
+from showroompodcast.showroom_datetime import ShowroomDatetime
 
+if TYPE_CHECKING:
+    from showroompodcast.recording_index import IndexedRecording
 
-@click.command()
+FORMATS_DATETIME = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]
+SECONDS_HOUR = 3600
+
+
+@click.group(invoke_without_command=True)
 @click.option(
     "-f",
     "--file",
     type=click.Path(exists=True, resolve_path=True, path_type=Path),
     default=Path("config.yml"),
 )
-def showroom_podcast(file: Path | None) -> None:
-    """Console script for SHOWROOM Podcast."""
+@click.pass_context
+def showroom_podcast(context: click.Context, file: Path | None) -> None:
+    """Console script for SHOWROOM Podcast, archives unless command is specified."""
+    if context.invoked_subcommand is not None:
+        context.obj = file
+        return
+    # Reason: To show help and run commands without importing dependencies only archiving requires.
+    from showroompodcast.showroom_podcast import ShowroomPodcast  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
     podcast = ShowroomPodcast(path_to_configuration=file)
     try:
         podcast.run()
     except (KeyboardInterrupt, asyncio.CancelledError):
         sys.exit(130)
+
+
+@showroom_podcast.group()
+@click.pass_context
+def index(context: click.Context) -> None:
+    """Queries index of archived recordings, configured by index.path."""
+    config = showroompodcast.CONFIG
+    config.load(context.obj)
+    if not config.index.path:
+        msg = "index.path is not configured."
+        raise click.UsageError(msg)
+    context.obj = RecordingIndex(config.index.path)
+
+
+@index.command()
+@click.option("--directory", default="./output", show_default=True)
+@click.pass_obj
+def scan(recording_index: RecordingIndex, directory: str) -> None:
+    """Indexes archives added or modified since last scan."""
+    # Reason: To defer importing FFmpeg binding until probing.
+    from showroompodcast.recording_indexer import RecordingIndexer  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
+    try:
+        list_indexed_recording = asyncio.run(RecordingIndexer(recording_index, directory).scan())
+    except (RecordingIndexError, OSError) as error:
+        raise click.ClickException(str(error)) from error
+    click.echo(f"Indexed {len(list_indexed_recording)} archives.")
+
+
+@index.command(name="list")
+@click.option("--room-id", type=int)
+@click.option("--since", type=click.DateTime(FORMATS_DATETIME), help="Start time in JST, inclusive.")
+@click.option("--until", type=click.DateTime(FORMATS_DATETIME), help="Start time in JST, exclusive.")
+@click.option("--incomplete", is_flag=True, help="Lists only archives which FFprobe regarded as broken.")
+@click.pass_obj
+def list_recording(
+    recording_index: RecordingIndex,
+    *,
+    room_id: int | None,
+    since: datetime | None,
+    until: datetime | None,
+    incomplete: bool,
+) -> None:
+    """Lists archives ordered by start time as tab separated values."""
+    try:
+        list_indexed_recording = recording_index.list_recording_sync(
+            room_id,
+            None if since is None else since.replace(tzinfo=ShowroomDatetime.JST).timestamp(),
+            None if until is None else until.replace(tzinfo=ShowroomDatetime.JST).timestamp(),
+            incomplete,
+        )
+    except RecordingIndexError as error:
+        raise click.ClickException(str(error)) from error
+    click.echo("name\troom_id\tstart\tend\tduration\tsize\tcodecs\tcomplete")
+    for indexed_recording in list_indexed_recording:
+        click.echo(format_indexed_recording(indexed_recording))
+
+
+def format_indexed_recording(indexed_recording: IndexedRecording) -> str:
+    """Formats as tab separated values in same order as header, times in JST."""
+    columns = [
+        indexed_recording.name,
+        str(indexed_recording.room_id),
+        datetime.fromtimestamp(indexed_recording.time_start, tz=ShowroomDatetime.JST).isoformat(),
+        datetime.fromtimestamp(indexed_recording.time_end, tz=ShowroomDatetime.JST).isoformat(),
+        f"{indexed_recording.duration:.3f}",
+        str(indexed_recording.size),
+        indexed_recording.codecs,
+        str(indexed_recording.is_complete).lower(),
+    ]
+    return "\t".join(columns)
+
+
+@index.command()
+@click.pass_obj
+def summary(recording_index: RecordingIndex) -> None:
+    """Summarizes archives by room as tab separated values."""
+    try:
+        list_room_summary = recording_index.summarize_sync()
+    except RecordingIndexError as error:
+        raise click.ClickException(str(error)) from error
+    click.echo("room_id\trecordings\thours\tsize\tincomplete")
+    for room_summary in list_room_summary:
+        click.echo(
+            f"{room_summary.room_id}\t{room_summary.number_recording}\t{room_summary.duration / SECONDS_HOUR:.2f}"
+            f"\t{room_summary.size}\t{room_summary.count_incomplete}",
+        )
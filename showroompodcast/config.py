@@ -13,17 +13,332 @@ class SlackConfig(DataClassJsonMixin):
 
     bot_token: str
     channel: str
+    # Events to notify while running, errors which stop the process are always notified.
+    events: list[str] = field(
+        default_factory=lambda: [
+            "retries_exhausted",
+            "archiving_failed",
+            "disk_pressure",
+            "network_issues",
+            "recordings_queued",
+        ],
+    )
+    # Seconds to coalesce events into one message.
+    window: float = 30.0
+    # Events over this while waiting to be sent are dropped and counted.
+    maximum_pending: int = 1000
+    # Messages are spaced within this rate, 0 is unlimited.
+    requests_per_second: float = 1.0
+    base_url: str = "https://slack.com/api/"
+
+
+@dataclass
+# Reason: Polling has many knobs to tune. pylint: disable-next=too-many-instance-attributes
+class PollingConfig(DataClassJsonMixin):
+    """This class implements configuration for polling."""
+
+    # How many polling requests can be in flight at same time.
+    number_concurrency: int = 10
+    # The budget of polling requests per second shared by all rooms, 0 is unlimited.
+    requests_per_second: float = 10.0
+    # Seconds between polling for rooms on live recently or around the time live usually starts.
+    interval_minimum: float = 5.0
+    # Seconds between polling for rooms off live for long time.
+    interval_maximum: float = 60.0
+    # When true, finds rooms on live by single request to list of all lives every interval_minimum seconds,
+    # then polls only those rooms to verify.
+    discovery: bool = False
+    # Seconds to reuse streaming URL resolved when live is detected.
+    streaming_url_time_to_live: float = 30.0
+    # Seconds between polling rooms being recorded, to stop recording when live ended, 0 disables.
+    interval_recording: float = 0.0
+    # Consecutive polling which reported live ended to stop recording.
+    confirmations_live_end: int = 2
+
+
+@dataclass
+class HttpConfig(DataClassJsonMixin):
+    """This class implements configuration for HTTP connection pooling."""
+
+    # How many hosts to keep connection pool for.
+    pool_connections: int = 10
+    # How many connections to keep alive for each host.
+    pool_maxsize: int = 10
+    # Seconds to keep idle connection alive.
+    keepalive_timeout: float = 30.0
+    # Origin of SHOWROOM API, to be replaced only to benchmark against fake SHOWROOM.
+    base_url: str = "https://www.showroom-live.com"
+
+
+@dataclass
+class RetryConfig(DataClassJsonMixin):
+    """This class implements configuration for retrying archiving when FFmpeg or fetching playlist failed."""
+
+    # Maximum attempts of FFmpeg for each live, or consecutive attempts to fetch playlist.
+    maximum_attempts: int = 5
+    # Gives up when attempts keep failing for this seconds.
+    seconds_budget: float = 300.0
+    # Attempt which recorded at least this seconds before failed resets backoff and budget.
+    seconds_stable: float = 60.0
+    # When true, checks whether still on live by polling API before each retry, then stops when live ended.
+    recheck_live: bool = True
+
+
+@dataclass
+class ArchiverConfig(DataClassJsonMixin):
+    """This class implements configuration for archiving."""
+
+    # "ffmpeg": Archives each live by FFmpeg in worker process.
+    # "hls": Archives lives by fetching HLS segments in the event loop of main process.
+    engine: str = "ffmpeg"
+    # When true, "hls" engine remuxes MPEG-TS into MP4 when live ends, otherwise keeps MPEG-TS.
+    remux: bool = True
+    # When true, "ffmpeg" engine resumes broken recording from live edge without waiting,
+    # then concatenates parts into one archive.
+    gapless_resume: bool = False
+    # "mp4": Plain MP4, unreadable when recording is interrupted.
+    # "fragmented_mp4": MP4 which is playable even if recording is interrupted, and while recording.
+    # "segment": MPEG-TS segments rotated every segment_time seconds with M3U8 index.
+    output_format: str = "mp4"
+    # Seconds of each segment when output format is "segment".
+    segment_time: int = 300
+    # Retry of FFmpeg by "ffmpeg" engine, and of fetching playlist by "hls" engine.
+    retry: RetryConfig = field(default_factory=RetryConfig, metadata={"dataclasses_json": {"mm_field": RetryConfig}})
+
+
+@dataclass
+class MetricsConfig(DataClassJsonMixin):
+    """This class implements configuration for metrics endpoint."""
+
+    # Port to serve metrics in Prometheus format at /metrics, 0 disables.
+    port: int = 0
+    host: str = "127.0.0.1"
+
+
+@dataclass
+class LoggingConfig(DataClassJsonMixin):
+    """This class implements configuration for logging."""
+
+    # Name of level in logging module, e.g. "DEBUG", "INFO".
+    level: str = "INFO"
+    # "text": Human readable text with context of room ID and recording.
+    # "json": JSON Lines with the same context.
+    style: str = "text"
+    # Seconds to drop repetitive logs of polling results after the first one, 0 disables sampling.
+    sampling_interval: float = 0.0
+
+
+@dataclass
+class AdmissionConfig(DataClassJsonMixin):
+    """This class implements configuration for admission control of new recordings."""
+
+    # Bytes of free disk space to keep in output directory, 0 disables checking disk space.
+    minimum_free_bytes: int = 0
+    # Seconds of recording to reserve disk space for, for each recording in progress.
+    seconds_to_reserve: float = 3600.0
+    # Bytes per second of aggregate write throughput, 0 means unlimited.
+    maximum_bytes_per_second: float = 0.0
+    # Kbps to assume when SHOWROOM doesn't tell quality of streaming URL.
+    default_quality: int = 1000
+
+
+@dataclass
+class S3Config(DataClassJsonMixin):
+    """This class implements configuration for S3 compatible object storage."""
+
+    endpoint_url: str = "https://s3.amazonaws.com"
+    region: str = "us-east-1"
+    bucket: str = ""
+    # Prefix of object key, e.g. "showroom/".
+    prefix: str = ""
+    # Read from environment variables AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY when empty.
+    access_key_id: str = ""
+    secret_access_key: str = ""
+    # Bytes of each part of multipart upload, at least 5 MiB.
+    part_size: int = 8 * 1024 * 1024
+
+
+@dataclass
+class SinkConfig(DataClassJsonMixin):
+    """This class implements configuration for output sink."""
+
+    # "local": Keeps archives in ./output.
+    # "s3": Uploads archives into S3 compatible object storage while recording.
+    backend: str = "local"
+    s3: S3Config = field(default_factory=S3Config, metadata={"dataclasses_json": {"mm_field": S3Config}})
 
 
 @dataclass
+class ShardConfig(DataClassJsonMixin):
+    """This class implements configuration for sharding rooms across multiple nodes."""
+
+    # "none": This node records all rooms.
+    # "file": Nodes coordinate by lease files in directory on shared volume, e.g. NFS.
+    # "redis": Nodes coordinate by Redis compatible server.
+    backend: str = "none"
+    # Unique name of this node in cluster, hostname and process ID when empty.
+    node_id: str = ""
+    # Seconds until leases of dead node expire, then its rooms move to other nodes.
+    lease_seconds: float = 30.0
+    # Seconds between renewing leases and rebalancing rooms, should be shorter than lease_seconds.
+    heartbeat_interval: float = 10.0
+    # Directory for "file" backend.
+    directory: str = "./leases"
+    # URL of server for "redis" backend, e.g. "redis://:password@127.0.0.1:6379/0".
+    redis_url: str = "redis://127.0.0.1:6379/0"
+    # Prefix of lease names to share backend with other clusters.
+    prefix: str = "showroom-podcast/"
+
+
+@dataclass
+class StateConfig(DataClassJsonMixin):
+    """This class implements configuration for state store of recordings which persists across restarts."""
+
+    # Path to SQLite database, empty disables.
+    path: str = ""
+    # What to do with FFmpeg process left recording by previous run which crashed.
+    # "adopt": Waits for it to finish without recording the room again.
+    # "terminate": Stops it so that the room is recorded again from the beginning of the next polling.
+    orphan: str = "adopt"
+
+
+@dataclass
+class IndexConfig(DataClassJsonMixin):
+    """This class implements configuration for index of archived recordings."""
+
+    # Path to SQLite database, empty disables.
+    path: str = ""
+
+
+@dataclass
+# Reason: One attribute per limit of resource. pylint: disable-next=too-many-instance-attributes
+class ResourceConfig(DataClassJsonMixin):
+    """This class implements configuration for resources of archiving, so that polling keeps headroom."""
+
+    # Niceness of worker processes and FFmpeg, 0 keeps the same priority as polling.
+    nice: int = 0
+    # I/O scheduling class of worker processes and FFmpeg on Linux, "best-effort" or "idle".
+    # Empty keeps the same as polling.
+    io_class: str = ""
+    # Priority in "best-effort" class from 0 (highest) to 7 (lowest).
+    io_level: int = 7
+    # Bytes of address space each FFmpeg process can allocate on Linux, 0 is unlimited.
+    memory_maximum: int = 0
+    # Path to cgroup v2 directory delegated to the user, which worker processes and FFmpeg join.
+    # Empty disables.
+    cgroup: str = ""
+    # Weights of the cgroup from 1 to 10000, relative to 100 of other cgroups.
+    cpu_weight: int = 50
+    io_weight: int = 50
+    # Bytes of memory all processes in the cgroup can use together, 0 is unlimited.
+    memory_maximum_total: int = 0
+
+
+@dataclass
+class WorkerConfig(DataClassJsonMixin):
+    """This class implements configuration for elastic pool of worker processes which archive."""
+
+    # Hard ceiling of worker processes, the pool grows from number_process up to this.
+    # 0 keeps the pool fixed at number_process.
+    maximum: int = 0
+    # Seconds between measuring demand and host load to resize the pool.
+    interval: float = 5.0
+    # The pool grows only while CPU usage of the host in percent is under this.
+    cpu_percent_maximum: float = 80.0
+    # The pool grows only while bytes of memory available in the host are over this.
+    memory_available_minimum: int = 512 * 1024 * 1024
+    # The pool grows only while bytes per second written into disks of the host are under this, 0 is unlimited.
+    bytes_written_per_second_maximum: int = 0
+    # Seconds without any recording before worker processes over number_process exit.
+    seconds_idle: float = 600.0
+
+
+@dataclass
+class PodcastConfig(DataClassJsonMixin):
+    """This class implements configuration for audio-only podcast published from archives after each recording."""
+
+    # Directory to write audio files and RSS feed of each room into, empty disables.
+    # Requires index, and local sink since archives are read from the output directory.
+    directory: str = ""
+    # URL which the directory is served at, to link audio files from feeds.
+    base_url: str = "http://localhost/podcast"
+    # Normalizes loudness into this integrated loudness in LUFS by re-encoding, 0 disables.
+    # When disabled, audio is copied without re-encoding if the codec is AAC.
+    loudness: float = 0.0
+    # Bitrate in kbps of audio when re-encoded.
+    bitrate: int = 128
+    # FFmpeg processes extracting audio at the same time, apart from worker processes recording.
+    number_concurrency: int = 1
+    # Episodes in each feed from the latest.
+    maximum_episodes: int = 100
+
+
+@dataclass
+# Reason: Each attribute is a top-level option of config.yml. pylint: disable-next=too-many-instance-attributes
 class Config(YamlDataClassConfig):
     """Configuration."""
 
     # Reason: To use auto complete
     number_process: int = None  # type:ignore[assignment]
+    # When true, starts all worker processes before any live starts to archive from the beginning.
+    prewarm_process: bool = False
     stop_if_file_exists: bool = None  # type:ignore[assignment]
     list_room_id: list[int] = field(default_factory=list)
+    # Seconds between checking whether this file is modified to apply list_room_id without restarting, 0 disables.
+    watch_config_interval: float = 0.0
     slack: SlackConfig = field(  # type:ignore[assignment]
         default=None,
         metadata={"dataclasses_json": {"mm_field": SlackConfig}},
     )
+    polling: PollingConfig = field(
+        default_factory=PollingConfig,
+        metadata={"dataclasses_json": {"mm_field": PollingConfig}},
+    )
+    http: HttpConfig = field(
+        default_factory=HttpConfig,
+        metadata={"dataclasses_json": {"mm_field": HttpConfig}},
+    )
+    archiver: ArchiverConfig = field(
+        default_factory=ArchiverConfig,
+        metadata={"dataclasses_json": {"mm_field": ArchiverConfig}},
+    )
+    sink: SinkConfig = field(
+        default_factory=SinkConfig,
+        metadata={"dataclasses_json": {"mm_field": SinkConfig}},
+    )
+    admission: AdmissionConfig = field(
+        default_factory=AdmissionConfig,
+        metadata={"dataclasses_json": {"mm_field": AdmissionConfig}},
+    )
+    metrics: MetricsConfig = field(
+        default_factory=MetricsConfig,
+        metadata={"dataclasses_json": {"mm_field": MetricsConfig}},
+    )
+    logging: LoggingConfig = field(
+        default_factory=LoggingConfig,
+        metadata={"dataclasses_json": {"mm_field": LoggingConfig}},
+    )
+    shard: ShardConfig = field(
+        default_factory=ShardConfig,
+        metadata={"dataclasses_json": {"mm_field": ShardConfig}},
+    )
+    state: StateConfig = field(
+        default_factory=StateConfig,
+        metadata={"dataclasses_json": {"mm_field": StateConfig}},
+    )
+    index: IndexConfig = field(
+        default_factory=IndexConfig,
+        metadata={"dataclasses_json": {"mm_field": IndexConfig}},
+    )
+    resource: ResourceConfig = field(
+        default_factory=ResourceConfig,
+        metadata={"dataclasses_json": {"mm_field": ResourceConfig}},
+    )
+    worker: WorkerConfig = field(
+        default_factory=WorkerConfig,
+        metadata={"dataclasses_json": {"mm_field": WorkerConfig}},
+    )
+    podcast: PodcastConfig = field(
+        default_factory=PodcastConfig,
+        metadata={"dataclasses_json": {"mm_field": PodcastConfig}},
+    )
@@ -0,0 +1,61 @@
+"""Configuration watcher."""
+
+from __future__ import annotations
+
+import asyncio
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+import yaml
+from marshmallow import ValidationError
+
+from showroompodcast.config import Config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+class ConfigWatcher:
+    """Watches configuration file by polling modification time, which works on any platform and file system."""
+
+    def __init__(self, path: Path, interval: float) -> None:
+        self.path = path
+        self.interval = interval
+        self.modification_time = self.stat_modification_time()
+        self.logger = getLogger(__name__)
+
+    async def watch(self, on_change: Callable[[Config], None]) -> None:
+        """Calls on_change with configuration loaded again each time the file is modified."""
+        while True:
+            await asyncio.sleep(self.interval)
+            config = self.load_if_modified()
+            if config is not None:
+                on_change(config)
+
+    def load_if_modified(self) -> Config | None:
+        """Returns None when not modified, or when invalid to keep current configuration.
+
+        Configuration without rooms is also invalid, since it's likely a file caught while editor writes it,
+        and applying it unschedules every room.
+        """
+        modification_time = self.stat_modification_time()
+        if modification_time is None or modification_time == self.modification_time:
+            return None
+        self.modification_time = modification_time
+        config = Config()
+        try:
+            config.load(self.path)
+        except (OSError, yaml.YAMLError, ValidationError) as error:
+            self.logger.warning("Invalid configuration is ignored. path: %s", self.path, exc_info=error)
+            return None
+        if not config.list_room_id:
+            self.logger.warning("Configuration without list_room_id is ignored. path: %s", self.path)
+            return None
+        return config
+
+    def stat_modification_time(self) -> int | None:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
@@ -15,3 +15,15 @@ class MaxRetriesExceededError(Error):
 
 class TemporaryNetworkIssuesError(Error):
     """Temporary network issues."""
+
+
+class LeaseBackendError(Error):
+    """Lease backend is unavailable or replied error."""
+
+
+class StateStoreError(Error):
+    """State store is unavailable or corrupted."""
+
+
+class RecordingIndexError(Error):
+    """Recording index is unavailable or corrupted."""
@@ -0,0 +1,144 @@
+"""HLS archiver."""
+
+from __future__ import annotations
+
+import time
+from functools import partial
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from anyio import Path
+
+from showroompodcast.api.streaming_url import StreamingUrl
+from showroompodcast.config import RetryConfig
+from showroompodcast.hls.hls_recorder import HlsRecorder
+from showroompodcast.live_end_detector import run_until_stop_requested
+from showroompodcast.remuxer import Remuxer
+from showroompodcast.retry_policy import RetryPolicy
+from showroompodcast.retry_policy import check_on_live
+from showroompodcast.showroom_datetime import ShowroomDatetime
+from showroompodcast.sink.local_copy_sink_writer import LocalCopySinkWriter
+from showroompodcast.sink.local_sink import LocalSink
+from showroompodcast.structured_logging import CONTEXT_RECORDING
+from showroompodcast.structured_logging import log_context
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+    from showroompodcast.live_end_detector import StopEvent
+    from showroompodcast.recording_indexer import RecordingIndexer
+    from showroompodcast.sink import Sink
+
+
+# Reason: Holds collaborators shared by recordings of all rooms. pylint: disable-next=too-many-instance-attributes
+class HlsArchiver:
+    """Archives SHOWROOM program by fetching HLS segments in the event loop of this process.
+
+    Unlike ShowroomArchiver, this requires neither worker process nor FFmpeg process while recording,
+    so that one event loop can archive many rooms at same time.
+    When sink is not local, MPEG-TS is streamed into the sink without remuxing,
+    with local copy which is kept to upload later when sink failed.
+    When recording_indexer is set, archives of the room in local sink are indexed after archiving.
+    Failures of fetching playlist are retried by retry_config, the same as "ffmpeg" engine.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        *,
+        remux: bool = True,
+        sink: Sink | None = None,
+        recording_indexer: RecordingIndexer | None = None,
+        retry_config: RetryConfig | None = None,
+    ) -> None:
+        self.session = session
+        self.remux = remux
+        self.sink = sink or LocalSink()
+        self.local_sink = self.sink if isinstance(self.sink, LocalSink) else LocalSink()
+        self.recording_indexer = recording_indexer
+        self.retry_config = retry_config or RetryConfig()
+        self.remuxer = Remuxer()
+        self.logger = getLogger(__name__)
+
+    async def archive(
+        self,
+        room_id: int,
+        time_detected: float | None = None,
+        streaming_url: str | None = None,
+        stop_event: StopEvent | None = None,
+        quality: int = 0,
+    ) -> None:
+        """Archives SHOWROOM program, same interface as ShowroomArchiver.archive()."""
+        with log_context(room_id=room_id):
+            await self.archive_room(room_id, time_detected, streaming_url, stop_event, quality)
+            if self.recording_indexer is not None and isinstance(self.sink, LocalSink):
+                await self.recording_indexer.index(room_id)
+
+    async def archive_room(
+        self,
+        room_id: int,
+        time_detected: float | None,
+        streaming_url: str | None,
+        stop_event: StopEvent | None = None,
+        quality: int = 0,
+    ) -> None:
+        """Resolves streaming URL unless given, then records MPEG-TS, which is remuxed into MP4 in local sink."""
+        self.logger.debug("Start archive")
+        if time_detected is not None:
+            self.logger.info(
+                "Latency from live detected to archive start: %.3f seconds. room_id: %d",
+                time.time() - time_detected,
+                room_id,
+            )
+        if streaming_url is None:
+            streaming_url = await StreamingUrl.find_url_for_best_quality_async(self.session, room_id, quality)
+        if streaming_url is None:
+            self.logger.warning("No streaming URL available. room_id: %d", room_id)
+            return
+        name = f"{room_id}-{ShowroomDatetime.encode(ShowroomDatetime.now_jst())}"
+        CONTEXT_RECORDING.set(name)
+        path_ts = self.local_sink.create_path(f"{name}.ts")
+        if await Path(path_ts).exists():
+            msg = f"File already exists. {path_ts=}"
+            raise FileExistsError(msg)
+        retry_policy = RetryPolicy(
+            self.retry_config,
+            partial(check_on_live, room_id) if self.retry_config.recheck_live else None,
+        )
+        hls_recorder = HlsRecorder(
+            self.session,
+            room_id,
+            streaming_url,
+            time_detected,
+            quality,
+            retry_policy=retry_policy,
+        )
+        if not isinstance(self.sink, LocalSink):
+            await self.record(hls_recorder, f"{name}.ts", stop_event)
+            return
+        try:
+            await self.record(hls_recorder, f"{name}.ts", stop_event)
+        finally:
+            if self.remux:
+                await self.remux_and_remove(path_ts, self.sink.create_path(f"{name}.mp4"))
+
+    async def record(self, hls_recorder: HlsRecorder, name_ts: str, stop_event: StopEvent | None = None) -> None:
+        """Records until live ends or stop is requested, with local copy unless sink is local."""
+        sink_writer = (
+            await self.sink.open(name_ts)
+            if isinstance(self.sink, LocalSink)
+            else await LocalCopySinkWriter.open(self.sink, self.local_sink, name_ts)
+        )
+        try:
+            if await run_until_stop_requested(hls_recorder.record(sink_writer), stop_event):
+                self.logger.info("Stopped since live ended. room_id: %d", hls_recorder.room_id)
+        finally:
+            await sink_writer.close()
+
+    async def remux_and_remove(self, path_ts: str, path_mp4: str) -> None:
+        """Remuxes MPEG-TS into MP4, then removes MPEG-TS. Keeps MPEG-TS when failed."""
+        path = Path(path_ts)
+        if not await path.exists() or (await path.stat()).st_size == 0:
+            return
+        await self.remuxer.remux(path_ts, path_mp4)
+        await path.unlink()
@@ -0,0 +1,188 @@
+"""HLS recorder."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from http import HTTPStatus
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError
+from aiohttp import ClientResponseError
+
+from showroompodcast.exceptions import MaxRetriesExceededError
+from showroompodcast.hls.playlist import MasterPlaylist
+from showroompodcast.hls.playlist import MediaPlaylist
+from showroompodcast.metrics import BYTES_WRITTEN
+from showroompodcast.metrics import FIRST_BYTE_LATENCY
+from showroompodcast.retry_policy import END_OF_FILE
+from showroompodcast.retry_policy import NOT_FOUND
+from showroompodcast.retry_policy import SERVER_ERROR
+from showroompodcast.retry_policy import TIMEOUT
+from showroompodcast.retry_policy import Failure
+from showroompodcast.retry_policy import RetryPolicy
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+    from showroompodcast.hls.playlist import Segment
+    from showroompodcast.retry_policy import ErrorClass
+    from showroompodcast.sink import SinkWriter
+
+
+def classify(error: ClientError | asyncio.TimeoutError) -> ErrorClass | None:
+    """Returns class of error to retry fetching playlist, or None when the error should not be retried."""
+    if isinstance(error, asyncio.TimeoutError):
+        return TIMEOUT
+    if not isinstance(error, ClientResponseError):
+        return END_OF_FILE
+    if error.status == HTTPStatus.NOT_FOUND:
+        return NOT_FOUND
+    if error.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        return SERVER_ERROR
+    return None
+
+
+# Reason: Position in playlist and statistics of one recording. pylint: disable-next=too-many-instance-attributes
+class HlsRecorder:
+    """Records HLS live by appending segments into single MPEG-TS stream.
+
+    MPEG-TS segments can be concatenated as is.
+    Recording finishes when playlist ends, or when retry policy gives up fetching playlist since live ended.
+    Media sequence going back before the playlist window is regarded as restart of the stream.
+    """
+
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        session: ClientSession,
+        room_id: int,
+        streaming_url: str,
+        time_detected: float | None = None,
+        quality: int = 0,
+        *,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        """The time_detected is the epoch time when live detected, to measure latency to the first byte.
+
+        The quality is kbps admitted, variant streams exceeding it are not chosen, 0 means unlimited.
+        """
+        self.session = session
+        self.room_id = room_id
+        self.time_detected = time_detected
+        self.bandwidth_maximum = quality * 1000
+        self.url_playlist = streaming_url
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.sequence_last: int | None = None
+        self.number_failure = 0
+        # Loop time when fetching playlist succeeded first since the last failure.
+        self.time_recovered: float | None = None
+        self.bytes_written = 0
+        self.number_segment_written = 0
+        self.number_segment_dropped = 0
+        self.logger = getLogger(__name__)
+
+    async def record(self, sink_writer: SinkWriter) -> None:
+        """Records until live ends."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                playlist = await self.fetch_playlist()
+            except (ClientError, asyncio.TimeoutError) as error:
+                if await self.wait_retry(error):
+                    continue
+                break
+            self.number_failure = 0
+            if self.time_recovered is None:
+                self.time_recovered = loop.time()
+            await self.write_new_segments(playlist, sink_writer)
+            if playlist.is_end:
+                break
+            # Refreshes more often than target duration not to miss segments.
+            await asyncio.sleep(playlist.target_duration / 2)
+        self.logger.info(
+            "Recording finished. room_id: %d, segments: %d, dropped: %d, bytes: %d",
+            self.room_id,
+            self.number_segment_written,
+            self.number_segment_dropped,
+            self.bytes_written,
+        )
+
+    async def wait_retry(self, error: ClientError | asyncio.TimeoutError) -> bool:
+        """Waits before retry fetching playlist.
+
+        Returns False when recording should finish: the error is not retryable, attempts or budget are exhausted,
+        or live ended.
+        """
+        self.logger.debug("Failed to fetch playlist. room_id: %d", self.room_id, exc_info=error)
+        error_class = classify(error)
+        self.number_failure += 1
+        if error_class is None or self.number_failure >= self.retry_policy.retry_config.maximum_attempts:
+            return False
+        loop = asyncio.get_running_loop()
+        seconds_attempt = 0.0 if self.time_recovered is None else loop.time() - self.time_recovered
+        self.time_recovered = None
+        try:
+            await self.retry_policy.wait(Failure(error_class, seconds_attempt))
+        except (MaxRetriesExceededError, StopAsyncIteration):
+            return False
+        return True
+
+    async def fetch_playlist(self) -> MediaPlaylist:
+        text = await self.fetch_text(self.url_playlist)
+        url_variant = MasterPlaylist.find_url_for_best_quality(text, self.url_playlist, self.bandwidth_maximum)
+        if url_variant is not None:
+            self.url_playlist = url_variant
+            text = await self.fetch_text(self.url_playlist)
+        return MediaPlaylist.parse(text, self.url_playlist)
+
+    def detect_restart(self, segments: list[Segment]) -> None:
+        """Resets the last sequence when the whole playlist is older than the last segment written by its length.
+
+        Encoder which reconnected may restart media sequence from 0.
+        Playlist slightly behind, e.g. cached by CDN, is not regarded as restart.
+        """
+        if self.sequence_last is None or not segments:
+            return
+        if segments[-1].sequence + len(segments) <= self.sequence_last:
+            self.logger.warning(
+                "Media sequence restarted from %d after %d. room_id: %d",
+                segments[0].sequence,
+                self.sequence_last,
+                self.room_id,
+            )
+            self.sequence_last = None
+
+    async def write_new_segments(self, playlist: MediaPlaylist, sink_writer: SinkWriter) -> None:
+        """Writes segments which are not written yet, in order."""
+        self.detect_restart(playlist.segments)
+        for segment in playlist.segments:
+            if self.sequence_last is not None and segment.sequence <= self.sequence_last:
+                continue
+            if self.sequence_last is not None and segment.sequence > self.sequence_last + 1:
+                number_dropped = segment.sequence - self.sequence_last - 1
+                self.logger.warning("Segments dropped: %d. room_id: %d", number_dropped, self.room_id)
+                self.number_segment_dropped += number_dropped
+            self.sequence_last = segment.sequence
+            try:
+                data = await self.fetch_bytes(segment.url)
+            except (ClientError, asyncio.TimeoutError) as error:
+                self.logger.warning("Failed to fetch segment. room_id: %d", self.room_id, exc_info=error)
+                self.number_segment_dropped += 1
+                continue
+            await sink_writer.write(data)
+            if self.time_detected is not None and self.bytes_written == 0:
+                FIRST_BYTE_LATENCY.observe(time.time() - self.time_detected)
+            BYTES_WRITTEN.inc(str(self.room_id), amount=len(data))
+            self.bytes_written += len(data)
+            self.number_segment_written += 1
+
+    async def fetch_text(self, url: str) -> str:
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def fetch_bytes(self, url: str) -> bytes:
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
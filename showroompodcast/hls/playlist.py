@@ -0,0 +1,85 @@
+"""HLS playlist."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from urllib.parse import urljoin
+
+TAG_MEDIA_SEQUENCE = "#EXT-X-MEDIA-SEQUENCE:"
+TAG_TARGET_DURATION = "#EXT-X-TARGETDURATION:"
+TAG_STREAM_INF = "#EXT-X-STREAM-INF:"
+TAG_END_LIST = "#EXT-X-ENDLIST"
+
+
+@dataclass
+class Segment:
+    """Media segment."""
+
+    sequence: int
+    url: str
+
+
+@dataclass
+class MediaPlaylist:
+    """Media playlist which lists segments.
+
+    see: https://datatracker.ietf.org/doc/html/rfc8216#section-4.3.3
+    """
+
+    target_duration: float = 2.0
+    segments: list[Segment] = field(default_factory=list)
+    is_end: bool = False
+
+    @staticmethod
+    def parse(text: str, url: str) -> MediaPlaylist:
+        """Parses text of playlist, relative URLs of segments are resolved by URL of playlist."""
+        playlist = MediaPlaylist()
+        sequence = 0
+        for line in (line.strip() for line in text.splitlines()):
+            if line.startswith(TAG_MEDIA_SEQUENCE):
+                sequence = int(line[len(TAG_MEDIA_SEQUENCE) :])
+            elif line.startswith(TAG_TARGET_DURATION):
+                playlist.target_duration = float(line[len(TAG_TARGET_DURATION) :])
+            elif line == TAG_END_LIST:
+                playlist.is_end = True
+            elif line and not line.startswith("#"):
+                playlist.segments.append(Segment(sequence, urljoin(url, line)))
+                sequence += 1
+        return playlist
+
+
+class MasterPlaylist:
+    """Master playlist which lists variant streams.
+
+    see: https://datatracker.ietf.org/doc/html/rfc8216#section-4.3.4
+    """
+
+    @staticmethod
+    def find_url_for_best_quality(text: str, url: str, bandwidth_maximum: int = 0) -> str | None:
+        """Returns URL of variant stream which has the highest bandwidth, or None when text is not master playlist.
+
+        Variants exceeding bandwidth_maximum bits per second are skipped unless all of them exceed, 0 means unlimited.
+        """
+        list_variant: list[tuple[int, str]] = []
+        bandwidth: int | None = None
+        for line in (line.strip() for line in text.splitlines()):
+            if line.startswith(TAG_STREAM_INF):
+                bandwidth = MasterPlaylist.parse_bandwidth(line[len(TAG_STREAM_INF) :])
+            elif line and not line.startswith("#") and bandwidth is not None:
+                list_variant.append((bandwidth, urljoin(url, line)))
+                bandwidth = None
+        if not list_variant:
+            return None
+        if bandwidth_maximum:
+            list_variant_in_budget = [variant for variant in list_variant if variant[0] <= bandwidth_maximum]
+            return max(list_variant_in_budget)[1] if list_variant_in_budget else min(list_variant)[1]
+        return max(list_variant)[1]
+
+    @staticmethod
+    def parse_bandwidth(attributes: str) -> int:
+        for attribute in attributes.split(","):
+            key, _, value = attribute.partition("=")
+            if key == "BANDWIDTH":
+                return int(value)
+        return 0
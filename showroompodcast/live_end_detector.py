@@ -0,0 +1,161 @@
+"""Detection of live end while recording, which stops recording without waiting FFmpeg to exit by itself."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import Protocol
+
+from showroompodcast.exceptions import TemporaryNetworkIssuesError
+from showroompodcast.structured_logging import SAMPLED
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from multiprocessing.connection import Connection
+    from typing import Any
+
+    from showroompodcast.archiving_task_registry import ArchivingTaskRegistry
+    from showroompodcast.config import PollingConfig
+    from showroompodcast.polling_engine import PollingEngine
+
+
+class StopEvent(Protocol):
+    """Event to request archiving to stop, asyncio.Event in the same process or StopPipe to worker process."""
+
+    def set(self) -> None: ...  # pragma: no cover
+
+    async def wait(self) -> bool: ...  # pragma: no cover
+
+
+class StopPipe:
+    """Pipe to request archiving in worker process to stop.
+
+    Worker waits until the pipe becomes readable instead of polling, and no manager process is required.
+    Only the end to receive is sent to worker process.
+    """
+
+    def __init__(self) -> None:
+        self.receiver, sender = multiprocessing.Pipe(duplex=False)
+        self.sender: Connection | None = sender
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Reason: Worker holding the end to send never sees end of file when parent process exits.
+        return {"receiver": self.receiver, "sender": None}
+
+    def set(self) -> None:
+        """Requests to stop, never blocks since the message is far smaller than the buffer of pipe."""
+        if self.sender is None:
+            msg = "Stop can be requested only by the process which created the pipe."
+            raise RuntimeError(msg)
+        self.sender.send_bytes(b"")
+
+    async def wait(self) -> bool:
+        """Returns True when stop is requested, or False when the pipe is closed without request."""
+        await self.wait_readable()
+        try:
+            self.receiver.recv_bytes()
+        except (OSError, EOFError):
+            getLogger(__name__).warning("Stop request became unavailable.", exc_info=True)
+            return False
+        return True
+
+    async def wait_readable(self) -> None:
+        """Returns when the message arrived or the pipe is closed."""
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+
+        def on_readable() -> None:
+            if not readable.done():
+                readable.set_result(None)
+
+        try:
+            loop.add_reader(self.receiver.fileno(), on_readable)
+        except NotImplementedError:
+            # Proactor event loop on Windows can't watch pipe, the thread ends when the pipe is closed.
+            await loop.run_in_executor(None, self.receiver.poll, None)
+            return
+        try:
+            await readable
+        finally:
+            loop.remove_reader(self.receiver.fileno())
+
+
+async def run_until_stop_requested(coroutine: Coroutine[Any, Any, None], stop_event: StopEvent | None) -> bool:
+    """Runs coroutine, or cancels it to finalize recording when stop is requested.
+
+    Returns True when stopped by request. Cancelling FFmpeg coroutine quits FFmpeg gracefully
+    within the time to force termination, so that archive is playable.
+    """
+    task = asyncio.create_task(coroutine)
+    if stop_event is None:
+        await task
+        return False
+    task_watch = asyncio.create_task(stop_event.wait())
+    try:
+        await asyncio.wait({task, task_watch}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        task_watch.cancel()
+    if task.done() or not task_watch.done() or not task_watch.result():
+        await task
+        return False
+    task.cancel()
+    # Not to suppress cancellation of this coroutine itself.
+    await asyncio.wait({task})
+    if not task.cancelled():
+        task.result()
+    return True
+
+
+class LiveEndDetector:
+    """Polls rooms being archived at low rate, then requests archiving to stop when live ended.
+
+    Without this, archiving finishes only when FFmpeg exits by itself,
+    which may take until timeout when HLS origin keeps serving stale playlist,
+    while the worker process can't archive next live.
+    Polling shares budget of requests per second with polling rooms not being archived.
+    """
+
+    def __init__(
+        self,
+        archiving_task_registry: ArchivingTaskRegistry,
+        polling_engine: PollingEngine,
+        polling_config: PollingConfig,
+    ) -> None:
+        self.archiving_task_registry = archiving_task_registry
+        self.polling_engine = polling_engine
+        self.interval = polling_config.interval_recording
+        self.confirmations = polling_config.confirmations_live_end
+        # Consecutive polls reported live ended by room ID.
+        self.dictionary_count_live_end: dict[int, int] = {}
+        self.logger = getLogger(__name__)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def check(self) -> None:
+        list_room_id = self.archiving_task_registry.list_room_id_stoppable()
+        for room_id in set(self.dictionary_count_live_end) - set(list_room_id):
+            del self.dictionary_count_live_end[room_id]
+        await asyncio.gather(*(self.check_room(room_id) for room_id in list_room_id))
+
+    async def check_room(self, room_id: int) -> None:
+        """Requests to stop when live ended is reported consecutively, unknown results are not counted."""
+        try:
+            is_on_live = await self.polling_engine.poll(room_id)
+        except TemporaryNetworkIssuesError as error:
+            self.logger.debug("Temporary network issues on polling recording.", exc_info=error, extra=SAMPLED)
+            return
+        if is_on_live:
+            self.dictionary_count_live_end.pop(room_id, None)
+            return
+        count = self.dictionary_count_live_end.get(room_id, 0) + 1
+        self.dictionary_count_live_end[room_id] = count
+        if count < self.confirmations:
+            return
+        self.logger.info("Live ended, stop recording. room_id: %d", room_id)
+        del self.dictionary_count_live_end[room_id]
+        self.archiving_task_registry.request_stop(room_id)
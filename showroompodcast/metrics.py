@@ -0,0 +1,190 @@
+"""Metrics in Prometheus text exposition format.
+
+Metrics updated in worker process are sent to parent process through queue set by initialize_worker(),
+then parent process serves all metrics by MetricsServer.
+"""
+
+from __future__ import annotations
+
+import math
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from multiprocessing.queues import Queue
+
+    # Name of metric, name of method, value, label values.
+    MetricsUpdate = tuple[str, str, float, tuple[str, ...]]
+
+
+class Metric:
+    """Base class of metric, each set of label values has its own value."""
+
+    TYPE = ""
+    queue: ClassVar[Queue[MetricsUpdate] | None] = None
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        REGISTRY.register(self)
+
+    def update(self, method: str, value: float, label_values: tuple[str, ...]) -> None:
+        """Applies update in parent process, or sends it to parent process in worker process."""
+        if Metric.queue is not None:
+            Metric.queue.put_nowait((self.name, method, value, label_values))
+            return
+        self.apply(method, value, label_values)
+
+    def apply(self, method: str, value: float, label_values: tuple[str, ...]) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self.render_samples())
+        return lines
+
+    def render_samples(self) -> list[str]:
+        raise NotImplementedError  # pragma: no cover
+
+    def format_labels(self, label_values: tuple[str, ...], extra: str = "") -> str:
+        list_label = [f'{name}="{value}"' for name, value in zip(self.label_names, label_values)]
+        if extra:
+            list_label.append(extra)
+        return "{" + ",".join(list_label) + "}" if list_label else ""
+
+
+class Counter(Metric):
+    """Value which only increases."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self.update("inc", amount, label_values)
+
+    def apply(self, _method: str, value: float, label_values: tuple[str, ...]) -> None:
+        self.values[label_values] = self.values.get(label_values, 0.0) + value
+
+    def render_samples(self) -> list[str]:
+        return [f"{self.name}{self.format_labels(labels)} {value}" for labels, value in self.values.items()]
+
+
+class Gauge(Counter):
+    """Value which increases and decreases."""
+
+    TYPE = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.update("inc", -amount, label_values)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    TYPE = "histogram"
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = (*buckets, math.inf)
+        self.counts: dict[tuple[str, ...], list[int]] = {}
+        self.sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        self.update("observe", value, label_values)
+
+    def apply(self, _method: str, value: float, label_values: tuple[str, ...]) -> None:
+        counts = self.counts.setdefault(label_values, [0] * len(self.buckets))
+        for index, bucket in enumerate(self.buckets):
+            if value <= bucket:
+                counts[index] += 1
+        self.sums[label_values] = self.sums.get(label_values, 0.0) + value
+
+    def render_samples(self) -> list[str]:
+        lines = []
+        for labels, counts in self.counts.items():
+            for bucket, count in zip(self.buckets, counts):
+                label_le = 'le="+Inf"' if math.isinf(bucket) else f'le="{bucket}"'
+                lines.append(f"{self.name}_bucket{self.format_labels(labels, label_le)} {count}")
+            lines.append(f"{self.name}_sum{self.format_labels(labels)} {self.sums[labels]}")
+            lines.append(f"{self.name}_count{self.format_labels(labels)} {counts[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registry of metrics in parent process."""
+
+    def __init__(self) -> None:
+        self.dictionary_metric: dict[str, Metric] = {}
+        self.list_collector: list[Callable[[], dict[str, float]]] = []
+        self.logger = getLogger(__name__)
+
+    def register(self, metric: Metric) -> None:
+        self.dictionary_metric[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], dict[str, float]]) -> None:
+        """Adds function which returns gauges by name, it's called at each time to render."""
+        self.list_collector.append(collector)
+
+    def apply(self, metrics_update: MetricsUpdate) -> None:
+        """Applies update sent from worker process."""
+        name, method, value, label_values = metrics_update
+        metric = self.dictionary_metric.get(name)
+        if metric is None:
+            self.logger.warning("Unknown metric. name: %s", name)
+            return
+        metric.apply(method, value, label_values)
+
+    def render(self) -> str:
+        """Renders metrics and collected gauges in Prometheus text exposition format."""
+        lines = []
+        for metric in self.dictionary_metric.values():
+            lines.extend(metric.render())
+        for collector in self.list_collector:
+            for name, value in collector().items():
+                lines.extend([f"# TYPE {name} gauge", f"{name} {value}"])
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+API_REQUEST_DURATION = Histogram(
+    "showroom_api_request_duration_seconds",
+    "Latency of request to SHOWROOM API.",
+    ("api",),
+)
+TEMPORARY_NETWORK_ISSUES = Counter(
+    "showroom_temporary_network_issues_total",
+    "Requests to SHOWROOM API failed by temporary network issues.",
+    ("api",),
+)
+SWEEP_DURATION = Histogram(
+    "showroom_sweep_duration_seconds",
+    "Duration to poll all rooms due at once.",
+)
+ROOMS_POLLED = Counter("showroom_rooms_polled_total", "Rooms polled, rate of this is rooms polled per second.")
+RECORDINGS_ACTIVE = Gauge("showroom_recordings_active", "Recordings in progress.")
+RECORDINGS_QUEUED = Gauge(
+    "showroom_recordings_queued",
+    "Recordings waiting for worker process, which miss the beginning of live, alert when this is over 0.",
+)
+WORKER_CAPACITY = Gauge("showroom_worker_capacity", "Recordings worker processes can run at the same time.")
+ARCHIVE_RETRIES = Counter("showroom_archive_retries_total", "Retries consumed to archive.")
+BYTES_WRITTEN = Counter("showroom_bytes_written_total", "Bytes of archive written.", ("room_id",))
+FIRST_BYTE_LATENCY = Histogram(
+    "showroom_first_byte_latency_seconds",
+    "Latency from live detected to the first byte of archive written.",
+    buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0),
+)
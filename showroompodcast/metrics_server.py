@@ -0,0 +1,89 @@
+"""Metrics server."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import queue
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+from showroompodcast.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from showroompodcast.config import MetricsConfig
+    from showroompodcast.metrics import MetricsUpdate
+
+
+class MetricsServer:
+    """Serves metrics at /metrics by HTTP in the event loop of parent process.
+
+    When port is 0, serves nothing, and queue is None so that worker process doesn't send metrics.
+    """
+
+    INTERVAL_RECEIVE = 1.0
+
+    def __init__(self, metrics_config: MetricsConfig) -> None:
+        self.host = metrics_config.host
+        self.port = metrics_config.port
+        self.queue: Queue[MetricsUpdate] | None = multiprocessing.Queue() if self.port else None
+        self.runner: web.AppRunner | None = None
+        self.task_receive: asyncio.Task[None] | None = None
+        self.logger = getLogger(__name__)
+
+    async def __aenter__(self) -> Self:
+        if not self.port:
+            return self
+        application = web.Application()
+        application.router.add_get("/metrics", self.handle_metrics)
+        self.runner = web.AppRunner(application)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.task_receive = asyncio.create_task(self.receive())
+        self.logger.info("Serving metrics at http://%s:%d/metrics", self.host, self.port)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stops receiving before closing queue, then waits for its feeder thread to exit."""
+        if self.task_receive is not None:
+            self.task_receive.cancel()
+            # Cancellation is expected.
+            await asyncio.gather(self.task_receive, return_exceptions=True)
+        if self.runner is not None:
+            await self.runner.cleanup()
+        if self.queue is not None:
+            self.queue.close()
+            self.queue.join_thread()
+
+    async def handle_metrics(self, _request: web.Request) -> web.Response:
+        self.apply_received()
+        return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
+
+    async def receive(self) -> None:
+        """Applies updates sent from worker processes periodically not to let queue grow."""
+        while True:
+            self.apply_received()
+            await asyncio.sleep(self.INTERVAL_RECEIVE)
+
+    def apply_received(self) -> None:
+        """Applies all updates sent from worker processes so far without blocking."""
+        if self.queue is None:
+            return
+        while True:
+            try:
+                metrics_update = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            REGISTRY.apply(metrics_update)
@@ -0,0 +1,80 @@
+"""Notifications of events while running, e.g. recording started, which are sent by notifier asynchronously."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import NamedTuple
+
+EVENT_RECORDING_STARTED = "recording_started"
+EVENT_RECORDING_FINISHED = "recording_finished"
+EVENT_RETRIES_EXHAUSTED = "retries_exhausted"
+EVENT_ARCHIVING_FAILED = "archiving_failed"
+EVENT_DISK_PRESSURE = "disk_pressure"
+EVENT_NETWORK_ISSUES = "network_issues"
+EVENT_RECORDINGS_QUEUED = "recordings_queued"
+LIST_EVENT = [
+    EVENT_RECORDING_STARTED,
+    EVENT_RECORDING_FINISHED,
+    EVENT_RETRIES_EXHAUSTED,
+    EVENT_ARCHIVING_FAILED,
+    EVENT_DISK_PRESSURE,
+    EVENT_NETWORK_ISSUES,
+    EVENT_RECORDINGS_QUEUED,
+]
+
+
+class Notification(NamedTuple):
+    """Event to notify."""
+
+    event: str
+    message: str
+    room_id: int | None = None
+
+
+class NotificationQueue:
+    """Bounded queue of notifications, which never blocks nor grows beyond maximum.
+
+    Notifications are accepted only for events subscribed, so that nothing is queued without notifier.
+    """
+
+    def __init__(self) -> None:
+        self.set_event_subscribed: set[str] = set()
+        self.maximum = 0
+        self.deque: deque[Notification] = deque()
+        self.count_dropped = 0
+
+    def subscribe(self, list_event: list[str], maximum: int) -> None:
+        unsupported = set(list_event) - set(LIST_EVENT)
+        if unsupported:
+            msg = f"Unsupported events: {sorted(unsupported)}"
+            raise ValueError(msg)
+        self.set_event_subscribed = set(list_event)
+        self.maximum = maximum
+
+    def unsubscribe(self) -> None:
+        self.set_event_subscribed = set()
+        self.deque.clear()
+
+    def put(self, notification: Notification) -> None:
+        if notification.event not in self.set_event_subscribed:
+            return
+        if len(self.deque) >= self.maximum:
+            self.count_dropped += 1
+            return
+        self.deque.append(notification)
+
+    def pop_all(self) -> tuple[list[Notification], int]:
+        """Returns notifications queued and count dropped since the last call."""
+        list_notification = list(self.deque)
+        count_dropped = self.count_dropped
+        self.deque.clear()
+        self.count_dropped = 0
+        return list_notification, count_dropped
+
+
+NOTIFICATIONS = NotificationQueue()
+
+
+def notify(event: str, message: str, *, room_id: int | None = None) -> None:
+    """Queues notification without blocking, dropped unless notifier subscribes the event."""
+    NOTIFICATIONS.put(Notification(event, message, room_id))
@@ -0,0 +1,144 @@
+"""Orphan reconciler."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import signal
+import sys
+from itertools import groupby
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from showroompodcast.exceptions import StateStoreError
+from showroompodcast.showroom_archiver import TIME_TO_FORCE_TERMINATION
+
+if TYPE_CHECKING:
+    from showroompodcast.archiving_task_registry import ArchivingTaskRegistry
+    from showroompodcast.state_store import Recording
+    from showroompodcast.state_store import StateStore
+
+POLICY_ADOPT = "adopt"
+POLICY_TERMINATE = "terminate"
+
+
+def is_recording_process(recording: Recording) -> bool:
+    """Checks whether the process is still recording.
+
+    On Linux, the command line is compared so that another process which reused the PID is not mistaken.
+    On Windows, always False since existence of process can't be checked without terminating it.
+    """
+    if sys.platform == "win32":
+        return False
+    path_cmdline = Path(f"/proc/{recording.pid}/cmdline")
+    if sys.platform == "linux":
+        try:
+            return recording.out_file_name in path_cmdline.read_bytes().decode(errors="replace").split("\0")
+        except OSError:
+            return False
+    try:
+        os.kill(recording.pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but owned by another user.
+        return True
+    return True
+
+
+class OrphanReconciler:
+    """Reconciles recordings in state store left by previous run, e.g. crashed, when starting.
+
+    Recordings whose process has exited are removed from the store.
+    FFmpeg processes still recording are adopted, i.e. their rooms are regarded as being archived until they exit,
+    or terminated by the policy.
+    """
+
+    INTERVAL = 5.0
+    INTERVAL_TERMINATION = 0.1
+
+    def __init__(self, state_store: StateStore, policy: str = POLICY_ADOPT) -> None:
+        if policy not in (POLICY_ADOPT, POLICY_TERMINATE):
+            msg = f"Unsupported orphan policy: {policy}"
+            raise ValueError(msg)
+        self.state_store = state_store
+        self.policy = policy
+        self.logger = getLogger(__name__)
+
+    async def reconcile(self, archiving_task_registry: ArchivingTaskRegistry) -> None:
+        """Reconciles, the store being unavailable doesn't prevent from starting."""
+        try:
+            await self.reconcile_recordings(archiving_task_registry)
+        except StateStoreError:
+            self.logger.exception("Failed to reconcile recordings of previous run.")
+
+    async def reconcile_recordings(self, archiving_task_registry: ArchivingTaskRegistry) -> None:
+        """Forgets recordings whose process has ended, then adopts or terminates the rest by policy."""
+        list_recording = await self.state_store.list_recording()
+        list_orphan = []
+        for recording in list_recording:
+            if is_recording_process(recording):
+                list_orphan.append(recording)
+                continue
+            self.logger.info(
+                "Recording of previous run has ended. room_id: %d, pid: %d",
+                recording.room_id,
+                recording.pid,
+            )
+            await self.state_store.unregister(recording.room_id, recording.pid)
+        if self.policy == POLICY_TERMINATE:
+            await asyncio.gather(*(self.terminate(recording) for recording in list_orphan))
+            return
+        list_orphan.sort(key=lambda recording: recording.room_id)
+        for room_id, group in groupby(list_orphan, key=lambda recording: recording.room_id):
+            list_recording_room = list(group)
+            self.logger.info(
+                "Adopted recording of previous run. room_id: %d, pids: %s",
+                room_id,
+                [recording.pid for recording in list_recording_room],
+            )
+            archiving_task_registry.register(room_id, asyncio.create_task(self.wait_until_exit(list_recording_room)))
+
+    async def wait_until_exit(self, list_recording: list[Recording]) -> None:
+        """Waits until all processes recording the room exit since they are not children of this process."""
+        for recording in list_recording:
+            await self.wait_exit(recording, self.INTERVAL)
+            self.logger.info("Adopted recording has ended. room_id: %d, pid: %d", recording.room_id, recording.pid)
+            await self.state_store.unregister(recording.room_id, recording.pid)
+
+    async def terminate(self, recording: Recording) -> None:
+        """Interrupts as same as Ctrl + C so that FFmpeg finalizes output file, then kills if it doesn't exit."""
+        self.logger.info(
+            "Terminating recording of previous run. room_id: %d, pid: %d",
+            recording.room_id,
+            recording.pid,
+        )
+        self.send_signal(recording.pid, signal.SIGINT)
+        if not await self.wait_exit(recording, self.INTERVAL_TERMINATION, TIME_TO_FORCE_TERMINATION):
+            self.logger.warning(
+                "Killing recording of previous run. room_id: %d, pid: %d",
+                recording.room_id,
+                recording.pid,
+            )
+            # Reason: Windows never reaches here since is_recording_process() returns False.
+            self.send_signal(recording.pid, signal.SIGKILL)  # type: ignore[attr-defined,unused-ignore]
+        await self.state_store.unregister(recording.room_id, recording.pid)
+
+    @staticmethod
+    async def wait_exit(recording: Recording, interval: float, seconds_timeout: float = math.inf) -> bool:
+        """Returns whether the process exited within timeout."""
+        loop = asyncio.get_running_loop()
+        time_timeout = loop.time() + seconds_timeout
+        while loop.time() < time_timeout:
+            if not is_recording_process(recording):
+                return True
+            await asyncio.sleep(interval)
+        return not is_recording_process(recording)
+
+    def send_signal(self, pid: int, signal_number: int) -> None:
+        try:
+            os.kill(pid, signal_number)
+        except ProcessLookupError:
+            self.logger.debug("Process already exited. pid: %d", pid)
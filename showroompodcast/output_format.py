@@ -0,0 +1,79 @@
+"""Output format."""
+
+from __future__ import annotations
+
+from pathlib import PurePath
+from typing import TYPE_CHECKING
+
+# noinspection PyPackageRequirements
+import ffmpeg
+
+if TYPE_CHECKING:
+    from asyncffmpeg import StreamSpec
+
+    from showroompodcast.config import ArchiverConfig
+
+
+class OutputFormat:
+    """Format of archive written by FFmpeg.
+
+    - "mp4": Plain MP4, unreadable when FFmpeg is killed before writing moov atom.
+    - "fragmented_mp4": MP4 which is playable even if recording is interrupted, and while recording.
+    - "segment": MPEG-TS segments rotated every segment_time seconds, indexed by M3U8 playlist of out file name.
+    """
+
+    MP4 = "mp4"
+    FRAGMENTED_MP4 = "fragmented_mp4"
+    SEGMENT = "segment"
+    TUPLE_NAME = (MP4, FRAGMENTED_MP4, SEGMENT)
+
+    def __init__(self, name: str = MP4, *, segment_time: int = 300) -> None:
+        if name not in self.TUPLE_NAME:
+            msg = f"Unsupported output format. {name=}, expected one of {self.TUPLE_NAME}"
+            raise ValueError(msg)
+        self.name = name
+        self.segment_time = segment_time
+
+    @classmethod
+    def create(cls, archiver_config: ArchiverConfig) -> OutputFormat:
+        return cls(archiver_config.output_format, segment_time=archiver_config.segment_time)
+
+    @property
+    def extension(self) -> str:
+        return ".m3u8" if self.name == self.SEGMENT else ".mp4"
+
+    @property
+    def is_concatenatable(self) -> bool:
+        """Whether parts of archive can be concatenated into one file."""
+        return self.name != self.SEGMENT
+
+    def create_output(self, stream: StreamSpec, out_file_name: str) -> StreamSpec:
+        """Creates output to write archive into out file name without re-encoding."""
+        if self.name == self.FRAGMENTED_MP4:
+            # To write moov atom first and flush each fragment, so that memory usage doesn't grow by duration.
+            movflags = "+frag_keyframe+empty_moov+default_base_moof"
+            return ffmpeg.output(stream, out_file_name, f="mp4", c="copy", movflags=movflags)
+        if self.name == self.SEGMENT:
+            return ffmpeg.output(
+                stream,
+                self.create_segment_file_name(out_file_name),
+                f="segment",
+                c="copy",
+                segment_time=str(self.segment_time),
+                segment_format="mpegts",
+                segment_list=out_file_name,
+                segment_list_type="m3u8",
+                # To update index each time segment is written, so that it can be read while recording.
+                segment_list_flags="+live",
+            )
+        return ffmpeg.output(stream, out_file_name, f="mp4", c="copy")
+
+    def find_first_file_name(self, out_file_name: str) -> str:
+        """Returns the file to be written first, index of segments is written after the first segment."""
+        if self.name == self.SEGMENT:
+            return self.create_segment_file_name(out_file_name) % 0
+        return out_file_name
+
+    @staticmethod
+    def create_segment_file_name(out_file_name: str) -> str:
+        return out_file_name.removesuffix(PurePath(out_file_name).suffix) + "-%05d.ts"
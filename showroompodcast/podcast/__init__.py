@@ -0,0 +1 @@
+"""Audio-only podcast published from archives."""
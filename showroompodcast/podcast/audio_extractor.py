@@ -0,0 +1,54 @@
+"""Audio extractor."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+# noinspection PyPackageRequirements
+import ffmpeg
+
+from showroompodcast.remuxer import Remuxer
+
+if TYPE_CHECKING:
+    from showroompodcast.config import PodcastConfig
+
+
+class AudioExtractor:
+    """Extracts audio track of archive into M4A by FFmpeg.
+
+    AAC is copied without re-encoding, unless loudness is normalized since it requires decoding.
+    """
+
+    EXTENSION = ".m4a"
+    MIME_TYPE = "audio/mp4"
+    # True peak and loudness range of EBU R128 by loudnorm filter of FFmpeg.
+    TRUE_PEAK = -1.5
+    LOUDNESS_RANGE = 11.0
+
+    def __init__(self, podcast_config: PodcastConfig) -> None:
+        self.loudness = podcast_config.loudness
+        self.bitrate = podcast_config.bitrate
+        self.remuxer = Remuxer()
+
+    def is_copyable(self, codecs: str) -> bool:
+        """The codecs is comma separated codec names of streams in archive, e.g. "h264,aac"."""
+        return not self.loudness and "aac" in codecs.split(",")
+
+    async def extract(self, path_input: str, path_output: str, codecs: str) -> None:
+        """Extracts audio into MP4 container with faststart so that podcast apps can stream it."""
+        stream = ffmpeg.input(path_input).audio
+        if self.is_copyable(codecs):
+            await self.remuxer.run(ffmpeg.output(stream, path_output, f="ipod", acodec="copy", movflags="+faststart"))
+            return
+        if self.loudness:
+            stream = stream.filter("loudnorm", I=self.loudness, TP=self.TRUE_PEAK, LRA=self.LOUDNESS_RANGE)
+        await self.remuxer.run(
+            ffmpeg.output(
+                stream,
+                path_output,
+                f="ipod",
+                acodec="aac",
+                audio_bitrate=f"{self.bitrate}k",
+                movflags="+faststart",
+            ),
+        )
@@ -0,0 +1,74 @@
+"""Index of podcast episodes."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from anyio import to_thread
+
+from showroompodcast.exceptions import RecordingIndexError
+from showroompodcast.sqlite_database import SqliteDatabase
+
+
+class Episode(NamedTuple):
+    """Audio extracted from archived recording, times are in epoch seconds."""
+
+    # Name of audio file in directory of the room.
+    name: str
+    room_id: int
+    # Name of archive which audio is extracted from.
+    name_recording: str
+    time_start: float
+    duration: float
+    size: int
+    mime_type: str
+
+
+class EpisodeIndex(SqliteDatabase):
+    """Episodes in SQLite database, feeds are generated from this instead of listing directory of podcast.
+
+    It can share the database of recording index.
+    """
+
+    NAME = "episode index"
+    ERROR = RecordingIndexError
+    SQL_CREATE_TABLE = (
+        "CREATE TABLE IF NOT EXISTS episode ("
+        "name TEXT NOT NULL, "
+        "room_id INTEGER NOT NULL, "
+        "name_recording TEXT PRIMARY KEY, "
+        "time_start REAL NOT NULL, "
+        "duration REAL NOT NULL, "
+        "size INTEGER NOT NULL, "
+        "mime_type TEXT NOT NULL)"
+    )
+    SQL_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS episode_room_id_time_start ON episode (room_id, time_start)"
+    SQL_SCHEMA = (SQL_CREATE_TABLE, SQL_CREATE_INDEX)
+
+    async def upsert(self, episode: Episode) -> None:
+        await to_thread.run_sync(self.upsert_sync, episode)
+
+    async def set_name_recording(self, room_id: int) -> set[str]:
+        """Returns names of archives which audio is already extracted from."""
+        return await to_thread.run_sync(self.set_name_recording_sync, room_id)
+
+    async def list_latest(self, room_id: int, limit: int) -> list[Episode]:
+        """Lists episodes of room from the latest."""
+        return await to_thread.run_sync(self.list_latest_sync, room_id, limit)
+
+    def upsert_sync(self, episode: Episode) -> None:
+        with self.connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO episode VALUES (?, ?, ?, ?, ?, ?, ?)", episode)
+
+    def set_name_recording_sync(self, room_id: int) -> set[str]:
+        with self.connect() as connection:
+            cursor = connection.execute("SELECT name_recording FROM episode WHERE room_id = ?", (room_id,))
+            return {name_recording for (name_recording,) in cursor.fetchall()}
+
+    def list_latest_sync(self, room_id: int, limit: int) -> list[Episode]:
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "SELECT * FROM episode WHERE room_id = ? ORDER BY time_start DESC, name LIMIT ?",
+                (room_id, limit),
+            )
+            return [Episode._make(row) for row in cursor.fetchall()]
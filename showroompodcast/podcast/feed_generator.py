@@ -0,0 +1,59 @@
+"""Feed generator."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from email.utils import formatdate
+from typing import TYPE_CHECKING
+from urllib.parse import quote
+from xml.etree.ElementTree import Element
+from xml.etree.ElementTree import SubElement
+from xml.etree.ElementTree import register_namespace
+from xml.etree.ElementTree import tostring
+
+from showroompodcast.showroom_datetime import ShowroomDatetime
+
+if TYPE_CHECKING:
+    from showroompodcast.podcast.episode_index import Episode
+
+NAMESPACE_ITUNES = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+URL_ROOM = "https://www.showroom-live.com/room/profile?room_id={}"
+
+
+class FeedGenerator:
+    """Generates RSS 2.0 feed of room with iTunes tags, which podcast apps subscribe."""
+
+    def __init__(self, base_url: str) -> None:
+        """Audio files are linked as <base_url>/<room ID>/<name>."""
+        self.base_url = base_url.rstrip("/")
+        register_namespace("itunes", NAMESPACE_ITUNES)
+
+    def generate(self, room_id: int, list_episode: list[Episode]) -> bytes:
+        """The list_episode is in order from the latest."""
+        rss = Element("rss", version="2.0")
+        channel = SubElement(rss, "channel")
+        SubElement(channel, "title").text = f"SHOWROOM room {room_id}"
+        SubElement(channel, "link").text = URL_ROOM.format(room_id)
+        SubElement(channel, "description").text = f"Audio of lives archived in SHOWROOM room {room_id}."
+        if list_episode:
+            SubElement(channel, "lastBuildDate").text = formatdate(list_episode[0].time_start, usegmt=True)
+        for episode in list_episode:
+            self.append_item(channel, episode)
+        feed: bytes = tostring(rss, encoding="utf-8", xml_declaration=True)
+        return feed
+
+    def append_item(self, channel: Element, episode: Episode) -> None:
+        """The GUID is name of archive, which stays the same even if audio is extracted again."""
+        time_start = datetime.fromtimestamp(episode.time_start, tz=ShowroomDatetime.JST)
+        item = SubElement(channel, "item")
+        SubElement(item, "title").text = f"Room {episode.room_id} {time_start:%Y-%m-%d %H:%M} JST"
+        SubElement(
+            item,
+            "enclosure",
+            url=f"{self.base_url}/{episode.room_id}/{quote(episode.name)}",
+            length=str(episode.size),
+            type=episode.mime_type,
+        )
+        SubElement(item, "guid", isPermaLink="false").text = episode.name_recording
+        SubElement(item, "pubDate").text = formatdate(episode.time_start, usegmt=True)
+        SubElement(item, f"{{{NAMESPACE_ITUNES}}}duration").text = str(round(episode.duration))
@@ -0,0 +1,147 @@
+"""Podcast publisher."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from anyio import Path
+from asyncffmpeg.exceptions import FFmpegProcessError
+
+from showroompodcast.exceptions import RecordingIndexError
+from showroompodcast.podcast.audio_extractor import AudioExtractor
+from showroompodcast.podcast.episode_index import Episode
+from showroompodcast.podcast.feed_generator import FeedGenerator
+from showroompodcast.structured_logging import log_context
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from showroompodcast.config import PodcastConfig
+    from showroompodcast.podcast.episode_index import EpisodeIndex
+    from showroompodcast.recording_index import IndexedRecording
+    from showroompodcast.recording_indexer import RecordingIndexer
+
+
+# Reason: Holds components, configuration and queue of rooms. pylint: disable-next=too-many-instance-attributes
+class PodcastPublisher:
+    """Publishes audio of archives as podcast after recording finishes, apart from recording.
+
+    Rooms requested are queued without duplicates, then published by bounded number of workers,
+    so that burst of finished lives doesn't spawn FFmpeg processes competing with recordings.
+    Archives to extract are found by comparing recording index with episode index,
+    then feed is regenerated from episode index, neither lists directories.
+    """
+
+    NAME_FEED = "feed.xml"
+
+    def __init__(
+        self,
+        recording_indexer: RecordingIndexer,
+        episode_index: EpisodeIndex,
+        podcast_config: PodcastConfig,
+        directory: str = "./output",
+    ) -> None:
+        """Archives are read from directory, which recording_indexer indexes."""
+        self.recording_indexer = recording_indexer
+        self.episode_index = episode_index
+        self.audio_extractor = AudioExtractor(podcast_config)
+        self.feed_generator = FeedGenerator(podcast_config.base_url)
+        self.directory_podcast = podcast_config.directory
+        self.number_concurrency = podcast_config.number_concurrency
+        self.maximum_episodes = podcast_config.maximum_episodes
+        self.directory = directory
+        self.queue: asyncio.Queue[int] = asyncio.Queue()
+        self.set_room_id_queued: set[int] = set()
+        # Not to publish the same room by multiple workers at once when requested again while publishing.
+        self.dictionary_lock: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.logger = getLogger(__name__)
+
+    def request(self, room_id: int, *_args: object) -> None:
+        """Queues room to publish, arguments after room ID are ignored to use as done callback."""
+        if room_id in self.set_room_id_queued:
+            return
+        self.set_room_id_queued.add(room_id)
+        self.queue.put_nowait(room_id)
+
+    async def run(self, is_archiving: Callable[[int], bool]) -> None:
+        """Publishes archives written while this process was stopped, then ones requested."""
+        await self.recording_indexer.index()
+        try:
+            list_room_summary = await self.recording_indexer.recording_index.summarize()
+        except RecordingIndexError:
+            self.logger.warning("Failed to list rooms archived.", exc_info=True)
+            list_room_summary = []
+        for room_summary in list_room_summary:
+            if not is_archiving(room_summary.room_id):
+                self.request(room_summary.room_id)
+        await asyncio.gather(*(self.work() for _ in range(self.number_concurrency)))
+
+    async def work(self) -> None:
+        """Publishes rooms requested until cancelled."""
+        while True:
+            room_id = await self.queue.get()
+            self.set_room_id_queued.discard(room_id)
+            async with self.dictionary_lock[room_id]:
+                await self.publish(room_id)
+
+    async def publish(self, room_id: int) -> None:
+        """Failure doesn't stop publishing other rooms, archives not extracted are retried at next request."""
+        with log_context(room_id=room_id):
+            try:
+                await self.publish_room(room_id)
+            except (RecordingIndexError, OSError):
+                self.logger.warning("Failed to publish podcast.", exc_info=True)
+            # Reason: Worker must keep working since nobody restarts it, unexpected errors are logged as errors.
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.logger.exception("Unexpected error on publishing podcast.")
+
+    async def publish_room(self, room_id: int) -> None:
+        """Extracts complete archives not extracted yet, feed is regenerated when any is extracted or it is missing."""
+        set_name_recording = await self.episode_index.set_name_recording(room_id)
+        list_recording = [
+            recording
+            for recording in await self.recording_indexer.recording_index.list_recording(room_id=room_id)
+            if recording.is_complete and recording.name not in set_name_recording
+        ]
+        path_directory = Path(self.directory_podcast, str(room_id))
+        await path_directory.mkdir(parents=True, exist_ok=True)
+        for recording in list_recording:
+            await self.extract(path_directory, recording)
+        path_feed = path_directory / self.NAME_FEED
+        if list_recording or not await path_feed.exists():
+            await self.write_feed(path_feed, room_id)
+
+    async def extract(self, path_directory: Path, recording: IndexedRecording) -> None:
+        """Writes into temporary file not to serve audio being written."""
+        name = f"{Path(recording.name).stem}{AudioExtractor.EXTENSION}"
+        path_output = path_directory / name
+        path_temporary = path_directory / f"{name}.tmp"
+        path_input = f"{self.directory}/{recording.name}"
+        try:
+            await self.audio_extractor.extract(path_input, str(path_temporary), recording.codecs)
+        except FFmpegProcessError as error:
+            self.logger.warning("Failed to extract audio. name: %s", recording.name, exc_info=error)
+            return
+        await path_temporary.replace(path_output)
+        size = (await path_output.stat()).st_size
+        episode = Episode(
+            name=name,
+            room_id=recording.room_id,
+            name_recording=recording.name,
+            time_start=recording.time_start,
+            duration=recording.duration,
+            size=size,
+            mime_type=AudioExtractor.MIME_TYPE,
+        )
+        await self.episode_index.upsert(episode)
+        self.logger.info("Audio extracted. name: %s", name)
+
+    async def write_feed(self, path_feed: Path, room_id: int) -> None:
+        """Replaces feed at once not to serve feed being written."""
+        list_episode = await self.episode_index.list_latest(room_id, self.maximum_episodes)
+        path_temporary = path_feed.with_name(f"{path_feed.name}.tmp")
+        await path_temporary.write_bytes(self.feed_generator.generate(room_id, list_episode))
+        await path_temporary.replace(path_feed)
@@ -0,0 +1,59 @@
+"""Polling engine."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from showroompodcast.api.onlives import Onlives
+from showroompodcast.api.polling import Polling
+from showroompodcast.api.streaming_url import Stream
+from showroompodcast.api.streaming_url import StreamingUrl
+from showroompodcast.metrics import ROOMS_POLLED
+from showroompodcast.rate_limiter import RateLimiter
+from showroompodcast.time_to_live_cache import TimeToLiveCache
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+class PollingEngine:
+    """Polls rooms concurrently within concurrency limit and requests-per-second budget."""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        *,
+        number_concurrency: int,
+        requests_per_second: float,
+        streaming_url_time_to_live: float = 30.0,
+    ) -> None:
+        self.session = session
+        self.semaphore = asyncio.Semaphore(number_concurrency)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.cache_stream: TimeToLiveCache[int, list[Stream]] = TimeToLiveCache(streaming_url_time_to_live)
+
+    async def poll(self, room_id: int) -> bool:
+        """Returns True when on live, otherwise returns False."""
+        await self.rate_limiter.acquire()
+        ROOMS_POLLED.inc()
+        async with self.semaphore:
+            return await Polling.poll_async(self.session, room_id)
+
+    async def discover(self) -> set[int]:
+        """Returns room IDs on live in whole SHOWROOM by single request."""
+        await self.rate_limiter.acquire()
+        async with self.semaphore:
+            return await Onlives.get_set_room_id_async(self.session)
+
+    async def resolve_streams(self, room_id: int) -> list[Stream]:
+        """Returns streams in order from best quality, or empty list when no URL is available yet."""
+        list_stream = self.cache_stream.get(room_id)
+        if list_stream is not None:
+            return list_stream
+        await self.rate_limiter.acquire()
+        async with self.semaphore:
+            list_stream = await StreamingUrl.list_stream_by_quality_async(self.session, room_id)
+        if list_stream:
+            self.cache_stream.set(room_id, list_stream)
+        return list_stream
@@ -0,0 +1,126 @@
+"""Polling scheduler."""
+
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from showroompodcast.config import PollingConfig
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class RoomHistory:
+    """Observed live history of a room to decide interval until next polling.
+
+    While room is off live, the interval grows from the minimum to the maximum,
+    so rooms which were on live recently are polled often and long-offline rooms rarely.
+    Around the time of day the room usually starts live, the minimum interval is used.
+    """
+
+    GROWTH_INTERVAL = 1.5
+    MINUTES_BEFORE_USUAL_START = 15
+    MINUTES_AFTER_USUAL_START = 30
+    NUMBER_LIVE_START_TO_REMEMBER = 20
+
+    def __init__(self, interval_minimum: float, interval_maximum: float) -> None:
+        self.interval_minimum = interval_minimum
+        self.interval_maximum = interval_maximum
+        self.interval = interval_minimum
+        self.is_on_live = False
+        self.deque_minute_live_start: deque[int] = deque(maxlen=self.NUMBER_LIVE_START_TO_REMEMBER)
+
+    def update(self, now: datetime, *, is_on_live: bool) -> None:
+        """Updates history by the result of polling."""
+        if is_on_live:
+            if not self.is_on_live:
+                self.deque_minute_live_start.append(self.minute_of_day(now))
+            self.interval = self.interval_minimum
+        else:
+            self.interval = min(self.interval * self.GROWTH_INTERVAL, self.interval_maximum)
+        self.is_on_live = is_on_live
+
+    def get_interval(self, now: datetime) -> float:
+        return self.interval_minimum if self.is_live_start_expected(now) else self.interval
+
+    def is_live_start_expected(self, now: datetime) -> bool:
+        """Returns True when current time of day is around the time live usually starts."""
+        minute = self.minute_of_day(now)
+        return any(
+            (start - minute) % MINUTES_PER_DAY <= self.MINUTES_BEFORE_USUAL_START
+            or (minute - start) % MINUTES_PER_DAY <= self.MINUTES_AFTER_USUAL_START
+            for start in self.deque_minute_live_start
+        )
+
+    @staticmethod
+    def minute_of_day(argument_datetime: datetime) -> int:
+        return argument_datetime.hour * 60 + argument_datetime.minute
+
+
+class PollingScheduler:
+    """Priority queue of rooms keyed by the time next polling is due.
+
+    Times are in the clock of event loop.
+    Popped rooms are out of queue until they are scheduled again, so a room is never polled twice at same time.
+    """
+
+    def __init__(self, list_room_id: list[int], polling_config: PollingConfig) -> None:
+        self.interval_minimum = polling_config.interval_minimum
+        self.interval_maximum = polling_config.interval_maximum
+        self.dictionary_room_history = {
+            room_id: RoomHistory(polling_config.interval_minimum, polling_config.interval_maximum)
+            for room_id in list_room_id
+        }
+        self.heap: list[tuple[float, int]] = [(0.0, room_id) for room_id in list_room_id]
+        heapq.heapify(self.heap)
+        self.set_room_id_popped: set[int] = set()
+
+    def add(self, list_room_id: list[int], time: float) -> None:
+        """Adds rooms to poll from the time, rooms already added are ignored."""
+        for room_id in list_room_id:
+            if room_id in self.dictionary_room_history:
+                continue
+            self.dictionary_room_history[room_id] = RoomHistory(self.interval_minimum, self.interval_maximum)
+            # Room removed and added again while polling is scheduled when the polling finishes.
+            if room_id not in self.set_room_id_popped:
+                heapq.heappush(self.heap, (time, room_id))
+
+    def remove(self, set_room_id: set[int]) -> None:
+        """Removes rooms from queue, rooms being polled are not scheduled again."""
+        for room_id in set_room_id:
+            self.dictionary_room_history.pop(room_id, None)
+        self.heap = [item for item in self.heap if item[1] not in set_room_id]
+        heapq.heapify(self.heap)
+
+    def pop_due(self, time: float) -> list[int]:
+        """Pops rooms whose polling is due."""
+        list_room_id = []
+        while self.heap and self.heap[0][0] <= time:
+            list_room_id.append(heapq.heappop(self.heap)[1])
+        self.set_room_id_popped.update(list_room_id)
+        return list_room_id
+
+    def seconds_until_next_due(self, time: float) -> float | None:
+        """Returns None when no room is in queue."""
+        return max(0.0, self.heap[0][0] - time) if self.heap else None
+
+    def schedule(self, room_id: int, time: float, now: datetime, *, is_on_live: bool | None) -> None:
+        """Schedules next polling by the result of polling, None means the result is unknown."""
+        self.set_room_id_popped.discard(room_id)
+        room_history = self.dictionary_room_history.get(room_id)
+        if room_history is None:
+            return
+        if is_on_live is not None:
+            room_history.update(now, is_on_live=is_on_live)
+        heapq.heappush(self.heap, (time + room_history.get_interval(now), room_id))
+
+    def postpone(self, room_id: int, time: float) -> None:
+        """Postpones polling without result, e.g. while the room is being archived."""
+        self.set_room_id_popped.discard(room_id)
+        if room_id not in self.dictionary_room_history:
+            return
+        heapq.heappush(self.heap, (time + self.interval_minimum, room_id))
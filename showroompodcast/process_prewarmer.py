@@ -0,0 +1,68 @@
+"""Process prewarmer."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+# Reason: To import modules archiving requires in worker process in advance,
+# even when the start method of process is spawn or forkserver.
+# pylint: disable-next=unused-import
+import showroompodcast.showroom_archiver  # noqa: F401
+from showroompodcast.api import ShowroomApi
+from showroompodcast.metrics import Metric
+from showroompodcast.resource_limiter import ResourceLimiter
+from showroompodcast.structured_logging import configure_worker
+
+if TYPE_CHECKING:
+    import logging
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.queues import Queue
+
+    from showroompodcast.config import LoggingConfig
+    from showroompodcast.config import ResourceConfig
+    from showroompodcast.metrics import MetricsUpdate
+
+
+def initialize_worker(
+    queue_metrics: Queue[MetricsUpdate] | None = None,
+    queue_log: Queue[logging.LogRecord] | None = None,
+    logging_config: LoggingConfig | None = None,
+    resource_config: ResourceConfig | None = None,
+) -> None:
+    """Initializes worker process before it receives the first archiving task.
+
+    Metrics updated in worker are sent to parent process through queue_metrics if it's set,
+    logs are sent through queue_log as well.
+    Worker lowers its own priority so that FFmpeg it spawns never starves polling in parent process.
+    """
+    Metric.queue = queue_metrics
+    if queue_log is not None and logging_config is not None:
+        configure_worker(queue_log, logging_config)
+    if resource_config is not None:
+        ResourceLimiter.configure(resource_config)
+        ResourceLimiter.limit_current_process()
+    ShowroomApi.get_session()
+
+
+def hold_worker(seconds: float) -> None:
+    """Keeps worker busy so that next submission spawns another worker."""
+    time.sleep(seconds)
+
+
+class ProcessPrewarmer:
+    """Starts all worker processes before any live starts.
+
+    ProcessPoolExecutor spawns worker lazily when no worker is idle at submission,
+    so the first archiving after live detected pays starting up process.
+    """
+
+    SECONDS_HOLD = 0.5
+
+    @classmethod
+    async def prewarm(cls, executor: ProcessPoolExecutor, number_process: int) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, hold_worker, cls.SECONDS_HOLD) for _ in range(number_process)),
+        )
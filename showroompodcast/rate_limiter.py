@@ -0,0 +1,26 @@
+"""Rate limiter."""
+
+import asyncio
+
+
+class RateLimiter:
+    """Asynchronous rate limiter which spaces acquisitions evenly.
+
+    Each acquisition reserves the next free time slot before awaiting,
+    so that concurrent coroutines share one budget without lock.
+    """
+
+    def __init__(self, requests_per_second: float) -> None:
+        """The requests_per_second 0 means unlimited."""
+        if requests_per_second < 0:
+            msg = f"Requests per second must not be negative: {requests_per_second}"
+            raise ValueError(msg)
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.time_next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Waits until the next time slot."""
+        now = asyncio.get_running_loop().time()
+        time_slot = max(now, self.time_next_slot)
+        self.time_next_slot = time_slot + self.interval
+        await asyncio.sleep(time_slot - now)
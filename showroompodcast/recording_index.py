@@ -0,0 +1,141 @@
+"""Index of archived recordings."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from anyio import to_thread
+
+from showroompodcast.exceptions import RecordingIndexError
+from showroompodcast.sqlite_database import SqliteDatabase
+
+
+class IndexedRecording(NamedTuple):
+    """Archived recording, times are in epoch seconds."""
+
+    name: str
+    room_id: int
+    time_start: float
+    time_end: float
+    duration: float
+    size: int
+    # To detect the file is modified since indexed.
+    mtime_ns: int
+    format_name: str
+    # Codecs of streams, e.g. "h264,aac".
+    codecs: str
+    is_complete: bool
+
+
+class RoomSummary(NamedTuple):
+    """Summary of archived recordings of room."""
+
+    room_id: int
+    number_recording: int
+    duration: float
+    size: int
+    count_incomplete: int
+
+
+class RecordingIndex(SqliteDatabase):
+    """Archived recordings in SQLite database, which is queried instead of listing and probing output directory."""
+
+    NAME = "recording index"
+    ERROR = RecordingIndexError
+    SQL_CREATE_TABLE = (
+        "CREATE TABLE IF NOT EXISTS recording ("
+        "name TEXT PRIMARY KEY, "
+        "room_id INTEGER NOT NULL, "
+        "time_start REAL NOT NULL, "
+        "time_end REAL NOT NULL, "
+        "duration REAL NOT NULL, "
+        "size INTEGER NOT NULL, "
+        "mtime_ns INTEGER NOT NULL, "
+        "format_name TEXT NOT NULL, "
+        "codecs TEXT NOT NULL, "
+        "is_complete INTEGER NOT NULL)"
+    )
+    SQL_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS recording_room_id_time_start ON recording (room_id, time_start)"
+    SQL_SCHEMA = (SQL_CREATE_TABLE, SQL_CREATE_INDEX)
+
+    async def upsert(self, list_recording: list[IndexedRecording]) -> None:
+        await to_thread.run_sync(self.upsert_sync, list_recording)
+
+    async def update(self, list_recording: list[IndexedRecording], list_name_removed: list[str]) -> None:
+        """Upserts recordings and deletes ones whose file was removed, in one transaction."""
+        await to_thread.run_sync(self.update_sync, list_recording, list_name_removed)
+
+    async def dictionary_signature(self, room_id: int | None = None) -> dict[str, tuple[int, int]]:
+        """Returns size and mtime_ns by name, to skip files not modified since indexed."""
+        return await to_thread.run_sync(self.dictionary_signature_sync, room_id)
+
+    async def list_recording(
+        self,
+        *,
+        room_id: int | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        incomplete_only: bool = False,
+    ) -> list[IndexedRecording]:
+        """Lists recordings started in range ordered by start time."""
+        return await to_thread.run_sync(self.list_recording_sync, room_id, since, until, incomplete_only)
+
+    async def summarize(self) -> list[RoomSummary]:
+        return await to_thread.run_sync(self.summarize_sync)
+
+    def upsert_sync(self, list_recording: list[IndexedRecording]) -> None:
+        self.update_sync(list_recording, [])
+
+    def update_sync(self, list_recording: list[IndexedRecording], list_name_removed: list[str]) -> None:
+        with self.connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO recording VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                list_recording,
+            )
+            connection.executemany("DELETE FROM recording WHERE name = ?", [(name,) for name in list_name_removed])
+
+    def dictionary_signature_sync(self, room_id: int | None) -> dict[str, tuple[int, int]]:
+        """Returns size and modification time by name to detect archives modified since last scan."""
+        sql = "SELECT name, size, mtime_ns FROM recording"
+        with self.connect() as connection:
+            cursor = (
+                connection.execute(sql)
+                if room_id is None
+                else connection.execute(f"{sql} WHERE room_id = ?", (room_id,))
+            )
+            return {name: (size, mtime_ns) for name, size, mtime_ns in cursor.fetchall()}
+
+    def list_recording_sync(
+        self,
+        room_id: int | None,
+        since: float | None,
+        until: float | None,
+        incomplete_only: bool,  # noqa: FBT001
+    ) -> list[IndexedRecording]:
+        """Conditions which are None are not applied."""
+        conditions = []
+        parameters: list[float] = []
+        if room_id is not None:
+            conditions.append("room_id = ?")
+            parameters.append(room_id)
+        if since is not None:
+            conditions.append("time_start >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("time_start < ?")
+            parameters.append(until)
+        if incomplete_only:
+            conditions.append("NOT is_complete")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.connect() as connection:
+            # Reason: Conditions are fixed strings, values are bound as parameters.
+            cursor = connection.execute(f"SELECT * FROM recording{where} ORDER BY time_start, name", parameters)  # noqa: S608
+            return [IndexedRecording._make((*row[:-1], bool(row[-1]))) for row in cursor.fetchall()]
+
+    def summarize_sync(self) -> list[RoomSummary]:
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "SELECT room_id, COUNT(*), SUM(duration), SUM(size), SUM(NOT is_complete) "
+                "FROM recording GROUP BY room_id ORDER BY room_id",
+            )
+            return [RoomSummary(*row) for row in cursor.fetchall()]
@@ -0,0 +1,117 @@
+"""Recording indexer."""
+
+from __future__ import annotations
+
+import re
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import Any
+
+# noinspection PyPackageRequirements
+import ffmpeg
+from anyio import Path
+from anyio import to_thread
+
+from showroompodcast.exceptions import RecordingIndexError
+from showroompodcast.recording_index import IndexedRecording
+from showroompodcast.showroom_datetime import ShowroomDatetime
+
+if TYPE_CHECKING:
+    from os import stat_result
+
+    from showroompodcast.recording_index import RecordingIndex
+
+
+class RecordingIndexer:
+    """Indexes archives in output directory incrementally, probes only files added or modified since indexed.
+
+    Parts before concatenated and segments are not indexed by themselves,
+    size of archive in "segment" format includes its segments.
+    """
+
+    PATTERN_ARCHIVE = re.compile(r"^(\d+)-(\d{4}_\d{2}_\d{2}-\d{2}_\d{2}_\d{2})\.(mp4|ts|m3u8)$")
+
+    def __init__(self, recording_index: RecordingIndex, directory: str = "./output") -> None:
+        self.recording_index = recording_index
+        self.directory = directory
+        self.logger = getLogger(__name__)
+
+    async def index(self, room_id: int | None = None) -> None:
+        """Scans, failure doesn't fail archiving since next scan retries."""
+        try:
+            list_recording = await self.scan(room_id)
+        except (RecordingIndexError, OSError):
+            self.logger.warning("Failed to index archives.", exc_info=True)
+            return
+        self.logger.debug("Indexed: %s", [recording.name for recording in list_recording])
+
+    async def scan(self, room_id: int | None = None) -> list[IndexedRecording]:
+        """Indexes archives added or modified since indexed, of all rooms when room_id is None.
+
+        Recordings whose file no longer exists, e.g. uploaded or remuxed, are removed from index.
+        Returns recordings indexed by this scan.
+        """
+        dictionary_signature = await self.recording_index.dictionary_signature(room_id)
+        list_recording = []
+        set_name_found = set()
+        async for path in Path(self.directory).iterdir():
+            match = self.PATTERN_ARCHIVE.match(path.name)
+            if match is None or (room_id is not None and int(match.group(1)) != room_id):
+                continue
+            set_name_found.add(path.name)
+            stat = await path.stat()
+            size = stat.st_size + await self.measure_segments(path)
+            if dictionary_signature.get(path.name) == (size, stat.st_mtime_ns):
+                continue
+            list_recording.append(
+                await self.create_indexed_recording(path, int(match.group(1)), match.group(2), stat, size),
+            )
+        list_name_removed = sorted(set(dictionary_signature) - set_name_found)
+        await self.recording_index.update(list_recording, list_name_removed)
+        if list_name_removed:
+            self.logger.debug("Removed from index: %s", list_name_removed)
+        return list_recording
+
+    async def create_indexed_recording(
+        self,
+        path: Path,
+        room_id: int,
+        string_datetime: str,
+        stat: stat_result,
+        size: int,
+    ) -> IndexedRecording:
+        """Archive which FFprobe can't read, or which has no duration or no audio, is regarded as incomplete."""
+        probe = await self.probe(path)
+        dictionary_format = probe.get("format", {})
+        list_stream = probe.get("streams", [])
+        duration = float(dictionary_format.get("duration", 0.0))
+        is_complete = duration > 0 and any(stream.get("codec_type") == "audio" for stream in list_stream)
+        time_start = ShowroomDatetime.decode(string_datetime).timestamp()
+        return IndexedRecording(
+            name=path.name,
+            room_id=room_id,
+            time_start=time_start,
+            # Incomplete archive was written until its last modification.
+            time_end=time_start + duration if is_complete else stat.st_mtime,
+            duration=duration,
+            size=size,
+            mtime_ns=stat.st_mtime_ns,
+            format_name=dictionary_format.get("format_name", ""),
+            codecs=",".join(stream.get("codec_name", "") for stream in list_stream),
+            is_complete=is_complete,
+        )
+
+    async def probe(self, path: Path) -> dict[str, Any]:
+        """Returns result of FFprobe, or empty dictionary when FFprobe can't read the file."""
+        try:
+            probe: dict[str, Any] = await to_thread.run_sync(ffmpeg.probe, str(path))
+        except ffmpeg.Error as error:
+            self.logger.debug("Failed to probe. path: %s, stderr: %s", path, error.stderr)
+            return {}
+        return probe
+
+    @staticmethod
+    async def measure_segments(path: Path) -> int:
+        if path.suffix != ".m3u8":
+            return 0
+        return sum([(await segment.stat()).st_size async for segment in path.parent.glob(f"{path.stem}-*.ts")])
@@ -0,0 +1,53 @@
+"""Remuxer."""
+
+from __future__ import annotations
+
+import asyncio
+
+# Reason: This package requires to use subprocess.
+from asyncio.subprocess import PIPE  # nosec
+from logging import getLogger
+
+# noinspection PyPackageRequirements
+import ffmpeg
+from anyio import Path
+from asyncffmpeg.exceptions import FFmpegProcessError
+
+from showroompodcast.resource_limiter import ResourceLimiter
+
+
+class Remuxer:
+    """Changes container without re-encoding by FFmpeg."""
+
+    def __init__(self) -> None:
+        self.logger = getLogger(__name__)
+
+    async def remux(self, path_input: str, path_output: str) -> None:
+        """Remuxes MPEG-TS or any other container into MP4."""
+        stream = ffmpeg.input(path_input)
+        await self.run(ffmpeg.output(stream, path_output, f="mp4", c="copy"))
+
+    async def concatenate(self, list_path_input: list[str], path_output: str) -> None:
+        """Concatenates files which have same codec parameters into MP4 by concat demuxer."""
+        path_list = Path(f"{path_output}.txt")
+        # Reason: Concat demuxer requires single quote in file name to be escaped.
+        lines = [
+            "file '{}'\n".format(str(await Path(path).absolute()).replace("'", "'\\''")) for path in list_path_input
+        ]
+        await path_list.write_text("".join(lines))
+        try:
+            stream = ffmpeg.input(str(path_list), f="concat", safe="0")
+            await self.run(ffmpeg.output(stream, path_output, f="mp4", c="copy"))
+        finally:
+            await path_list.unlink()
+
+    async def run(self, stream_spec: ffmpeg.nodes.OutputStream) -> None:
+        """Runs FFmpeg without blocking event loop."""
+        arguments = ffmpeg.compile(stream_spec, overwrite_output=True)
+        self.logger.debug("Run: %s", arguments)
+        # Reason: Arguments are built by ffmpeg-python, not by shell.
+        process = await asyncio.create_subprocess_exec(*arguments, stdout=PIPE, stderr=PIPE)  # nosec
+        ResourceLimiter.limit_ffmpeg(process.pid)
+        _, stderr = await process.communicate()
+        if process.returncode:
+            raise FFmpegProcessError(stderr.decode("utf-8", errors="replace"), process.returncode)
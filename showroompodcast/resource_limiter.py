@@ -0,0 +1,119 @@
+"""Resource limiter of processes which archive."""
+
+from __future__ import annotations
+
+import os
+import sys
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import ClassVar
+
+import psutil
+
+from showroompodcast.config import ResourceConfig
+from showroompodcast.structured_logging import SAMPLED
+
+if sys.platform == "linux":
+    import resource
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+# Classes of ioprio_set() on Linux.
+IO_CLASSES = {"best-effort": 2, "idle": 3}
+
+
+def set_memory_maximum(pid: int, memory_maximum: int) -> None:
+    """Sets soft and hard limit of address space, prlimit() is available only on Linux."""
+    if sys.platform == "linux":
+        resource.prlimit(pid, resource.RLIMIT_AS, (memory_maximum, memory_maximum))
+
+
+class ResourceLimiter:
+    """Lowers priority and caps resources of processes which archive, so that polling keeps headroom.
+
+    Worker processes limit themselves when they start, then FFmpeg inherits priorities and cgroup.
+    Limits are applied by best effort, ones unsupported on the platform are skipped.
+    """
+
+    resource_config: ClassVar[ResourceConfig] = ResourceConfig()
+    logger: ClassVar[Logger] = getLogger(__name__)
+
+    @staticmethod
+    def configure(resource_config: ResourceConfig) -> None:
+        """Configures limits of processes which are limited after this, in current process."""
+        if resource_config.io_class and resource_config.io_class not in IO_CLASSES:
+            msg = f"Unsupported I/O class: {resource_config.io_class}"
+            raise ValueError(msg)
+        ResourceLimiter.resource_config = resource_config
+
+    @classmethod
+    def set_up_cgroup(cls) -> None:
+        """Writes weights and memory maximum of all recordings together into cgroup, by main process."""
+        if not cls.resource_config.cgroup:
+            return
+        memory_maximum_total = cls.resource_config.memory_maximum_total
+        dictionary_value = {
+            "cpu.weight": str(cls.resource_config.cpu_weight),
+            "io.weight": f"default {cls.resource_config.io_weight}",
+            "memory.max": str(memory_maximum_total) if memory_maximum_total else "max",
+        }
+        for name, value in dictionary_value.items():
+            path = Path(cls.resource_config.cgroup, name)
+            try:
+                path.write_text(value, encoding="utf-8")
+            except OSError:
+                cls.logger.warning("Failed to set %s, the controller may be unavailable.", path, exc_info=True)
+
+    @classmethod
+    def limit_current_process(cls) -> None:
+        """Limits worker process, processes spawned after this inherit the limits except memory."""
+        pid = os.getpid()
+        cls.lower_priority(pid)
+        cls.join_cgroup(pid)
+
+    @classmethod
+    def limit_ffmpeg(cls, pid: int) -> None:
+        """Limits FFmpeg process which has started, including one spawned by main process."""
+        cls.lower_priority(pid)
+        cls.limit_memory(pid)
+        cls.join_cgroup(pid)
+
+    @classmethod
+    def lower_priority(cls, pid: int) -> None:
+        """Never raises priority, since it requires privilege."""
+        if sys.platform == "win32":
+            return
+        try:
+            if cls.resource_config.nice:
+                nice = max(os.getpriority(os.PRIO_PROCESS, pid), cls.resource_config.nice)
+                os.setpriority(os.PRIO_PROCESS, pid, nice)
+            if sys.platform == "linux" and cls.resource_config.io_class:
+                io_class = IO_CLASSES[cls.resource_config.io_class]
+                io_level = cls.resource_config.io_level if cls.resource_config.io_class == "best-effort" else 0
+                psutil.Process(pid).ionice(io_class, io_level)
+        except (OSError, psutil.Error):
+            cls.logger.warning("Failed to lower priority. pid: %d", pid, exc_info=True, extra=SAMPLED)
+
+    @classmethod
+    def limit_memory(cls, pid: int) -> None:
+        """Limits address space of the process, only on Linux since prlimit() is available only there."""
+        memory_maximum = cls.resource_config.memory_maximum
+        if sys.platform != "linux" or not memory_maximum:
+            return
+        try:
+            set_memory_maximum(pid, memory_maximum)
+        except OSError:
+            cls.logger.warning("Failed to limit memory. pid: %d", pid, exc_info=True, extra=SAMPLED)
+
+    @classmethod
+    def join_cgroup(cls, pid: int) -> None:
+        """Moves the process into the cgroup, processes spawned after this belong to it too."""
+        if not cls.resource_config.cgroup:
+            return
+        try:
+            with Path(cls.resource_config.cgroup, "cgroup.procs").open("a", encoding="utf-8") as file:
+                file.write(f"{pid}\n")
+        except OSError:
+            cls.logger.warning("Failed to join cgroup. pid: %d", pid, exc_info=True, extra=SAMPLED)
@@ -0,0 +1,140 @@
+"""Retry policy of archiving."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+from collections import Counter
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+from anyio import to_thread
+from asyncffmpeg.exceptions import FFmpegProcessError
+from requests import RequestException
+
+from showroompodcast.api.polling import Polling
+from showroompodcast.config import RetryConfig
+from showroompodcast.exceptions import MaxRetriesExceededError
+from showroompodcast.exceptions import TemporaryNetworkIssuesError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+
+
+class ErrorClass(NamedTuple):
+    """Class of error to retry, backoff starts from seconds_base and doubles up to seconds_maximum.
+
+    Backoff never gets shorter than seconds_minimum by jitter nor immediate first retry.
+    """
+
+    name: str
+    seconds_base: float
+    seconds_maximum: float
+    seconds_minimum: float = 0.0
+
+
+# Playlist is not published yet or already removed, appears soon after live starts or reconnects.
+NOT_FOUND = ErrorClass("not_found", 1.0, 8.0)
+# Origin is overloaded, backs off longer not to make it worse when many rooms fail together.
+SERVER_ERROR = ErrorClass("server_error", 2.0, 30.0)
+TIMEOUT = ErrorClass("timeout", 1.0, 15.0)
+# Connection dropped while recording, usually short blip.
+END_OF_FILE = ErrorClass("end_of_file", 0.5, 8.0)
+# Output file of the same second exists, waits at least 1 second so that the name changes.
+FILE_EXISTS = ErrorClass("file_exists", 1.0, 2.0, seconds_minimum=1.0)
+LIST_PATTERN_ERROR_CLASS = [
+    (re.compile(r"404 Not Found"), NOT_FOUND),
+    (re.compile(r"Server returned 5(\d\d|XX)"), SERVER_ERROR),
+    (re.compile(r"timed out|Connection timeout", re.IGNORECASE), TIMEOUT),
+    (re.compile(r"End of file|Input/output error|Connection reset by peer"), END_OF_FILE),
+]
+
+
+def classify(error: BaseException) -> ErrorClass | None:
+    """Returns class of error to retry, or None when the error should not be retried."""
+    if isinstance(error, FileExistsError):
+        return FILE_EXISTS
+    if not isinstance(error, FFmpegProcessError):
+        return None
+    message = str(error)
+    for pattern, error_class in LIST_PATTERN_ERROR_CLASS:
+        if pattern.search(message):
+            return error_class
+    return None
+
+
+class Failure(NamedTuple):
+    """Failed attempt to retry."""
+
+    error_class: ErrorClass
+    seconds_attempt: float
+
+
+async def check_on_live(room_id: int) -> bool | None:
+    """Returns whether on live by polling API, or None when it's unknown due to network issues."""
+    try:
+        return await to_thread.run_sync(Polling.poll, room_id)
+    except (TemporaryNetworkIssuesError, RequestException):
+        return None
+
+
+class RetryPolicy:
+    """Decides when to retry failed attempt, or to give up.
+
+    Backoff is exponential by each class of error with equal jitter,
+    so that short blips are recovered quickly while rooms failing together don't retry at the same time.
+    Gives up when attempts keep failing over the time budget.
+    Attempt which recorded for stable seconds before failed resets backoff and budget.
+    """
+
+    def __init__(
+        self,
+        retry_config: RetryConfig | None = None,
+        is_on_live: Callable[[], Awaitable[bool | None]] | None = None,
+        *,
+        immediate_first: bool = False,
+    ) -> None:
+        """When is_on_live is set, stops retrying when live ended.
+
+        When immediate_first is true, the first retry after stable attempt doesn't wait, e.g. gapless resume.
+        """
+        self.retry_config = retry_config or RetryConfig()
+        self.is_on_live = is_on_live
+        self.immediate_first = immediate_first
+        self.random = random.Random()  # noqa: S311
+        self.counter_failure: Counter[str] = Counter()
+        self.time_first_failure: float | None = None
+        self.logger = getLogger(__name__)
+
+    async def wait(self, failure: Failure) -> None:
+        """Waits before retry.
+
+        Raises MaxRetriesExceededError when the budget is exhausted, StopAsyncIteration when live ended.
+        """
+        loop = asyncio.get_running_loop()
+        if failure.seconds_attempt >= self.retry_config.seconds_stable:
+            self.counter_failure.clear()
+            self.time_first_failure = None
+        if self.time_first_failure is None:
+            self.time_first_failure = loop.time()
+        if loop.time() - self.time_first_failure >= self.retry_config.seconds_budget:
+            raise MaxRetriesExceededError
+        if self.is_on_live is not None and await self.is_on_live() is False:
+            self.logger.info("Live ended, stop retrying. error: %s", failure.error_class.name)
+            raise StopAsyncIteration
+        seconds = self.calculate_backoff(failure.error_class)
+        self.logger.debug("Retry in %.3f seconds. error: %s", seconds, failure.error_class.name)
+        await asyncio.sleep(seconds)
+
+    def calculate_backoff(self, error_class: ErrorClass) -> float:
+        """Returns seconds to wait, and counts the failure."""
+        is_first = not self.counter_failure
+        count = self.counter_failure[error_class.name]
+        self.counter_failure[error_class.name] += 1
+        if is_first and self.immediate_first:
+            return error_class.seconds_minimum
+        seconds = min(error_class.seconds_maximum, error_class.seconds_base * 2.0**count)
+        return max(error_class.seconds_minimum, seconds / 2 + self.random.uniform(0, seconds / 2))
@@ -0,0 +1,30 @@
+"""Sharding of rooms across multiple recorder nodes."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+
+
+class LeaseBackend:
+    """Base class of backend shared by nodes to hold leases which expire unless renewed.
+
+    Methods raise LeaseBackendError when the backend is unavailable.
+    """
+
+    @abstractmethod
+    async def acquire(self, name: str, owner: str, seconds: float) -> bool:
+        """Acquires or renews the lease for seconds, returns False when another owner holds it."""
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def release(self, name: str, owner: str) -> None:
+        """Releases the lease only when the owner holds it."""
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def list_owner(self, prefix: str) -> list[str]:
+        """Lists owners of leases not expired whose name starts with the prefix."""
+        raise NotImplementedError  # pragma: no cover
+
+    async def close(self) -> None:
+        """Closes connection to the backend if any."""
@@ -0,0 +1,101 @@
+"""File lease backend."""
+
+from __future__ import annotations
+
+# Reason: Only POSIX supports, this module is imported only when file backend is configured.
+import fcntl
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import quote
+from urllib.parse import unquote
+
+from anyio import to_thread
+
+from showroompodcast.exceptions import LeaseBackendError
+from showroompodcast.shard import LeaseBackend
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class FileLeaseBackend(LeaseBackend):
+    """Leases as files in directory on shared volume, e.g. NFS, operations are serialized by advisory lock.
+
+    Expiration is judged by wall clock, so clocks of nodes should be synchronized, e.g. by NTP.
+    """
+
+    NAME_LOCK = ".lock"
+    SUFFIX = ".json"
+
+    def __init__(self, directory: str) -> None:
+        self.path_directory = Path(directory)
+
+    async def acquire(self, name: str, owner: str, seconds: float) -> bool:
+        return await to_thread.run_sync(self.acquire_sync, name, owner, seconds)
+
+    async def release(self, name: str, owner: str) -> None:
+        await to_thread.run_sync(self.release_sync, name, owner)
+
+    async def list_owner(self, prefix: str) -> list[str]:
+        return await to_thread.run_sync(self.list_owner_sync, prefix)
+
+    def acquire_sync(self, name: str, owner: str, seconds: float) -> bool:
+        """Renews own lease, or takes over lease which expired."""
+        with self.lock():
+            now = time.time()
+            lease = self.read(self.create_path(name))
+            if lease is not None and lease[0] != owner and lease[1] > now:
+                return False
+            path = self.create_path(name)
+            path_temporary = path.with_suffix(".tmp")
+            path_temporary.write_text(json.dumps({"owner": owner, "expires": now + seconds}), encoding="utf-8")
+            path_temporary.replace(path)
+            return True
+
+    def release_sync(self, name: str, owner: str) -> None:
+        with self.lock():
+            path = self.create_path(name)
+            lease = self.read(path)
+            if lease is not None and lease[0] == owner:
+                path.unlink()
+
+    def list_owner_sync(self, prefix: str) -> list[str]:
+        with self.lock():
+            now = time.time()
+            return [
+                lease[0]
+                for path in sorted(self.path_directory.glob(f"*{self.SUFFIX}"))
+                if unquote(path.name.removesuffix(self.SUFFIX)).startswith(prefix)
+                and (lease := self.read(path)) is not None
+                and lease[1] > now
+            ]
+
+    def create_path(self, name: str) -> Path:
+        return self.path_directory / f"{quote(name, safe='')}{self.SUFFIX}"
+
+    @staticmethod
+    def read(path: Path) -> tuple[str, float] | None:
+        """Returns owner and expiration time, or None when no lease or it's broken."""
+        try:
+            dictionary = json.loads(path.read_text(encoding="utf-8"))
+            return str(dictionary["owner"]), float(dictionary["expires"])
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
+
+    @contextmanager
+    def lock(self) -> Generator[None, None, None]:
+        """Serializes operations across nodes by exclusive lock on lock file."""
+        try:
+            self.path_directory.mkdir(parents=True, exist_ok=True)
+            with (self.path_directory / self.NAME_LOCK).open("a") as file:
+                fcntl.flock(file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+        except OSError as error:
+            msg = f"Failed to access lease directory. {self.path_directory=}"
+            raise LeaseBackendError(msg) from error
@@ -0,0 +1,34 @@
+"""Consistent hash ring."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+
+
+def hash_key(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring which maps rooms to nodes.
+
+    When a node joins or leaves, only rooms of that node move.
+    Each node has virtual nodes so that rooms are distributed evenly.
+    """
+
+    NUMBER_VIRTUAL_NODE = 64
+
+    def __init__(self, list_node: list[str]) -> None:
+        if not list_node:
+            msg = "Hash ring requires at least one node."
+            raise ValueError(msg)
+        self.list_point = sorted(
+            (hash_key(f"{node}#{index}"), node) for node in list_node for index in range(self.NUMBER_VIRTUAL_NODE)
+        )
+        self.list_hash = [point[0] for point in self.list_point]
+
+    def find(self, room_id: int) -> str:
+        """Finds the node in charge of the room."""
+        index = bisect.bisect(self.list_hash, hash_key(str(room_id))) % len(self.list_point)
+        return self.list_point[index][1]
@@ -0,0 +1,34 @@
+"""Lease backend factory."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from showroompodcast.shard.redis_lease_backend import RedisLeaseBackend
+
+if TYPE_CHECKING:
+    from showroompodcast.config import ShardConfig
+    from showroompodcast.shard import LeaseBackend
+
+BACKEND_NONE = "none"
+BACKEND_FILE = "file"
+BACKEND_REDIS = "redis"
+
+
+class LeaseBackendFactory:
+    """Lease backend factory."""
+
+    @staticmethod
+    def create(shard_config: ShardConfig) -> LeaseBackend | None:
+        """Returns None when sharding is disabled."""
+        if shard_config.backend == BACKEND_NONE:
+            return None
+        if shard_config.backend == BACKEND_FILE:
+            # Reason: fcntl is available only on POSIX.
+            from showroompodcast.shard.file_lease_backend import FileLeaseBackend  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
+            return FileLeaseBackend(shard_config.directory)
+        if shard_config.backend == BACKEND_REDIS:
+            return RedisLeaseBackend(shard_config.redis_url)
+        msg = f"Unsupported lease backend. {shard_config.backend=}"
+        raise ValueError(msg)
@@ -0,0 +1,148 @@
+"""Redis lease backend."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any
+
+from yarl import URL
+
+from showroompodcast.exceptions import LeaseBackendError
+from showroompodcast.shard import LeaseBackend
+
+PORT_DEFAULT = 6379
+
+
+class RespConnection:
+    """Minimal client of RESP, the protocol of Redis, not to depend on client library.
+
+    Commands are sent one by one since leases are renewed only every few seconds.
+    """
+
+    def __init__(self, redis_url: str) -> None:
+        url = URL(redis_url)
+        self.host = url.host or "127.0.0.1"
+        self.port = url.port or PORT_DEFAULT
+        self.database = int(url.path.lstrip("/") or 0)
+        self.password = url.password
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        # Created in event loop since asyncio.Lock binds event loop at creation in Python 3.9.
+        self.lock: asyncio.Lock | None = None
+
+    async def execute(self, *args: str | float) -> Any:  # noqa: ANN401
+        """Executes command, reconnects next time when connection is broken."""
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            try:
+                return await self.execute_on_connection(*args)
+            except (OSError, asyncio.IncompleteReadError) as error:
+                await self.close()
+                msg = f"Failed to execute command on Redis. {self.host=}, {self.port=}"
+                raise LeaseBackendError(msg) from error
+
+    async def execute_on_connection(self, *args: str | float) -> Any:  # noqa: ANN401
+        """Connects, authenticates and selects database lazily at first command."""
+        if self.reader is None or self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            if self.password is not None:
+                await self.send_and_receive("AUTH", self.password)
+            if self.database:
+                await self.send_and_receive("SELECT", self.database)
+        return await self.send_and_receive(*args)
+
+    async def send_and_receive(self, *args: str | float) -> Any:  # noqa: ANN401
+        assert self.reader is not None  # noqa: S101
+        assert self.writer is not None  # noqa: S101
+        self.writer.write(self.encode(*args))
+        await self.writer.drain()
+        return await self.read_reply(self.reader)
+
+    @staticmethod
+    def encode(*args: str | float) -> bytes:
+        list_bytes = [str(argument).encode() for argument in args]
+        return f"*{len(list_bytes)}\r\n".encode() + b"".join(
+            b"$%d\r\n%s\r\n" % (len(argument), argument) for argument in list_bytes
+        )
+
+    @classmethod
+    async def read_reply(cls, reader: asyncio.StreamReader) -> Any:  # noqa: ANN401
+        """Reads reply, bulk strings are decoded as UTF-8."""
+        line = (await reader.readuntil(b"\r\n"))[:-2]
+        prefix, body = line[:1], line[1:].decode()
+        if prefix == b"+":
+            return body
+        if prefix == b"-":
+            msg = f"Redis replied error: {body}"
+            raise LeaseBackendError(msg)
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            return None if length < 0 else (await reader.readexactly(length + 2))[:-2].decode()
+        if prefix == b"*":
+            length = int(body)
+            return None if length < 0 else [await cls.read_reply(reader) for _ in range(length)]
+        msg = f"Unexpected reply from Redis: {line!r}"
+        raise LeaseBackendError(msg)
+
+    async def close(self) -> None:
+        """Next command reconnects."""
+        if self.writer is not None:
+            self.writer.close()
+            # Connection may be already broken.
+            with contextlib.suppress(OSError):
+                await self.writer.wait_closed()
+        self.reader = None
+        self.writer = None
+
+
+class RedisLeaseBackend(LeaseBackend):
+    """Leases as keys with expiration in Redis compatible server, e.g. Redis, Valkey, KeyDB.
+
+    Compare-and-set is done by Lua script atomically, expiration is judged by the clock of the server.
+    """
+
+    SCRIPT_ACQUIRE = (
+        "local owner = redis.call('GET', KEYS[1]) "
+        "if owner == false or owner == ARGV[1] then "
+        "redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2]) return 1 end "
+        "return 0"
+    )
+    SCRIPT_RELEASE = "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end return 0"
+    COUNT_SCAN = 1000
+
+    def __init__(self, redis_url: str) -> None:
+        self.connection = RespConnection(redis_url)
+
+    async def acquire(self, name: str, owner: str, seconds: float) -> bool:
+        milliseconds = max(1, int(seconds * 1000))
+        return bool(await self.connection.execute("EVAL", self.SCRIPT_ACQUIRE, 1, name, owner, milliseconds))
+
+    async def release(self, name: str, owner: str) -> None:
+        await self.connection.execute("EVAL", self.SCRIPT_RELEASE, 1, name, owner)
+
+    async def list_owner(self, prefix: str) -> list[str]:
+        list_key: list[str] = []
+        cursor = "0"
+        while True:
+            cursor, keys = await self.connection.execute(
+                "SCAN",
+                cursor,
+                "MATCH",
+                f"{prefix}*",
+                "COUNT",
+                self.COUNT_SCAN,
+            )
+            list_key.extend(keys)
+            if cursor == "0":
+                break
+        if not list_key:
+            return []
+        # Keys may expire between SCAN and MGET.
+        return [owner for owner in await self.connection.execute("MGET", *sorted(list_key)) if owner is not None]
+
+    async def close(self) -> None:
+        await self.connection.close()
@@ -0,0 +1,119 @@
+"""Shard coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from showroompodcast.exceptions import LeaseBackendError
+from showroompodcast.shard.hash_ring import HashRing
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from showroompodcast.config import ShardConfig
+    from showroompodcast.shard import LeaseBackend
+
+
+# Reason: Holds configuration of shard and state of leases together. pylint: disable-next=too-many-instance-attributes
+class ShardCoordinator:
+    """Splits rooms across nodes by consistent hashing over nodes alive, and guards each recording by lease.
+
+    Each node keeps node lease alive by heartbeat, nodes whose lease expired are regarded as dead,
+    then their rooms move to other nodes.
+    Since nodes may disagree on nodes alive for a moment, room lease ensures that exactly one node records each live.
+    """
+
+    PREFIX_NODE = "node/"
+    PREFIX_ROOM = "room/"
+
+    def __init__(self, lease_backend: LeaseBackend, shard_config: ShardConfig, list_room_id: list[int]) -> None:
+        self.lease_backend = lease_backend
+        self.node_id = shard_config.node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.prefix = shard_config.prefix
+        self.lease_seconds = shard_config.lease_seconds
+        self.heartbeat_interval = shard_config.heartbeat_interval
+        self.list_room_id = list_room_id
+        self.list_room_id_owned: list[int] = []
+        self.set_room_id_leased: set[int] = set()
+        self.set_task_release: set[asyncio.Task[None]] = set()
+        self.logger = getLogger(__name__)
+
+    async def run(self, on_rooms_changed: Callable[[list[int]], None]) -> None:
+        """Calls on_rooms_changed with rooms this node should poll every heartbeat."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            on_rooms_changed(await self.heartbeat())
+
+    async def heartbeat(self) -> list[int]:
+        """Renews leases, then returns rooms this node should poll.
+
+        Keeps previous rooms when the backend is unavailable, recordings are still guarded by room lease.
+        """
+        try:
+            await self.lease_backend.acquire(self.name_node(), self.node_id, self.lease_seconds)
+            await self.renew_rooms()
+            list_node = await self.lease_backend.list_owner(f"{self.prefix}{self.PREFIX_NODE}")
+        except LeaseBackendError as error:
+            self.logger.warning("Failed to heartbeat, keeps current rooms.", exc_info=error)
+            return self.list_room_id_owned
+        hash_ring = HashRing(sorted({*list_node, self.node_id}))
+        list_room_id_owned = [room_id for room_id in self.list_room_id if hash_ring.find(room_id) == self.node_id]
+        if list_room_id_owned != self.list_room_id_owned:
+            self.logger.info("Rooms rebalanced. nodes: %s, rooms: %d", list_node, len(list_room_id_owned))
+        self.list_room_id_owned = list_room_id_owned
+        return list_room_id_owned
+
+    async def renew_rooms(self) -> None:
+        for room_id in sorted(self.set_room_id_leased):
+            if not await self.lease_backend.acquire(self.name_room(room_id), self.node_id, self.lease_seconds):
+                # Another node took over while this node couldn't renew, e.g. network partition.
+                self.logger.warning("Lost lease of recording. room_id: %d", room_id)
+                self.set_room_id_leased.discard(room_id)
+
+    async def acquire_room(self, room_id: int) -> bool:
+        """Returns True when this node may record the room, False when another node records or it's unknown."""
+        try:
+            is_acquired = await self.lease_backend.acquire(self.name_room(room_id), self.node_id, self.lease_seconds)
+        except LeaseBackendError as error:
+            self.logger.warning("Failed to acquire lease of recording. room_id: %d", room_id, exc_info=error)
+            return False
+        if is_acquired:
+            self.set_room_id_leased.add(room_id)
+        else:
+            self.logger.debug("Another node is recording. room_id: %d", room_id)
+        return is_acquired
+
+    def release_room_later(self, room_id: int, *_args: object) -> None:
+        """Releases room lease in background, arguments are the same as done callback of future."""
+        task = asyncio.ensure_future(self.release_room(room_id))
+        self.set_task_release.add(task)
+        task.add_done_callback(self.set_task_release.discard)
+
+    async def release_room(self, room_id: int) -> None:
+        self.set_room_id_leased.discard(room_id)
+        try:
+            await self.lease_backend.release(self.name_room(room_id), self.node_id)
+        except LeaseBackendError as error:
+            # The lease expires anyway.
+            self.logger.warning("Failed to release lease of recording. room_id: %d", room_id, exc_info=error)
+
+    async def close(self) -> None:
+        """Leaves cluster so that other nodes take over rooms without waiting for expiration."""
+        try:
+            for room_id in sorted(self.set_room_id_leased):
+                await self.release_room(room_id)
+            await self.lease_backend.release(self.name_node(), self.node_id)
+        except LeaseBackendError as error:
+            self.logger.warning("Failed to leave cluster.", exc_info=error)
+        finally:
+            await self.lease_backend.close()
+
+    def name_node(self) -> str:
+        return f"{self.prefix}{self.PREFIX_NODE}{self.node_id}"
+
+    def name_room(self, room_id: int) -> str:
+        return f"{self.prefix}{self.PREFIX_ROOM}{room_id}"
@@ -1,21 +1,51 @@
 """SHOWROOM archiver."""
 
+from __future__ import annotations
+
 import asyncio
 import os
-from collections.abc import AsyncIterator
+import time
+from functools import partial
 from logging import getLogger
-from threading import Lock
+from typing import TYPE_CHECKING
 from typing import Generic
 from typing import TypeVar
 
+from anyio import Path
 from asyncffmpeg import FFmpegCoroutineFactory
 from asyncffmpeg.exceptions import FFmpegProcessError
-from asyncffmpeg.ffmpeg_coroutine import FFmpegCoroutine
-from asyncffmpeg.ffmpegprocess.interface import FFmpegProcess
 
+from showroompodcast.archive_concatenator import ArchiveConcatenator
+from showroompodcast.config import ArchiverConfig
 from showroompodcast.exceptions import MaxRetriesExceededError
-from showroompodcast.raise_if import raise_if
+from showroompodcast.exceptions import StateStoreError
+from showroompodcast.live_end_detector import run_until_stop_requested
+from showroompodcast.metrics import ARCHIVE_RETRIES
+from showroompodcast.metrics import BYTES_WRITTEN
+from showroompodcast.metrics import FIRST_BYTE_LATENCY
+from showroompodcast.output_format import OutputFormat
+from showroompodcast.resource_limiter import ResourceLimiter
+from showroompodcast.retry_policy import FILE_EXISTS
+from showroompodcast.retry_policy import Failure
+from showroompodcast.retry_policy import RetryPolicy
+from showroompodcast.retry_policy import check_on_live
+from showroompodcast.retry_policy import classify
 from showroompodcast.showroom_stream_spec_factory import ShowroomStreamSpecFactory
+from showroompodcast.structured_logging import CONTEXT_RECORDING
+from showroompodcast.structured_logging import SAMPLED
+from showroompodcast.structured_logging import log_context
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+
+    from asyncffmpeg.ffmpeg_coroutine import FFmpegCoroutine
+    from asyncffmpeg.ffmpegprocess.interface import FFmpegProcess
+
+    from showroompodcast.live_end_detector import StopEvent
+    from showroompodcast.recording_indexer import RecordingIndexer
+    from showroompodcast.state_store import StateStore
 
 TIME_TO_FORCE_TERMINATION = 8
 
@@ -24,67 +54,333 @@ T = TypeVar("T")
 
 
 class AsyncRetry(Generic[T]):
-    """Asynchronous retry."""
+    """Asynchronous retry.
+
+    Each item which the asynchronous generator yields is a failed attempt.
+    When before_retry is set, it's awaited with the item before next attempt, e.g. to back off.
+    """
 
-    def __init__(self, asynchronous_generator: AsyncIterator[T], count: int) -> None:
+    def __init__(
+        self,
+        asynchronous_generator: AsyncIterator[T],
+        count: int,
+        *,
+        before_retry: Callable[[T], Awaitable[None]] | None = None,
+    ) -> None:
         self.attempts = 0
         self.asynchronous_generator = asynchronous_generator
         self.count = count
+        self.before_retry = before_retry
 
-    def __aiter__(self) -> "AsyncRetry[T]":
+    def __aiter__(self) -> AsyncRetry[T]:
         return self
 
     async def __anext__(self) -> T:
         if self.attempts >= self.count:
             raise MaxRetriesExceededError
+        if self.attempts > 0:
+            ARCHIVE_RETRIES.inc()
         value = await self.asynchronous_generator.__anext__()
         self.attempts += 1
+        if self.before_retry is not None and self.attempts < self.count:
+            await self.before_retry(value)
         return value
 
 
 class ShowroomArchiver:
     """SHOWROOM archiver."""
 
-    RETRY = 5
+    def __init__(
+        self,
+        *,
+        time_to_force_termination: int = TIME_TO_FORCE_TERMINATION,
+        archiver_config: ArchiverConfig | None = None,
+        state_store: StateStore | None = None,
+        recording_indexer: RecordingIndexer | None = None,
+    ) -> None:
+        """When state_store is set, FFmpeg processes recording are stored to be reconciled after restart.
 
-    def __init__(self, *, time_to_force_termination: int = TIME_TO_FORCE_TERMINATION) -> None:
+        When recording_indexer is set, archives of the room are indexed after archiving.
+        """
         self.ffmpeg_coroutine = FFmpegCoroutineFactory.create(time_to_force_termination=time_to_force_termination)
+        self.archiver_config = archiver_config or ArchiverConfig()
+        self.state_store = state_store
+        self.recording_indexer = recording_indexer
+        # To validate output format before archiving.
+        OutputFormat.create(self.archiver_config)
         self.logger = getLogger(__name__)
 
-    async def archive(self, room_id: int, lock: Lock) -> None:
-        """Archives SHOWROOM program."""
-        self.logger.debug("Start archive")
-        self.logger.debug("room_id: %d", room_id)
-        archive_attempter = ArchiveAttempter(self.ffmpeg_coroutine, room_id)
+    async def archive(
+        self,
+        room_id: int,
+        time_detected: float | None = None,
+        streaming_url: str | None = None,
+        stop_event: StopEvent | None = None,
+        quality: int = 0,
+    ) -> None:
+        """Archives SHOWROOM program.
+
+        The time_detected is the epoch time when parent process detected live, to measure latency.
+        The streaming_url resolved in advance is used for the first attempt.
+        When stop_event is set by parent process, FFmpeg quits gracefully and retries stop.
+        The quality is kbps admitted, retries resolve streaming URL not exceeding it, 0 means unlimited.
+        """
+        with log_context(room_id=room_id):
+            self.logger.debug("Start archive")
+            if time_detected is not None:
+                self.logger.info(
+                    "Latency from live detected to worker start: %.3f seconds. room_id: %d",
+                    time.time() - time_detected,
+                    room_id,
+                )
+            archive_attempter = ArchiveAttempter(
+                self.ffmpeg_coroutine,
+                room_id,
+                time_detected,
+                streaming_url,
+                archiver_config=self.archiver_config,
+                state_store=self.state_store,
+                quality=quality,
+            )
+            await self.retry(archive_attempter, stop_event)
+
+    async def retry(self, archive_attempter: ArchiveAttempter, stop_event: StopEvent | None = None) -> None:
+        """Retries until archiving completes, then concatenates parts even if retries are exhausted or stopped."""
+        retry_config = self.archiver_config.retry
+        retry_policy = RetryPolicy(
+            retry_config,
+            partial(check_on_live, archive_attempter.room_id) if retry_config.recheck_live else None,
+            immediate_first=archive_attempter.gapless_resume,
+        )
+        async_retry = AsyncRetry(archive_attempter, retry_config.maximum_attempts, before_retry=retry_policy.wait)
         try:
-            async for _ in AsyncRetry(archive_attempter, self.RETRY):
-                pass
-        finally:
-            lock.release()
+            if await run_until_stop_requested(self.attempt(async_retry), stop_event):
+                self.logger.info("Stopped since live ended. room_id: %d", archive_attempter.room_id)
+        except MaxRetriesExceededError:
+            await self.finish(archive_attempter)
+            raise
+        await self.finish(archive_attempter)
+
+    @staticmethod
+    async def attempt(async_retry: AsyncRetry[Failure]) -> None:
+        async for _ in async_retry:
+            pass
 
+    async def finish(self, archive_attempter: ArchiveAttempter) -> None:
+        await archive_attempter.concatenate()
+        if self.recording_indexer is not None:
+            await self.recording_indexer.index(archive_attempter.room_id)
 
+
+# Reason: State across attempts of one live. pylint: disable-next=too-many-instance-attributes
 class ArchiveAttempter:
     """Archive attmpter."""
 
-    def __init__(self, ffmpeg_coroutine: FFmpegCoroutine[FFmpegProcess], room_id: int) -> None:
+    # Reason: Optional collaborators are keyword-only and have defaults.
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        ffmpeg_coroutine: FFmpegCoroutine[FFmpegProcess],
+        room_id: int,
+        time_detected: float | None = None,
+        streaming_url: str | None = None,
+        *,
+        archiver_config: ArchiverConfig | None = None,
+        state_store: StateStore | None = None,
+        quality: int = 0,
+    ) -> None:
+        archiver_config = archiver_config or ArchiverConfig()
         self.ffmpeg_coroutine = ffmpeg_coroutine
         self.room_id = room_id
+        # Only the first attempt measures latency and uses streaming URL resolved in advance,
+        # since the URL may be stale when the attempt failed.
+        self.time_detected = time_detected
+        self.streaming_url = streaming_url
+        self.quality = quality
+        self.output_format = OutputFormat.create(archiver_config)
+        self.stream_spec_factory = ShowroomStreamSpecFactory(room_id, output_format=self.output_format)
+        self.task_watch_first_byte: asyncio.Task[float | None] | None = None
+        self.task_report_bytes_written: asyncio.Task[None] | None = None
+        # When gapless resume, retries write into parts of the archive of the first attempt without waiting.
+        # Segments are not concatenated since each part has its own index.
+        self.gapless_resume = archiver_config.gapless_resume and self.output_format.is_concatenatable
+        self.archive_concatenator: ArchiveConcatenator | None = None
+        self.state_store = state_store
+        # PID of FFmpeg process of current attempt stored in state store.
+        self.pid_recording: int | None = None
         self.logger = getLogger(__name__)
 
-    def __aiter__(self) -> "ArchiveAttempter":
+    def __aiter__(self) -> ArchiveAttempter:
         return self
 
-    async def __anext__(self) -> None:
+    async def __anext__(self) -> Failure:
+        """Attempts, returns failure to retry, or stops when FFmpeg finished."""
+        self.stream_spec_factory = ShowroomStreamSpecFactory(
+            self.room_id,
+            self.streaming_url,
+            part_file_name=None
+            if self.archive_concatenator is None
+            else self.archive_concatenator.create_part_file_name(),
+            output_format=self.output_format,
+            quality=self.quality,
+        )
+        self.streaming_url = None
+        time_start = time.monotonic()
         try:
-            await self.ffmpeg_coroutine.execute(ShowroomStreamSpecFactory(self.room_id).create)
+            await self.ffmpeg_coroutine.execute(self.stream_spec_factory.create, after_start=self.after_start)
         except FFmpegProcessError as error:
-            raise_if(condition="404 Not Found" not in str(error))
+            error_class = classify(error)
+            if error_class is None:
+                raise
+            self.logger.warning("FFmpeg failed, retry. error: %s", error_class.name, exc_info=error)
         except (KeyboardInterrupt, asyncio.CancelledError):
             self.logger.debug("SIGINT for PID=%d", os.getpid())
             self.logger.debug("FFmpeg run cancelled.")
             raise
         except FileExistsError as error:
             self.logger.debug(str(error), exc_info=error)
+            error_class = FILE_EXISTS
         else:
             raise StopAsyncIteration
-        await asyncio.sleep(1)
+        finally:
+            if self.task_watch_first_byte is not None:
+                self.task_watch_first_byte.cancel()
+            if self.task_report_bytes_written is not None:
+                self.task_report_bytes_written.cancel()
+            self.start_tracking_parts()
+            await self.unregister_recording()
+        return Failure(error_class, time.monotonic() - time_start)
+
+    def start_tracking_parts(self) -> None:
+        """Tracks the archive of the first attempt which wrote into file, to resume into its parts."""
+        if self.gapless_resume and self.archive_concatenator is None and self.stream_spec_factory.out_file_name:
+            self.archive_concatenator = ArchiveConcatenator(self.stream_spec_factory.out_file_name)
+
+    async def concatenate(self) -> None:
+        """Concatenates parts into one archive when resumed."""
+        if self.archive_concatenator is not None:
+            await self.archive_concatenator.concatenate()
+
+    async def after_start(self, ffmpeg_process: FFmpegProcess) -> None:
+        """Starts to watch output file without blocking FFmpeg process from being awaited."""
+        ResourceLimiter.limit_ffmpeg(ffmpeg_process.popen.pid)
+        if self.stream_spec_factory.out_file_name is None:
+            return
+        # To add recording to logs of this attempt, including tasks created below.
+        CONTEXT_RECORDING.set(self.stream_spec_factory.out_file_name)
+        await self.register_recording(ffmpeg_process.popen.pid, self.stream_spec_factory.out_file_name)
+        bytes_written_reporter = BytesWrittenReporter(
+            self.room_id,
+            self.stream_spec_factory.out_file_name,
+            on_written=None if self.state_store is None else self.touch_recording,
+        )
+        self.task_report_bytes_written = asyncio.create_task(bytes_written_reporter.report())
+        if self.time_detected is None:
+            return
+        first_byte_watcher = FirstByteWatcher(self.room_id, self.time_detected)
+        self.task_watch_first_byte = asyncio.create_task(
+            first_byte_watcher.watch(self.output_format.find_first_file_name(self.stream_spec_factory.out_file_name)),
+        )
+        self.time_detected = None
+
+    async def register_recording(self, pid: int, out_file_name: str) -> None:
+        """Failure of state store doesn't stop archiving, only the reconciliation after restart gets inaccurate."""
+        if self.state_store is None:
+            return
+        try:
+            await self.state_store.register(self.room_id, pid, out_file_name)
+        except StateStoreError:
+            self.logger.warning("Failed to register recording.", exc_info=True)
+            return
+        self.pid_recording = pid
+
+    async def touch_recording(self) -> None:
+        if self.state_store is None or self.pid_recording is None:
+            return
+        try:
+            await self.state_store.touch(self.room_id, self.pid_recording)
+        except StateStoreError:
+            self.logger.warning("Failed to update recording.", exc_info=True, extra=SAMPLED)
+
+    async def unregister_recording(self) -> None:
+        """Unregisters after each attempt, only when FFmpeg of the attempt has been registered."""
+        if self.state_store is None or self.pid_recording is None:
+            return
+        pid_recording, self.pid_recording = self.pid_recording, None
+        try:
+            await self.state_store.unregister(self.room_id, pid_recording)
+        except StateStoreError:
+            self.logger.warning("Failed to unregister recording.", exc_info=True)
+
+
+class FirstByteWatcher:
+    """Logs latency from live detected to the first byte written into output file."""
+
+    INTERVAL = 0.1
+    TIMEOUT = 60.0
+
+    def __init__(self, room_id: int, time_detected: float) -> None:
+        self.room_id = room_id
+        self.time_detected = time_detected
+        self.logger = getLogger(__name__)
+
+    async def watch(self, out_file_name: str) -> float | None:
+        """Returns latency in seconds, or None when timed out."""
+        path = Path(out_file_name)
+        time_timeout = time.time() + self.TIMEOUT
+        while time.time() < time_timeout:
+            if await path.exists() and (await path.stat()).st_size > 0:
+                latency = time.time() - self.time_detected
+                FIRST_BYTE_LATENCY.observe(latency)
+                self.logger.info(
+                    "Latency from live detected to first byte: %.3f seconds. room_id: %d",
+                    latency,
+                    self.room_id,
+                )
+                return latency
+            await asyncio.sleep(self.INTERVAL)
+        self.logger.warning("No byte written within %.1f seconds. room_id: %d", self.TIMEOUT, self.room_id)
+        return None
+
+
+class BytesWrittenReporter:
+    """Reports bytes written by FFmpeg into files of archive as metrics periodically.
+
+    Files of archive are the out file and files starting with its stem, e.g. segments.
+    """
+
+    INTERVAL = 5.0
+
+    def __init__(
+        self,
+        room_id: int,
+        out_file_name: str,
+        *,
+        on_written: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        """The on_written is called each time the files grew, i.e. the live is still on."""
+        self.room_id = room_id
+        self.path = Path(out_file_name)
+        self.on_written = on_written
+        self.bytes_reported = 0
+
+    async def report(self) -> None:
+        """Reports until cancelled, files existing before start are not counted."""
+        self.bytes_reported = await self.measure()
+        try:
+            while True:
+                await asyncio.sleep(self.INTERVAL)
+                await self.report_increase()
+        except asyncio.CancelledError:
+            await self.report_increase()
+            raise
+
+    async def report_increase(self) -> None:
+        bytes_written = await self.measure()
+        if bytes_written > self.bytes_reported:
+            BYTES_WRITTEN.inc(str(self.room_id), amount=bytes_written - self.bytes_reported)
+            self.bytes_reported = bytes_written
+            if self.on_written is not None:
+                await self.on_written()
+
+    async def measure(self) -> int:
+        return sum([(await path.stat()).st_size async for path in self.path.parent.glob(f"{self.path.stem}*")])
@@ -9,11 +9,17 @@ class ShowroomDatetime:
     """Datetime for SHOWROOM specification."""
 
     FORMAT_CODE = "%Y_%m_%d-%H_%M_%S"
+    JST = timezone(timedelta(hours=+9), "JST")
 
     @staticmethod
     def encode(argument_datetime: datetime) -> str:
         return argument_datetime.strftime(ShowroomDatetime.FORMAT_CODE)
 
+    @staticmethod
+    def decode(string: str) -> datetime:
+        """Decodes string encoded by encode() from time in JST."""
+        return datetime.strptime(string, ShowroomDatetime.FORMAT_CODE).replace(tzinfo=ShowroomDatetime.JST)
+
     @staticmethod
     def now_jst() -> datetime:
-        return datetime.now(tz=timezone(timedelta(hours=+9), "JST"))
+        return datetime.now(tz=ShowroomDatetime.JST)
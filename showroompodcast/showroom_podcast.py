@@ -4,21 +4,59 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from functools import partial
 from typing import TYPE_CHECKING
 
 from asynccpu import ProcessTaskPoolExecutor
 
 from showroompodcast import CONFIG
+from showroompodcast.admission_controller import AdmissionController
+from showroompodcast.api import ShowroomApi
 from showroompodcast.archiving_task_manager import ArchivingTaskManager
+from showroompodcast.background_tasks import BackgroundTasks
+from showroompodcast.config_watcher import ConfigWatcher
+from showroompodcast.hls.hls_archiver import HlsArchiver
+from showroompodcast.live_end_detector import LiveEndDetector
+from showroompodcast.live_end_detector import StopPipe
+from showroompodcast.metrics import REGISTRY
+from showroompodcast.metrics_server import MetricsServer
+from showroompodcast.orphan_reconciler import OrphanReconciler
+from showroompodcast.podcast.episode_index import EpisodeIndex
+from showroompodcast.podcast.podcast_publisher import PodcastPublisher
+from showroompodcast.polling_engine import PollingEngine
+from showroompodcast.process_prewarmer import initialize_worker
+from showroompodcast.recording_index import RecordingIndex
+from showroompodcast.recording_indexer import RecordingIndexer
+from showroompodcast.resource_limiter import ResourceLimiter
+from showroompodcast.shard.lease_backend_factory import LeaseBackendFactory
+from showroompodcast.shard.shard_coordinator import ShardCoordinator
 from showroompodcast.showroom_archiver import TIME_TO_FORCE_TERMINATION
 from showroompodcast.showroom_archiver import ShowroomArchiver
 from showroompodcast.showroom_poller import ShowroomPoller
+from showroompodcast.sink.local_sink import LocalSink
+from showroompodcast.sink.output_uploader import OutputUploader
+from showroompodcast.sink.sink_factory import BACKEND_LOCAL
+from showroompodcast.sink.sink_factory import SinkFactory
 from showroompodcast.slack.slack_client import SlackNotification
+from showroompodcast.slack.slack_notifier import SlackNotifier
+from showroompodcast.state_store import StateStore
+from showroompodcast.structured_logging import StructuredLogging
+from showroompodcast.worker_pool import WorkerPool
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from multiprocessing.queues import Queue
     from pathlib import Path
 
+    from showroompodcast.config import Config
+    from showroompodcast.live_end_detector import StopEvent
+    from showroompodcast.metrics import MetricsUpdate
+    from showroompodcast.sink import Sink
 
+ENGINE_HLS = "hls"
+
+
+# Reason: Holds components configured at startup. pylint: disable-next=too-many-instance-attributes
 class ShowroomPodcast:
     """Main class."""
 
@@ -28,25 +66,179 @@ class ShowroomPodcast:
         path_to_configuration: Path | None = None,
         time_to_force_termination: int = TIME_TO_FORCE_TERMINATION,
     ) -> None:
-        logging.basicConfig(level=logging.DEBUG)
         # Reason: YAML Dataclass Config's issue.
         CONFIG.load(path_to_configuration)  # type: ignore[arg-type]
-        self.showroom_archiver = ShowroomArchiver(time_to_force_termination=time_to_force_termination)
-        self.archiving_task_manager = ArchivingTaskManager(CONFIG.list_room_id)
+        self.path_to_configuration = path_to_configuration or CONFIG.FILE_PATH
+        self.structured_logging = StructuredLogging(CONFIG.logging)
+        ShowroomApi.configure(CONFIG.http)
+        ResourceLimiter.configure(CONFIG.resource)
+        state_store = StateStore(CONFIG.state.path) if CONFIG.state.path else None
+        self.orphan_reconciler = None if state_store is None else OrphanReconciler(state_store, CONFIG.state.orphan)
+        self.recording_indexer = RecordingIndexer(RecordingIndex(CONFIG.index.path)) if CONFIG.index.path else None
+        if CONFIG.podcast.directory and (self.recording_indexer is None or CONFIG.sink.backend != BACKEND_LOCAL):
+            msg = "Podcast requires index and local sink."
+            raise ValueError(msg)
+        self.showroom_archiver = ShowroomArchiver(
+            time_to_force_termination=time_to_force_termination,
+            archiver_config=CONFIG.archiver,
+            state_store=state_store,
+            recording_indexer=self.recording_indexer,
+        )
+        self.archiving_task_manager = ArchivingTaskManager(CONFIG.list_room_id, CONFIG.polling)
+        lease_backend = LeaseBackendFactory.create(CONFIG.shard)
+        self.shard_coordinator = (
+            None if lease_backend is None else ShardCoordinator(lease_backend, CONFIG.shard, CONFIG.list_room_id)
+        )
         self.logger = logging.getLogger(__name__)
 
     def run(self) -> None:
         """Runs."""
+        self.structured_logging.start()
+        ResourceLimiter.set_up_cgroup()
         try:
             asyncio.run(self.archive_repeatedly())
         except Exception as error:
             self.logger.exception("Unexpected error")
-            if CONFIG.slack.bot_token is not None and CONFIG.slack.channel is not None:
+            if self.is_slack_configured():
                 SlackNotification(CONFIG.slack.bot_token, CONFIG.slack.channel).post_error(error)
             raise
+        finally:
+            ShowroomApi.close_session()
+            self.structured_logging.stop()
 
     async def archive_repeatedly(self) -> None:
-        with ProcessTaskPoolExecutor(max_workers=CONFIG.number_process, cancel_tasks_when_shutdown=True) as executor:
-            showroom_poller = ShowroomPoller(self.showroom_archiver, executor)
-            while True:
-                await self.archiving_task_manager.poll_all_rooms(showroom_poller)
+        async with MetricsServer(CONFIG.metrics) as metrics_server:
+            await self.archive_repeatedly_in_worker(metrics_server.queue)
+
+    async def archive_repeatedly_in_worker(self, queue_metrics: Queue[MetricsUpdate] | None) -> None:
+        """Worker processes send metrics through the queue_metrics."""
+        async with ShowroomApi.create_client_session(limit=CONFIG.polling.number_concurrency) as session:
+            polling_engine = PollingEngine(
+                session,
+                number_concurrency=CONFIG.polling.number_concurrency,
+                requests_per_second=CONFIG.polling.requests_per_second,
+                streaming_url_time_to_live=CONFIG.polling.streaming_url_time_to_live,
+            )
+            create_stop_event = self.get_create_stop_event()
+            async with SinkFactory.create(CONFIG.sink) as sink:
+                if CONFIG.archiver.engine == ENGINE_HLS:
+                    # Recordings run in this process, so no worker process is spawned.
+                    await self.poll_rooms_repeatedly(None, polling_engine, sink, create_stop_event)
+                    return
+                create_executor = partial(
+                    ProcessTaskPoolExecutor,
+                    initializer=initialize_worker,
+                    initargs=(queue_metrics, self.structured_logging.queue, CONFIG.logging, CONFIG.resource),
+                    cancel_tasks_when_shutdown=True,
+                )
+                worker_pool = WorkerPool(
+                    create_executor,
+                    CONFIG.number_process,
+                    CONFIG.worker,
+                    prewarm=CONFIG.prewarm_process,
+                )
+                async with worker_pool:
+                    await self.poll_rooms_repeatedly(worker_pool, polling_engine, sink, create_stop_event)
+
+    @staticmethod
+    def get_create_stop_event() -> Callable[[], StopEvent] | None:
+        """Returns factory of events to stop archiving when live ended, or None when it's disabled."""
+        if CONFIG.polling.interval_recording <= 0:
+            return None
+        return asyncio.Event if CONFIG.archiver.engine == ENGINE_HLS else StopPipe
+
+    async def poll_rooms_repeatedly(
+        self,
+        worker_pool: WorkerPool | None,
+        polling_engine: PollingEngine,
+        sink: Sink,
+        create_stop_event: Callable[[], StopEvent] | None = None,
+    ) -> None:
+        """Polls rooms until cancelled, with background tasks which run alongside, e.g. uploading archives.
+
+        The worker_pool is None when archiving by HLS archiver in this process.
+        """
+        async with ShowroomApi.create_client_session(limit=CONFIG.http.pool_maxsize) as session_hls:
+            hls_archiver = (
+                HlsArchiver(
+                    session_hls,
+                    remux=CONFIG.archiver.remux,
+                    sink=sink,
+                    recording_indexer=self.recording_indexer,
+                    retry_config=CONFIG.archiver.retry,
+                )
+                if CONFIG.archiver.engine == ENGINE_HLS
+                else None
+            )
+            podcast_publisher = self.create_podcast_publisher()
+            admission_controller = AdmissionController(CONFIG.admission)
+            REGISTRY.add_collector(admission_controller.metrics)
+            showroom_poller = ShowroomPoller(
+                self.showroom_archiver,
+                worker_pool,
+                polling_engine,
+                hls_archiver=hls_archiver,
+                admission_controller=admission_controller,
+                shard_coordinator=self.shard_coordinator,
+                create_stop_event=create_stop_event,
+                podcast_publisher=podcast_publisher,
+            )
+            if self.orphan_reconciler is not None:
+                # To skip rooms already being recorded by FFmpeg processes left by previous run.
+                await self.orphan_reconciler.reconcile(showroom_poller.archiving_task_registry)
+            # Heartbeat stops before leases are released.
+            try:
+                async with BackgroundTasks() as background_tasks:
+                    background_tasks.start(admission_controller.run())
+                    if not isinstance(sink, LocalSink):
+                        background_tasks.start(OutputUploader(sink).run(showroom_poller.is_archiving))
+                    if create_stop_event is not None:
+                        registry = showroom_poller.archiving_task_registry
+                        background_tasks.start(LiveEndDetector(registry, polling_engine, CONFIG.polling).run())
+                    if worker_pool is not None:
+                        background_tasks.start(worker_pool.run())
+                    if self.is_slack_configured():
+                        background_tasks.start(SlackNotifier(CONFIG.slack).run())
+                    if CONFIG.watch_config_interval > 0:
+                        config_watcher = ConfigWatcher(self.path_to_configuration, CONFIG.watch_config_interval)
+                        background_tasks.start(config_watcher.watch(self.apply_config))
+                    if self.recording_indexer is not None:
+                        # To index archives written while this process was stopped,
+                        # publisher publishes them after indexing.
+                        background_tasks.start(
+                            self.recording_indexer.index()
+                            if podcast_publisher is None
+                            else podcast_publisher.run(showroom_poller.is_archiving),
+                        )
+                    await self.start_heartbeat(background_tasks)
+                    while True:
+                        await self.archiving_task_manager.poll_rooms(showroom_poller)
+            finally:
+                if self.shard_coordinator is not None:
+                    await self.shard_coordinator.close()
+
+    def create_podcast_publisher(self) -> PodcastPublisher | None:
+        if not CONFIG.podcast.directory or self.recording_indexer is None:
+            return None
+        # The episode index shares the database with the recording index.
+        return PodcastPublisher(self.recording_indexer, EpisodeIndex(CONFIG.index.path), CONFIG.podcast)
+
+    @staticmethod
+    def is_slack_configured() -> bool:
+        return CONFIG.slack is not None and CONFIG.slack.bot_token is not None and CONFIG.slack.channel is not None
+
+    async def start_heartbeat(self, background_tasks: BackgroundTasks) -> None:
+        """Polls only rooms of this node decided by the first heartbeat, then keeps rebalancing."""
+        if self.shard_coordinator is None:
+            return
+        self.archiving_task_manager.update_rooms(await self.shard_coordinator.heartbeat())
+        background_tasks.start(self.shard_coordinator.run(self.archiving_task_manager.update_rooms))
+
+    def apply_config(self, config: Config) -> None:
+        """Applies list of rooms modified, other configurations require restart."""
+        CONFIG.list_room_id = config.list_room_id
+        if self.shard_coordinator is None:
+            self.archiving_task_manager.update_rooms(config.list_room_id)
+        else:
+            # Rooms of this node are decided at next heartbeat.
+            self.shard_coordinator.list_room_id = config.list_room_id
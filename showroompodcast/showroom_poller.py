@@ -1,30 +1,146 @@
 """SHOWROOM poller."""
 
-from logging import getLogger
-from threading import Lock
+from __future__ import annotations
 
-from asynccpu import ProcessTaskPoolExecutor
+import asyncio
+import time
+from functools import partial
+from logging import getLogger
+from typing import TYPE_CHECKING
 
-from showroompodcast.api.polling import Polling
+from showroompodcast.admission_controller import AdmissionController
+from showroompodcast.archiving_task_registry import ArchivingTaskRegistry
+from showroompodcast.config import AdmissionConfig
 from showroompodcast.exceptions import TemporaryNetworkIssuesError
-from showroompodcast.showroom_archiver import ShowroomArchiver
+from showroompodcast.notification import EVENT_NETWORK_ISSUES
+from showroompodcast.notification import notify
+from showroompodcast.structured_logging import SAMPLED
+from showroompodcast.structured_logging import log_context
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
+    from showroompodcast.api.streaming_url import Stream
+    from showroompodcast.archiving_task_registry import FutureArchivingTask
+    from showroompodcast.hls.hls_archiver import HlsArchiver
+    from showroompodcast.live_end_detector import StopEvent
+    from showroompodcast.podcast.podcast_publisher import PodcastPublisher
+    from showroompodcast.polling_engine import PollingEngine
+    from showroompodcast.shard.shard_coordinator import ShardCoordinator
+    from showroompodcast.showroom_archiver import ShowroomArchiver
+    from showroompodcast.worker_pool import WorkerPool
 
+
+# Reason: Holds optional collaborators given by constructor. pylint: disable-next=too-many-instance-attributes
 class ShowroomPoller:
     """SHOWROOM poller."""
 
-    def __init__(self, showroom_archiver: ShowroomArchiver, executor: ProcessTaskPoolExecutor) -> None:
+    # Reason: Optional collaborators are keyword-only and have defaults.
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        showroom_archiver: ShowroomArchiver,
+        worker_pool: WorkerPool | None,
+        polling_engine: PollingEngine,
+        *,
+        hls_archiver: HlsArchiver | None = None,
+        admission_controller: AdmissionController | None = None,
+        shard_coordinator: ShardCoordinator | None = None,
+        create_stop_event: Callable[[], StopEvent] | None = None,
+        podcast_publisher: PodcastPublisher | None = None,
+    ) -> None:
+        """Archives in this process by hls_archiver if it's set, otherwise in worker process of worker_pool.
+
+        The worker_pool can be None when hls_archiver is set, not to spawn worker processes.
+        When shard_coordinator is set, archives only when this node acquired lease of the room.
+        When create_stop_event is set, each archiving watches its event to stop when live ended.
+        When podcast_publisher is set, the room is published as podcast after each archiving finishes.
+        """
         self.showroom_archiver = showroom_archiver
-        self.executor = executor
+        self.worker_pool = worker_pool
+        self.polling_engine = polling_engine
+        self.hls_archiver = hls_archiver
+        self.admission_controller = admission_controller or AdmissionController(AdmissionConfig())
+        self.shard_coordinator = shard_coordinator
+        self.create_stop_event = create_stop_event
+        self.podcast_publisher = podcast_publisher
+        self.archiving_task_registry = ArchivingTaskRegistry()
         self.logger = getLogger(__name__)
 
-    def poll(self, room_id: int, lock_archive_task: Lock) -> None:
-        """Polls."""
+    async def poll(self, room_id: int) -> bool | None:
+        """Polls and starts archiving when on live.
+
+        Returns whether on live, or None when it's unknown due to temporary network issues.
+        """
+        with log_context(room_id=room_id):
+            try:
+                is_on_live = await self.polling_engine.poll(room_id)
+            except TemporaryNetworkIssuesError as error:
+                self.logger.debug("Temporary network issues on polling.", exc_info=error, extra=SAMPLED)
+                notify(EVENT_NETWORK_ISSUES, "polling")
+                # Continue to poll.
+                return None
+            if is_on_live and not self.is_archiving(room_id):
+                await self.admit_and_start_archiving(room_id)
+            return is_on_live
+
+    async def admit_and_start_archiving(self, room_id: int) -> None:
+        """Skips room when admission controller or shard coordinator rejects it, releases both when archiving ends."""
+        time_detected = time.time()
+        stream = self.admission_controller.admit(room_id, await self.resolve_streams(room_id))
+        if stream is None:
+            return
+        if self.shard_coordinator is not None and not await self.shard_coordinator.acquire_room(room_id):
+            self.admission_controller.release(room_id)
+            return
         try:
-            is_on_live = Polling.poll(room_id)
+            stop_event = None if self.create_stop_event is None else self.create_stop_event()
+            task = self.start_archiving(room_id, time_detected, stream, stop_event)
+        except BaseException:
+            # Done callbacks can't release them since the task doesn't exist.
+            self.admission_controller.release(room_id)
+            if self.shard_coordinator is not None:
+                self.shard_coordinator.release_room_later(room_id)
+            raise
+        self.archiving_task_registry.register(room_id, task, stop_event)
+        task.add_done_callback(partial(self.admission_controller.release, room_id))
+        if self.shard_coordinator is not None:
+            task.add_done_callback(partial(self.shard_coordinator.release_room_later, room_id))
+        if self.podcast_publisher is not None:
+            task.add_done_callback(partial(self.podcast_publisher.request, room_id))
+
+    def start_archiving(
+        self,
+        room_id: int,
+        time_detected: float,
+        stream: Stream,
+        stop_event: StopEvent | None,
+    ) -> FutureArchivingTask:
+        """Archives the stream admitted, also retries don't exceed its quality."""
+        arguments = (room_id, time_detected, stream.url or None, stop_event, stream.quality)
+        if self.hls_archiver is not None:
+            return asyncio.ensure_future(self.hls_archiver.archive(*arguments))
+        # Reason: The worker_pool is None only when hls_archiver is set.
+        assert self.worker_pool is not None  # noqa: S101
+        return self.worker_pool.create_process_task(self.showroom_archiver.archive, *arguments)
+
+    async def resolve_streams(self, room_id: int) -> list[Stream]:
+        """Resolves streams in advance, worker resolves instead when this returns empty list."""
+        try:
+            return await self.polling_engine.resolve_streams(room_id)
         except TemporaryNetworkIssuesError as error:
-            self.logger.debug(str(error), exc_info=error)
-            # Continue to poll.
-            return
-        if is_on_live and lock_archive_task.acquire(blocking=False):
-            self.executor.create_process_task(self.showroom_archiver.archive, room_id, lock_archive_task)
+            self.logger.debug("Temporary network issues on resolving streams.", exc_info=error, extra=SAMPLED)
+            notify(EVENT_NETWORK_ISSUES, "resolving streams")
+            return []
+
+    async def discover(self) -> set[int] | None:
+        """Returns room IDs on live, or None when it's unknown due to temporary network issues."""
+        try:
+            return await self.polling_engine.discover()
+        except TemporaryNetworkIssuesError as error:
+            self.logger.debug("Temporary network issues on discovery.", exc_info=error, extra=SAMPLED)
+            notify(EVENT_NETWORK_ISSUES, "discovery")
+            # Continue to discover.
+            return None
+
+    def is_archiving(self, room_id: int) -> bool:
+        return self.archiving_task_registry.is_archiving(room_id)
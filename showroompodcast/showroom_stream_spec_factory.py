@@ -1,15 +1,21 @@
 """Stream spec factory."""
 
+from __future__ import annotations
+
 from logging import getLogger
+from typing import TYPE_CHECKING
 
 # noinspection PyPackageRequirements
 import ffmpeg
 from anyio import Path
-from asyncffmpeg import StreamSpec
 
 from showroompodcast.api.streaming_url import StreamingUrl
+from showroompodcast.output_format import OutputFormat
 from showroompodcast.showroom_datetime import ShowroomDatetime
 
+if TYPE_CHECKING:
+    from asyncffmpeg import StreamSpec
+
 ENVIRONMENT_VALIABLE_KEY_AREA_ID = "RADIKO_AREA_ID"
 AREA_ID_DEFAULT = "JP13"
 
@@ -17,20 +23,45 @@ AREA_ID_DEFAULT = "JP13"
 class ShowroomStreamSpecFactory:
     """Stream spec factory."""
 
-    def __init__(self, room_id: int) -> None:
+    def __init__(
+        self,
+        room_id: int,
+        streaming_url: str | None = None,
+        *,
+        part_file_name: str | None = None,
+        output_format: OutputFormat | None = None,
+        quality: int = 0,
+    ) -> None:
+        """The streaming_url is resolved when it's None, not exceeding quality kbps unless it's 0.
+
+        When part_file_name is set, resumes archive into it from live edge.
+        """
         self.room_id = room_id
+        self.streaming_url = streaming_url
+        self.quality = quality
+        self.part_file_name = part_file_name
+        self.output_format = output_format or OutputFormat()
+        self.out_file_name: str | None = None
         self.logger = getLogger(__name__)
 
     async def create(self) -> StreamSpec:
         """Creates."""
-        now = ShowroomDatetime.now_jst()
-        now_string = ShowroomDatetime.encode(now)
-        out_file_name = f"./output/{self.room_id}-{now_string}.mp4"
+        out_file_name = self.part_file_name or self.create_out_file_name()
         self.logger.debug("out file name: %s", out_file_name)
         if await Path(out_file_name).exists():
             self.logger.error("File already exists. out_file_name = %s", out_file_name)
             msg = f"File already exists. {out_file_name=}"
             raise FileExistsError(msg)
-        streaming_url = StreamingUrl.get_url_for_best_quality(self.room_id)
-        stream = ffmpeg.input(streaming_url, copytb="1")
-        return ffmpeg.output(stream, out_file_name, f="mp4", c="copy")
+        self.out_file_name = out_file_name
+        streaming_url = self.streaming_url or StreamingUrl.get_url_for_best_quality(self.room_id, self.quality)
+        if self.part_file_name is None:
+            stream = ffmpeg.input(streaming_url, copytb="1")
+        else:
+            # To start from the latest segment since previous part has older segments.
+            stream = ffmpeg.input(streaming_url, copytb="1", live_start_index="-1")
+        return self.output_format.create_output(stream, out_file_name)
+
+    def create_out_file_name(self) -> str:
+        now = ShowroomDatetime.now_jst()
+        now_string = ShowroomDatetime.encode(now)
+        return f"./output/{self.room_id}-{now_string}{self.output_format.extension}"
@@ -0,0 +1,60 @@
+"""Output sink to store archives."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from typing import TYPE_CHECKING
+
+import anyio
+from anyio import Path
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+
+class SinkWriter:
+    """Base class of writer to stream archive into sink."""
+
+    @abstractmethod
+    async def write(self, data: bytes) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Finishes archive, keeps data written so far even if archiving is interrupted."""
+        raise NotImplementedError  # pragma: no cover
+
+
+class Sink:
+    """Base class of output sink."""
+
+    CHUNK_SIZE = 1024 * 1024
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def open(self, name: str) -> SinkWriter:
+        """Opens writer to stream archive of the name."""
+        raise NotImplementedError  # pragma: no cover
+
+    async def upload(self, path: str, name: str) -> None:
+        """Stores local file as the name, then removes local file."""
+        sink_writer = await self.open(name)
+        try:
+            async with await anyio.open_file(path, "rb") as file:
+                while chunk := await file.read(self.CHUNK_SIZE):
+                    await sink_writer.write(chunk)
+        finally:
+            await sink_writer.close()
+        await Path(path).unlink()
@@ -0,0 +1,69 @@
+"""Local copy sink writer."""
+
+from __future__ import annotations
+
+import asyncio
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError
+from anyio import Path
+
+from showroompodcast.sink import SinkWriter
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from showroompodcast.sink import Sink
+    from showroompodcast.sink.local_sink import LocalSink
+    from showroompodcast.sink.local_sink import LocalSinkWriter
+
+# Errors of sink which don't stop recording.
+SINK_ERRORS = (ClientError, asyncio.TimeoutError)
+
+
+class LocalCopySinkWriter(SinkWriter):
+    """Streams archive into sink while keeping copy in local sink, which is removed once sink stored archive.
+
+    Errors of sink don't stop recording: streaming into sink stops, and the local copy is kept,
+    then OutputUploader uploads it after recording finishes.
+    """
+
+    def __init__(self, sink_writer: SinkWriter | None, local_sink_writer: LocalSinkWriter, path: str) -> None:
+        """The sink_writer is None when sink is unavailable from the beginning."""
+        self.sink_writer = sink_writer
+        self.local_sink_writer = local_sink_writer
+        self.path = path
+        self.logger = getLogger(__name__)
+
+    @classmethod
+    async def open(cls, sink: Sink, local_sink: LocalSink, name: str) -> Self:
+        """Opens both, recording starts even if sink is unavailable, then it's uploaded later."""
+        local_sink_writer = await local_sink.open(name)
+        try:
+            sink_writer: SinkWriter | None = await sink.open(name)
+        except SINK_ERRORS as error:
+            getLogger(__name__).warning("Failed to open sink, upload later. name: %s", name, exc_info=error)
+            sink_writer = None
+        return cls(sink_writer, local_sink_writer, local_sink.create_path(name))
+
+    async def write(self, data: bytes) -> None:
+        await self.local_sink_writer.write(data)
+        if self.sink_writer is None:
+            return
+        try:
+            await self.sink_writer.write(data)
+        except SINK_ERRORS as error:
+            self.logger.warning("Failed to write into sink, upload later. path: %s", self.path, exc_info=error)
+            self.sink_writer = None
+
+    async def close(self) -> None:
+        await self.local_sink_writer.close()
+        if self.sink_writer is None:
+            return
+        try:
+            await self.sink_writer.close()
+        except SINK_ERRORS as error:
+            self.logger.warning("Failed to close sink, upload later. path: %s", self.path, exc_info=error)
+            return
+        await Path(self.path).unlink()
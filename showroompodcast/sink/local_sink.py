@@ -0,0 +1,43 @@
+"""Local sink."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import anyio
+from anyio import Path
+
+from showroompodcast.sink import Sink
+from showroompodcast.sink import SinkWriter
+
+if TYPE_CHECKING:
+    from anyio import AsyncFile
+
+
+class LocalSinkWriter(SinkWriter):
+    """Appends archive into local file."""
+
+    def __init__(self, file: AsyncFile[bytes]) -> None:
+        self.file = file
+
+    async def write(self, data: bytes) -> None:
+        await self.file.write(data)
+
+    async def close(self) -> None:
+        await self.file.aclose()
+
+
+class LocalSink(Sink):
+    """Stores archives in local directory."""
+
+    def __init__(self, directory: str = "./output") -> None:
+        self.directory = directory
+
+    def create_path(self, name: str) -> str:
+        return f"{self.directory}/{name}"
+
+    async def open(self, name: str) -> LocalSinkWriter:
+        return LocalSinkWriter(await anyio.open_file(self.create_path(name), "ab"))
+
+    async def upload(self, path: str, name: str) -> None:
+        await Path(path).rename(self.create_path(name))
@@ -0,0 +1,72 @@
+"""Output uploader."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections import defaultdict
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError
+from anyio import Path
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from showroompodcast.sink import Sink
+
+
+class OutputUploader:
+    """Uploads archives written into local output directory by FFmpeg, then removes them.
+
+    Archives of rooms being archived are kept, except segments which next segment has already started,
+    so that local disk usage is bounded by the size of segment when output format is "segment".
+    """
+
+    INTERVAL = 10.0
+    PATTERN_ROOM_ID = re.compile(r"^(\d+)-")
+    PATTERN_SEGMENT = re.compile(r"^(.+)-\d{5}\.ts$")
+    # Temporary files while concatenating.
+    PATTERN_EXCLUDED = re.compile(r"\.(concatenated\.mp4|txt)$")
+
+    def __init__(self, sink: Sink, directory: str = "./output") -> None:
+        self.sink = sink
+        self.directory = directory
+        self.logger = getLogger(__name__)
+
+    async def run(self, is_archiving: Callable[[int], bool]) -> None:
+        while True:
+            await self.upload_finished(is_archiving)
+            await asyncio.sleep(self.INTERVAL)
+
+    async def upload_finished(self, is_archiving: Callable[[int], bool]) -> None:
+        """Uploads finished archives, retries at next time when failed."""
+        list_name = sorted([path.name async for path in Path(self.directory).iterdir()])
+        for name in self.list_finished(list_name, is_archiving):
+            await self.upload(name)
+
+    async def upload(self, name: str) -> None:
+        try:
+            await self.sink.upload(f"{self.directory}/{name}", name)
+        except (ClientError, asyncio.TimeoutError, OSError) as error:
+            self.logger.warning("Failed to upload. name: %s", name, exc_info=error)
+
+    def list_finished(self, list_name: list[str], is_archiving: Callable[[int], bool]) -> list[str]:
+        """Lists names of finished archives in sorted list of names."""
+        list_finished: list[str] = []
+        dictionary_segment: defaultdict[str, list[str]] = defaultdict(list)
+        for name in list_name:
+            match = self.PATTERN_ROOM_ID.match(name)
+            if match is None or self.PATTERN_EXCLUDED.search(name):
+                continue
+            if not is_archiving(int(match.group(1))):
+                list_finished.append(name)
+                continue
+            match_segment = self.PATTERN_SEGMENT.match(name)
+            if match_segment is not None:
+                dictionary_segment[match_segment.group(1)].append(name)
+        for list_segment in dictionary_segment.values():
+            # The last segment is still being written.
+            list_finished.extend(list_segment[:-1])
+        return list_finished
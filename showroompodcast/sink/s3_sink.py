@@ -0,0 +1,139 @@
+"""S3 sink."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from logging import getLogger
+from typing import TYPE_CHECKING
+from urllib.parse import quote
+
+from aiohttp import ClientError
+from aiohttp import ClientSession
+from yarl import URL
+
+from showroompodcast.sink import Sink
+from showroompodcast.sink import SinkWriter
+from showroompodcast.sink.signature_v4 import SignatureV4
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from showroompodcast.config import S3Config
+
+# S3 rejects parts smaller than this except the last one when completing multipart upload.
+PART_SIZE_MINIMUM = 5 * 1024 * 1024
+
+
+class S3MultipartWriter(SinkWriter):
+    """Streams archive into object by multipart upload, uploads each part as soon as it's filled.
+
+    When uploading part failed, the upload is aborted not to leave parts billed in storage.
+    """
+
+    def __init__(self, s3_sink: S3Sink, name: str, upload_id: str) -> None:
+        self.s3_sink = s3_sink
+        self.name = name
+        self.upload_id = upload_id
+        self.buffer = bytearray()
+        self.list_etag: list[str] = []
+        self.is_aborted = False
+        self.logger = getLogger(__name__)
+
+    async def write(self, data: bytes) -> None:
+        self.buffer.extend(data)
+        while len(self.buffer) >= self.s3_sink.part_size:
+            await self.upload_part(bytes(self.buffer[: self.s3_sink.part_size]))
+            del self.buffer[: self.s3_sink.part_size]
+
+    async def close(self) -> None:
+        """Completes upload, or aborts it when nothing is written not to create empty object."""
+        if self.is_aborted:
+            return
+        if self.buffer:
+            await self.upload_part(bytes(self.buffer))
+            self.buffer.clear()
+        query = f"uploadId={quote(self.upload_id)}"
+        if not self.list_etag:
+            await self.s3_sink.request("DELETE", self.name, query)
+            return
+        parts = "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+            for number, etag in enumerate(self.list_etag, start=1)
+        )
+        payload = f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode()
+        await self.s3_sink.request("POST", self.name, query, payload)
+        self.logger.info("Uploaded. name: %s, parts: %d", self.name, len(self.list_etag))
+
+    async def upload_part(self, data: bytes) -> None:
+        """Aborts upload when failed, since parts after the failed one can't make a complete object."""
+        query = f"partNumber={len(self.list_etag) + 1}&uploadId={quote(self.upload_id)}"
+        try:
+            _, etag = await self.s3_sink.request("PUT", self.name, query, data)
+        except (ClientError, asyncio.TimeoutError):
+            await self.abort()
+            raise
+        self.list_etag.append(etag)
+
+    async def abort(self) -> None:
+        """Parts left by abort failed are expected to be removed by lifecycle rule of the bucket."""
+        self.is_aborted = True
+        try:
+            await self.s3_sink.request("DELETE", self.name, f"uploadId={quote(self.upload_id)}")
+        except (ClientError, asyncio.TimeoutError) as error:
+            self.logger.warning("Failed to abort upload. name: %s", self.name, exc_info=error)
+
+
+class S3Sink(Sink):
+    """Stores archives into S3 compatible object storage.
+
+    Credentials are read from environment variables AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY
+    when they are not set in configuration.
+    """
+
+    def __init__(self, s3_config: S3Config) -> None:
+        self.endpoint_url = s3_config.endpoint_url.rstrip("/")
+        self.bucket = s3_config.bucket
+        self.prefix = s3_config.prefix
+        self.part_size = s3_config.part_size
+        self.signature_v4 = SignatureV4(
+            s3_config.access_key_id or os.environ.get("AWS_ACCESS_KEY_ID", ""),
+            s3_config.secret_access_key or os.environ.get("AWS_SECRET_ACCESS_KEY", ""),
+            s3_config.region,
+        )
+        self.session: ClientSession | None = None
+
+    async def __aenter__(self) -> Self:
+        self.session = ClientSession()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self.session is not None:
+            await self.session.close()
+
+    async def open(self, name: str) -> S3MultipartWriter:
+        text, _ = await self.request("POST", name, "uploads")
+        match = re.search(r"<UploadId>(.+?)</UploadId>", text)
+        if match is None:
+            msg = f"UploadId not found in response. {text=}"
+            raise ValueError(msg)
+        return S3MultipartWriter(self, name, match.group(1))
+
+    async def request(self, method: str, name: str, query: str, payload: bytes = b"") -> tuple[str, str]:
+        """Returns response text and ETag."""
+        if self.session is None:
+            msg = "S3Sink is not opened by async with statement."
+            raise RuntimeError(msg)
+        url = f"{self.endpoint_url}/{quote(self.bucket)}/{quote(self.prefix + name)}?{query}"
+        headers = self.signature_v4.sign(method, url, payload)
+        async with self.session.request(method, URL(url, encoded=True), data=payload, headers=headers) as response:
+            response.raise_for_status()
+            return await response.text(), response.headers.get("ETag", "")
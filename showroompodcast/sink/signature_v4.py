@@ -0,0 +1,71 @@
+"""AWS Signature Version 4."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+from datetime import datetime
+from datetime import timezone
+from urllib.parse import parse_qsl
+from urllib.parse import quote
+from urllib.parse import urlsplit
+
+
+class SignatureV4:
+    """Signs request to S3 compatible object storage.
+
+    see: https://docs.aws.amazon.com/AmazonS3/latest/API/sig-v4-header-based-auth.html
+    """
+
+    ALGORITHM = "AWS4-HMAC-SHA256"
+    SERVICE = "s3"
+
+    def __init__(self, access_key_id: str, secret_access_key: str, region: str) -> None:
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.region = region
+
+    def sign(self, method: str, url: str, payload: bytes, now: datetime | None = None) -> dict[str, str]:
+        """Returns headers to add into request, the URL is expected to be URI-encoded already."""
+        now = now or datetime.now(tz=timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date = now.strftime("%Y%m%d")
+        payload_hash = hashlib.sha256(payload).hexdigest()
+        headers = {"host": urlsplit(url).netloc, "x-amz-content-sha256": payload_hash, "x-amz-date": amz_date}
+        signed_headers = ";".join(sorted(headers))
+        canonical_request = self.create_canonical_request(method, url, headers, payload_hash)
+        scope = f"{date}/{self.region}/{self.SERVICE}/aws4_request"
+        string_to_sign = "\n".join(
+            [self.ALGORITHM, amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()],
+        )
+        signature = hmac.new(self.derive_signing_key(date), string_to_sign.encode(), hashlib.sha256).hexdigest()
+        authorization = (
+            f"{self.ALGORITHM} Credential={self.access_key_id}/{scope},"
+            f"SignedHeaders={signed_headers},Signature={signature}"
+        )
+        return {"Authorization": authorization, "x-amz-content-sha256": payload_hash, "x-amz-date": amz_date}
+
+    @classmethod
+    def create_canonical_request(cls, method: str, url: str, headers: dict[str, str], payload_hash: str) -> str:
+        split_result = urlsplit(url)
+        return "\n".join(
+            [
+                method,
+                split_result.path or "/",
+                cls.canonicalize_query(split_result.query),
+                "".join(f"{key}:{headers[key]}\n" for key in sorted(headers)),
+                ";".join(sorted(headers)),
+                payload_hash,
+            ],
+        )
+
+    @staticmethod
+    def canonicalize_query(query: str) -> str:
+        list_pair = sorted(parse_qsl(query, keep_blank_values=True))
+        return "&".join(f"{quote(key, safe='-_.~')}={quote(value, safe='-_.~')}" for key, value in list_pair)
+
+    def derive_signing_key(self, date: str) -> bytes:
+        key = f"AWS4{self.secret_access_key}".encode()
+        for message in [date, self.region, self.SERVICE, "aws4_request"]:
+            key = hmac.new(key, message.encode(), hashlib.sha256).digest()
+        return key
@@ -0,0 +1,36 @@
+"""Sink factory."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from showroompodcast.sink.local_sink import LocalSink
+from showroompodcast.sink.s3_sink import PART_SIZE_MINIMUM
+from showroompodcast.sink.s3_sink import S3Sink
+
+if TYPE_CHECKING:
+    from showroompodcast.config import SinkConfig
+    from showroompodcast.sink import Sink
+
+BACKEND_LOCAL = "local"
+BACKEND_S3 = "s3"
+
+
+class SinkFactory:
+    """Sink factory."""
+
+    @staticmethod
+    def create(sink_config: SinkConfig) -> Sink:
+        """Creates sink of the backend, raises ValueError when the backend is unsupported or misconfigured.
+
+        Part size is validated here since S3 rejects it only when completing upload after a whole live.
+        """
+        if sink_config.backend == BACKEND_LOCAL:
+            return LocalSink()
+        if sink_config.backend == BACKEND_S3:
+            if sink_config.s3.part_size < PART_SIZE_MINIMUM:
+                msg = f"Part size must be at least {PART_SIZE_MINIMUM} bytes: {sink_config.s3.part_size}"
+                raise ValueError(msg)
+            return S3Sink(sink_config.s3)
+        msg = f"Unsupported sink backend. {sink_config.backend=}"
+        raise ValueError(msg)
@@ -0,0 +1,106 @@
+"""Slack notifier."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientError
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
+from slack_sdk.web.async_client import AsyncWebClient
+
+from showroompodcast.notification import EVENT_ARCHIVING_FAILED
+from showroompodcast.notification import EVENT_DISK_PRESSURE
+from showroompodcast.notification import EVENT_NETWORK_ISSUES
+from showroompodcast.notification import EVENT_RECORDING_FINISHED
+from showroompodcast.notification import EVENT_RECORDING_STARTED
+from showroompodcast.notification import EVENT_RECORDINGS_QUEUED
+from showroompodcast.notification import EVENT_RETRIES_EXHAUSTED
+from showroompodcast.notification import LIST_EVENT
+from showroompodcast.notification import NOTIFICATIONS
+from showroompodcast.rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from showroompodcast.config import SlackConfig
+    from showroompodcast.notification import Notification
+    from showroompodcast.notification import NotificationQueue
+
+TITLES = {
+    EVENT_RECORDING_STARTED: "Recording started",
+    EVENT_RECORDING_FINISHED: "Recording finished",
+    EVENT_RETRIES_EXHAUSTED: "Retries exhausted",
+    EVENT_ARCHIVING_FAILED: "Archiving failed",
+    EVENT_DISK_PRESSURE: "Disk pressure",
+    EVENT_NETWORK_ISSUES: "Temporary network issues",
+    EVENT_RECORDINGS_QUEUED: "Recordings waiting for worker process",
+}
+
+
+def format_notifications(list_notification: list[Notification], count_dropped: int, maximum_lines: int) -> str:
+    """Coalesces notifications into one message, duplicates are counted.
+
+    Events are in fixed order, lines of each event are in order of the first occurrence.
+    """
+    counter = Counter(list_notification)
+    lines: list[str] = []
+    for event in LIST_EVENT:
+        list_unique = [notification for notification in counter if notification.event == event]
+        if not list_unique:
+            continue
+        count = sum(counter[notification] for notification in list_unique)
+        lines.append(f"*{TITLES[event]}* ({count})")
+        for notification in list_unique[:maximum_lines]:
+            room = "" if notification.room_id is None else f"room {notification.room_id}: "
+            times = f" ({counter[notification]} times)" if counter[notification] > 1 else ""
+            lines.append(f"• {room}{notification.message}{times}")
+        if len(list_unique) > maximum_lines:
+            lines.append(f"• and {len(list_unique) - maximum_lines} more")
+    if count_dropped:
+        lines.append(f"{count_dropped} notifications dropped since too many.")
+    return "\n".join(lines)
+
+
+class SlackNotifier:
+    """Sends notifications queued to Slack on the event loop.
+
+    Notifications are coalesced over the window into one message,
+    and messages are spaced within the rate limit of Slack.
+    Producers only queue, so flood of events never blocks polling or archiving.
+    """
+
+    MAXIMUM_LINES = 20
+
+    def __init__(self, slack_config: SlackConfig, queue: NotificationQueue = NOTIFICATIONS) -> None:
+        self.slack_config = slack_config
+        self.queue = queue
+        self.rate_limiter = RateLimiter(slack_config.requests_per_second)
+        self.logger = getLogger(__name__)
+
+    async def run(self) -> None:
+        """Sends until cancelled, then sends notifications queued so far."""
+        self.queue.subscribe(self.slack_config.events, self.slack_config.maximum_pending)
+        client = AsyncWebClient(token=self.slack_config.bot_token, base_url=self.slack_config.base_url)
+        # Waits as Slack tells by Retry-After when rate limited.
+        client.retry_handlers.append(AsyncRateLimitErrorRetryHandler(max_retry_count=1))
+        try:
+            while True:
+                await asyncio.sleep(self.slack_config.window)
+                await self.flush(client)
+        finally:
+            await asyncio.shield(self.flush(client))
+            self.queue.unsubscribe()
+
+    async def flush(self, client: AsyncWebClient) -> None:
+        """Posts notifications queued so far as one message, failure is only logged not to stop notifying."""
+        list_notification, count_dropped = self.queue.pop_all()
+        if not list_notification and not count_dropped:
+            return
+        text = format_notifications(list_notification, count_dropped, self.MAXIMUM_LINES)
+        await self.rate_limiter.acquire()
+        try:
+            await client.chat_postMessage(channel=self.slack_config.channel, text=text)
+        except (SlackApiError, ClientError, asyncio.TimeoutError):
+            self.logger.warning("Failed to notify. text: %s", text, exc_info=True)
@@ -0,0 +1,46 @@
+"""SQLite database."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from typing import ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from showroompodcast.exceptions import Error
+
+
+class SqliteDatabase:
+    """Database in SQLite file, subclasses define schema and error.
+
+    Each operation opens its own connection so that the database can be pickled into worker processes.
+    """
+
+    SECONDS_TIMEOUT = 10.0
+    # Statements to create tables and indexes if not exist, executed on each connection.
+    SQL_SCHEMA: ClassVar[tuple[str, ...]] = ()
+    # Raised instead of sqlite3.Error, the name is used in its message.
+    ERROR: ClassVar[type[Error]]
+    NAME: ClassVar[str]
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @contextmanager
+    def connect(self) -> Generator[sqlite3.Connection, None, None]:
+        """Connects and commits, or rolls back when error."""
+        try:
+            with closing(sqlite3.connect(self.path, timeout=self.SECONDS_TIMEOUT)) as connection:
+                # To let processes write while others read.
+                connection.execute("PRAGMA journal_mode=WAL")
+                for sql in self.SQL_SCHEMA:
+                    connection.execute(sql)
+                with connection:
+                    yield connection
+        except sqlite3.Error as error:
+            msg = f"Failed to access {self.NAME}: {self.path}"
+            raise self.ERROR(msg) from error
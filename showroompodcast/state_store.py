@@ -0,0 +1,75 @@
+"""State store of recordings which persists across restarts."""
+
+from __future__ import annotations
+
+import time
+from typing import NamedTuple
+
+from anyio import to_thread
+
+from showroompodcast.exceptions import StateStoreError
+from showroompodcast.sqlite_database import SqliteDatabase
+
+
+class Recording(NamedTuple):
+    """FFmpeg process recording a room."""
+
+    room_id: int
+    pid: int
+    out_file_name: str
+    time_started: float
+    time_last_seen_live: float
+
+
+class StateStore(SqliteDatabase):
+    """Recordings in progress in SQLite database, shared by parent process and worker processes."""
+
+    NAME = "state store"
+    ERROR = StateStoreError
+    SQL_CREATE = (
+        "CREATE TABLE IF NOT EXISTS recording ("
+        "room_id INTEGER NOT NULL, "
+        "pid INTEGER NOT NULL, "
+        "out_file_name TEXT NOT NULL, "
+        "time_started REAL NOT NULL, "
+        "time_last_seen_live REAL NOT NULL, "
+        "PRIMARY KEY (room_id, pid))"
+    )
+    SQL_SCHEMA = (SQL_CREATE,)
+
+    async def register(self, room_id: int, pid: int, out_file_name: str) -> None:
+        await to_thread.run_sync(self.register_sync, room_id, pid, out_file_name)
+
+    async def touch(self, room_id: int, pid: int) -> None:
+        """Updates the time when the recording was seen live, i.e. the output file grew."""
+        await to_thread.run_sync(self.touch_sync, room_id, pid)
+
+    async def unregister(self, room_id: int, pid: int) -> None:
+        await to_thread.run_sync(self.unregister_sync, room_id, pid)
+
+    async def list_recording(self) -> list[Recording]:
+        return await to_thread.run_sync(self.list_recording_sync)
+
+    def register_sync(self, room_id: int, pid: int, out_file_name: str) -> None:
+        now = time.time()
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO recording VALUES (?, ?, ?, ?, ?)",
+                (room_id, pid, out_file_name, now, now),
+            )
+
+    def touch_sync(self, room_id: int, pid: int) -> None:
+        with self.connect() as connection:
+            connection.execute(
+                "UPDATE recording SET time_last_seen_live = ? WHERE room_id = ? AND pid = ?",
+                (time.time(), room_id, pid),
+            )
+
+    def unregister_sync(self, room_id: int, pid: int) -> None:
+        with self.connect() as connection:
+            connection.execute("DELETE FROM recording WHERE room_id = ? AND pid = ?", (room_id, pid))
+
+    def list_recording_sync(self) -> list[Recording]:
+        with self.connect() as connection:
+            cursor = connection.execute("SELECT * FROM recording ORDER BY time_started")
+            return [Recording(*row) for row in cursor.fetchall()]
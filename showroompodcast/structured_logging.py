@@ -0,0 +1,174 @@
+"""Structured logging which never blocks event loop and worker processes on log I/O."""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import multiprocessing
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from datetime import timezone
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from typing import TYPE_CHECKING
+from typing import Any
+
+from showroompodcast.config import LoggingConfig
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from multiprocessing.queues import Queue
+
+CONTEXT_ROOM_ID: ContextVar[int | None] = ContextVar("room_id", default=None)
+CONTEXT_RECORDING: ContextVar[str | None] = ContextVar("recording", default=None)
+# Pass as extra to sample repetitive log, e.g. results of polling.
+SAMPLED = {"sampled": True}
+STYLE_JSON = "json"
+STYLE_TEXT = "text"
+
+
+@contextmanager
+def log_context(*, room_id: int | None = None, recording: str | None = None) -> Generator[None, None, None]:
+    """Adds room ID and recording to logs in this context, including tasks created in this context."""
+    token_room_id = CONTEXT_ROOM_ID.set(room_id) if room_id is not None else None
+    token_recording = CONTEXT_RECORDING.set(recording) if recording is not None else None
+    try:
+        yield
+    finally:
+        if token_recording is not None:
+            CONTEXT_RECORDING.reset(token_recording)
+        if token_room_id is not None:
+            CONTEXT_ROOM_ID.reset(token_room_id)
+
+
+class ContextFilter(logging.Filter):
+    """Captures context in the process and the task which logged, before the record is queued."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.room_id = CONTEXT_ROOM_ID.get()
+        record.recording = CONTEXT_RECORDING.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Passes the first of repetitive logs, then drops same message for the interval.
+
+    Only logs with extra=SAMPLED are sampled, the count dropped is attached to the next one passed.
+    """
+
+    def __init__(self, interval: float) -> None:
+        super().__init__()
+        self.interval = interval
+        self.dictionary_sampled: dict[tuple[str, int, str], tuple[float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or self.interval <= 0:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        time_passed, count_dropped = self.dictionary_sampled.get(key, (-self.interval, 0))
+        if now - time_passed < self.interval:
+            self.dictionary_sampled[key] = (time_passed, count_dropped + 1)
+            return False
+        self.dictionary_sampled[key] = (now, 0)
+        record.dropped = count_dropped
+        return True
+
+
+class PicklableQueueHandler(QueueHandler):
+    """Queues record with formatted message and exception so that it can be sent to another process."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats record as JSON Lines."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dictionary: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.process,
+            "message": record.getMessage(),
+        }
+        for key in ("room_id", "recording", "dropped"):
+            value = getattr(record, key, None)
+            if value:
+                dictionary[key] = value
+        if record.exc_text:
+            dictionary["exception"] = record.exc_text
+        return json.dumps(dictionary, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Formats record as human readable text with context."""
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(process)d %(name)s%(context)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        context = " ".join(
+            f"{key}={getattr(record, key)}"
+            for key in ("room_id", "recording", "dropped")
+            if getattr(record, key, None)
+        )
+        record.context = f" [{context}]" if context else ""
+        return super().format(record)
+
+
+def create_queue_handler(queue: Queue[logging.LogRecord], logging_config: LoggingConfig) -> QueueHandler:
+    handler = PicklableQueueHandler(queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter(logging_config.sampling_interval))
+    return handler
+
+
+def configure_worker(queue: Queue[logging.LogRecord], logging_config: LoggingConfig) -> None:
+    """Replaces handlers inherited from parent process so that worker only puts logs into queue."""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(create_queue_handler(queue, logging_config))
+    root.setLevel(logging_config.level)
+
+
+class StructuredLogging:
+    """Puts logs of this process and worker processes into queue, which a thread writes into stderr.
+
+    Since multiprocessing queue sends by its feeder thread, logging never blocks on I/O.
+    """
+
+    def __init__(self, logging_config: LoggingConfig | None = None) -> None:
+        self.logging_config = logging_config or LoggingConfig()
+        if self.logging_config.style not in (STYLE_JSON, STYLE_TEXT):
+            msg = f"Unsupported logging style: {self.logging_config.style}"
+            raise ValueError(msg)
+        self.queue: Queue[logging.LogRecord] = multiprocessing.Queue()
+        self.handler = create_queue_handler(self.queue, self.logging_config)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(JsonFormatter() if self.logging_config.style == STYLE_JSON else TextFormatter())
+        self.listener = QueueListener(self.queue, stream_handler)
+
+    def start(self) -> None:
+        root = logging.getLogger()
+        root.addHandler(self.handler)
+        root.setLevel(self.logging_config.level)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Writes logs queued so far, then stops."""
+        logging.getLogger().removeHandler(self.handler)
+        self.listener.stop()
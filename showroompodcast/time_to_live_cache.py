@@ -0,0 +1,32 @@
+"""Time-to-live cache."""
+
+from __future__ import annotations
+
+import time
+from typing import Generic
+from typing import TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TimeToLiveCache(Generic[K, V]):
+    """Cache whose values expire after time to live in seconds."""
+
+    def __init__(self, time_to_live: float) -> None:
+        self.time_to_live = time_to_live
+        self.dictionary: dict[K, tuple[float, V]] = {}
+
+    def get(self, key: K) -> V | None:
+        """Returns None when the value doesn't exist or has expired."""
+        item = self.dictionary.get(key)
+        if item is None:
+            return None
+        time_expire, value = item
+        if time.monotonic() >= time_expire:
+            del self.dictionary[key]
+            return None
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self.dictionary[key] = (time.monotonic() + self.time_to_live, value)
@@ -0,0 +1,246 @@
+"""Elastic pool of worker processes which archive."""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import time
+from logging import getLogger
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+import psutil
+from anyio import to_thread
+
+from showroompodcast.metrics import RECORDINGS_QUEUED
+from showroompodcast.metrics import WORKER_CAPACITY
+from showroompodcast.notification import EVENT_RECORDINGS_QUEUED
+from showroompodcast.notification import notify
+from showroompodcast.process_prewarmer import ProcessPrewarmer
+from showroompodcast.structured_logging import SAMPLED
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+
+    from asynccpu import ProcessTaskPoolExecutor
+    from typing_extensions import Self
+
+    from showroompodcast.config import WorkerConfig
+
+
+class HostLoad(NamedTuple):
+    """Load of the host which archiving competes for."""
+
+    cpu_percent: float
+    memory_available: int
+    bytes_written_per_second: float
+
+
+# Reason: Tracks configuration, capacity and host load together. pylint: disable-next=too-many-instance-attributes
+class WorkerPool:
+    """Elastic pool of worker processes which archive.
+
+    Recordings start only within capacity, since submitting to executor whose workers are all busy
+    blocks the event loop until any recording finishes.
+    Recordings over capacity wait in this process, and they are reported since they miss the beginning of live.
+    While recordings are waiting, capacity grows up to the hard ceiling as long as the host has headroom.
+    Executor spawns worker process only when no worker is idle, but never exits it,
+    so the executor is replaced when no recording runs for a while to shrink back to number_process.
+    """
+
+    def __init__(
+        self,
+        create_executor: Callable[[int], ProcessTaskPoolExecutor],
+        number_process: int,
+        worker_config: WorkerConfig,
+        *,
+        prewarm: bool = False,
+    ) -> None:
+        """The create_executor receives max_workers."""
+        self.create_executor = create_executor
+        self.number_process = number_process
+        self.maximum = max(number_process, worker_config.maximum)
+        self.interval = worker_config.interval
+        self.cpu_percent_maximum = worker_config.cpu_percent_maximum
+        self.memory_available_minimum = worker_config.memory_available_minimum
+        self.bytes_written_per_second_maximum = worker_config.bytes_written_per_second_maximum
+        self.seconds_idle = worker_config.seconds_idle
+        self.prewarm = prewarm
+        self.executor: ProcessTaskPoolExecutor | None = None
+        self.capacity = 0
+        self.set_capacity(number_process)
+        self.number_running = 0
+        self.number_waiting = 0
+        # Worker processes spawned by current executor.
+        self.number_spawned = 0
+        self.time_idle_since = time.monotonic()
+        self.event_released = asyncio.Event()
+        self.bytes_written_last: int | None = None
+        self.time_measured_last = 0.0
+        self.logger = getLogger(__name__)
+
+    async def __aenter__(self) -> Self:
+        await self.get_executor()
+        return self
+
+    async def __aexit__(self, *_args: object) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def get_executor(self) -> ProcessTaskPoolExecutor:
+        """Creates executor lazily, again after it was recycled."""
+        if self.executor is None:
+            self.executor = self.create_executor(self.maximum)
+            self.number_spawned = 0
+            if self.prewarm:
+                await ProcessPrewarmer.prewarm(self.executor, self.number_process)
+                self.number_spawned = self.number_process
+        return self.executor
+
+    def create_process_task(
+        self,
+        function_coroutine: Callable[..., Awaitable[None]],
+        *args: object,
+    ) -> asyncio.Future[None]:
+        """Starts function in worker process, or returns task which waits for capacity in this process."""
+        if self.executor is None or self.number_waiting or self.number_running >= self.capacity:
+            return asyncio.ensure_future(self.wait_and_submit(function_coroutine, *args))
+        self.number_running += 1
+        return self.submit(self.executor, function_coroutine, *args)
+
+    def submit(
+        self,
+        executor: ProcessTaskPoolExecutor,
+        function_coroutine: Callable[..., Awaitable[None]],
+        *args: object,
+    ) -> asyncio.Future[None]:
+        """Submits function which capacity is already acquired for."""
+        try:
+            future = executor.create_process_task(function_coroutine, *args)
+        except BaseException:
+            self.release()
+            raise
+        self.number_spawned = max(self.number_spawned, self.number_running)
+        # Releases when worker finishes, even if the future is cancelled after the worker started.
+        future.add_done_callback(self.release)
+        return future
+
+    async def wait_and_submit(
+        self,
+        function_coroutine: Callable[..., Awaitable[None]],
+        *args: object,
+    ) -> None:
+        """Submits once capacity is acquired, capacity is released when submitting fails."""
+        await self.acquire()
+        try:
+            executor = await self.get_executor()
+        except BaseException:
+            self.release()
+            raise
+        # Not to release capacity while worker process keeps archiving.
+        await asyncio.shield(self.submit(executor, function_coroutine, *args))
+
+    async def acquire(self) -> None:
+        """Waits for capacity, recordings waiting are reported."""
+        if self.number_running >= self.capacity:
+            self.logger.warning(
+                "All worker processes are busy, recording waits. capacity: %d, maximum: %d",
+                self.capacity,
+                self.maximum,
+            )
+            notify(EVENT_RECORDINGS_QUEUED, f"waiting for worker process, capacity: {self.capacity}")
+            self.number_waiting += 1
+            RECORDINGS_QUEUED.inc()
+            try:
+                while self.number_running >= self.capacity:
+                    self.event_released.clear()
+                    await self.event_released.wait()
+            finally:
+                self.number_waiting -= 1
+                RECORDINGS_QUEUED.dec()
+        self.number_running += 1
+
+    def release(self, *_args: object) -> None:
+        """Releases capacity, arguments are ignored to use as done callback."""
+        self.number_running -= 1
+        if not self.number_running:
+            self.time_idle_since = time.monotonic()
+        self.event_released.set()
+
+    def set_capacity(self, capacity: int) -> None:
+        WORKER_CAPACITY.inc(amount=capacity - self.capacity)
+        self.capacity = capacity
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.resize()
+
+    async def resize(self) -> None:
+        """Grows capacity by recordings waiting, or shrinks it when nothing waits."""
+        host_load = self.measure()
+        if self.number_waiting:
+            self.grow(host_load)
+            return
+        self.set_capacity(max(self.number_process, self.number_running))
+        if self.is_idle():
+            await self.recycle()
+
+    def grow(self, host_load: HostLoad) -> None:
+        """Grows capacity to cover recordings waiting, within maximum and only when host has headroom."""
+        if self.capacity >= self.maximum:
+            self.logger.warning("Worker pool reached maximum: %d", self.maximum, extra=SAMPLED)
+            return
+        if not self.has_headroom(host_load):
+            self.logger.warning("Worker pool can't grow since host is busy. %s", host_load, extra=SAMPLED)
+            return
+        self.set_capacity(min(self.maximum, self.number_running + self.number_waiting))
+        self.logger.info("Worker pool grew. capacity: %d", self.capacity)
+        self.event_released.set()
+
+    def has_headroom(self, host_load: HostLoad) -> bool:
+        return (
+            host_load.cpu_percent < self.cpu_percent_maximum
+            and host_load.memory_available > self.memory_available_minimum
+            and (
+                not self.bytes_written_per_second_maximum
+                or host_load.bytes_written_per_second < self.bytes_written_per_second_maximum
+            )
+        )
+
+    def measure(self) -> HostLoad:
+        """CPU usage and bytes written are since the last measurement, they are 0 at the first measurement."""
+        time_measured = time.monotonic()
+        disk_io_counters = psutil.disk_io_counters()
+        bytes_written = 0 if disk_io_counters is None else disk_io_counters.write_bytes
+        bytes_written_per_second = (
+            0.0
+            if self.bytes_written_last is None or time_measured <= self.time_measured_last
+            else (bytes_written - self.bytes_written_last) / (time_measured - self.time_measured_last)
+        )
+        self.bytes_written_last = bytes_written
+        self.time_measured_last = time_measured
+        return HostLoad(psutil.cpu_percent(), psutil.virtual_memory().available, bytes_written_per_second)
+
+    def is_idle(self) -> bool:
+        return (
+            self.executor is not None
+            and self.number_spawned > self.number_process
+            and not self.number_running
+            and time.monotonic() - self.time_idle_since >= self.seconds_idle
+        )
+
+    async def recycle(self) -> None:
+        """Replaces executor to exit worker processes over number_process."""
+        executor = self.executor
+        if executor is None:
+            return
+        self.executor = None
+        self.logger.info("Worker pool shrinks. worker processes: %d", self.number_spawned)
+        # Executor replaces handler of SIGTERM, then next executor should not chain handler of this one.
+        if executor.original_sigint_handler is not None:
+            signal.signal(signal.SIGTERM, executor.original_sigint_handler)
+        await to_thread.run_sync(executor.shutdown)
+        if self.prewarm:
+            await self.get_executor()
@@ -0,0 +1,21 @@
+"""Tests for onlives.py."""
+
+import pytest
+
+from showroompodcast.api import ShowroomApi
+from showroompodcast.api.onlives import Onlives
+from tests.conftest import FakeShowroomApi
+
+
+class TestOnlives:
+    """Tests for Onlives."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(fake_showroom_api: FakeShowroomApi) -> None:
+        """Rooms listed in any genre should be returned without duplication."""
+        fake_showroom_api.listed_on_live([[1, 2], [2, 3]])
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            set_room_id = await Onlives.get_set_room_id_async(session)
+        assert set_room_id == {1, 2, 3}
+        assert fake_showroom_api.count_request_onlives == 1
@@ -1,10 +1,13 @@
 """Tests for polling.py."""
 
 import pytest
+from aiohttp import ClientResponseError
 from requests.models import HTTPError
 
+from showroompodcast.api import ShowroomApi
 from showroompodcast.api.polling import Polling
 from showroompodcast.exceptions import TemporaryNetworkIssuesError
+from tests.conftest import FakeShowroomApi
 
 
 class TestPolling:
@@ -31,3 +34,26 @@ class TestPolling:
         exception = excinfo.value.__cause__
         assert isinstance(exception, HTTPError)
         assert exception.response.status_code == status_code
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("on_live", "expected"), [(False, False), (True, True)])
+    async def test_async(self, fake_showroom_api: FakeShowroomApi, *, on_live: bool, expected: bool) -> None:
+        """Tests for poll_async."""
+        room_id = 1
+        (fake_showroom_api.on_live if on_live else fake_showroom_api.not_on_live)([room_id])
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            is_on_live = await Polling.poll_async(session, room_id)
+        assert is_on_live is expected
+
+    @pytest.mark.asyncio
+    async def test_async_503(self, fake_showroom_api: FakeShowroomApi) -> None:
+        """The function: poll_async() should raise TemporaryNetworkIssuesError when the status code is 503."""
+        room_id = 1
+        fake_showroom_api.status_503([room_id])
+        status_code = 503
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            with pytest.raises(TemporaryNetworkIssuesError) as excinfo:
+                await Polling.poll_async(session, room_id)
+        exception = excinfo.value.__cause__
+        assert isinstance(exception, ClientResponseError)
+        assert exception.status == status_code
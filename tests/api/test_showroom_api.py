@@ -0,0 +1,57 @@
+"""Tests for showroompodcast/api/__init__.py."""
+
+from collections.abc import Generator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from showroompodcast.api import ShowroomApi
+from showroompodcast.config import HttpConfig
+
+
+@pytest.fixture
+def closed_session() -> Generator[None, None, None]:
+    ShowroomApi.close_session()
+    yield
+    ShowroomApi.close_session()
+    ShowroomApi.configure(HttpConfig())
+
+
+class TestShowroomApi:
+    """Tests for ShowroomApi."""
+
+    @staticmethod
+    @pytest.mark.usefixtures("closed_session")
+    def test_get_session() -> None:
+        """The session should be shared between requests in same process."""
+        pool_connections = 2
+        pool_maxsize = 3
+        ShowroomApi.configure(HttpConfig(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+        session = ShowroomApi.get_session()
+        assert ShowroomApi.get_session() is session
+        adapter = session.get_adapter("https://www.showroom-live.com/api/live/polling")
+        # Reason: Attribute is not typed in requests. pylint: disable=protected-access
+        assert adapter._pool_connections == pool_connections  # type: ignore[attr-defined]  # noqa: SLF001
+        assert adapter._pool_maxsize == pool_maxsize  # type: ignore[attr-defined]  # noqa: SLF001
+
+    @staticmethod
+    @pytest.mark.usefixtures("closed_session")
+    def test_get_session_in_child_process(mocker: MockerFixture) -> None:
+        """The session inherited over fork should be abandoned without closing."""
+        session_parent = ShowroomApi.get_session()
+        spy_close = mocker.spy(session_parent, "close")
+        mocker.patch("showroompodcast.api.os.getpid", return_value=-1)
+        session_child = ShowroomApi.get_session()
+        assert session_child is not session_parent
+        assert ShowroomApi.get_session() is session_child
+        spy_close.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.usefixtures("closed_session")
+    def test_close_session(mocker: MockerFixture) -> None:
+        """The session should be closed and created again at next request."""
+        session = ShowroomApi.get_session()
+        spy_close = mocker.spy(session, "close")
+        ShowroomApi.close_session()
+        spy_close.assert_called_once_with()
+        assert ShowroomApi.get_session() is not session
@@ -2,16 +2,42 @@
 
 import pytest
 
+from showroompodcast.api import ShowroomApi
+from showroompodcast.api.streaming_url import Stream
 from showroompodcast.api.streaming_url import StreamingUrl
+from tests.conftest import FakeShowroomApi
+
+EXPECTED_URL = (
+    "https://hls-css.live.showroom-live.com/live/e528adc6d148858dc650976df10e3663205e6327663fc1475368bf0f9667ee41.m3u8"
+)
 
 
 class TestStreamingUrl:
+    """Tests for StreamingUrl."""
+
     @staticmethod
     @pytest.mark.usefixtures("mock_request_room_1_streaming_url")
     def test() -> None:
         room_id = 1
         url = StreamingUrl.get_url_for_best_quality(room_id)
-        assert url == (
-            "https://hls-css.live.showroom-live.com/live"
-            "/e528adc6d148858dc650976df10e3663205e6327663fc1475368bf0f9667ee41.m3u8"
-        )
+        assert url == EXPECTED_URL
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_async(fake_showroom_api_room_1_streaming_url: FakeShowroomApi) -> None:
+        """Best quality URL should be found, or None when no URL is available yet."""
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            url = await StreamingUrl.find_url_for_best_quality_async(session, 1)
+            assert url == EXPECTED_URL
+            fake_showroom_api_room_1_streaming_url.streaming_url[1] = "{}"
+            assert await StreamingUrl.find_url_for_best_quality_async(session, 1) is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("quality_maximum", "expected"),
+        [(0, "high"), (1500, "high"), (1000, "medium"), (100, "low")],
+    )
+    def test_select_stream(quality_maximum: int, expected: str) -> None:
+        """The best stream within quality admitted should be selected, or the lowest when all exceed."""
+        list_stream = [Stream("high", 1500), Stream("medium", 500), Stream("low", 150)]
+        assert StreamingUrl.select_stream(list_stream, quality_maximum).url == expected
@@ -0,0 +1,15 @@
+"""Tests for benchmark.py."""
+
+from benchmarks.benchmark import parse_metrics
+
+
+def test_parse_metrics() -> None:
+    """Samples should be summed over labels."""
+    text = (
+        "# HELP showroom_bytes_written_total Bytes of archive written.\n"
+        "# TYPE showroom_bytes_written_total counter\n"
+        'showroom_bytes_written_total{room_id="1"} 10.0\n'
+        'showroom_bytes_written_total{room_id="2"} 20.0\n'
+        "showroom_sweep_duration_seconds_count 3\n"
+    )
+    assert parse_metrics(text) == {"showroom_bytes_written_total": 30.0, "showroom_sweep_duration_seconds_count": 3.0}
@@ -0,0 +1,56 @@
+"""Tests for fake_showroom.py."""
+
+import time
+
+import requests
+
+from benchmarks.fake_showroom import FakeShowroom
+from benchmarks.fake_showroom import Live
+from benchmarks.fake_showroom import Scenario
+
+
+class TestLive:
+    """Tests for Live."""
+
+    @staticmethod
+    def test_count_segment_dropped() -> None:
+        """Segments before recording started aren't dropped, tail is dropped only after live ends."""
+        live = Live(time_start=0.0, time_end=10.0, seconds_segment=1.0, set_sequence_requested={2, 3, 5})
+        expected_dropped_on_live = 1
+        expected_dropped_after_live = 5
+        assert live.count_segment_dropped(now=7.0) == expected_dropped_on_live
+        assert live.count_segment_dropped(now=11.0) == expected_dropped_after_live
+
+
+class TestFakeShowroom:
+    """Tests for FakeShowroom."""
+
+    @staticmethod
+    def test() -> None:
+        """Live should be detected and archived without drop."""
+        scenario = Scenario(
+            number_room=2,
+            live_probability=1.0,
+            seconds_live_start_within=0.0,
+            seconds_live=0.5,
+            latency=0.0,
+            error_rate=0.0,
+            seconds_segment=0.1,
+            bytes_segment=4,
+        )
+        fake_showroom = FakeShowroom(scenario)
+        with fake_showroom.serve() as url:
+            assert "live_end" not in requests.get(f"{url}/api/live/polling?room_id=1", timeout=10).json()
+            response = requests.get(f"{url}/api/live/streaming_url?room_id=1", timeout=10).json()
+            url_playlist = response["streaming_url_list"][0]["url"]
+            time.sleep(0.6)
+            playlist = requests.get(url_playlist, timeout=10).text
+            list_segment = [line for line in playlist.splitlines() if line.endswith(".ts")]
+            for segment in list_segment:
+                assert requests.get(url_playlist.replace("playlist.m3u8", segment), timeout=10).content == bytes(4)
+            summary = fake_showroom.summarize()
+        assert playlist.endswith("#EXT-X-ENDLIST")
+        assert summary["lives"] == scenario.number_room
+        assert summary["lives_detected"] == 1
+        assert summary["segments_requested"] == scenario.number_segment_in_playlist
+        assert summary["segments_dropped"] == 0
@@ -0,0 +1,27 @@
+"""Tests for import_time.py."""
+
+import pytest
+
+from benchmarks.import_time import ENTRY_POINTS
+from benchmarks.import_time import EntryPoint
+from benchmarks.import_time import ImportTime
+from benchmarks.import_time import measure
+from benchmarks.import_time import parse_import_time
+
+
+def test_parse_import_time() -> None:
+    """Cumulative time should be parsed by module, header should be skipped."""
+    text = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      1000 |       1500 |     click.core\n"
+        "import time:       200 |       1700 | click\n"
+    )
+    assert parse_import_time(text) == ImportTime({"_io": 120, "click.core": 1500, "click": 1700})
+
+
+@pytest.mark.parametrize("entry_point", ENTRY_POINTS, ids=lambda entry_point: entry_point.module)
+def test_forbidden(entry_point: EntryPoint) -> None:
+    """Entry points should not import heavy dependencies which they don't use."""
+    import_time = measure(entry_point.module)
+    assert import_time.list_imported(entry_point.forbidden) == []
@@ -3,7 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import fnmatch
 import json
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
 from datetime import timezone
 from pathlib import Path
@@ -13,6 +22,7 @@ from typing import Any
 import pytest
 import pytest_asyncio
 import requests_mock
+from aiohttp import web
 from asynccpu.process_task_pool_executor import ProcessTaskPoolExecutor
 from asyncffmpeg.exceptions import FFmpegProcessError
 from asyncffmpeg.ffmpeg_coroutine_factory import FFmpegCoroutineFactory
@@ -21,6 +31,12 @@ from slack_sdk.errors import SlackApiError
 from slack_sdk.web.slack_response import SlackResponse
 
 import showroompodcast.slack.slack_client
+from showroompodcast.api.onlives import Onlives
+from showroompodcast.api.polling import Polling
+from showroompodcast.api.streaming_url import StreamingUrl
+from showroompodcast.shard.redis_lease_backend import RedisLeaseBackend
+from showroompodcast.state_store import StateStore
+from showroompodcast.worker_pool import WorkerPool
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable
@@ -34,6 +50,12 @@ if TYPE_CHECKING:
     from asyncffmpeg.ffmpegprocess.interface import FFmpegProcess
     from pytest_mock import MockerFixture
 
+    from showroompodcast.config import WorkerConfig
+
+    CreateWorkerPool = Callable[[WorkerConfig], WorkerPool]
+
+OUT_FILE_NAME_RECORDING = "./output/1-2021_08_07-21_00_00.mp4"
+
 
 # Reason: Mock pylint: disable-next=too-few-public-methods
 class MockFFmpegCoroutine:
@@ -42,7 +64,7 @@ class MockFFmpegCoroutine:
     def __init__(
         self,
         mocker: MockerFixture,
-        side_effect: Callable[[Callable[[], Awaitable[StreamSpec]]], Awaitable[StreamSpec]],
+        side_effect: Callable[..., Awaitable[None]],
     ) -> None:
         self.execute = mocker.AsyncMock(side_effect=side_effect)
 
@@ -78,7 +100,12 @@ class MockSlackWebClient:
         return mock_chat_post_message  # type: ignore[no-any-return]
 
 
-async def sleep_one_second(_: Callable[[], Awaitable[StreamSpec]]) -> None:
+async def sleep_one_second(
+    _: Callable[[], Awaitable[StreamSpec]],
+    *,
+    # Reason: Same signature as FFmpegCoroutine.execute(). pylint: disable-next=unused-argument
+    after_start: Callable[[FFmpegProcess], Awaitable[Any]] | None = None,  # noqa: ARG001
+) -> None:
     await asyncio.sleep(1)
 
 
@@ -188,6 +215,356 @@ class MockPolling:
             yield
 
 
+class FakeShowroomApi:
+    """Fake SHOWROOM API served on localhost to test requests via aiohttp."""
+
+    PATH_POLLING = "/api/live/polling"
+    PATH_ONLIVES = "/api/live/onlives"
+    PATH_STREAMING_URL = "/api/live/streaming_url"
+    TEXT_NOT_ON_LIVE = '{"live_end":1,"invalid":1}'
+    TEXT_ON_LIVE = '{"is_login":true,"online_user_num":411,"live_watch_incentive":{}}'
+
+    def __init__(self) -> None:
+        self.polling: dict[int, tuple[int, str]] = {}
+        self.count_request_polling: Counter[int] = Counter()
+        self.onlives: tuple[int, str] = (200, json.dumps({"onlives": []}))
+        self.count_request_onlives = 0
+        self.streaming_url: dict[int, str] = {}
+        self.application = web.Application()
+        self.application.router.add_get(self.PATH_POLLING, self.handle_polling)
+        self.application.router.add_get(self.PATH_ONLIVES, self.handle_onlives)
+        self.application.router.add_get(self.PATH_STREAMING_URL, self.handle_streaming_url)
+
+    def not_on_live(self, list_room_id: list[int]) -> FakeShowroomApi:
+        self.polling.update(dict.fromkeys(list_room_id, (200, self.TEXT_NOT_ON_LIVE)))
+        return self
+
+    def on_live(self, list_room_id: list[int]) -> FakeShowroomApi:
+        self.polling.update(dict.fromkeys(list_room_id, (200, self.TEXT_ON_LIVE)))
+        return self
+
+    def status_503(self, list_room_id: list[int]) -> FakeShowroomApi:
+        self.polling.update(dict.fromkeys(list_room_id, (503, "")))
+        return self
+
+    def listed_on_live(self, list_list_room_id: list[list[int]]) -> FakeShowroomApi:
+        """Lists rooms on live, each list of room IDs is a genre."""
+        onlives = [
+            {"genre_id": index, "lives": [{"room_id": room_id} for room_id in list_room_id]}
+            for index, list_room_id in enumerate(list_list_room_id)
+        ]
+        self.onlives = (200, json.dumps({"onlives": onlives}))
+        return self
+
+    async def handle_onlives(self, _request: web.Request) -> web.Response:
+        self.count_request_onlives += 1
+        status, text = self.onlives
+        return web.Response(status=status, text=text)
+
+    async def handle_streaming_url(self, request: web.Request) -> web.Response:
+        room_id = int(request.query["room_id"])
+        return web.Response(text=self.streaming_url.get(room_id, "{}"))
+
+    async def handle_polling(self, request: web.Request) -> web.Response:
+        room_id = int(request.query["room_id"])
+        self.count_request_polling[room_id] += 1
+        status, text = self.polling[room_id]
+        return web.Response(status=status, text=text)
+
+    @contextmanager
+    def serve(self, mocker: MockerFixture) -> Generator[FakeShowroomApi, None, None]:
+        """Serves and points API classes to this server."""
+        with serve_on_thread(self.application) as url:
+            mocker.patch.object(Polling, "url", return_value=url + self.PATH_POLLING)
+            mocker.patch.object(Onlives, "url", return_value=url + self.PATH_ONLIVES)
+            mocker.patch.object(StreamingUrl, "url", return_value=url + self.PATH_STREAMING_URL)
+            yield self
+
+
+class FakeHlsOrigin:
+    """Fake HLS origin which serves live playlist advancing one segment for each request."""
+
+    PATH_PLAYLIST = "/live/playlist.m3u8"
+    TARGET_DURATION = 0.1
+
+    def __init__(self, number_segment: int, *, number_segment_in_playlist: int = 3) -> None:
+        self.number_segment = number_segment
+        self.number_segment_in_playlist = number_segment_in_playlist
+        self.count_request_playlist = 0
+        self.url = ""
+        self.application = web.Application()
+        self.application.router.add_get(self.PATH_PLAYLIST, self.handle_playlist)
+        self.application.router.add_get("/live/{sequence}.ts", self.handle_segment)
+
+    @staticmethod
+    def create_segment(sequence: int) -> bytes:
+        return f"segment{sequence};".encode()
+
+    async def handle_playlist(self, _request: web.Request) -> web.Response:
+        """Serves live playlist which advances one segment, and ends when the last segment is listed."""
+        self.count_request_playlist += 1
+        end = min(self.count_request_playlist + self.number_segment_in_playlist - 1, self.number_segment)
+        start = max(0, end - self.number_segment_in_playlist)
+        lines = ["#EXTM3U", f"#EXT-X-TARGETDURATION:{self.TARGET_DURATION}", f"#EXT-X-MEDIA-SEQUENCE:{start}"]
+        for sequence in range(start, end):
+            lines.extend([f"#EXTINF:{self.TARGET_DURATION},", f"{sequence}.ts"])
+        if end == self.number_segment:
+            lines.append("#EXT-X-ENDLIST")
+        return web.Response(text="\n".join(lines))
+
+    async def handle_segment(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.create_segment(int(request.match_info["sequence"])))
+
+    @contextmanager
+    def serve(self) -> Generator[FakeHlsOrigin, None, None]:
+        with serve_on_thread(self.application) as url:
+            self.url = url + self.PATH_PLAYLIST
+            yield self
+
+
+class FakeS3:
+    """Fake S3 compatible object storage which supports multipart upload."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.count_request_upload_part = 0
+        # Status to reply to upload part, to fail uploading.
+        self.status_upload_part = 200
+        self.url = ""
+        self.application = web.Application()
+        self.application.router.add_route("*", "/{bucket}/{key:.+}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Handles steps of multipart upload including abort, requests without signature are forbidden."""
+        if not request.headers.get("Authorization", "").startswith("AWS4-HMAC-SHA256 Credential="):
+            return web.Response(status=403)
+        key = f"{request.match_info['bucket']}/{request.match_info['key']}"
+        if request.method == "POST" and "uploads" in request.query:
+            upload_id = f"upload{len(self.uploads)}"
+            self.uploads[upload_id] = {}
+            body = f"<InitiateMultipartUploadResult><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+            return web.Response(text=body)
+        parts = self.uploads[request.query["uploadId"]]
+        if request.method == "PUT":
+            self.count_request_upload_part += 1
+            if self.status_upload_part != web.HTTPOk.status_code:
+                return web.Response(status=self.status_upload_part)
+            parts[int(request.query["partNumber"])] = await request.read()
+            return web.Response(headers={"ETag": f'"etag{request.query["partNumber"]}"'})
+        if request.method == "POST":
+            self.objects[key] = b"".join(parts[number] for number in sorted(parts))
+        del self.uploads[request.query["uploadId"]]
+        return web.Response()
+
+    @contextmanager
+    def serve(self) -> Generator[FakeS3, None, None]:
+        with serve_on_thread(self.application) as url:
+            self.url = url
+            yield self
+
+
+class FakeRedis:
+    """Local stand-in of Redis which supports commands and scripts RedisLeaseBackend uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[str, float | None]] = {}
+        self.url = ""
+
+    def get(self, key: str) -> str | None:
+        value, time_expire = self.data.get(key, ("", None))
+        if key not in self.data or (time_expire is not None and time_expire <= time.monotonic()):
+            self.data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: str, value: str, milliseconds: int) -> None:
+        self.data[key] = (value, time.monotonic() + milliseconds / 1000)
+
+    def execute(self, command: str, *args: str) -> Any:  # noqa: ANN401
+        """Supports only commands which RedisLeaseBackend sends."""
+        if command in ("AUTH", "SELECT", "PING"):
+            return "OK"
+        if command == "GET":
+            return self.get(args[0])
+        if command == "MGET":
+            return [self.get(key) for key in args]
+        if command == "SCAN":
+            pattern = args[args.index("MATCH") + 1]
+            return ["0", [key for key in list(self.data) if fnmatch.fnmatchcase(key, pattern) and self.get(key)]]
+        if command == "EVAL":
+            return self.evaluate(*args)
+        msg = f"ERR unknown command '{command}'"
+        raise ValueError(msg)
+
+    def evaluate(self, script: str, _number_key: str, key: str, owner: str, *args: str) -> int:
+        """Emulates Lua scripts of RedisLeaseBackend instead of interpreting them."""
+        owner_current = self.get(key)
+        if script == RedisLeaseBackend.SCRIPT_ACQUIRE:
+            if owner_current not in (None, owner):
+                return 0
+            self.set(key, owner, int(args[0]))
+            return 1
+        if script == RedisLeaseBackend.SCRIPT_RELEASE and owner_current == owner:
+            del self.data[key]
+            return 1
+        return 0
+
+    @classmethod
+    def encode(cls, reply: Any) -> bytes:  # noqa: ANN401
+        """Encodes reply in RESP, ValueError as error reply."""
+        if isinstance(reply, ValueError):
+            return f"-{reply}\r\n".encode()
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, list):
+            return f"*{len(reply)}\r\n".encode() + b"".join(cls.encode(item) for item in reply)
+        return f"${len(reply.encode())}\r\n{reply}\r\n".encode()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handles commands of connection one by one until client closes it."""
+        try:
+            while header := await reader.readline():
+                args = []
+                for _ in range(int(header[1:])):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+                try:
+                    command, *arguments = args
+                    reply = self.execute(command, *arguments)
+                except ValueError as error:
+                    reply = error
+                writer.write(self.encode(reply))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    @contextmanager
+    def serve(self) -> Generator[FakeRedis, None, None]:
+        """Serves on another thread with independent event loop, as same as serve_on_thread()."""
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(self.handle, "127.0.0.1", 0))
+        host, port = server.sockets[0].getsockname()[:2]
+        self.url = f"redis://{host}:{port}/0"
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            server.close()
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+
+
+class FakeSlack:
+    """Fake Slack Web API which records messages posted, and rate limits first requests if configured."""
+
+    def __init__(self, count_rate_limited: int = 0) -> None:
+        self.count_rate_limited = count_rate_limited
+        self.messages: list[dict[str, Any]] = []
+        self.count_request = 0
+        self.url = ""
+        self.application = web.Application()
+        self.application.router.add_post("/chat.postMessage", self.handle_post_message)
+
+    async def handle_post_message(self, request: web.Request) -> web.Response:
+        self.count_request += 1
+        if self.count_request <= self.count_rate_limited:
+            return web.json_response({"ok": False, "error": "ratelimited"}, status=429, headers={"Retry-After": "0"})
+        message = await request.json() if request.content_type == "application/json" else dict(await request.post())
+        self.messages.append(message)
+        return web.json_response({"ok": True, "channel": message["channel"], "ts": str(len(self.messages))})
+
+    @contextmanager
+    def serve(self) -> Generator[FakeSlack, None, None]:
+        with serve_on_thread(self.application) as url:
+            self.url = url + "/"
+            yield self
+
+
+@contextmanager
+def serve_on_thread(application: web.Application) -> Generator[str, None, None]:
+    """Serves application on another thread, and returns base URL.
+
+    The event loop is independent so that both synchronous and asynchronous tests can request.
+    """
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(application)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", 0).start())
+    host, port = runner.addresses[0][:2]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
+
+
+@pytest.fixture
+def fake_hls_origin() -> Generator[FakeHlsOrigin, None, None]:
+    with FakeHlsOrigin(number_segment=5).serve() as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_redis() -> Generator[FakeRedis, None, None]:
+    with FakeRedis().serve() as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_slack() -> Generator[FakeSlack, None, None]:
+    with FakeSlack().serve() as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_slack_rate_limited() -> Generator[FakeSlack, None, None]:
+    with FakeSlack(count_rate_limited=1).serve() as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_s3() -> Generator[FakeS3, None, None]:
+    with FakeS3().serve() as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_showroom_api(mocker: MockerFixture) -> Generator[FakeShowroomApi, None, None]:
+    with FakeShowroomApi().serve(mocker) as fake:
+        yield fake
+
+
+@pytest.fixture
+def fake_showroom_api_room_1_streaming_url(
+    resource_path_root: Path,
+    # Reason: pytest fixture.
+    fake_showroom_api: FakeShowroomApi,  # pylint: disable=redefined-outer-name
+) -> FakeShowroomApi:
+    """Fake SHOWROOM API which responds streaming URL of room 1."""
+    fake_showroom_api.streaming_url[1] = (resource_path_root / "response_streaming_url.json").read_text(
+        encoding="utf-8",
+    )
+    return fake_showroom_api
+
+
+@pytest.fixture
+# Reason: pytest fixture. pylint: disable-next=redefined-outer-name
+def fake_showroom_api_room_1_to_5_on_live(fake_showroom_api: FakeShowroomApi) -> FakeShowroomApi:
+    return fake_showroom_api.on_live(list(range(1, 6)))
+
+
 @pytest.fixture
 def mock_request_room_1_not_on_live() -> Generator[None, None, None]:
     yield from MockPolling.not_on_live([1])
@@ -203,11 +580,6 @@ def mock_request_room_1_503() -> Generator[None, None, None]:
     yield from MockPolling.status_503([1])
 
 
-@pytest.fixture
-def mock_request_room_1_to_5_on_live() -> Generator[None, None, None]:
-    yield from MockPolling.on_live(list(range(1, 6)))
-
-
 class MockStreamingUrl:
     """Mock of SHOWROOM streaming URL API."""
 
@@ -229,6 +601,41 @@ def mock_request_room_1_streaming_url(resource_path_root: Path) -> Generator[Non
     yield from MockStreamingUrl.mock_request_streaming_url(1, response_text)
 
 
+@pytest.fixture
+def process_sleeping() -> Generator[subprocess.Popen[bytes], None, None]:
+    """Process as a stand-in of FFmpeg, killed after test."""
+    with subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"]) as process:
+        yield process
+        process.kill()
+
+
+@pytest.fixture
+def process_recording() -> Generator[subprocess.Popen[bytes], None, None]:
+    """Process which has output file name in its command line as same as FFmpeg."""
+    # Reason: Arguments are fixed.
+    with subprocess.Popen(  # noqa: S603
+        [sys.executable, "-c", "import time; time.sleep(30)", OUT_FILE_NAME_RECORDING],
+    ) as process:
+        # To reap the process as soon as it exits, otherwise zombie is regarded as still running.
+        threading.Thread(target=process.wait, daemon=True).start()
+        yield process
+        process.kill()
+
+
+@pytest.fixture
+def pid_ended() -> int:
+    """PID of process which had output file name in its command line, it has exited."""
+    # Reason: Arguments are fixed.
+    with subprocess.Popen([sys.executable, "-c", "pass", OUT_FILE_NAME_RECORDING]) as process:  # noqa: S603
+        process.wait()
+    return process.pid
+
+
+@pytest.fixture
+def state_store(tmp_path: Path) -> StateStore:
+    return StateStore(str(tmp_path / "state.sqlite3"))
+
+
 @pytest.fixture
 def existing_file_2021_08_07_21_00_00() -> Generator[TextIOWrapper, None, None]:
     path_to_file_example = create_path_to_file_2021_08_07_21_00_00()
@@ -279,8 +686,45 @@ def create_mock_ffmpeg_coroutine(mocker: MockerFixture, side_effect: Any) -> FFm
 def mock_process_task_pool_executor(mocker: MockerFixture) -> None:
     """Mocks ProcessTaskPoolExecutor."""
     process_task_executor = ProcessTaskPoolExecutor()
-    mock_method = mocker.MagicMock(side_effect=[None, None, None, None, FFmpegProcessError("", 127)])
+    # Futures never finish, as if archiving continues.
+    list_future: list[Future[None] | FFmpegProcessError] = [Future() for _ in range(4)]
+    mock_method = mocker.MagicMock(side_effect=[*list_future, FFmpegProcessError("", 127)])
     # Reason: Creating Mock.
     process_task_executor.create_process_task = mock_method  # type: ignore[method-assign]
     mock_constructor = mocker.MagicMock(return_value=process_task_executor)
     mocker.patch("showroompodcast.showroom_podcast.ProcessTaskPoolExecutor", mock_constructor)
+
+
+class FakeExecutor:
+    """Executor whose process tasks finish only when test finishes them."""
+
+    def __init__(self, mocker: MockerFixture) -> None:
+        self.list_future: list[asyncio.Future[None]] = []
+        self.original_sigint_handler = signal.getsignal(signal.SIGTERM)
+        self.shutdown: MagicMock = mocker.MagicMock()
+
+    def create_process_task(self, _function_coroutine: object, *_args: object) -> asyncio.Future[None]:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self.list_future.append(future)
+        return future
+
+
+@pytest.fixture
+def list_executor() -> list[FakeExecutor]:
+    return []
+
+
+@pytest.fixture
+# Reason: Test receives the same list_executor. pylint: disable-next=redefined-outer-name
+def create_worker_pool(mocker: MockerFixture, list_executor: list[FakeExecutor]) -> CreateWorkerPool:
+    """Creates worker pool which creates fake executor, list_executor collects executors created."""
+
+    def create_executor(_max_workers: int) -> FakeExecutor:
+        executor = FakeExecutor(mocker)
+        list_executor.append(executor)
+        return executor
+
+    def create(worker_config: WorkerConfig) -> WorkerPool:
+        return WorkerPool(create_executor, 1, worker_config)  # type: ignore[arg-type]
+
+    return create
@@ -0,0 +1 @@
+"""HLS."""
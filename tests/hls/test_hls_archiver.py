@@ -0,0 +1,93 @@
+"""Tests for hls_archiver.py."""
+
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from showroompodcast.api import ShowroomApi
+from showroompodcast.config import S3Config
+from showroompodcast.hls.hls_archiver import HlsArchiver
+from showroompodcast.remuxer import Remuxer
+from showroompodcast.sink.s3_sink import S3Sink
+from tests.conftest import FakeHlsOrigin
+from tests.conftest import FakeS3
+
+
+class TestHlsArchiver:
+    """Tests for HlsArchiver."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_now_2021_08_07_21_00_00")
+    async def test(
+        fake_hls_origin: FakeHlsOrigin,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        mocker: MockerFixture,
+    ) -> None:
+        """Recorded MPEG-TS should be remuxed into MP4, then removed."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        mock_remux = mocker.patch.object(Remuxer, "remux")
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            await HlsArchiver(session).archive(1, streaming_url=fake_hls_origin.url)
+        mock_remux.assert_called_once_with("./output/1-2021_08_07-21_00_00.ts", "./output/1-2021_08_07-21_00_00.mp4")
+        assert not (tmp_path / "output" / "1-2021_08_07-21_00_00.ts").exists()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_now_2021_08_07_21_00_00")
+    async def test_without_remux(
+        fake_hls_origin: FakeHlsOrigin,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Recorded MPEG-TS should be kept as is."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            await HlsArchiver(session, remux=False).archive(1, streaming_url=fake_hls_origin.url)
+        assert (tmp_path / "output" / "1-2021_08_07-21_00_00.ts").stat().st_size > 0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_now_2021_08_07_21_00_00")
+    async def test_s3(
+        fake_hls_origin: FakeHlsOrigin,
+        fake_s3: FakeS3,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """MPEG-TS should be streamed into object storage, then local copy should be removed."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        s3_config = S3Config(endpoint_url=fake_s3.url, bucket="archive", access_key_id="access_key_id")
+        async with ShowroomApi.create_client_session(limit=1) as session, S3Sink(s3_config) as s3_sink:
+            await HlsArchiver(session, sink=s3_sink).archive(1, streaming_url=fake_hls_origin.url)
+        list_sequence = range(fake_hls_origin.number_segment)
+        expected = b"".join(FakeHlsOrigin.create_segment(sequence) for sequence in list_sequence)
+        assert fake_s3.objects == {"archive/1-2021_08_07-21_00_00.ts": expected}
+        assert not list((tmp_path / "output").iterdir())
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_now_2021_08_07_21_00_00")
+    async def test_s3_failed(
+        fake_hls_origin: FakeHlsOrigin,
+        fake_s3: FakeS3,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Recording should continue into local copy when upload failed, which is kept to upload later."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        fake_s3.status_upload_part = 500
+        s3_config = S3Config(endpoint_url=fake_s3.url, bucket="archive", access_key_id="access_key_id", part_size=1)
+        async with ShowroomApi.create_client_session(limit=1) as session, S3Sink(s3_config) as s3_sink:
+            await HlsArchiver(session, sink=s3_sink).archive(1, streaming_url=fake_hls_origin.url)
+        list_sequence = range(fake_hls_origin.number_segment)
+        expected = b"".join(FakeHlsOrigin.create_segment(sequence) for sequence in list_sequence)
+        assert (tmp_path / "output" / "1-2021_08_07-21_00_00.ts").read_bytes() == expected
+        assert fake_s3.objects == {}
+        assert fake_s3.uploads == {}
@@ -0,0 +1,125 @@
+"""Tests for hls_recorder.py."""
+
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+from aiohttp import ClientConnectionError
+from aiohttp import ClientError
+from aiohttp import ClientResponseError
+
+from showroompodcast.api import ShowroomApi
+from showroompodcast.config import RetryConfig
+from showroompodcast.hls.hls_recorder import HlsRecorder
+from showroompodcast.hls.hls_recorder import classify
+from showroompodcast.hls.playlist import MediaPlaylist
+from showroompodcast.retry_policy import END_OF_FILE
+from showroompodcast.retry_policy import NOT_FOUND
+from showroompodcast.retry_policy import SERVER_ERROR
+from showroompodcast.retry_policy import TIMEOUT
+from showroompodcast.retry_policy import RetryPolicy
+from showroompodcast.sink.local_sink import LocalSink
+from tests.conftest import FakeHlsOrigin
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+    from showroompodcast.retry_policy import ErrorClass
+
+
+def create_client_response_error(status: int) -> ClientResponseError:
+    return ClientResponseError(request_info=None, history=(), status=status)  # type: ignore[arg-type]
+
+
+class TestHlsRecorder:
+    """Tests for HlsRecorder."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(fake_hls_origin: FakeHlsOrigin, tmp_path: Path) -> None:
+        """All segments should be written once in order until playlist ends."""
+        path = tmp_path / "1-2021_08_07-21_00_00.ts"
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            hls_recorder = HlsRecorder(session, 1, fake_hls_origin.url)
+            sink_writer = await LocalSink(str(tmp_path)).open(path.name)
+            await hls_recorder.record(sink_writer)
+            await sink_writer.close()
+        list_sequence = range(fake_hls_origin.number_segment)
+        assert path.read_bytes() == b"".join(FakeHlsOrigin.create_segment(sequence) for sequence in list_sequence)
+        assert hls_recorder.number_segment_written == fake_hls_origin.number_segment
+        assert hls_recorder.number_segment_dropped == 0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_live_end_without_end_list(
+        fake_hls_origin: FakeHlsOrigin,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Recording should finish when retry policy gives up fetching playlist."""
+        monkeypatch.setattr("showroompodcast.retry_policy.asyncio.sleep", _no_sleep)
+        path = tmp_path / "1-2021_08_07-21_00_00.ts"
+        retry_policy = RetryPolicy(RetryConfig(maximum_attempts=2))
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            sink_writer = await LocalSink(str(tmp_path)).open(path.name)
+            hls_recorder = HlsRecorder(session, 1, fake_hls_origin.url + "/not_found", retry_policy=retry_policy)
+            await hls_recorder.record(sink_writer)
+            await sink_writer.close()
+        assert path.read_bytes() == b""
+        assert hls_recorder.number_failure == retry_policy.retry_config.maximum_attempts
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_live_ended(fake_hls_origin: FakeHlsOrigin, tmp_path: Path) -> None:
+        """Recording should finish without waiting backoff when retry policy found live ended."""
+
+        async def is_on_live() -> bool:
+            return False
+
+        path = tmp_path / "1-2021_08_07-21_00_00.ts"
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            sink_writer = await LocalSink(str(tmp_path)).open(path.name)
+            retry_policy = RetryPolicy(is_on_live=is_on_live)
+            hls_recorder = HlsRecorder(session, 1, fake_hls_origin.url + "/not_found", retry_policy=retry_policy)
+            await hls_recorder.record(sink_writer)
+            await sink_writer.close()
+        assert hls_recorder.number_failure == 1
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (asyncio.TimeoutError(), TIMEOUT),
+            (ClientConnectionError(), END_OF_FILE),
+            (create_client_response_error(HTTPStatus.NOT_FOUND), NOT_FOUND),
+            (create_client_response_error(HTTPStatus.SERVICE_UNAVAILABLE), SERVER_ERROR),
+            (create_client_response_error(HTTPStatus.FORBIDDEN), None),
+        ],
+    )
+    def test_classify(error: ClientError | asyncio.TimeoutError, expected: ErrorClass | None) -> None:
+        """Errors of fetching playlist should be classified to retry, except client errors other than 404."""
+        assert classify(error) == expected
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_restart(mocker: MockerFixture) -> None:
+        """Segments after media sequence restarted should be written, though playlist slightly behind should not."""
+        hls_recorder = HlsRecorder(mocker.MagicMock(), 1, "https://example.com/playlist.m3u8")
+        mocker.patch.object(hls_recorder, "fetch_bytes", side_effect=lambda url: url.encode())
+        sink_writer = mocker.AsyncMock()
+        for list_sequence in [[10, 11, 12], [9, 10, 11], [0, 1, 2]]:
+            list_line = ["#EXTM3U", f"#EXT-X-MEDIA-SEQUENCE:{list_sequence[0]}"]
+            text = "\n".join(list_line + [f"{sequence}.ts" for sequence in list_sequence])
+            await hls_recorder.write_new_segments(MediaPlaylist.parse(text, "https://example.com/"), sink_writer)
+        list_data = [call.args[0] for call in sink_writer.write.await_args_list]
+        assert list_data == [f"https://example.com/{sequence}.ts".encode() for sequence in [10, 11, 12, 0, 1, 2]]
+        assert hls_recorder.number_segment_dropped == 0
+
+
+async def _no_sleep(_: float) -> None:
+    pass
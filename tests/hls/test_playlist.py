@@ -0,0 +1,74 @@
+"""Tests for playlist.py."""
+
+import pytest
+
+from showroompodcast.hls.playlist import MasterPlaylist
+from showroompodcast.hls.playlist import MediaPlaylist
+from showroompodcast.hls.playlist import Segment
+
+URL_PLAYLIST = "https://hls-css.live.showroom-live.com/live/abcdef.m3u8"
+TEXT_MASTER_PLAYLIST = (
+    "#EXTM3U\n"
+    "#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=300000\n"
+    "low/index.m3u8\n"
+    "#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=1500000\n"
+    "high/index.m3u8\n"
+)
+
+
+class TestMediaPlaylist:
+    """Tests for MediaPlaylist."""
+
+    @staticmethod
+    def test() -> None:
+        """Segments should be numbered from media sequence and resolved by URL of playlist."""
+        text = (
+            "#EXTM3U\n"
+            "#EXT-X-VERSION:3\n"
+            "#EXT-X-TARGETDURATION:2\n"
+            "#EXT-X-MEDIA-SEQUENCE:100\n"
+            "#EXTINF:2.000,\n"
+            "abcdef-100.ts\n"
+            "#EXTINF:2.000,\n"
+            "https://example.com/abcdef-101.ts\n"
+        )
+        playlist = MediaPlaylist.parse(text, URL_PLAYLIST)
+        expected_target_duration = 2.0
+        assert playlist.target_duration == expected_target_duration
+        assert playlist.segments == [
+            Segment(100, "https://hls-css.live.showroom-live.com/live/abcdef-100.ts"),
+            Segment(101, "https://example.com/abcdef-101.ts"),
+        ]
+        assert not playlist.is_end
+        assert MediaPlaylist.parse(text + "\n#EXT-X-ENDLIST\n", URL_PLAYLIST).is_end
+
+
+class TestMasterPlaylist:
+    """Tests for MasterPlaylist."""
+
+    @staticmethod
+    def test() -> None:
+        """Variant stream which has the highest bandwidth should be returned."""
+        url = MasterPlaylist.find_url_for_best_quality(TEXT_MASTER_PLAYLIST, URL_PLAYLIST)
+        assert url == "https://hls-css.live.showroom-live.com/live/high/index.m3u8"
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        ("bandwidth_maximum", "expected"),
+        [
+            (1000000, "https://hls-css.live.showroom-live.com/live/low/index.m3u8"),
+            (200000, "https://hls-css.live.showroom-live.com/live/low/index.m3u8"),
+            (1500000, "https://hls-css.live.showroom-live.com/live/high/index.m3u8"),
+        ],
+    )
+    def test_bandwidth_maximum(bandwidth_maximum: int, expected: str) -> None:
+        """Variant stream within bandwidth admitted should be returned, or the lowest when all exceed."""
+        assert (
+            MasterPlaylist.find_url_for_best_quality(TEXT_MASTER_PLAYLIST, URL_PLAYLIST, bandwidth_maximum) == expected
+        )
+
+    @staticmethod
+    def test_media_playlist() -> None:
+        """None should be returned for media playlist."""
+        text = "#EXTM3U\n#EXT-X-TARGETDURATION:2\n#EXTINF:2.000,\nabcdef-100.ts\n"
+        assert MasterPlaylist.find_url_for_best_quality(text, URL_PLAYLIST) is None
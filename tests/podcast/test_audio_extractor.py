@@ -0,0 +1,56 @@
+"""Tests for audio_extractor.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.config import PodcastConfig
+from showroompodcast.podcast.audio_extractor import AudioExtractor
+
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def mock_exec(mocker: MockerFixture) -> MagicMock:
+    """Mocks FFmpeg, which isn't limited since the process doesn't exist."""
+    mocker.patch("showroompodcast.remuxer.ResourceLimiter.limit_ffmpeg")
+    mock_process = mocker.MagicMock(returncode=0, pid=123)
+    mock_process.communicate = mocker.AsyncMock(return_value=(b"", b""))
+    mock: MagicMock = mocker.patch("asyncio.create_subprocess_exec", return_value=mock_process)
+    return mock
+
+
+class TestAudioExtractor:
+    """Tests for AudioExtractor."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("loudness", "codecs", "expected_codec", "expected_filter"),
+        [
+            (0.0, "h264,aac", "copy", False),
+            (0.0, "h264,mp3", "aac", False),
+            (-16.0, "h264,aac", "aac", True),
+        ],
+    )
+    async def test(
+        # Reason: Fixture of this module.
+        mock_exec: MagicMock,  # pylint: disable=redefined-outer-name
+        loudness: float,
+        codecs: str,
+        expected_codec: str,
+        expected_filter: bool,  # noqa: FBT001
+    ) -> None:
+        """AAC should be copied without re-encoding unless loudness is normalized."""
+        audio_extractor = AudioExtractor(PodcastConfig(loudness=loudness))
+        await audio_extractor.extract("1-2021_08_07-21_00_00.mp4", "1-2021_08_07-21_00_00.m4a", codecs)
+        arguments = list(mock_exec.call_args.args)
+        assert arguments[arguments.index("-acodec") + 1] == expected_codec
+        assert arguments[arguments.index("-f") + 1] == "ipod"
+        assert any("loudnorm" in argument for argument in arguments) == expected_filter
+        assert "1-2021_08_07-21_00_00.m4a" in arguments
@@ -0,0 +1,54 @@
+"""Tests for episode_index.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.exceptions import RecordingIndexError
+from showroompodcast.podcast.episode_index import Episode
+from showroompodcast.podcast.episode_index import EpisodeIndex
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def create_episode(room_id: int, string_datetime: str, time_start: float) -> Episode:
+    return Episode(
+        name=f"{room_id}-{string_datetime}.m4a",
+        room_id=room_id,
+        name_recording=f"{room_id}-{string_datetime}.mp4",
+        time_start=time_start,
+        duration=60.0,
+        size=10,
+        mime_type="audio/mp4",
+    )
+
+
+class TestEpisodeIndex:
+    """Tests for EpisodeIndex."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path) -> None:
+        """Episodes should be listed by room from the latest within limit."""
+        episode_index = EpisodeIndex(str(tmp_path / "index.sqlite3"))
+        list_episode = [
+            create_episode(1, "2021_08_07-21_00_00", 100.0),
+            create_episode(1, "2021_08_08-21_00_00", 200.0),
+            create_episode(1, "2021_08_09-21_00_00", 300.0),
+            create_episode(2, "2021_08_07-21_00_00", 100.0),
+        ]
+        for episode in list_episode:
+            await episode_index.upsert(episode)
+        assert await episode_index.list_latest(1, 2) == [list_episode[2], list_episode[1]]
+        assert await episode_index.set_name_recording(2) == {"2-2021_08_07-21_00_00.mp4"}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_error(tmp_path: Path) -> None:
+        """Database which can't be opened should raise RecordingIndexError."""
+        episode_index = EpisodeIndex(str(tmp_path / "not_exist" / "index.sqlite3"))
+        with pytest.raises(RecordingIndexError):
+            await episode_index.list_latest(1, 1)
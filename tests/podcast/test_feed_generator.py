@@ -0,0 +1,53 @@
+"""Tests for feed_generator.py."""
+
+from xml.etree.ElementTree import fromstring
+
+from showroompodcast.podcast.episode_index import Episode
+from showroompodcast.podcast.feed_generator import NAMESPACE_ITUNES
+from showroompodcast.podcast.feed_generator import FeedGenerator
+from showroompodcast.showroom_datetime import ShowroomDatetime
+
+
+class TestFeedGenerator:
+    """Tests for FeedGenerator."""
+
+    @staticmethod
+    def test() -> None:
+        """Each episode should be item which links audio file under base URL."""
+        time_start = ShowroomDatetime.decode("2021_08_07-21_00_00").timestamp()
+        episode = Episode(
+            name="1-2021_08_07-21_00_00.m4a",
+            room_id=1,
+            name_recording="1-2021_08_07-21_00_00.mp4",
+            time_start=time_start,
+            duration=3600.4,
+            size=10,
+            mime_type="audio/mp4",
+        )
+        feed = FeedGenerator("https://example.com/podcast/").generate(1, [episode])
+        # Reason: Feed is generated by this test itself.
+        channel = fromstring(feed).find("channel")  # noqa: S314
+        assert channel is not None
+        items = channel.findall("item")
+        assert len(items) == 1
+        assert items[0].findtext("title") == "Room 1 2021-08-07 21:00 JST"
+        assert items[0].findtext("pubDate") == "Sat, 07 Aug 2021 12:00:00 GMT"
+        assert items[0].findtext("guid") == "1-2021_08_07-21_00_00.mp4"
+        assert items[0].findtext(f"{{{NAMESPACE_ITUNES}}}duration") == "3600"
+        enclosure = items[0].find("enclosure")
+        assert enclosure is not None
+        assert enclosure.attrib == {
+            "url": "https://example.com/podcast/1/1-2021_08_07-21_00_00.m4a",
+            "length": "10",
+            "type": "audio/mp4",
+        }
+
+    @staticmethod
+    def test_empty() -> None:
+        """Feed without episodes should be still valid."""
+        feed = FeedGenerator("https://example.com/podcast").generate(1, [])
+        assert feed.startswith(b"<?xml")
+        # Reason: Feed is generated by this test itself.
+        channel = fromstring(feed).find("channel")  # noqa: S314
+        assert channel is not None
+        assert channel.findall("item") == []
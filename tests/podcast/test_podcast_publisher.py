@@ -0,0 +1,130 @@
+"""Tests for podcast_publisher.py."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from asyncffmpeg.exceptions import FFmpegProcessError
+
+from showroompodcast.config import PodcastConfig
+from showroompodcast.podcast.episode_index import EpisodeIndex
+from showroompodcast.podcast.podcast_publisher import PodcastPublisher
+from showroompodcast.recording_index import IndexedRecording
+from showroompodcast.recording_index import RecordingIndex
+from showroompodcast.recording_indexer import RecordingIndexer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import MagicMock
+
+    from pytest_mock import MockerFixture
+
+
+def create_recording(name: str, *, is_complete: bool = True) -> IndexedRecording:
+    return IndexedRecording(
+        name=name,
+        room_id=int(name.split("-", maxsplit=1)[0]),
+        time_start=1628337600.0,
+        time_end=1628341200.0,
+        duration=3600.0,
+        size=10,
+        mtime_ns=0,
+        format_name="mp4",
+        codecs="h264,aac",
+        is_complete=is_complete,
+    )
+
+
+@pytest.fixture
+def podcast_publisher(tmp_path: Path) -> PodcastPublisher:
+    path_index = str(tmp_path / "index.sqlite3")
+    podcast_config = PodcastConfig(directory=str(tmp_path / "podcast"))
+    recording_indexer = RecordingIndexer(RecordingIndex(path_index), str(tmp_path / "output"))
+    return PodcastPublisher(recording_indexer, EpisodeIndex(path_index), podcast_config, str(tmp_path / "output"))
+
+
+@pytest.fixture
+def mock_extract(mocker: MockerFixture) -> MagicMock:
+    """Mocks FFmpeg, which writes audio unless input name contains "broken"."""
+
+    async def extract(path_input: str, path_output: str, _codecs: str) -> None:
+        if "broken" in path_input:
+            msg = "Invalid data found"
+            raise FFmpegProcessError(msg, 1)
+        # Reason: Stand-in of FFmpeg writes small file.
+        with open(path_output, "wb") as file:  # noqa: ASYNC230,PTH123
+            file.write(b"audio")
+
+    mock: MagicMock = mocker.patch(
+        "showroompodcast.podcast.podcast_publisher.AudioExtractor.extract",
+        side_effect=extract,
+    )
+    return mock
+
+
+class TestPodcastPublisher:
+    """Tests for PodcastPublisher."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    # Reason: Fixtures of this module. pylint: disable-next=redefined-outer-name
+    async def test_publish(tmp_path: Path, podcast_publisher: PodcastPublisher, mock_extract: MagicMock) -> None:
+        """Only complete archives not extracted yet should be extracted, then feed should be written."""
+        await podcast_publisher.recording_indexer.recording_index.upsert(
+            [
+                create_recording("1-2021_08_07-21_00_00.mp4"),
+                create_recording("1-2021_08_07-22_00_00.mp4", is_complete=False),
+                create_recording("1-2021_08_07-23_00_00.broken.mp4"),
+                create_recording("2-2021_08_07-21_00_00.mp4"),
+            ],
+        )
+        await podcast_publisher.publish(1)
+        path_directory = tmp_path / "podcast" / "1"
+        assert sorted(path.name for path in path_directory.iterdir()) == ["1-2021_08_07-21_00_00.m4a", "feed.xml"]
+        assert b"1-2021_08_07-21_00_00.m4a" in (path_directory / "feed.xml").read_bytes()
+        number_extracted = 2
+        assert mock_extract.call_count == number_extracted
+        await podcast_publisher.publish(1)
+        # Archive failed to extract should be retried.
+        number_extracted = 3
+        assert mock_extract.call_count == number_extracted
+        assert mock_extract.call_args.args[0].endswith("1-2021_08_07-23_00_00.broken.mp4")
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_run(
+        # Reason: Fixtures of this module.
+        podcast_publisher: PodcastPublisher,  # pylint: disable=redefined-outer-name
+        mock_extract: MagicMock,  # pylint: disable=redefined-outer-name
+        mocker: MockerFixture,
+    ) -> None:
+        """Rooms archived should be published at start except rooms being archived, requested rooms after that."""
+        mocker.patch.object(podcast_publisher.recording_indexer, "index")
+        await podcast_publisher.recording_indexer.recording_index.upsert(
+            [create_recording("1-2021_08_07-21_00_00.mp4"), create_recording("2-2021_08_07-21_00_00.mp4")],
+        )
+        room_id_archiving = 2
+        mock_publish = mocker.patch.object(podcast_publisher, "publish")
+        podcast_publisher.request(3)
+        podcast_publisher.request(3)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(podcast_publisher.run(lambda room_id: room_id == room_id_archiving), timeout=0.1)
+        assert [call.args[0] for call in mock_publish.call_args_list] == [3, 1]
+        mock_extract.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    # Reason: Fixture of this module. pylint: disable-next=redefined-outer-name
+    async def test_work_unexpected_error(podcast_publisher: PodcastPublisher, mocker: MockerFixture) -> None:
+        """Unexpected error on a room should be logged, and worker should keep publishing other rooms."""
+        msg = "Unexpected"
+        mock_publish_room = mocker.patch.object(podcast_publisher, "publish_room", side_effect=[ValueError(msg), None])
+        mock_logger = mocker.patch.object(podcast_publisher, "logger")
+        podcast_publisher.request(1)
+        podcast_publisher.request(2)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(podcast_publisher.work(), timeout=0.1)
+        assert [call.args[0] for call in mock_publish_room.call_args_list] == [1, 2]
+        mock_logger.exception.assert_called_once()
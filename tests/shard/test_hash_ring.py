@@ -0,0 +1,37 @@
+"""Tests for hash_ring.py."""
+
+import pytest
+
+from showroompodcast.shard.hash_ring import HashRing
+
+NUMBER_ROOM = 3000
+
+
+class TestHashRing:
+    """Tests for HashRing."""
+
+    @staticmethod
+    def test_distribution() -> None:
+        """Rooms should be distributed roughly evenly."""
+        list_node = ["node-a", "node-b", "node-c"]
+        hash_ring = HashRing(list_node)
+        list_count = [
+            sum(1 for room_id in range(NUMBER_ROOM) if hash_ring.find(room_id) == node) for node in list_node
+        ]
+        expected_minimum = NUMBER_ROOM / len(list_node) / 2
+        assert all(count > expected_minimum for count in list_count)
+
+    @staticmethod
+    def test_node_leaves() -> None:
+        """Only rooms of the node left should move."""
+        hash_ring_before = HashRing(["node-a", "node-b", "node-c"])
+        hash_ring_after = HashRing(["node-a", "node-b"])
+        for room_id in range(NUMBER_ROOM):
+            node_before = hash_ring_before.find(room_id)
+            if node_before != "node-c":
+                assert hash_ring_after.find(room_id) == node_before
+
+    @staticmethod
+    def test_no_node() -> None:
+        with pytest.raises(ValueError, match="at least one node"):
+            HashRing([])
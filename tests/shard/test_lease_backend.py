@@ -0,0 +1,72 @@
+"""Tests for lease backends."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.exceptions import LeaseBackendError
+from showroompodcast.shard.file_lease_backend import FileLeaseBackend
+from showroompodcast.shard.redis_lease_backend import RedisLeaseBackend
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from showroompodcast.shard import LeaseBackend
+    from tests.conftest import FakeRedis
+
+SECONDS_LEASE = 0.2
+
+
+async def assert_lease_semantics(lease_backend: LeaseBackend) -> None:
+    """Lease should be exclusive until released or expired, and renewable by its owner."""
+    assert await lease_backend.acquire("test/room/1", "node-a", SECONDS_LEASE)
+    assert not await lease_backend.acquire("test/room/1", "node-b", SECONDS_LEASE)
+    assert await lease_backend.acquire("test/room/1", "node-a", SECONDS_LEASE)
+    assert await lease_backend.acquire("test/room/2", "node-b", SECONDS_LEASE)
+    assert await lease_backend.acquire("other/room/3", "node-c", SECONDS_LEASE)
+    assert sorted(await lease_backend.list_owner("test/")) == ["node-a", "node-b"]
+    await lease_backend.release("test/room/1", "node-b")
+    assert not await lease_backend.acquire("test/room/1", "node-b", SECONDS_LEASE)
+    await lease_backend.release("test/room/1", "node-a")
+    assert await lease_backend.acquire("test/room/1", "node-b", SECONDS_LEASE)
+    await asyncio.sleep(SECONDS_LEASE * 1.5)
+    assert await lease_backend.list_owner("test/") == []
+    assert await lease_backend.acquire("test/room/1", "node-a", SECONDS_LEASE)
+    await lease_backend.close()
+
+
+class TestFileLeaseBackend:
+    """Tests for FileLeaseBackend."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path) -> None:
+        await assert_lease_semantics(FileLeaseBackend(str(tmp_path / "leases")))
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_unavailable(tmp_path: Path) -> None:
+        """Error should be raised when directory is unavailable."""
+        path_file = tmp_path / "file"
+        path_file.write_text("", encoding="utf-8")
+        with pytest.raises(LeaseBackendError):
+            await FileLeaseBackend(str(path_file / "leases")).acquire("test/room/1", "node-a", SECONDS_LEASE)
+
+
+class TestRedisLeaseBackend:
+    """Tests for RedisLeaseBackend."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(fake_redis: FakeRedis) -> None:
+        await assert_lease_semantics(RedisLeaseBackend(fake_redis.url))
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_unavailable(unused_tcp_port: int) -> None:
+        """Error should be raised when server is unavailable."""
+        with pytest.raises(LeaseBackendError):
+            await RedisLeaseBackend(f"redis://127.0.0.1:{unused_tcp_port}/0").acquire("test", "node-a", 1.0)
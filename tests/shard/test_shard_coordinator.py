@@ -0,0 +1,72 @@
+"""Tests for shard_coordinator.py."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.config import ShardConfig
+from showroompodcast.shard.file_lease_backend import FileLeaseBackend
+from showroompodcast.shard.redis_lease_backend import RedisLeaseBackend
+from showroompodcast.shard.shard_coordinator import ShardCoordinator
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tests.conftest import FakeRedis
+
+LIST_ROOM_ID = list(range(1, 101))
+SECONDS_LEASE = 0.2
+
+
+class TestShardCoordinator:
+    """Tests for ShardCoordinator."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path) -> None:
+        """Nodes should split rooms without overlap, then rooms of node left should move to the other."""
+        lease_backend = FileLeaseBackend(str(tmp_path))
+        shard_coordinator_a = ShardCoordinator(lease_backend, ShardConfig(node_id="node-a"), LIST_ROOM_ID)
+        shard_coordinator_b = ShardCoordinator(lease_backend, ShardConfig(node_id="node-b"), LIST_ROOM_ID)
+        # Node a takes all rooms until node b joins.
+        assert await shard_coordinator_a.heartbeat() == LIST_ROOM_ID
+        list_room_id_b = await shard_coordinator_b.heartbeat()
+        list_room_id_a = await shard_coordinator_a.heartbeat()
+        assert list_room_id_a
+        assert list_room_id_b
+        assert sorted(list_room_id_a + list_room_id_b) == LIST_ROOM_ID
+        await shard_coordinator_a.close()
+        assert await shard_coordinator_b.heartbeat() == LIST_ROOM_ID
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_node_dies(fake_redis: FakeRedis) -> None:
+        """Rooms and recordings of dead node should move after its leases expire."""
+        lease_backend_a = RedisLeaseBackend(fake_redis.url)
+        shard_config_a = ShardConfig(node_id="node-a", lease_seconds=SECONDS_LEASE)
+        shard_config_b = ShardConfig(node_id="node-b", lease_seconds=SECONDS_LEASE)
+        shard_coordinator_a = ShardCoordinator(lease_backend_a, shard_config_a, LIST_ROOM_ID)
+        shard_coordinator_b = ShardCoordinator(RedisLeaseBackend(fake_redis.url), shard_config_b, LIST_ROOM_ID)
+        await shard_coordinator_a.heartbeat()
+        assert await shard_coordinator_a.acquire_room(1)
+        assert len(await shard_coordinator_b.heartbeat()) < len(LIST_ROOM_ID)
+        assert not await shard_coordinator_b.acquire_room(1)
+        # Node a dies without leaving cluster.
+        await lease_backend_a.close()
+        await asyncio.sleep(SECONDS_LEASE * 1.5)
+        assert await shard_coordinator_b.heartbeat() == LIST_ROOM_ID
+        assert await shard_coordinator_b.acquire_room(1)
+        await shard_coordinator_b.close()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_backend_unavailable(unused_tcp_port: int) -> None:
+        """Rooms should be kept and recording should not start when backend is unavailable."""
+        lease_backend = RedisLeaseBackend(f"redis://127.0.0.1:{unused_tcp_port}/0")
+        shard_coordinator = ShardCoordinator(lease_backend, ShardConfig(node_id="node-a"), LIST_ROOM_ID)
+        assert await shard_coordinator.heartbeat() == []
+        assert not await shard_coordinator.acquire_room(1)
+        await shard_coordinator.close()
@@ -0,0 +1 @@
+"""Sink."""
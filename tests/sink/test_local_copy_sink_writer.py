@@ -0,0 +1,48 @@
+"""Tests for local_copy_sink_writer.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from showroompodcast.sink.local_copy_sink_writer import LocalCopySinkWriter
+from showroompodcast.sink.local_sink import LocalSink
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+class TestLocalCopySinkWriter:
+    """Tests for LocalCopySinkWriter."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path, mocker: MockerFixture) -> None:
+        """Local copy should be removed once sink stored archive."""
+        sink = mocker.MagicMock()
+        sink.open = mocker.AsyncMock(return_value=mocker.AsyncMock())
+        writer = await LocalCopySinkWriter.open(sink, LocalSink(str(tmp_path)), "1-2021_08_07-21_00_00.ts")
+        await writer.write(b"segment0;")
+        assert (tmp_path / "1-2021_08_07-21_00_00.ts").exists()
+        await writer.close()
+        sink.open.return_value.write.assert_awaited_once_with(b"segment0;")
+        sink.open.return_value.close.assert_awaited_once()
+        assert not (tmp_path / "1-2021_08_07-21_00_00.ts").exists()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method_failed", ["open", "close"])
+    async def test_sink_failed(method_failed: str, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Local copy should be kept to upload later when sink failed."""
+        sink_writer = mocker.AsyncMock()
+        sink = mocker.MagicMock()
+        sink.open = mocker.AsyncMock(return_value=sink_writer)
+        getattr(sink if method_failed == "open" else sink_writer, method_failed).side_effect = ClientConnectionError()
+        writer = await LocalCopySinkWriter.open(sink, LocalSink(str(tmp_path)), "1-2021_08_07-21_00_00.ts")
+        await writer.write(b"segment0;")
+        await writer.close()
+        assert (tmp_path / "1-2021_08_07-21_00_00.ts").read_bytes() == b"segment0;"
@@ -0,0 +1,50 @@
+"""Tests for output_uploader.py."""
+
+from pathlib import Path
+
+import pytest
+
+from showroompodcast.config import S3Config
+from showroompodcast.sink.output_uploader import OutputUploader
+from showroompodcast.sink.s3_sink import S3Sink
+from tests.conftest import FakeS3
+
+
+def is_archiving(room_id: int) -> bool:
+    return room_id == 1
+
+
+class TestOutputUploader:
+    """Tests for OutputUploader."""
+
+    @staticmethod
+    def test_list_finished() -> None:
+        """Archives of room being archived should be kept except segments which next segment has started."""
+        list_name = [
+            ".gitkeep",
+            "1-2021_08_07-21_00_00-00000.ts",
+            "1-2021_08_07-21_00_00-00001.ts",
+            "1-2021_08_07-21_00_00.m3u8",
+            "1-2021_08_07-22_00_00.mp4",
+            "2-2021_08_07-21_00_00.concatenated.mp4",
+            "2-2021_08_07-21_00_00.mp4",
+            "2-2021_08_07-21_00_00.mp4.txt",
+        ]
+        output_uploader = OutputUploader(S3Sink(S3Config()))
+        assert output_uploader.list_finished(list_name, is_archiving) == [
+            "2-2021_08_07-21_00_00.mp4",
+            "1-2021_08_07-21_00_00-00000.ts",
+        ]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_finished(fake_s3: FakeS3, tmp_path: Path) -> None:
+        """Archives finished should be uploaded then removed, while archives in progress should be kept."""
+        (tmp_path / "1-2021_08_07-21_00_00.mp4").write_bytes(b"archiving")
+        (tmp_path / "2-2021_08_07-21_00_00.mp4").write_bytes(b"archived")
+        s3_config = S3Config(endpoint_url=fake_s3.url, bucket="archive", access_key_id="access_key_id")
+        async with S3Sink(s3_config) as s3_sink:
+            await OutputUploader(s3_sink, str(tmp_path)).upload_finished(is_archiving)
+        assert fake_s3.objects == {"archive/2-2021_08_07-21_00_00.mp4": b"archived"}
+        assert (tmp_path / "1-2021_08_07-21_00_00.mp4").exists()
+        assert not (tmp_path / "2-2021_08_07-21_00_00.mp4").exists()
@@ -0,0 +1,71 @@
+"""Tests for s3_sink.py."""
+
+from pathlib import Path
+
+import pytest
+from aiohttp import ClientResponseError
+
+from showroompodcast.config import S3Config
+from showroompodcast.sink.s3_sink import S3Sink
+from tests.conftest import FakeS3
+
+
+def create_s3_config(fake_s3: FakeS3) -> S3Config:
+    return S3Config(
+        endpoint_url=fake_s3.url,
+        bucket="archive",
+        prefix="showroom/",
+        access_key_id="access_key_id",
+        secret_access_key="secret_access_key",  # noqa: S106
+        part_size=4,
+    )
+
+
+class TestS3Sink:
+    """Tests for S3Sink."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(fake_s3: FakeS3) -> None:
+        """Each part should be uploaded as soon as it's filled."""
+        async with S3Sink(create_s3_config(fake_s3)) as s3_sink:
+            s3_writer = await s3_sink.open("1-2021_08_07-21_00_00.ts")
+            await s3_writer.write(b"segment0;")
+            expected_count_request_upload_part = 2
+            assert fake_s3.count_request_upload_part == expected_count_request_upload_part
+            await s3_writer.write(b"segment1;")
+            await s3_writer.close()
+        assert fake_s3.objects == {"archive/showroom/1-2021_08_07-21_00_00.ts": b"segment0;segment1;"}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_empty(fake_s3: FakeS3) -> None:
+        """Upload should be aborted when nothing is written."""
+        async with S3Sink(create_s3_config(fake_s3)) as s3_sink:
+            await (await s3_sink.open("1-2021_08_07-21_00_00.ts")).close()
+        assert fake_s3.objects == {}
+        assert fake_s3.uploads == {}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_part_failed(fake_s3: FakeS3) -> None:
+        """Upload should be aborted when uploading part failed, and shouldn't be completed when closed."""
+        fake_s3.status_upload_part = 500
+        async with S3Sink(create_s3_config(fake_s3)) as s3_sink:
+            s3_writer = await s3_sink.open("1-2021_08_07-21_00_00.ts")
+            with pytest.raises(ClientResponseError):
+                await s3_writer.write(b"segment0;")
+            assert fake_s3.uploads == {}
+            await s3_writer.close()
+        assert fake_s3.objects == {}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload(fake_s3: FakeS3, tmp_path: Path) -> None:
+        """Local file should be removed after uploaded."""
+        path = tmp_path / "1-2021_08_07-21_00_00.mp4"
+        path.write_bytes(b"archive")
+        async with S3Sink(create_s3_config(fake_s3)) as s3_sink:
+            await s3_sink.upload(str(path), path.name)
+        assert fake_s3.objects == {"archive/showroom/1-2021_08_07-21_00_00.mp4": b"archive"}
+        assert not path.exists()
@@ -0,0 +1,28 @@
+"""Tests for sink_factory.py."""
+
+import pytest
+
+from showroompodcast.config import S3Config
+from showroompodcast.config import SinkConfig
+from showroompodcast.sink.s3_sink import S3Sink
+from showroompodcast.sink.sink_factory import SinkFactory
+
+
+class TestSinkFactory:
+    """Tests for SinkFactory."""
+
+    @staticmethod
+    def test_s3() -> None:
+        assert isinstance(SinkFactory.create(SinkConfig(backend="s3")), S3Sink)
+
+    @staticmethod
+    def test_part_size_too_small() -> None:
+        """Part size which S3 rejects at the end of upload should be rejected at startup."""
+        sink_config = SinkConfig(backend="s3", s3=S3Config(part_size=5 * 1024 * 1024 - 1))
+        with pytest.raises(ValueError, match="Part size must be at least"):
+            SinkFactory.create(sink_config)
+
+    @staticmethod
+    def test_unsupported_backend() -> None:
+        with pytest.raises(ValueError, match="Unsupported sink backend"):
+            SinkFactory.create(SinkConfig(backend="ftp"))
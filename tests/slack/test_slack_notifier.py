@@ -0,0 +1,91 @@
+"""Tests for slack_notifier.py."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.config import SlackConfig
+from showroompodcast.notification import EVENT_ARCHIVING_FAILED
+from showroompodcast.notification import EVENT_NETWORK_ISSUES
+from showroompodcast.notification import EVENT_RECORDING_STARTED
+from showroompodcast.notification import Notification
+from showroompodcast.notification import NotificationQueue
+from showroompodcast.slack.slack_notifier import SlackNotifier
+from showroompodcast.slack.slack_notifier import format_notifications
+
+if TYPE_CHECKING:
+    from tests.conftest import FakeSlack
+
+
+def create_slack_config(base_url: str, window: float = 30.0) -> SlackConfig:
+    list_event = [EVENT_RECORDING_STARTED, EVENT_NETWORK_ISSUES]
+    return SlackConfig("xoxb-test", "channel", events=list_event, window=window, base_url=base_url)
+
+
+def test_format_notifications() -> None:
+    """Duplicates should be counted, lines over maximum should be summarized, and events should be in fixed order."""
+    list_notification = [
+        Notification(EVENT_NETWORK_ISSUES, "polling"),
+        Notification(EVENT_ARCHIVING_FAILED, "OSError: disk full", 3),
+        Notification(EVENT_ARCHIVING_FAILED, "OSError: disk full", 1),
+        Notification(EVENT_ARCHIVING_FAILED, "OSError: disk full", 2),
+        Notification(EVENT_NETWORK_ISSUES, "polling"),
+    ]
+    expected = (
+        "*Archiving failed* (3)\n"
+        "• room 3: OSError: disk full\n"
+        "• room 1: OSError: disk full\n"
+        "• and 1 more\n"
+        "*Temporary network issues* (2)\n"
+        "• polling (2 times)\n"
+        "5 notifications dropped since too many."
+    )
+    assert format_notifications(list_notification, count_dropped=5, maximum_lines=2) == expected
+
+
+class TestSlackNotifier:
+    """Tests for SlackNotifier."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_run(fake_slack: FakeSlack) -> None:
+        """Notifications in window should be sent as one message, and queued ones should be sent when cancelled."""
+        queue = NotificationQueue()
+        slack_notifier = SlackNotifier(create_slack_config(fake_slack.url, window=0.2), queue)
+        task = asyncio.create_task(slack_notifier.run())
+        await asyncio.sleep(0)
+        for room_id in range(1, 4):
+            queue.put(Notification(EVENT_RECORDING_STARTED, "started", room_id))
+            queue.put(Notification(EVENT_NETWORK_ISSUES, "polling"))
+        await asyncio.sleep(0.5)
+        queue.put(Notification(EVENT_RECORDING_STARTED, "started", 4))
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert [message["channel"] for message in fake_slack.messages] == ["channel", "channel"]
+        assert "*Recording started* (3)" in fake_slack.messages[0]["text"]
+        assert "• polling (3 times)" in fake_slack.messages[0]["text"]
+        assert fake_slack.messages[1]["text"] == "*Recording started* (1)\n• room 4: started"
+        # Not to queue without notifier.
+        queue.put(Notification(EVENT_RECORDING_STARTED, "started", 5))
+        assert queue.pop_all() == ([], 0)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_rate_limited(fake_slack_rate_limited: FakeSlack) -> None:
+        """Message should be sent again after waiting as Slack tells by Retry-After."""
+        queue = NotificationQueue()
+        slack_notifier = SlackNotifier(create_slack_config(fake_slack_rate_limited.url), queue)
+        task = asyncio.create_task(slack_notifier.run())
+        await asyncio.sleep(0)
+        queue.put(Notification(EVENT_NETWORK_ISSUES, "polling"))
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Rate limited once, then sent.
+        count_request_expected = 2
+        assert fake_slack_rate_limited.count_request == count_request_expected
+        assert fake_slack_rate_limited.messages[0]["text"] == "*Temporary network issues* (1)\n• polling"
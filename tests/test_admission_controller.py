@@ -0,0 +1,99 @@
+"""Tests for admission_controller.py."""
+
+import asyncio
+from typing import NamedTuple
+
+import pytest
+from pytest_mock import MockerFixture
+
+from showroompodcast.admission_controller import STREAM_UNKNOWN
+from showroompodcast.admission_controller import AdmissionController
+from showroompodcast.api.streaming_url import Stream
+from showroompodcast.config import AdmissionConfig
+
+STREAM_HIGH = Stream("https://example.com/high.m3u8", 1000)
+STREAM_MEDIUM = Stream("https://example.com/medium.m3u8", 200)
+LIST_STREAM = [STREAM_HIGH, STREAM_MEDIUM]
+BYTES_PER_SECOND_HIGH = 125_000
+GIGABYTE = 1_000_000_000
+
+
+class DiskUsage(NamedTuple):
+    """Same as return value of shutil.disk_usage()."""
+
+    total: int
+    used: int
+    free: int
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    @staticmethod
+    def test_unlimited(mocker: MockerFixture) -> None:
+        """Best quality should be admitted without checking disk by default."""
+        mock_disk_usage = mocker.patch("shutil.disk_usage")
+        admission_controller = AdmissionController(AdmissionConfig())
+        assert admission_controller.admit(1, LIST_STREAM) == STREAM_HIGH
+        assert admission_controller.admit(2, []) == STREAM_UNKNOWN
+        mock_disk_usage.assert_not_called()
+
+    @staticmethod
+    def test_throughput() -> None:
+        """Lower quality should be chosen when best quality exceeds throughput, then rejected."""
+        admission_config = AdmissionConfig(maximum_bytes_per_second=BYTES_PER_SECOND_HIGH * 2)
+        admission_controller = AdmissionController(admission_config)
+        assert admission_controller.admit(1, LIST_STREAM) == STREAM_HIGH
+        assert admission_controller.admit(2, LIST_STREAM) == STREAM_HIGH
+        assert admission_controller.admit(3, LIST_STREAM) is None
+        admission_controller.release(2)
+        assert admission_controller.admit(3, LIST_STREAM) == STREAM_HIGH
+        admission_controller.release(3)
+        admission_controller.admit(4, [STREAM_MEDIUM])
+        assert admission_controller.admit(5, LIST_STREAM) == STREAM_MEDIUM
+        metrics = admission_controller.metrics()
+        expected_admitted = 5
+        assert metrics["admission_admitted_total"] == expected_admitted
+        assert metrics["admission_downgraded_total"] == 1
+        assert metrics["admission_rejected_total"] == 1
+
+    @staticmethod
+    def test_disk_space(mocker: MockerFixture) -> None:
+        """Disk space should be reserved for recordings in progress."""
+        bytes_free = GIGABYTE + BYTES_PER_SECOND_HIGH * 3600
+        mocker.patch("shutil.disk_usage", return_value=DiskUsage(10 * GIGABYTE, GIGABYTE, bytes_free))
+        admission_controller = AdmissionController(AdmissionConfig(minimum_free_bytes=GIGABYTE))
+        assert admission_controller.admit(1, LIST_STREAM) == STREAM_HIGH
+        assert admission_controller.admit(2, LIST_STREAM) is None
+        assert admission_controller.metrics()["admission_bytes_free"] == bytes_free
+
+    @staticmethod
+    def test_measured_throughput(mocker: MockerFixture) -> None:
+        """Throughput written by others should be counted."""
+        mocker.patch(
+            "shutil.disk_usage",
+            side_effect=[
+                DiskUsage(10 * GIGABYTE, GIGABYTE, 9 * GIGABYTE),
+                DiskUsage(10 * GIGABYTE, GIGABYTE + BYTES_PER_SECOND_HIGH * 2 * 10, 9 * GIGABYTE),
+            ],
+        )
+        mocker.patch("time.monotonic", side_effect=[100.0, 110.0])
+        admission_config = AdmissionConfig(maximum_bytes_per_second=BYTES_PER_SECOND_HIGH * 2)
+        admission_controller = AdmissionController(admission_config)
+        admission_controller.measure()
+        assert admission_controller.admit(1, [STREAM_MEDIUM]) == STREAM_MEDIUM
+        admission_controller.measure()
+        assert admission_controller.admit(2, LIST_STREAM) is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_run(mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Throughput should be measured every window, not at admission, unless throughput is unlimited."""
+        mock_measure = mocker.patch.object(AdmissionController, "measure")
+        await AdmissionController(AdmissionConfig()).run()
+        mock_measure.assert_not_called()
+        monkeypatch.setattr(AdmissionController, "SECONDS_WINDOW", 0.01)
+        admission_config = AdmissionConfig(maximum_bytes_per_second=BYTES_PER_SECOND_HIGH)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(AdmissionController(admission_config).run(), timeout=0.1)
+        assert mock_measure.call_count > 1
@@ -0,0 +1,64 @@
+"""Tests for archive_concatenator.py."""
+
+from pathlib import Path
+
+import pytest
+from asyncffmpeg.exceptions import FFmpegProcessError
+from pytest_mock import MockerFixture
+
+from showroompodcast.archive_concatenator import ArchiveConcatenator
+from showroompodcast.remuxer import Remuxer
+
+
+def concatenate(list_path_input: list[str], path_output: str) -> None:
+    Path(path_output).write_bytes(b"".join(Path(path_input).read_bytes() for path_input in list_path_input))
+
+
+class TestArchiveConcatenator:
+    """Tests for ArchiveConcatenator."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path, mocker: MockerFixture) -> None:
+        """Parts should be concatenated into the file name of archive, then removed."""
+        mocker.patch.object(Remuxer, "concatenate", side_effect=concatenate)
+        path_archive = tmp_path / "1-2021_08_07-21_00_00.mp4"
+        archive_concatenator = ArchiveConcatenator(str(path_archive))
+        path_archive.write_bytes(b"part0;")
+        part_file_name_1 = archive_concatenator.create_part_file_name()
+        assert part_file_name_1 == str(tmp_path / "1-2021_08_07-21_00_00.part1.mp4")
+        (tmp_path / "1-2021_08_07-21_00_00.part1.mp4").write_bytes(b"part1;")
+        # Part which failed before writing is skipped.
+        archive_concatenator.create_part_file_name()
+        archive_concatenator.create_part_file_name()
+        (tmp_path / "1-2021_08_07-21_00_00.part3.mp4").write_bytes(b"part3;")
+        await archive_concatenator.concatenate()
+        assert path_archive.read_bytes() == b"part0;part1;part3;"
+        assert not (tmp_path / "1-2021_08_07-21_00_00.part1.mp4").exists()
+        assert not (tmp_path / "1-2021_08_07-21_00_00.part3.mp4").exists()
+        assert not (tmp_path / "1-2021_08_07-21_00_00.concatenated.mp4").exists()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_not_resumed(tmp_path: Path, mocker: MockerFixture) -> None:
+        """Archive should be kept as is when not resumed."""
+        mock_concatenate = mocker.patch.object(Remuxer, "concatenate")
+        path_archive = tmp_path / "1-2021_08_07-21_00_00.mp4"
+        path_archive.write_bytes(b"part0;")
+        await ArchiveConcatenator(str(path_archive)).concatenate()
+        mock_concatenate.assert_not_called()
+        assert path_archive.read_bytes() == b"part0;"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_error(tmp_path: Path, mocker: MockerFixture) -> None:
+        """Parts should be kept when failed to concatenate."""
+        mocker.patch.object(Remuxer, "concatenate", side_effect=FFmpegProcessError("Invalid data found", 1))
+        path_archive = tmp_path / "1-2021_08_07-21_00_00.mp4"
+        archive_concatenator = ArchiveConcatenator(str(path_archive))
+        path_archive.write_bytes(b"part0;")
+        archive_concatenator.create_part_file_name()
+        (tmp_path / "1-2021_08_07-21_00_00.part1.mp4").write_bytes(b"part1;")
+        await archive_concatenator.concatenate()
+        assert path_archive.read_bytes() == b"part0;"
+        assert (tmp_path / "1-2021_08_07-21_00_00.part1.mp4").exists()
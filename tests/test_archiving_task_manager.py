@@ -0,0 +1,55 @@
+"""Tests for archiving_task_manager.py."""
+
+from concurrent.futures import Future
+
+import pytest
+from pytest_mock import MockerFixture
+
+from showroompodcast.api import ShowroomApi
+from showroompodcast.archiving_task_manager import ArchivingTaskManager
+from showroompodcast.config import PollingConfig
+from showroompodcast.polling_engine import PollingEngine
+from showroompodcast.showroom_poller import ShowroomPoller
+from tests.conftest import FakeShowroomApi
+
+
+class TestArchivingTaskManager:
+    """Tests for ArchivingTaskManager."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_discover_rooms_on_live(fake_showroom_api: FakeShowroomApi, mocker: MockerFixture) -> None:
+        """Only configured rooms listed on live should be polled to verify, then archived."""
+        fake_showroom_api.listed_on_live([[2, 99]]).on_live([2])
+        archiving_task_manager = ArchivingTaskManager([1, 2, 3], PollingConfig(interval_minimum=0, discovery=True))
+        executor = mocker.MagicMock()
+        executor.create_process_task.return_value = Future()
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=100)
+            showroom_poller = ShowroomPoller(mocker.MagicMock(), executor, polling_engine)
+            # Room on archiving should not be polled again at second time.
+            number_sweep = 2
+            for _ in range(number_sweep):
+                await archiving_task_manager.poll_rooms(showroom_poller)
+        assert fake_showroom_api.count_request_onlives == number_sweep
+        assert fake_showroom_api.count_request_polling == {2: 1}
+        executor.create_process_task.assert_called_once()
+        assert showroom_poller.is_archiving(2)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_update_rooms(fake_showroom_api: FakeShowroomApi, mocker: MockerFixture) -> None:
+        """Added rooms should be polled, removed rooms should not be polled while archiving continues."""
+        fake_showroom_api.on_live([1]).not_on_live([2, 3])
+        archiving_task_manager = ArchivingTaskManager([1, 2], PollingConfig(interval_minimum=10))
+        executor = mocker.MagicMock()
+        executor.create_process_task.return_value = Future()
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=100)
+            showroom_poller = ShowroomPoller(mocker.MagicMock(), executor, polling_engine)
+            await archiving_task_manager.poll_rooms(showroom_poller)
+            archiving_task_manager.update_rooms([2, 3])
+            await archiving_task_manager.poll_rooms(showroom_poller)
+        assert fake_showroom_api.count_request_polling == {1: 1, 2: 1, 3: 1}
+        assert archiving_task_manager.polling_scheduler.dictionary_room_history.keys() == {2, 3}
+        assert showroom_poller.is_archiving(1)
@@ -0,0 +1,62 @@
+"""Tests for archiving_task_registry.py."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from showroompodcast.archiving_task_registry import ArchivingTaskRegistry
+from showroompodcast.exceptions import MaxRetriesExceededError
+from showroompodcast.notification import LIST_EVENT
+from showroompodcast.notification import NOTIFICATIONS
+from showroompodcast.notification import Notification
+
+
+class TestArchivingTaskRegistry:
+    """Tests for ArchivingTaskRegistry."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [None, RuntimeError("Worker process died")])
+    async def test(error: Exception | None) -> None:
+        """Room should be unregistered when task is done, regardless of whether it succeeds or not."""
+        archiving_task_registry = ArchivingTaskRegistry()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        archiving_task_registry.register(1, future)
+        assert archiving_task_registry.is_archiving(1)
+        assert not archiving_task_registry.is_archiving(2)
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+        # Done callbacks are scheduled by event loop.
+        await asyncio.sleep(0)
+        assert not archiving_task_registry.is_archiving(1)
+        assert len(archiving_task_registry) == 0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (None, Notification("recording_finished", "finished", 1)),
+            (MaxRetriesExceededError(), Notification("retries_exhausted", "gave up retrying", 1)),
+            (OSError("disk full"), Notification("archiving_failed", "OSError: disk full", 1)),
+        ],
+    )
+    async def test_notify(error: Exception | None, expected: Notification) -> None:
+        """Start and result of archiving should be notified."""
+        NOTIFICATIONS.subscribe(LIST_EVENT, maximum=10)
+        try:
+            archiving_task_registry = ArchivingTaskRegistry()
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            archiving_task_registry.register(1, future)
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+            await asyncio.sleep(0)
+            assert NOTIFICATIONS.pop_all() == ([Notification("recording_started", "started", 1), expected], 0)
+        finally:
+            NOTIFICATIONS.unsubscribe()
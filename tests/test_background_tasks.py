@@ -0,0 +1,52 @@
+"""Tests for background_tasks.py."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from showroompodcast.background_tasks import BackgroundTasks
+
+
+async def fail() -> None:
+    msg = "Background task failed"
+    raise RuntimeError(msg)
+
+
+class TestBackgroundTasks:
+    """Tests for BackgroundTasks."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_cancel_when_exit() -> None:
+        """Tasks still running should be cancelled and awaited when exit."""
+        event_cancelled = asyncio.Event()
+
+        async def run_forever() -> None:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                event_cancelled.set()
+                raise
+
+        async with BackgroundTasks() as background_tasks:
+            background_tasks.start(run_forever())
+            await asyncio.sleep(0)
+            assert len(background_tasks.set_task) == 1
+        assert event_cancelled.is_set()
+        assert not background_tasks.set_task
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_log_failure(caplog: pytest.LogCaptureFixture) -> None:
+        """Failure should be logged since nobody awaits the task, and other tasks should keep running."""
+        async with BackgroundTasks() as background_tasks:
+            background_tasks.start(asyncio.sleep(3600))
+            background_tasks.start(fail())
+            await asyncio.sleep(0.01)
+            assert len(background_tasks.set_task) == 1
+        records = [record for record in caplog.records if record.levelno == logging.ERROR]
+        assert [record.getMessage() for record in records] == ["Background task failed. name: fail"]
+        assert records[0].exc_info is not None
@@ -3,10 +3,14 @@
 import logging
 from pathlib import Path
 
+import click
 import pytest
 from click.testing import CliRunner
 
 from showroompodcast.cli import showroom_podcast
+from showroompodcast.recording_index import IndexedRecording
+from showroompodcast.recording_index import RecordingIndex
+from showroompodcast.showroom_datetime import ShowroomDatetime
 
 
 class TestShowroomPodcast:
@@ -14,7 +18,7 @@ class TestShowroomPodcast:
 
     @staticmethod
     @pytest.mark.usefixtures(
-        "mock_request_room_1_to_5_on_live",
+        "fake_showroom_api_room_1_to_5_on_live",
         "mock_slack_web_client_type_error",
         "mock_process_task_pool_executor",
     )
@@ -28,3 +32,61 @@ class TestShowroomPodcast:
             ["--file", str(resource_path_root / "config_valid_slack_configuration.yml")],
         )
         assert result.exit_code == 1
+
+
+class TestIndex:
+    """Test for index command."""
+
+    @staticmethod
+    def test(tmp_path: Path) -> None:
+        """Archives indexed should be listed and summarized as tab separated values."""
+        path_index = tmp_path / "index.sqlite3"
+        path_config = tmp_path / "config.yml"
+        path_config.write_text(f"number_process: 1\nlist_room_id: [1]\nindex:\n  path: {path_index}\n")
+        time_start = ShowroomDatetime.decode("2021_08_07-21_00_00").timestamp()
+        recording = IndexedRecording(
+            name="1-2021_08_07-21_00_00.mp4",
+            room_id=1,
+            time_start=time_start,
+            time_end=time_start + 5400,
+            duration=5400,
+            size=10,
+            mtime_ns=0,
+            format_name="mp4",
+            codecs="aac",
+            is_complete=True,
+        )
+        time_start_broken = time_start + 86400
+        recording_broken = recording._replace(
+            name="1-2021_08_08-21_00_00.mp4",
+            time_start=time_start_broken,
+            time_end=time_start_broken,
+            duration=0,
+            size=5,
+            codecs="",
+            is_complete=False,
+        )
+        RecordingIndex(str(path_index)).upsert_sync([recording, recording_broken])
+        runner = CliRunner()
+        result = runner.invoke(showroom_podcast, ["--file", str(path_config), "index", "list", "--incomplete"])
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines()[1:] == [
+            "1-2021_08_08-21_00_00.mp4\t1\t2021-08-08T21:00:00+09:00\t2021-08-08T21:00:00+09:00\t0.000\t5\t\tfalse",
+        ]
+        arguments = ["--file", str(path_config), "index", "list", "--until", "2021-08-08"]
+        result = runner.invoke(showroom_podcast, arguments)
+        assert [line.split("\t")[0] for line in result.output.splitlines()[1:]] == ["1-2021_08_07-21_00_00.mp4"]
+        result = runner.invoke(showroom_podcast, ["--file", str(path_config), "index", "summary"])
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines()[1:] == ["1\t2\t1.50\t15\t1"]
+
+    @staticmethod
+    def test_not_configured(resource_path_root: Path) -> None:
+        """Index command should fail as usage error when index is not configured."""
+        runner = CliRunner()
+        result = runner.invoke(
+            showroom_podcast,
+            ["--file", str(resource_path_root / "config_valid_slack_configuration.yml"), "index", "summary"],
+        )
+        assert result.exit_code == click.UsageError.exit_code
+        assert "index.path is not configured." in result.output
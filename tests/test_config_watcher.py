@@ -0,0 +1,45 @@
+"""Tests for config_watcher.py."""
+
+import os
+from pathlib import Path
+
+from showroompodcast.config_watcher import ConfigWatcher
+
+
+def write(path: Path, text: str, modification_time_ns: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(modification_time_ns, modification_time_ns))
+
+
+class TestConfigWatcher:
+    """Tests for ConfigWatcher."""
+
+    @staticmethod
+    def test(tmp_path: Path) -> None:
+        """Configuration should be loaded only when modified, invalid one should be ignored."""
+        path = tmp_path / "config.yml"
+        write(path, "number_process: 2\nlist_room_id: [1, 2]\n", 1_000_000_000)
+        config_watcher = ConfigWatcher(path, 1.0)
+        assert config_watcher.load_if_modified() is None
+        write(path, "number_process: 2\nlist_room_id: [2, 3]\n", 2_000_000_000)
+        config = config_watcher.load_if_modified()
+        assert config is not None
+        assert config.list_room_id == [2, 3]
+        assert config_watcher.load_if_modified() is None
+        write(path, "number_process: 2\nlist_room_id: [2, 3\n", 3_000_000_000)
+        assert config_watcher.load_if_modified() is None
+        path.unlink()
+        assert config_watcher.load_if_modified() is None
+
+    @staticmethod
+    def test_partial(tmp_path: Path) -> None:
+        """File caught while being written should be ignored not to unschedule every room."""
+        path = tmp_path / "config.yml"
+        write(path, "number_process: 1\nlist_room_id: [1, 2]\n", 1_000_000_000)
+        config_watcher = ConfigWatcher(path, 1.0)
+        write(path, "number_process: 1\n", 2_000_000_000)
+        assert config_watcher.load_if_modified() is None
+        write(path, "", 3_000_000_000)
+        assert config_watcher.load_if_modified() is None
+        write(path, "number_process: 1\nlist_room_id: []\n", 4_000_000_000)
+        assert config_watcher.load_if_modified() is None
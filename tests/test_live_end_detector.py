@@ -0,0 +1,123 @@
+"""Tests for live_end_detector.py."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.archiving_task_registry import ArchivingTaskRegistry
+from showroompodcast.config import PollingConfig
+from showroompodcast.exceptions import TemporaryNetworkIssuesError
+from showroompodcast.live_end_detector import LiveEndDetector
+from showroompodcast.live_end_detector import StopPipe
+from showroompodcast.live_end_detector import run_until_stop_requested
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest_mock import MockerFixture
+
+    from showroompodcast.live_end_detector import StopEvent
+
+
+async def record(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+def create_stop_pipe_unavailable() -> StopPipe:
+    """Pipe whose parent process has exited."""
+    stop_pipe = StopPipe()
+    assert stop_pipe.sender is not None
+    stop_pipe.sender.close()
+    return stop_pipe
+
+
+def wait_in_worker(stop_pipe: StopPipe) -> tuple[bool, bool]:
+    """Returns whether the end to send is not sent to worker, and whether stop is requested."""
+    return stop_pipe.sender is None, asyncio.run(stop_pipe.wait())
+
+
+class TestRunUntilStopRequested:
+    """Tests for run_until_stop_requested()."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "create_stop_event",
+        [lambda: None, asyncio.Event, StopPipe, create_stop_pipe_unavailable],
+    )
+    async def test_finished(create_stop_event: Callable[[], StopEvent | None]) -> None:
+        """Coroutine should be awaited until it finishes by itself unless stop is requested."""
+        assert not await run_until_stop_requested(record(0.05), create_stop_event())
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("create_stop_event", [asyncio.Event, StopPipe])
+    async def test_stop_requested(create_stop_event: Callable[[], StopEvent]) -> None:
+        """Coroutine should be cancelled when stop is requested."""
+        stop_event = create_stop_event()
+        task = asyncio.create_task(run_until_stop_requested(record(3600), stop_event))
+        await asyncio.sleep(0.05)
+        stop_event.set()
+        assert await asyncio.wait_for(task, timeout=1)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_stop_requested_to_worker() -> None:
+        """Stop should be requested to worker process through pipe, which it can't request by itself."""
+        stop_pipe = StopPipe()
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            future = loop.run_in_executor(executor, wait_in_worker, stop_pipe)
+            await asyncio.sleep(0.1)
+            assert not future.done()
+            stop_pipe.set()
+            assert await asyncio.wait_for(future, timeout=10) == (True, True)
+
+
+class TestLiveEndDetector:
+    """Tests for LiveEndDetector."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_check(mocker: MockerFixture) -> None:
+        """Stop should be requested after live ended is reported consecutively, unknown results are not counted."""
+        archiving_task_registry = ArchivingTaskRegistry()
+        loop = asyncio.get_running_loop()
+        stop_event_1 = asyncio.Event()
+        stop_event_2 = asyncio.Event()
+        archiving_task_registry.register(1, loop.create_future(), stop_event_1)
+        archiving_task_registry.register(2, loop.create_future(), stop_event_2)
+        # Not stoppable, e.g. FFmpeg process adopted after restart.
+        archiving_task_registry.register(3, loop.create_future())
+        results: dict[int, list[bool | Exception]] = {
+            1: [False, True, False, TemporaryNetworkIssuesError(), False],
+            2: [False, False],
+        }
+        polling_engine = mocker.MagicMock()
+        polling_engine.poll = mocker.AsyncMock(side_effect=lambda room_id: raise_or_return(results[room_id].pop(0)))
+        live_end_detector = LiveEndDetector(archiving_task_registry, polling_engine, PollingConfig())
+        await live_end_detector.check()
+        await live_end_detector.check()
+        assert not stop_event_1.is_set()
+        assert stop_event_2.is_set()
+        assert archiving_task_registry.list_room_id_stoppable() == [1]
+        await live_end_detector.check()
+        await live_end_detector.check()
+        assert not stop_event_1.is_set()
+        await live_end_detector.check()
+        assert stop_event_1.is_set()
+        assert not archiving_task_registry.list_room_id_stoppable()
+        # Requested rooms are polled no more, and remains archiving until the task finishes.
+        expected_call_count = 7
+        assert polling_engine.poll.await_count == expected_call_count
+        assert archiving_task_registry.is_archiving(1)
+
+
+def raise_or_return(result: bool | Exception) -> bool:  # noqa: FBT001
+    if isinstance(result, Exception):
+        raise result
+    return result
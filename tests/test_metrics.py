@@ -0,0 +1,62 @@
+"""Tests for metrics.py."""
+
+import queue
+
+from pytest_mock import MockerFixture
+
+from showroompodcast.metrics import REGISTRY
+from showroompodcast.metrics import Counter
+from showroompodcast.metrics import Gauge
+from showroompodcast.metrics import Histogram
+from showroompodcast.metrics import Metric
+
+
+class TestMetrics:
+    """Tests for metrics."""
+
+    @staticmethod
+    def test_counter_and_gauge() -> None:
+        """Samples should be rendered with labels."""
+        counter = Counter("test_requests_total", "Requests.", ("api",))
+        counter.inc("Polling")
+        counter.inc("Polling", amount=2)
+        gauge = Gauge("test_recordings", "Recordings.")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert counter.render() == [
+            "# HELP test_requests_total Requests.",
+            "# TYPE test_requests_total counter",
+            'test_requests_total{api="Polling"} 3.0',
+        ]
+        assert gauge.render_samples() == ["test_recordings 1.0"]
+
+    @staticmethod
+    def test_histogram() -> None:
+        """Buckets should be cumulative."""
+        histogram = Histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        assert histogram.render_samples() == [
+            'test_latency_seconds_bucket{le="0.1"} 1',
+            'test_latency_seconds_bucket{le="1.0"} 2',
+            'test_latency_seconds_bucket{le="+Inf"} 2',
+            "test_latency_seconds_sum 0.55",
+            "test_latency_seconds_count 2",
+        ]
+
+    @staticmethod
+    def test_worker(mocker: MockerFixture) -> None:
+        """Update in worker process should be sent to parent process, then applied there."""
+        queue_metrics: queue.Queue[object] = queue.Queue()
+        mocker.patch.object(Metric, "queue", queue_metrics)
+        counter = Counter("test_worker_total", "Updated in worker.")
+        counter.inc()
+        assert not counter.values
+        REGISTRY.apply(queue_metrics.get_nowait())  # type: ignore[arg-type]
+        assert counter.values == {(): 1.0}
+
+    @staticmethod
+    def test_collector() -> None:
+        REGISTRY.add_collector(lambda: {"test_collected": 2.0})
+        assert "# TYPE test_collected gauge\ntest_collected 2.0\n" in REGISTRY.render()
@@ -0,0 +1,49 @@
+"""Tests for metrics_server.py."""
+
+import asyncio
+import socket
+
+import pytest
+from aiohttp import ClientSession
+
+from showroompodcast.config import MetricsConfig
+from showroompodcast.metrics import ROOMS_POLLED
+from showroompodcast.metrics_server import MetricsServer
+
+
+def find_free_port() -> int:
+    with socket.socket() as server_socket:
+        server_socket.bind(("127.0.0.1", 0))
+        port: int = server_socket.getsockname()[1]
+        return port
+
+
+class TestMetricsServer:
+    """Tests for MetricsServer."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test() -> None:
+        """Metrics sent from worker process should be served."""
+        port = find_free_port()
+        async with MetricsServer(MetricsConfig(port=port)) as metrics_server, ClientSession() as session:
+            value_before = ROOMS_POLLED.values.get((), 0.0)
+            assert metrics_server.queue is not None
+            metrics_server.queue.put((ROOMS_POLLED.name, "inc", 1.0, ()))
+            # Since multiprocessing.Queue sends by feeder thread, waits for periodic receiving.
+            await asyncio.sleep(MetricsServer.INTERVAL_RECEIVE * 1.5)
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                text = await response.text()
+        assert "# TYPE showroom_api_request_duration_seconds histogram" in text
+        assert f"showroom_rooms_polled_total {value_before + 1.0}" in text
+        assert metrics_server.task_receive is not None
+        assert metrics_server.task_receive.done()
+        with pytest.raises(ValueError, match="is closed"):
+            metrics_server.queue.put((ROOMS_POLLED.name, "inc", 1.0, ()))
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_disabled() -> None:
+        async with MetricsServer(MetricsConfig()) as metrics_server:
+            assert metrics_server.queue is None
+            assert metrics_server.runner is None
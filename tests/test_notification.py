@@ -0,0 +1,35 @@
+"""Tests for notification.py."""
+
+import pytest
+
+from showroompodcast.notification import EVENT_DISK_PRESSURE
+from showroompodcast.notification import EVENT_RECORDING_STARTED
+from showroompodcast.notification import Notification
+from showroompodcast.notification import NotificationQueue
+
+
+class TestNotificationQueue:
+    """Tests for NotificationQueue."""
+
+    @staticmethod
+    def test_put() -> None:
+        """Only events subscribed should be queued, and notifications over maximum should be counted as dropped."""
+        queue = NotificationQueue()
+        queue.put(Notification(EVENT_DISK_PRESSURE, "rejected", 1))
+        assert queue.pop_all() == ([], 0)
+        queue.subscribe([EVENT_DISK_PRESSURE], maximum=2)
+        for room_id in range(1, 5):
+            queue.put(Notification(EVENT_DISK_PRESSURE, "rejected", room_id))
+        queue.put(Notification(EVENT_RECORDING_STARTED, "started", 1))
+        expected = [Notification(EVENT_DISK_PRESSURE, "rejected", 1), Notification(EVENT_DISK_PRESSURE, "rejected", 2)]
+        assert queue.pop_all() == (expected, 2)
+        assert queue.pop_all() == ([], 0)
+        queue.put(Notification(EVENT_DISK_PRESSURE, "rejected", 1))
+        queue.unsubscribe()
+        queue.put(Notification(EVENT_DISK_PRESSURE, "rejected", 1))
+        assert queue.pop_all() == ([], 0)
+
+    @staticmethod
+    def test_subscribe_unsupported() -> None:
+        with pytest.raises(ValueError, match="recording_paused"):
+            NotificationQueue().subscribe(["recording_paused"], maximum=1)
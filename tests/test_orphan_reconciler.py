@@ -0,0 +1,81 @@
+"""Tests for orphan_reconciler.py."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.archiving_task_registry import ArchivingTaskRegistry
+from showroompodcast.orphan_reconciler import POLICY_TERMINATE
+from showroompodcast.orphan_reconciler import OrphanReconciler
+from tests.conftest import OUT_FILE_NAME_RECORDING
+
+if TYPE_CHECKING:
+    import subprocess
+
+    from showroompodcast.state_store import StateStore
+
+
+class TestOrphanReconciler:
+    """Test for OrphanReconciler."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_ended(state_store: StateStore, pid_ended: int) -> None:
+        """Recording whose process has exited should be removed without regarded as archiving."""
+        await state_store.register(1, pid_ended, OUT_FILE_NAME_RECORDING)
+        archiving_task_registry = ArchivingTaskRegistry()
+        await OrphanReconciler(state_store).reconcile(archiving_task_registry)
+        assert not archiving_task_registry.is_archiving(1)
+        assert await state_store.list_recording() == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform != "linux", reason="Command line is compared only on Linux.")
+    async def test_pid_reused(state_store: StateStore, process_recording: subprocess.Popen[bytes]) -> None:
+        """Another process which reused the PID should not be regarded as recording."""
+        await state_store.register(1, process_recording.pid, "./output/1-2021_08_07-22_00_00.mp4")
+        archiving_task_registry = ArchivingTaskRegistry()
+        await OrphanReconciler(state_store).reconcile(archiving_task_registry)
+        assert not archiving_task_registry.is_archiving(1)
+        assert process_recording.poll() is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_adopt(
+        state_store: StateStore,
+        process_recording: subprocess.Popen[bytes],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Room should be regarded as archiving until the adopted process exits."""
+        monkeypatch.setattr(OrphanReconciler, "INTERVAL", 0.1)
+        await state_store.register(1, process_recording.pid, OUT_FILE_NAME_RECORDING)
+        archiving_task_registry = ArchivingTaskRegistry()
+        await OrphanReconciler(state_store).reconcile(archiving_task_registry)
+        assert archiving_task_registry.is_archiving(1)
+        assert process_recording.poll() is None
+        task = archiving_task_registry.dictionary_task[1]
+        assert isinstance(task, asyncio.Task)
+        process_recording.terminate()
+        await asyncio.wait_for(task, timeout=5)
+        assert not archiving_task_registry.is_archiving(1)
+        assert await state_store.list_recording() == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_terminate(state_store: StateStore, process_recording: subprocess.Popen[bytes]) -> None:
+        """Orphaned process should be stopped so that the room is recorded again."""
+        await state_store.register(1, process_recording.pid, OUT_FILE_NAME_RECORDING)
+        archiving_task_registry = ArchivingTaskRegistry()
+        await OrphanReconciler(state_store, POLICY_TERMINATE).reconcile(archiving_task_registry)
+        assert not archiving_task_registry.is_archiving(1)
+        assert process_recording.wait(timeout=5) is not None
+        assert await state_store.list_recording() == []
+
+    @staticmethod
+    def test_unsupported_policy(state_store: StateStore) -> None:
+        with pytest.raises(ValueError, match="Unsupported orphan policy"):
+            OrphanReconciler(state_store, "ignore")
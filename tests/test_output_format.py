@@ -0,0 +1,73 @@
+"""Tests for output_format.py."""
+
+import ffmpeg
+import pytest
+from ffmpeg.nodes import OutputNode
+from ffmpeg.nodes import OutputStream
+
+from showroompodcast.config import ArchiverConfig
+from showroompodcast.output_format import OutputFormat
+
+OUT_FILE_NAME_MP4 = "./output/1-2021_08_07-21_00_00.mp4"
+OUT_FILE_NAME_SEGMENT = "./output/1-2021_08_07-21_00_00.m3u8"
+
+
+def create_output_node(output_format: OutputFormat, out_file_name: str) -> OutputNode:
+    stream_spec = output_format.create_output(ffmpeg.input("https://example.com/live.m3u8"), out_file_name)
+    assert isinstance(stream_spec, OutputStream)
+    output_node = stream_spec.node
+    assert isinstance(output_node, OutputNode)
+    return output_node
+
+
+class TestOutputFormat:
+    """Tests for OutputFormat."""
+
+    @staticmethod
+    def test_mp4() -> None:
+        """Plain MP4 should be written by default, copying streams without re-encoding."""
+        output_format = OutputFormat()
+        assert output_format.extension == ".mp4"
+        assert output_format.is_concatenatable
+        assert output_format.find_first_file_name(OUT_FILE_NAME_MP4) == OUT_FILE_NAME_MP4
+        output_node = create_output_node(output_format, OUT_FILE_NAME_MP4)
+        assert output_node.kwargs == {"c": "copy", "filename": OUT_FILE_NAME_MP4, "format": "mp4"}
+
+    @staticmethod
+    def test_fragmented_mp4() -> None:
+        """Moov atom should be written first, then fragments."""
+        output_format = OutputFormat.create(ArchiverConfig(output_format="fragmented_mp4"))
+        assert output_format.extension == ".mp4"
+        assert output_format.is_concatenatable
+        output_node = create_output_node(output_format, OUT_FILE_NAME_MP4)
+        assert output_node.kwargs == {
+            "c": "copy",
+            "filename": OUT_FILE_NAME_MP4,
+            "format": "mp4",
+            "movflags": "+frag_keyframe+empty_moov+default_base_moof",
+        }
+
+    @staticmethod
+    def test_segment() -> None:
+        """Segments should be indexed by playlist of out file name."""
+        output_format = OutputFormat.create(ArchiverConfig(output_format="segment", segment_time=60))
+        assert output_format.extension == ".m3u8"
+        assert not output_format.is_concatenatable
+        first_file_name = output_format.find_first_file_name(OUT_FILE_NAME_SEGMENT)
+        assert first_file_name == "./output/1-2021_08_07-21_00_00-00000.ts"
+        output_node = create_output_node(output_format, OUT_FILE_NAME_SEGMENT)
+        assert output_node.kwargs == {
+            "c": "copy",
+            "filename": "./output/1-2021_08_07-21_00_00-%05d.ts",
+            "format": "segment",
+            "segment_time": "60",
+            "segment_format": "mpegts",
+            "segment_list": OUT_FILE_NAME_SEGMENT,
+            "segment_list_type": "m3u8",
+            "segment_list_flags": "+live",
+        }
+
+    @staticmethod
+    def test_unsupported() -> None:
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            OutputFormat("mkv")
@@ -0,0 +1,24 @@
+"""Tests for polling_engine.py."""
+
+import asyncio
+
+import pytest
+
+from showroompodcast.api import ShowroomApi
+from showroompodcast.polling_engine import PollingEngine
+from tests.conftest import FakeShowroomApi
+
+
+class TestPollingEngine:
+    """Tests for PollingEngine."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(fake_showroom_api_room_1_to_5_on_live: FakeShowroomApi) -> None:
+        """All rooms should be polled concurrently, each room exactly once."""
+        list_room_id = list(range(1, 6))
+        async with ShowroomApi.create_client_session(limit=2) as session:
+            polling_engine = PollingEngine(session, number_concurrency=2, requests_per_second=100)
+            results = await asyncio.gather(*(polling_engine.poll(room_id) for room_id in list_room_id))
+        assert results == [True] * len(list_room_id)
+        assert fake_showroom_api_room_1_to_5_on_live.count_request_polling == dict.fromkeys(list_room_id, 1)
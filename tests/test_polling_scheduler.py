@@ -0,0 +1,83 @@
+"""Tests for polling_scheduler.py."""
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from showroompodcast.config import PollingConfig
+from showroompodcast.polling_scheduler import PollingScheduler
+from showroompodcast.polling_scheduler import RoomHistory
+
+JST = timezone(timedelta(hours=+9), "JST")
+INTERVAL_MINIMUM = 5.0
+INTERVAL_MAXIMUM = 60.0
+
+
+class TestRoomHistory:
+    """Tests for RoomHistory."""
+
+    @staticmethod
+    def test_interval_grows_while_off_live() -> None:
+        """Interval should grow up to maximum while off live, and reset to minimum on live."""
+        room_history = RoomHistory(INTERVAL_MINIMUM, INTERVAL_MAXIMUM)
+        now = datetime(2021, 8, 7, 12, 0, 0, tzinfo=JST)
+        list_interval = []
+        for _ in range(8):
+            room_history.update(now, is_on_live=False)
+            list_interval.append(room_history.get_interval(now))
+        assert list_interval == sorted(list_interval)
+        assert list_interval[0] > INTERVAL_MINIMUM
+        assert list_interval[-1] == INTERVAL_MAXIMUM
+        room_history.update(now, is_on_live=True)
+        assert room_history.get_interval(now) == INTERVAL_MINIMUM
+
+    @staticmethod
+    def test_interval_around_usual_start() -> None:
+        """Minimum interval should be used around the time of day live usually starts."""
+        room_history = RoomHistory(INTERVAL_MINIMUM, INTERVAL_MAXIMUM)
+        # Live started at 21:00 on a day, then room has been off live for long time.
+        room_history.update(datetime(2021, 8, 7, 21, 0, 0, tzinfo=JST), is_on_live=True)
+        for _ in range(10):
+            room_history.update(datetime(2021, 8, 8, 12, 0, 0, tzinfo=JST), is_on_live=False)
+        assert room_history.get_interval(datetime(2021, 8, 8, 12, 0, 0, tzinfo=JST)) == INTERVAL_MAXIMUM
+        assert room_history.get_interval(datetime(2021, 8, 8, 20, 50, 0, tzinfo=JST)) == INTERVAL_MINIMUM
+        assert room_history.get_interval(datetime(2021, 8, 8, 21, 20, 0, tzinfo=JST)) == INTERVAL_MINIMUM
+        assert room_history.get_interval(datetime(2021, 8, 8, 22, 0, 0, tzinfo=JST)) == INTERVAL_MAXIMUM
+
+
+class TestPollingScheduler:
+    """Tests for PollingScheduler."""
+
+    @staticmethod
+    def test() -> None:
+        """Rooms should be popped in order of next-due time, and only when due."""
+        polling_config = PollingConfig(interval_minimum=INTERVAL_MINIMUM, interval_maximum=INTERVAL_MAXIMUM)
+        polling_scheduler = PollingScheduler([1, 2, 3], polling_config)
+        now = datetime(2021, 8, 7, 12, 0, 0, tzinfo=JST)
+        assert sorted(polling_scheduler.pop_due(0.0)) == [1, 2, 3]
+        assert polling_scheduler.seconds_until_next_due(0.0) is None
+        polling_scheduler.schedule(1, 0.0, now, is_on_live=False)
+        polling_scheduler.schedule(2, 0.0, now, is_on_live=True)
+        polling_scheduler.postpone(3, 1.0)
+        assert polling_scheduler.seconds_until_next_due(0.0) == INTERVAL_MINIMUM
+        assert polling_scheduler.pop_due(5.0) == [2]
+        assert polling_scheduler.pop_due(6.0) == [3]
+        assert not polling_scheduler.pop_due(7.0)
+        assert polling_scheduler.pop_due(7.5) == [1]
+
+    @staticmethod
+    def test_add_and_remove() -> None:
+        """Added rooms should be due from the time, removed rooms should not be scheduled again."""
+        polling_config = PollingConfig(interval_minimum=INTERVAL_MINIMUM, interval_maximum=INTERVAL_MAXIMUM)
+        polling_scheduler = PollingScheduler([1, 2, 3], polling_config)
+        now = datetime(2021, 8, 7, 12, 0, 0, tzinfo=JST)
+        assert polling_scheduler.pop_due(0.0) == [1, 2, 3]
+        polling_scheduler.schedule(1, 0.0, now, is_on_live=True)
+        polling_scheduler.remove({1, 2})
+        polling_scheduler.add([2, 4], 1.0)
+        polling_scheduler.schedule(2, 2.0, now, is_on_live=True)
+        polling_scheduler.schedule(3, 2.0, now, is_on_live=True)
+        assert polling_scheduler.pop_due(1.0) == [4]
+        # Room 2 being polled while removed and added again is scheduled only once.
+        assert polling_scheduler.pop_due(10.0) == [2, 3]
+        assert polling_scheduler.seconds_until_next_due(10.0) is None
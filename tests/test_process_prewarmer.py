@@ -0,0 +1,22 @@
+"""Tests for process_prewarmer.py."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from showroompodcast.process_prewarmer import ProcessPrewarmer
+from showroompodcast.process_prewarmer import initialize_worker
+
+
+class TestProcessPrewarmer:
+    """Tests for ProcessPrewarmer."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test() -> None:
+        """All worker processes should be started."""
+        number_process = 2
+        with ProcessPoolExecutor(max_workers=number_process, initializer=initialize_worker) as executor:
+            await ProcessPrewarmer.prewarm(executor, number_process)
+            # Reason: No public API to count worker processes. pylint: disable-next=protected-access
+            assert len(executor._processes) == number_process  # noqa: SLF001
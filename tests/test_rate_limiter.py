@@ -0,0 +1,40 @@
+"""Tests for rate_limiter.py."""
+
+import asyncio
+
+import pytest
+
+from showroompodcast.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test() -> None:
+        """Concurrent acquisitions should be spaced by the interval of budget."""
+        requests_per_second = 50
+        number_acquisition = 6
+        rate_limiter = RateLimiter(requests_per_second)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(rate_limiter.acquire() for _ in range(number_acquisition)))
+        elapsed = loop.time() - start
+        assert elapsed >= (number_acquisition - 1) / requests_per_second
+        assert elapsed < 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_unlimited() -> None:
+        """Acquisitions should not wait when requests per second is 0."""
+        rate_limiter = RateLimiter(0)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(rate_limiter.acquire() for _ in range(100)))
+        assert loop.time() - start < 1
+
+    @staticmethod
+    def test_negative() -> None:
+        with pytest.raises(ValueError, match="Requests per second must not be negative"):
+            RateLimiter(-1)
@@ -0,0 +1,83 @@
+"""Tests for recording_index.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.exceptions import RecordingIndexError
+from showroompodcast.recording_index import IndexedRecording
+from showroompodcast.recording_index import RecordingIndex
+from showroompodcast.recording_index import RoomSummary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+TIME_START = 1628337600.0
+
+
+def create_indexed_recording(
+    room_id: int,
+    seconds_after: float,
+    duration: float,
+    *,
+    is_complete: bool = True,
+) -> IndexedRecording:
+    """Creates recording which starts seconds_after since TIME_START."""
+    time_start = TIME_START + seconds_after
+    return IndexedRecording(
+        name=f"{room_id}-{int(time_start)}.mp4",
+        room_id=room_id,
+        time_start=time_start,
+        time_end=time_start + duration,
+        duration=duration,
+        size=1000,
+        mtime_ns=int(time_start + duration) * 10**9,
+        format_name="mov,mp4,m4a,3gp,3g2,mj2",
+        codecs="h264,aac",
+        is_complete=is_complete,
+    )
+
+
+class TestRecordingIndex:
+    """Test for RecordingIndex."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path) -> None:
+        """Recordings should be queried by room, range of start time and completeness."""
+        recording_index = RecordingIndex(str(tmp_path / "index.sqlite3"))
+        recording_1_first = create_indexed_recording(1, 0, 3600)
+        recording_1_second = create_indexed_recording(1, 86400, 1800, is_complete=False)
+        recording_2 = create_indexed_recording(2, 3600, 7200)
+        await recording_index.upsert([recording_1_second, recording_2, recording_1_first])
+        assert await recording_index.list_recording() == [recording_1_first, recording_2, recording_1_second]
+        assert await recording_index.list_recording(room_id=1) == [recording_1_first, recording_1_second]
+        assert await recording_index.list_recording(since=TIME_START + 1, until=TIME_START + 86400) == [recording_2]
+        assert await recording_index.list_recording(incomplete_only=True) == [recording_1_second]
+        assert await recording_index.dictionary_signature(2) == {
+            recording_2.name: (recording_2.size, recording_2.mtime_ns),
+        }
+        assert await recording_index.summarize() == [
+            RoomSummary(1, 2, 5400, 2000, 1),
+            RoomSummary(2, 1, 7200, 1000, 0),
+        ]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upsert_replaces(tmp_path: Path) -> None:
+        """Recording indexed again should replace the previous one."""
+        recording_index = RecordingIndex(str(tmp_path / "index.sqlite3"))
+        recording = create_indexed_recording(1, 0, 0, is_complete=False)
+        await recording_index.upsert([recording])
+        recording_complete = recording._replace(duration=3600.0, is_complete=True)
+        await recording_index.upsert([recording_complete])
+        assert await recording_index.list_recording() == [recording_complete]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_unavailable(tmp_path: Path) -> None:
+        """Error of SQLite should be raised as RecordingIndexError."""
+        with pytest.raises(RecordingIndexError):
+            await RecordingIndex(str(tmp_path / "not_exist" / "index.sqlite3")).summarize()
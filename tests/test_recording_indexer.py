@@ -0,0 +1,116 @@
+"""Tests for recording_indexer.py."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from typing import Any
+
+import ffmpeg
+import pytest
+
+from showroompodcast.recording_index import RecordingIndex
+from showroompodcast.recording_indexer import RecordingIndexer
+from showroompodcast.showroom_datetime import ShowroomDatetime
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import MagicMock
+
+    from pytest_mock import MockerFixture
+
+SECONDS_DURATION = 3600.5
+PROBE_COMPLETE = {
+    "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": str(SECONDS_DURATION)},
+    "streams": [{"codec_type": "video", "codec_name": "h264"}, {"codec_type": "audio", "codec_name": "aac"}],
+}
+
+
+@pytest.fixture
+def mock_probe(mocker: MockerFixture) -> MagicMock:
+    """Mocks FFprobe, files whose name contains "broken" can't be read."""
+
+    def probe(filename: str, **_kwargs: Any) -> dict[str, Any]:  # noqa: ANN401
+        if "broken" in filename:
+            raise ffmpeg.Error(cmd="ffprobe", stdout=b"", stderr=b"moov atom not found")
+        return PROBE_COMPLETE
+
+    mock: MagicMock = mocker.patch("ffmpeg.probe", side_effect=probe)
+    return mock
+
+
+class TestRecordingIndexer:
+    """Test for RecordingIndexer."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    # Reason: pytest fixture defined in this module. pylint: disable-next=redefined-outer-name
+    async def test(tmp_path: Path, mock_probe: MagicMock) -> None:
+        """Only archives added or modified since last scan should be probed."""
+        directory = tmp_path / "output"
+        directory.mkdir()
+        (directory / "1-2021_08_07-21_00_00.mp4").write_bytes(b"mp4")
+        (directory / "1-2021_08_07-22_00_00.part1.mp4").write_bytes(b"part")
+        (directory / "1-2021_08_07-22_00_00.mp4.txt").write_bytes(b"list")
+        (directory / "2-2021_08_07-21_00_00.m3u8").write_bytes(b"index")
+        (directory / "2-2021_08_07-21_00_00-00000.ts").write_bytes(b"segment0")
+        (directory / "2-2021_08_07-21_00_00-00001.ts").write_bytes(b"segment1")
+        recording_index = RecordingIndex(str(tmp_path / "index.sqlite3"))
+        recording_indexer = RecordingIndexer(recording_index, str(directory))
+        list_recording = sorted(await recording_indexer.scan(), key=lambda recording: recording.name)
+        assert [recording.name for recording in list_recording] == [
+            "1-2021_08_07-21_00_00.mp4",
+            "2-2021_08_07-21_00_00.m3u8",
+        ]
+        recording = list_recording[0]
+        assert recording.room_id == 1
+        assert recording.time_start == ShowroomDatetime.decode("2021_08_07-21_00_00").timestamp()
+        assert recording.time_end == recording.time_start + SECONDS_DURATION
+        assert recording.codecs == "h264,aac"
+        assert recording.is_complete
+        assert list_recording[1].size == len(b"index") + len(b"segment0") + len(b"segment1")
+        assert await recording_indexer.scan() == []
+        number_probed = 2
+        assert mock_probe.call_count == number_probed
+        path_modified = directory / "1-2021_08_07-21_00_00.mp4"
+        path_modified.write_bytes(b"mp4 modified")
+        os.utime(path_modified, ns=(0, path_modified.stat().st_mtime_ns + 10**9))
+        assert [recording.name for recording in await recording_indexer.scan(1)] == ["1-2021_08_07-21_00_00.mp4"]
+        assert len(await recording_index.list_recording()) == number_probed
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_probe")
+    async def test_broken(tmp_path: Path) -> None:
+        """Archive which FFprobe can't read should be indexed as incomplete ended at last modification."""
+        path = tmp_path / "1-2021_08_07-21_00_00.mp4"
+        path.write_bytes(b"broken")
+        recording_index = RecordingIndex(str(tmp_path / "index.sqlite3"))
+        await RecordingIndexer(recording_index, str(tmp_path)).index()
+        (recording,) = await recording_index.list_recording(incomplete_only=True)
+        assert recording.duration == 0
+        assert recording.time_end == path.stat().st_mtime
+        assert not recording.is_complete
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_probe")
+    async def test_removed(tmp_path: Path) -> None:
+        """Recording whose file was removed, e.g. uploaded or remuxed, should be removed by scan of its room."""
+        path = tmp_path / "1-2021_08_07-21_00_00.ts"
+        path.write_bytes(b"ts")
+        (tmp_path / "2-2021_08_07-21_00_00.mp4").write_bytes(b"mp4")
+        recording_index = RecordingIndex(str(tmp_path / "index.sqlite3"))
+        recording_indexer = RecordingIndexer(recording_index, str(tmp_path))
+        await recording_indexer.scan()
+        path.unlink()
+        await recording_indexer.scan(2)
+        number_recordings = 2
+        assert len(await recording_index.list_recording()) == number_recordings
+        assert await recording_indexer.scan(1) == []
+        assert [recording.name for recording in await recording_index.list_recording()] == [
+            "2-2021_08_07-21_00_00.mp4",
+        ]
+        (tmp_path / "2-2021_08_07-21_00_00.mp4").unlink()
+        await recording_indexer.scan()
+        assert await recording_index.list_recording() == []
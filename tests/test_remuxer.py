@@ -0,0 +1,71 @@
+"""Tests for remuxer.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from asyncffmpeg.exceptions import FFmpegProcessError
+
+from showroompodcast.remuxer import Remuxer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import MagicMock
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture(autouse=True)
+def mock_limit_ffmpeg(mocker: MockerFixture) -> MagicMock:
+    """Not to limit process which doesn't exist since subprocess is mocked."""
+    return mocker.patch("showroompodcast.remuxer.ResourceLimiter.limit_ffmpeg")
+
+
+class TestRemuxer:
+    """Tests for Remuxer."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    # Reason: pytest fixture. pylint: disable-next=redefined-outer-name
+    async def test(mocker: MockerFixture, mock_limit_ffmpeg: MagicMock) -> None:
+        """FFmpeg should copy streams into MP4 without re-encoding, and should be limited."""
+        mock_process = mocker.MagicMock(returncode=0, pid=123)
+        mock_process.communicate = mocker.AsyncMock(return_value=(b"", b""))
+        mock_exec = mocker.patch("asyncio.create_subprocess_exec", return_value=mock_process)
+        await Remuxer().remux("input.ts", "output.mp4")
+        arguments = mock_exec.call_args.args
+        assert arguments[0] == "ffmpeg"
+        assert "input.ts" in arguments
+        assert "output.mp4" in arguments
+        assert "copy" in arguments
+        mock_limit_ffmpeg.assert_called_once_with(123)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_error(mocker: MockerFixture) -> None:
+        """Error of FFmpeg should be raised."""
+        mock_process = mocker.MagicMock(returncode=1)
+        mock_process.communicate = mocker.AsyncMock(return_value=(b"", b"Invalid data found"))
+        mocker.patch("asyncio.create_subprocess_exec", return_value=mock_process)
+        with pytest.raises(FFmpegProcessError, match="Invalid data found"):
+            await Remuxer().remux("input.ts", "output.mp4")
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_concatenate(tmp_path: Path, mocker: MockerFixture) -> None:
+        """Inputs should be listed for concat demuxer, and the list should be removed."""
+        list_content: list[str] = []
+
+        async def communicate() -> tuple[bytes, bytes]:
+            list_content.append((tmp_path / "output.mp4.txt").read_text())
+            return b"", b""
+
+        mock_process = mocker.MagicMock(returncode=0)
+        mock_process.communicate = communicate
+        mock_exec = mocker.patch("asyncio.create_subprocess_exec", return_value=mock_process)
+        path_input = str(tmp_path / "it's.mp4")
+        await Remuxer().concatenate([path_input, str(tmp_path / "part1.mp4")], str(tmp_path / "output.mp4"))
+        assert "concat" in mock_exec.call_args.args
+        assert list_content == [f"file '{tmp_path}/it'\\''s.mp4'\nfile '{tmp_path}/part1.mp4'\n"]
+        assert not (tmp_path / "output.mp4.txt").exists()
@@ -0,0 +1,97 @@
+"""Tests for resource_limiter.py."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import psutil
+import pytest
+
+from showroompodcast.config import ResourceConfig
+from showroompodcast.resource_limiter import ResourceLimiter
+
+if sys.platform == "linux":
+    import resource
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+GIGABYTE = 1_000_000_000
+
+
+@pytest.fixture
+def configure() -> Generator[None, None, None]:
+    """Restores default configuration not to limit processes in other tests."""
+    yield
+    ResourceLimiter.configure(ResourceConfig())
+
+
+@pytest.mark.usefixtures("configure")
+@pytest.mark.skipif(sys.platform != "linux", reason="I/O priority and memory limit are supported only on Linux.")
+class TestResourceLimiter:
+    """Tests for ResourceLimiter."""
+
+    @staticmethod
+    def test_limit_ffmpeg(process_sleeping: subprocess.Popen[bytes], tmp_path: Path) -> None:
+        """Priority should be lowered, memory should be limited, and process should join cgroup."""
+        resource_config = ResourceConfig(
+            nice=5,
+            io_class="best-effort",
+            io_level=6,
+            memory_maximum=2 * GIGABYTE,
+            cgroup=str(tmp_path),
+        )
+        ResourceLimiter.configure(resource_config)
+        ResourceLimiter.limit_ffmpeg(process_sleeping.pid)
+        assert os.getpriority(os.PRIO_PROCESS, process_sleeping.pid) == resource_config.nice
+        process = psutil.Process(process_sleeping.pid)
+        assert tuple(process.ionice()) == (psutil.IOPRIO_CLASS_BE, resource_config.io_level)
+        memory_maximum = resource_config.memory_maximum
+        # Checks platform again for linters, though this class is skipped except on Linux.
+        if sys.platform == "linux":
+            assert resource.prlimit(process_sleeping.pid, resource.RLIMIT_AS) == (memory_maximum, memory_maximum)
+        assert (tmp_path / "cgroup.procs").read_text(encoding="utf-8") == f"{process_sleeping.pid}\n"
+
+    @staticmethod
+    def test_never_raise_priority(process_sleeping: subprocess.Popen[bytes]) -> None:
+        """Niceness higher than configured should be kept, since lowering it requires privilege."""
+        nice_current = 15
+        os.setpriority(os.PRIO_PROCESS, process_sleeping.pid, nice_current)
+        ResourceLimiter.configure(ResourceConfig(nice=10, io_class=""))
+        ResourceLimiter.limit_ffmpeg(process_sleeping.pid)
+        assert os.getpriority(os.PRIO_PROCESS, process_sleeping.pid) == nice_current
+
+    @staticmethod
+    def test_process_exited(caplog: pytest.LogCaptureFixture, tmp_path: Path) -> None:
+        """Failure should be logged without raising, since FFmpeg may exit immediately."""
+        with subprocess.Popen([sys.executable, "-c", "pass"]) as process:
+            process.wait()
+        resource_config = ResourceConfig(
+            nice=10,
+            io_class="best-effort",
+            memory_maximum=GIGABYTE,
+            cgroup=str(tmp_path / "not_exist"),
+        )
+        ResourceLimiter.configure(resource_config)
+        ResourceLimiter.limit_ffmpeg(process.pid)
+        assert "Failed to lower priority." in caplog.text
+        assert "Failed to limit memory." in caplog.text
+        assert "Failed to join cgroup." in caplog.text
+
+    @staticmethod
+    def test_set_up_cgroup(tmp_path: Path) -> None:
+        """Weights and memory maximum of all recordings together should be written in format of cgroup v2."""
+        ResourceLimiter.configure(ResourceConfig(cgroup=str(tmp_path), cpu_weight=20, io_weight=30))
+        ResourceLimiter.set_up_cgroup()
+        assert (tmp_path / "cpu.weight").read_text(encoding="utf-8") == "20"
+        assert (tmp_path / "io.weight").read_text(encoding="utf-8") == "default 30"
+        assert (tmp_path / "memory.max").read_text(encoding="utf-8") == "max"
+
+    @staticmethod
+    def test_unsupported_io_class() -> None:
+        with pytest.raises(ValueError, match="realtime"):
+            ResourceLimiter.configure(ResourceConfig(io_class="realtime"))
@@ -0,0 +1,122 @@
+"""Tests for retry_policy.py."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from asyncffmpeg.exceptions import FFmpegProcessError
+
+from showroompodcast.config import RetryConfig
+from showroompodcast.exceptions import MaxRetriesExceededError
+from showroompodcast.retry_policy import END_OF_FILE
+from showroompodcast.retry_policy import FILE_EXISTS
+from showroompodcast.retry_policy import NOT_FOUND
+from showroompodcast.retry_policy import SERVER_ERROR
+from showroompodcast.retry_policy import TIMEOUT
+from showroompodcast.retry_policy import ErrorClass
+from showroompodcast.retry_policy import Failure
+from showroompodcast.retry_policy import RetryPolicy
+from showroompodcast.retry_policy import check_on_live
+from showroompodcast.retry_policy import classify
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (FFmpegProcessError("Server returned 404 Not Found", 1), NOT_FOUND),
+        (FFmpegProcessError("Server returned 503 Service Unavailable", 1), SERVER_ERROR),
+        (FFmpegProcessError("Server returned 5XX Server Error reply", 1), SERVER_ERROR),
+        (FFmpegProcessError("Connection to tcp://example.com:443 failed: Connection timed out", 1), TIMEOUT),
+        (FFmpegProcessError("https://example.com/1.ts: End of file", 1), END_OF_FILE),
+        (FileExistsError("File already exists."), FILE_EXISTS),
+        (FFmpegProcessError("Invalid data found when processing input", 1), None),
+        (ValueError("Unexpected"), None),
+    ],
+)
+def test_classify(error: BaseException, expected: ErrorClass | None) -> None:
+    """Errors should be classified by message, or None when they should not be retried."""
+    assert classify(error) == expected
+
+
+class TestRetryPolicy:
+    """Test for RetryPolicy."""
+
+    @staticmethod
+    def test_calculate_backoff() -> None:
+        """Backoff should double by each class of error with jitter, up to its maximum."""
+        retry_policy = RetryPolicy()
+        for count in range(6):
+            seconds = min(SERVER_ERROR.seconds_maximum, SERVER_ERROR.seconds_base * 2**count)
+            assert seconds / 2 <= retry_policy.calculate_backoff(SERVER_ERROR) <= seconds
+        assert retry_policy.calculate_backoff(END_OF_FILE) <= END_OF_FILE.seconds_base
+
+    @staticmethod
+    def test_immediate_first() -> None:
+        """Only the first retry should not wait when immediate first."""
+        retry_policy = RetryPolicy(immediate_first=True)
+        assert retry_policy.calculate_backoff(NOT_FOUND) == 0.0
+        assert retry_policy.calculate_backoff(NOT_FOUND) > 0.0
+
+    @staticmethod
+    def test_calculate_backoff_file_exists() -> None:
+        """Backoff of file name collision should be long enough that the name of the next second is used."""
+        retry_policy = RetryPolicy(immediate_first=True)
+        for _ in range(3):
+            assert retry_policy.calculate_backoff(FILE_EXISTS) >= 1.0
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_wait_budget() -> None:
+        """Retry should be given up when attempts keep failing over the budget, until stable attempt."""
+        retry_policy = RetryPolicy(RetryConfig(seconds_budget=0.5, seconds_stable=10.0))
+        # Waits longer than the budget.
+        await retry_policy.wait(Failure(FILE_EXISTS, 0.0))
+        with pytest.raises(MaxRetriesExceededError):
+            await retry_policy.wait(Failure(FILE_EXISTS, 0.0))
+        time_start = time.monotonic()
+        await retry_policy.wait(Failure(END_OF_FILE, 10.0))
+        assert time.monotonic() - time_start <= END_OF_FILE.seconds_base
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_wait_live_ended() -> None:
+        """Retry should be stopped without waiting when live ended."""
+
+        async def is_on_live() -> bool:
+            return False
+
+        time_start = time.monotonic()
+        with pytest.raises(StopAsyncIteration):
+            await RetryPolicy(is_on_live=is_on_live).wait(Failure(NOT_FOUND, 0.0))
+        assert time.monotonic() - time_start < NOT_FOUND.seconds_base / 2
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_wait_live_unknown() -> None:
+        """Retry should continue when whether on live is unknown."""
+
+        async def is_on_live() -> None:
+            await asyncio.sleep(0)
+
+        await RetryPolicy(is_on_live=is_on_live).wait(Failure(END_OF_FILE, 0.0))
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_request_room_1_not_on_live")
+async def test_check_on_live_not_on_live() -> None:
+    assert await check_on_live(1) is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_request_room_1_on_live")
+async def test_check_on_live_on_live() -> None:
+    assert await check_on_live(1) is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("mock_request_room_1_503")
+async def test_check_on_live_unknown() -> None:
+    """Whether on live should be unknown when polling failed."""
+    assert await check_on_live(1) is None
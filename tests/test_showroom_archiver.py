@@ -1,25 +1,39 @@
 """Tests for showroom_archiver.py."""
 
 import asyncio
+import time
 from collections.abc import AsyncGenerator
+from collections.abc import Awaitable
+from collections.abc import Callable
 from logging import getLogger
-from threading import Lock
+from pathlib import Path
 
+import ffmpeg
 import pytest
 from asyncffmpeg import FFmpegCoroutine
+from asyncffmpeg import StreamSpec
 from asyncffmpeg.exceptions import FFmpegProcessError
 from asyncffmpeg.ffmpeg_coroutine_factory import FFmpegCoroutineFactory
 from asyncffmpeg.ffmpegprocess.interface import FFmpegProcess
 from ffmpeg.nodes import InputNode
 from ffmpeg.nodes import OutputNode
 from ffmpeg.nodes import OutputStream
+from pytest_mock import MockerFixture
 
+from showroompodcast.config import ArchiverConfig
 from showroompodcast.exceptions import MaxRetriesExceededError
+from showroompodcast.live_end_detector import StopPipe
+from showroompodcast.metrics import BYTES_WRITTEN
 from showroompodcast.showroom_archiver import ArchiveAttempter
 from showroompodcast.showroom_archiver import AsyncRetry
+from showroompodcast.showroom_archiver import BytesWrittenReporter
+from showroompodcast.showroom_archiver import FirstByteWatcher
 from showroompodcast.showroom_archiver import ShowroomArchiver
 from showroompodcast.showroom_datetime import ShowroomDatetime
+from showroompodcast.state_store import Recording
+from showroompodcast.state_store import StateStore
 from tests.conftest import MockFFmpegCoroutine
+from tests.conftest import create_mock_ffmpeg_coroutine
 
 
 class TestShowroomArchiver:
@@ -29,18 +43,8 @@ class TestShowroomArchiver:
     @pytest.mark.usefixtures("mock_request_room_1_streaming_url")
     # Reason: pytest fixture. pylint: disable=unused-argument
     async def test(self, mock_ffmpeg_coroutine: MockFFmpegCoroutine) -> None:
-        """Following specifications should be ensured:
-
-        - Locked lock should be unlocked.
-        - MaxRetriesEceededError should be raised.
-        """
-        lock = Lock()
-        # Reason: Releasing lock will be executed in function call. pylint: disable=consider-using-with
-        lock.acquire()
-        task = asyncio.create_task(ShowroomArchiver().archive(1, lock))
-        assert lock.locked()
-        await task
-        assert not lock.locked()
+        """Archiving should finish when FFmpeg finishes, with stream spec for best quality."""
+        await ShowroomArchiver().archive(1)
         args, _ = mock_ffmpeg_coroutine.execute.call_args
         async_function_crate = args[0]
         stream_spec = await async_function_crate()
@@ -49,6 +53,54 @@ class TestShowroomArchiver:
         assert isinstance(output_node, OutputNode)
         self.assert_output_node(output_node)
 
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_request_room_1_streaming_url", "mock_ffmpeg_coroutine")
+    async def test_recording_indexer(mocker: MockerFixture) -> None:
+        """Archives of the room should be indexed when archiving finished."""
+        recording_indexer = mocker.AsyncMock()
+        await ShowroomArchiver(recording_indexer=recording_indexer).archive(1)
+        recording_indexer.index.assert_awaited_once_with(1)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_request_room_1_not_on_live")
+    async def test_live_ended_while_retrying(mocker: MockerFixture) -> None:
+        """Retry should be stopped without error when live ended."""
+
+        async def execute(_create_stream_spec: Callable[[], Awaitable[StreamSpec]], **_kwargs: object) -> None:
+            msg = "Server returned 404 Not Found"
+            raise FFmpegProcessError(msg, 1)
+
+        showroom_archiver = ShowroomArchiver()
+        showroom_archiver.ffmpeg_coroutine = create_mock_ffmpeg_coroutine(mocker, execute)
+        await showroom_archiver.archive(1)
+        assert showroom_archiver.ffmpeg_coroutine.execute.call_count == 1  # type: ignore[attr-defined]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_request_room_1_streaming_url")
+    async def test_stop_event(mocker: MockerFixture) -> None:
+        """FFmpeg should be cancelled to quit gracefully and archiving should finish when stop is requested."""
+        list_cancelled: list[bool] = []
+
+        async def execute(_create_stream_spec: Callable[[], Awaitable[StreamSpec]], **_kwargs: object) -> None:
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                list_cancelled.append(True)
+                raise
+
+        showroom_archiver = ShowroomArchiver()
+        showroom_archiver.ffmpeg_coroutine = create_mock_ffmpeg_coroutine(mocker, execute)
+        stop_event = StopPipe()
+        task = asyncio.create_task(showroom_archiver.archive(1, stop_event=stop_event))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        stop_event.set()
+        await asyncio.wait_for(task, timeout=1)
+        assert list_cancelled == [True]
+
     def assert_output_node(self, output_node: OutputNode) -> None:
         assert output_node.args == []
         now = ShowroomDatetime.now_jst()
@@ -147,3 +199,197 @@ class TestArchiveAttempter:
         with pytest.raises(FFmpegProcessError):
             # Reason: To support Python 3.9
             await archive_attempter.__anext__()  # pylint: disable=unnecessary-dunder-call
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_request_room_1_streaming_url", "mock_now_2021_08_07_21_00_00")
+    async def test_gapless_resume(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture) -> None:
+        """Retry should resume into part of the archive from live edge without waiting."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        list_stream_spec: list[StreamSpec] = []
+
+        async def execute(create_stream_spec: Callable[[], Awaitable[StreamSpec]], **_kwargs: object) -> None:
+            list_stream_spec.append(await create_stream_spec())
+            if len(list_stream_spec) == 1:
+                msg = "Server returned 404 Not Found"
+                raise FFmpegProcessError(msg, 1)
+
+        ffmpeg_coroutine = create_mock_ffmpeg_coroutine(mocker, execute)
+        archive_attempter = ArchiveAttempter(ffmpeg_coroutine, 1, archiver_config=ArchiverConfig(gapless_resume=True))
+        time_start = time.monotonic()
+        assert await TestArchiveAttempter.count_iteration(archive_attempter) == 1
+        assert time.monotonic() - time_start < 1
+        stream_spec_part = list_stream_spec[1]
+        assert isinstance(stream_spec_part, OutputStream)
+        output_node_part = stream_spec_part.node
+        assert isinstance(output_node_part, OutputNode)
+        assert output_node_part.kwargs["filename"] == "./output/1-2021_08_07-21_00_00.part1.mp4"
+        input_node_part = output_node_part.incoming_edge_map[0][0]
+        assert isinstance(input_node_part, InputNode)
+        assert input_node_part.kwargs["live_start_index"] == "-1"
+        assert archive_attempter.archive_concatenator is not None
+        assert archive_attempter.archive_concatenator.out_file_name == "./output/1-2021_08_07-21_00_00.mp4"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_request_room_1_streaming_url", "mock_now_2021_08_07_21_00_00")
+    async def test_state_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture) -> None:
+        """Recording should be in state store while FFmpeg process runs."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        state_store = StateStore(str(tmp_path / "state.sqlite3"))
+        pid = 12345
+        list_recording_while_running: list[Recording] = []
+
+        async def execute(
+            create_stream_spec: Callable[[], Awaitable[StreamSpec]],
+            *,
+            after_start: Callable[[FFmpegProcess], Awaitable[None]],
+        ) -> None:
+            await create_stream_spec()
+            await after_start(mocker.MagicMock(popen=mocker.MagicMock(pid=pid)))
+            list_recording_while_running.extend(await state_store.list_recording())
+
+        ffmpeg_coroutine = create_mock_ffmpeg_coroutine(mocker, execute)
+        archive_attempter = ArchiveAttempter(ffmpeg_coroutine, 1, state_store=state_store)
+        assert await TestArchiveAttempter.count_iteration(archive_attempter) == 0
+        assert [
+            (recording.room_id, recording.pid, recording.out_file_name) for recording in list_recording_while_running
+        ] == [
+            (1, pid, "./output/1-2021_08_07-21_00_00.mp4"),
+        ]
+        assert await state_store.list_recording() == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_request_room_1_streaming_url", "mock_now_2021_08_07_21_00_00")
+    @pytest.mark.parametrize(
+        ("output_format", "expected_args"),
+        [
+            ("mp4", ["-f", "mp4", "-c", "copy", "./output/1-2021_08_07-21_00_00.mp4"]),
+            (
+                "fragmented_mp4",
+                [
+                    "-f",
+                    "mp4",
+                    "-c",
+                    "copy",
+                    "-movflags",
+                    "+frag_keyframe+empty_moov+default_base_moof",
+                    "./output/1-2021_08_07-21_00_00.mp4",
+                ],
+            ),
+            (
+                "segment",
+                [
+                    "-f",
+                    "segment",
+                    "-c",
+                    "copy",
+                    "-segment_format",
+                    "mpegts",
+                    "-segment_list",
+                    "./output/1-2021_08_07-21_00_00.m3u8",
+                    "-segment_list_flags",
+                    "+live",
+                    "-segment_list_type",
+                    "m3u8",
+                    "-segment_time",
+                    "300",
+                    "./output/1-2021_08_07-21_00_00-%05d.ts",
+                ],
+            ),
+        ],
+    )
+    async def test_output_format(
+        output_format: str,
+        expected_args: list[str],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        mocker: MockerFixture,
+    ) -> None:
+        """FFmpeg should write archive in output format configured, also on retries."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        list_args: list[list[str]] = []
+
+        async def execute(create_stream_spec: Callable[[], Awaitable[StreamSpec]], **_kwargs: object) -> None:
+            list_args.append(ffmpeg.get_args(await create_stream_spec()))
+            if len(list_args) == 1:
+                msg = "Server returned 404 Not Found"
+                raise FFmpegProcessError(msg, 1)
+
+        ffmpeg_coroutine = create_mock_ffmpeg_coroutine(mocker, execute)
+        archiver_config = ArchiverConfig(output_format=output_format)
+        archive_attempter = ArchiveAttempter(ffmpeg_coroutine, 1, archiver_config=archiver_config)
+        assert await TestArchiveAttempter.count_iteration(archive_attempter) == 1
+        expected_attempts = 2
+        assert len(list_args) == expected_attempts
+        for args in list_args:
+            assert args[-len(expected_args) :] == expected_args
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_now_2021_08_07_21_00_00")
+    async def test_quality(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture) -> None:
+        """Retries should resolve streaming URL within quality admitted, not the best quality."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output").mkdir()
+        mock_get_url = mocker.patch(
+            "showroompodcast.showroom_stream_spec_factory.StreamingUrl.get_url_for_best_quality",
+            return_value="https://example.com/medium.m3u8",
+        )
+        count_attempt = 0
+
+        async def execute(create_stream_spec: Callable[[], Awaitable[StreamSpec]], **_kwargs: object) -> None:
+            nonlocal count_attempt
+            count_attempt += 1
+            await create_stream_spec()
+            if count_attempt == 1:
+                msg = "Server returned 404 Not Found"
+                raise FFmpegProcessError(msg, 1)
+
+        ffmpeg_coroutine = create_mock_ffmpeg_coroutine(mocker, execute)
+        quality = 500
+        archive_attempter = ArchiveAttempter(ffmpeg_coroutine, 1, quality=quality)
+        assert await TestArchiveAttempter.count_iteration(archive_attempter) == 1
+        assert [call.args for call in mock_get_url.call_args_list] == [(1, quality), (1, quality)]
+
+
+class TestFirstByteWatcher:
+    """Test for FirstByteWatcher."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path) -> None:
+        """Latency should be measured when the first byte is written."""
+        path = tmp_path / "1-2021_08_07-21_00_00.mp4"
+        path.touch()
+        time_detected = time.time()
+        task = asyncio.create_task(FirstByteWatcher(1, time_detected).watch(str(path)))
+        seconds_until_first_byte = 0.3
+        await asyncio.sleep(seconds_until_first_byte)
+        path.write_bytes(b"\x00")
+        latency = await task
+        assert latency is not None
+        assert latency >= seconds_until_first_byte
+
+
+class TestBytesWrittenReporter:
+    """Test for BytesWrittenReporter."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path) -> None:
+        """Bytes written after start should be reported even when cancelled."""
+        path = tmp_path / "1-2021_08_07-21_00_00.m3u8"
+        path.write_bytes(b"index")
+        task = asyncio.create_task(BytesWrittenReporter(1, str(path)).report())
+        await asyncio.sleep(0.1)
+        (tmp_path / "1-2021_08_07-21_00_00-00000.ts").write_bytes(b"segment0;")
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        expected_bytes_written = len(b"segment0;")
+        assert BYTES_WRITTEN.values[("1",)] >= expected_bytes_written
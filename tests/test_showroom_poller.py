@@ -1,18 +1,158 @@
 """Test for showroom_poller.py."""
 
-from threading import Lock
+import asyncio
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import ANY
 
 import pytest
+from pytest_mock import MockerFixture
 
+from showroompodcast.admission_controller import AdmissionController
+from showroompodcast.api import ShowroomApi
+from showroompodcast.config import AdmissionConfig
+from showroompodcast.config import ShardConfig
+from showroompodcast.polling_engine import PollingEngine
+from showroompodcast.shard.file_lease_backend import FileLeaseBackend
+from showroompodcast.shard.shard_coordinator import ShardCoordinator
 from showroompodcast.showroom_poller import ShowroomPoller
+from tests.conftest import FakeShowroomApi
 
 
 class TestShowroomPoller:
     """Test for ShowroomPoller."""
 
     @staticmethod
-    @pytest.mark.usefixtures("mock_request_room_1_503")
-    # Reason: pytest fixture. pylint: disable=unused-argument
-    def test() -> None:
-        # Reason: This test doesn't require arguments.
-        ShowroomPoller(None, None).poll(1, Lock())  # type: ignore[arg-type]
+    @pytest.mark.asyncio
+    async def test(fake_showroom_api: FakeShowroomApi) -> None:
+        """Temporary network issues should not lock room."""
+        fake_showroom_api.status_503([1])
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=1)
+            # Reason: This test doesn't require arguments.
+            showroom_poller = ShowroomPoller(None, None, polling_engine)  # type: ignore[arg-type]
+            assert await showroom_poller.poll(1) is None
+            assert not showroom_poller.is_archiving(1)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_on_live(fake_showroom_api_room_1_streaming_url: FakeShowroomApi, mocker: MockerFixture) -> None:
+        """Archiving should start with streaming URL resolved in advance and its quality, only once while archiving."""
+        fake_showroom_api_room_1_streaming_url.on_live([1])
+        executor = mocker.MagicMock()
+        executor.create_process_task.return_value = Future()
+        showroom_archiver = mocker.MagicMock()
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=100)
+            showroom_poller = ShowroomPoller(showroom_archiver, executor, polling_engine)
+            assert await showroom_poller.poll(1) is True
+            assert await showroom_poller.poll(1) is True
+        executor.create_process_task.assert_called_once_with(
+            showroom_archiver.archive,
+            1,
+            ANY,
+            "https://hls-css.live.showroom-live.com/live/"
+            "e528adc6d148858dc650976df10e3663205e6327663fc1475368bf0f9667ee41.m3u8",
+            None,
+            1000,
+        )
+        assert showroom_poller.is_archiving(1)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_publish_podcast(
+        fake_showroom_api_room_1_streaming_url: FakeShowroomApi,
+        mocker: MockerFixture,
+    ) -> None:
+        """Room should be requested to publish podcast when archiving finishes."""
+        fake_showroom_api_room_1_streaming_url.on_live([1])
+        executor = mocker.MagicMock()
+        future: Future[None] = Future()
+        executor.create_process_task.return_value = future
+        podcast_publisher = mocker.MagicMock()
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=100)
+            showroom_poller = ShowroomPoller(
+                mocker.MagicMock(),
+                executor,
+                polling_engine,
+                podcast_publisher=podcast_publisher,
+            )
+            assert await showroom_poller.poll(1) is True
+            podcast_publisher.request.assert_not_called()
+            future.set_result(None)
+        podcast_publisher.request.assert_called_once_with(1, future)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_rejected(fake_showroom_api_room_1_streaming_url: FakeShowroomApi, mocker: MockerFixture) -> None:
+        """Archiving should not start when out of budget, to retry at next polling."""
+        fake_showroom_api_room_1_streaming_url.on_live([1])
+        executor = mocker.MagicMock()
+        admission_controller = AdmissionController(AdmissionConfig(maximum_bytes_per_second=1))
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=100)
+            showroom_poller = ShowroomPoller(None, executor, polling_engine, admission_controller=admission_controller)  # type: ignore[arg-type]
+            assert await showroom_poller.poll(1) is True
+        executor.create_process_task.assert_not_called()
+        assert not showroom_poller.is_archiving(1)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_shard(
+        fake_showroom_api_room_1_streaming_url: FakeShowroomApi,
+        mocker: MockerFixture,
+        tmp_path: Path,
+    ) -> None:
+        """Only the node which acquired lease should archive, then lease should be released when finished."""
+        fake_showroom_api_room_1_streaming_url.on_live([1])
+        lease_backend = FileLeaseBackend(str(tmp_path))
+        list_executor = [mocker.MagicMock(), mocker.MagicMock()]
+        future: Future[None] = Future()
+        list_executor[0].create_process_task.return_value = future
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=100)
+            list_showroom_poller = [
+                ShowroomPoller(
+                    mocker.MagicMock(),
+                    executor,
+                    polling_engine,
+                    shard_coordinator=ShardCoordinator(lease_backend, ShardConfig(node_id=node_id), [1]),
+                )
+                for node_id, executor in zip(["node-a", "node-b"], list_executor)
+            ]
+            for showroom_poller in list_showroom_poller:
+                assert await showroom_poller.poll(1) is True
+            list_executor[1].create_process_task.assert_not_called()
+            future.set_result(None)
+            await asyncio.sleep(0.1)
+        assert await lease_backend.list_owner("") == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_start_failed(
+        fake_showroom_api_room_1_streaming_url: FakeShowroomApi,
+        mocker: MockerFixture,
+        tmp_path: Path,
+    ) -> None:
+        """Budget and lease should be released when archiving failed to start, not to shrink budget forever."""
+        fake_showroom_api_room_1_streaming_url.on_live([1])
+        lease_backend = FileLeaseBackend(str(tmp_path))
+        executor = mocker.MagicMock()
+        executor.create_process_task.side_effect = OSError("Too many open files")
+        admission_controller = AdmissionController(AdmissionConfig())
+        async with ShowroomApi.create_client_session(limit=1) as session:
+            polling_engine = PollingEngine(session, number_concurrency=1, requests_per_second=100)
+            showroom_poller = ShowroomPoller(
+                mocker.MagicMock(),
+                executor,
+                polling_engine,
+                admission_controller=admission_controller,
+                shard_coordinator=ShardCoordinator(lease_backend, ShardConfig(node_id="node-a"), [1]),
+            )
+            with pytest.raises(OSError, match="Too many open files"):
+                await showroom_poller.poll(1)
+            await asyncio.sleep(0.1)
+        assert not admission_controller.dictionary_bytes_per_second
+        assert not showroom_poller.is_archiving(1)
+        assert await lease_backend.list_owner("") == []
@@ -0,0 +1,42 @@
+"""Tests for state_store.py."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.exceptions import StateStoreError
+from showroompodcast.state_store import StateStore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestStateStore:
+    """Test for StateStore."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test(tmp_path: Path) -> None:
+        """Recordings should persist across instances until unregistered."""
+        path = str(tmp_path / "state.sqlite3")
+        state_store = StateStore(path)
+        await state_store.register(1, 100, "./output/1-2021_08_07-21_00_00.mp4")
+        await state_store.register(2, 200, "./output/2-2021_08_07-21_00_00.mp4")
+        list_recording = await StateStore(path).list_recording()
+        assert [(recording.room_id, recording.pid) for recording in list_recording] == [(1, 100), (2, 200)]
+        recording = list_recording[0]
+        await state_store.touch(1, 100)
+        list_recording = await state_store.list_recording()
+        assert list_recording[0].time_last_seen_live >= recording.time_last_seen_live
+        assert list_recording[0].time_started == recording.time_started
+        await state_store.unregister(1, 100)
+        assert [(recording.room_id, recording.pid) for recording in await state_store.list_recording()] == [(2, 200)]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_unavailable(tmp_path: Path) -> None:
+        """Error of SQLite should be raised as StateStoreError."""
+        with pytest.raises(StateStoreError):
+            await StateStore(str(tmp_path / "not_exist" / "state.sqlite3")).list_recording()
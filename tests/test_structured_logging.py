@@ -0,0 +1,102 @@
+"""Tests for structured_logging.py."""
+
+import json
+import logging
+import pickle
+
+import pytest
+from pytest_mock import MockerFixture
+
+from showroompodcast.config import LoggingConfig
+from showroompodcast.structured_logging import SAMPLED
+from showroompodcast.structured_logging import ContextFilter
+from showroompodcast.structured_logging import JsonFormatter
+from showroompodcast.structured_logging import PicklableQueueHandler
+from showroompodcast.structured_logging import SamplingFilter
+from showroompodcast.structured_logging import StructuredLogging
+from showroompodcast.structured_logging import log_context
+
+
+def create_record(message: str, *args: object, sampled: bool = False) -> logging.LogRecord:
+    record = logging.LogRecord("test", logging.DEBUG, __file__, 1, message, args, None)
+    if sampled:
+        record.sampled = True
+    return record
+
+
+class TestStructuredLogging:
+    """Tests for structured logging."""
+
+    @staticmethod
+    def test_context() -> None:
+        """Context should be attached only inside the context."""
+        context_filter = ContextFilter()
+        with log_context(room_id=1), log_context(recording="1-2021_08_07-21_00_00.mp4"):
+            record = create_record("In context")
+            context_filter.filter(record)
+        assert getattr(record, "room_id", None) == 1
+        assert getattr(record, "recording", None) == "1-2021_08_07-21_00_00.mp4"
+        record = create_record("Out of context")
+        context_filter.filter(record)
+        assert getattr(record, "room_id", 0) is None
+
+    @staticmethod
+    def test_sampling(mocker: MockerFixture) -> None:
+        """Repetitive logs should be dropped within interval, and the count should be attached to the next one."""
+        mock_monotonic = mocker.patch("showroompodcast.structured_logging.time.monotonic", return_value=100.0)
+        sampling_filter = SamplingFilter(60.0)
+        list_passed = [
+            sampling_filter.filter(create_record("Polled. room_id: %d", room_id, sampled=True)) for room_id in range(3)
+        ]
+        assert list_passed == [True, False, False]
+        assert sampling_filter.filter(create_record("Not sampled"))
+        mock_monotonic.return_value = 160.0
+        record = create_record("Polled. room_id: %d", 1, sampled=True)
+        assert sampling_filter.filter(record)
+        expected_dropped = 2
+        assert getattr(record, "dropped", None) == expected_dropped
+
+    @staticmethod
+    def test_json() -> None:
+        """Record queued should be picklable and formatted as JSON with context and exception."""
+        queue_handler = PicklableQueueHandler(None)  # type: ignore[arg-type]
+        queue_handler.addFilter(ContextFilter())
+        error = ValueError("Test")
+        record = logging.LogRecord(
+            "test",
+            logging.ERROR,
+            __file__,
+            1,
+            "Failed. %s",
+            (error,),
+            (ValueError, error, None),
+        )
+        with log_context(room_id=1):
+            queue_handler.filter(record)
+        prepared = pickle.loads(pickle.dumps(queue_handler.prepare(record)))  # noqa: S301
+        dictionary = json.loads(JsonFormatter().format(prepared))
+        assert dictionary["level"] == "ERROR"
+        assert dictionary["message"] == "Failed. Test"
+        assert dictionary["room_id"] == 1
+        assert "ValueError: Test" in dictionary["exception"]
+
+    @staticmethod
+    def test_start_and_stop(capsys: pytest.CaptureFixture[str]) -> None:
+        """Logs queued should be written when stopped, sampled logs should be dropped."""
+        logging_config = LoggingConfig(level="DEBUG", style="json", sampling_interval=60.0)
+        structured_logging = StructuredLogging(logging_config)
+        logger = logging.getLogger("test_structured_logging")
+        structured_logging.start()
+        try:
+            for room_id in range(3):
+                with log_context(room_id=room_id + 1):
+                    logger.debug("Temporary network issues.", extra=SAMPLED)
+        finally:
+            structured_logging.stop()
+        list_line = capsys.readouterr().err.splitlines()
+        assert [json.loads(line)["room_id"] for line in list_line] == [1]
+
+    @staticmethod
+    def test_invalid_style() -> None:
+        with pytest.raises(ValueError, match="Unsupported logging style"):
+            StructuredLogging(LoggingConfig(style="xml"))
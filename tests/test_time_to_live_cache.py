@@ -0,0 +1,21 @@
+"""Tests for time_to_live_cache.py."""
+
+from pytest_mock import MockerFixture
+
+from showroompodcast.time_to_live_cache import TimeToLiveCache
+
+
+class TestTimeToLiveCache:
+    """Tests for TimeToLiveCache."""
+
+    @staticmethod
+    def test(mocker: MockerFixture) -> None:
+        """Value should be returned until it expires."""
+        mock_monotonic = mocker.patch("showroompodcast.time_to_live_cache.time.monotonic", return_value=100.0)
+        cache: TimeToLiveCache[int, str] = TimeToLiveCache(30.0)
+        assert cache.get(1) is None
+        cache.set(1, "url")
+        mock_monotonic.return_value = 129.9
+        assert cache.get(1) == "url"
+        mock_monotonic.return_value = 130.0
+        assert cache.get(1) is None
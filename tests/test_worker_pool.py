@@ -0,0 +1,129 @@
+"""Tests for worker_pool.py."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from showroompodcast.config import WorkerConfig
+from showroompodcast.metrics import RECORDINGS_QUEUED
+from showroompodcast.worker_pool import HostLoad
+from showroompodcast.worker_pool import WorkerPool
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+    from tests.conftest import CreateWorkerPool
+    from tests.conftest import FakeExecutor
+
+GIGABYTE = 1_000_000_000
+HOST_IDLE = HostLoad(10.0, 8 * GIGABYTE, 0.0)
+HOST_BUSY = HostLoad(95.0, 8 * GIGABYTE, 0.0)
+
+
+async def archive(_room_id: int) -> None:
+    """Stand-in of archiving, never called since executor is mocked."""
+
+
+async def finish(future: asyncio.Future[None]) -> None:
+    future.set_result(None)
+    # To run done callbacks and tasks waiting.
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestWorkerPool:
+    """Tests for WorkerPool."""
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_queue(create_worker_pool: CreateWorkerPool, list_executor: list[FakeExecutor]) -> None:
+        """Recording over capacity should wait without submitting, and be reported until it starts."""
+        queued_before = RECORDINGS_QUEUED.values.get((), 0.0)
+        async with create_worker_pool(WorkerConfig()) as worker_pool:
+            worker_pool.create_process_task(archive, 1)
+            task = worker_pool.create_process_task(archive, 2)
+            await asyncio.sleep(0)
+            assert len(list_executor[0].list_future) == 1
+            assert RECORDINGS_QUEUED.values[()] == queued_before + 1
+            await finish(list_executor[0].list_future[0])
+            number_recordings = 2
+            assert len(list_executor[0].list_future) == number_recordings
+            assert RECORDINGS_QUEUED.values[()] == queued_before
+            await finish(list_executor[0].list_future[1])
+            assert task.done()
+            assert worker_pool.number_running == 0
+        list_executor[0].shutdown.assert_called_once_with()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("maximum", "host_load", "expected_capacity"),
+        [(3, HOST_IDLE, 3), (2, HOST_IDLE, 2), (3, HOST_BUSY, 1), (0, HOST_IDLE, 1)],
+    )
+    async def test_grow(
+        create_worker_pool: CreateWorkerPool,
+        mocker: MockerFixture,
+        maximum: int,
+        host_load: HostLoad,
+        expected_capacity: int,
+    ) -> None:
+        """Capacity should grow by recordings waiting up to maximum, only when host has headroom."""
+        mocker.patch.object(WorkerPool, "measure", return_value=host_load)
+        async with create_worker_pool(WorkerConfig(maximum=maximum)) as worker_pool:
+            for room_id in range(3):
+                worker_pool.create_process_task(archive, room_id)
+            await asyncio.sleep(0)
+            await worker_pool.resize()
+            await asyncio.sleep(0)
+            assert worker_pool.capacity == expected_capacity
+            assert worker_pool.number_running == expected_capacity
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_shrink(
+        create_worker_pool: CreateWorkerPool,
+        list_executor: list[FakeExecutor],
+        mocker: MockerFixture,
+    ) -> None:
+        """Executor should be replaced when no recording runs for a while after pool grew."""
+        mocker.patch.object(WorkerPool, "measure", return_value=HOST_IDLE)
+        async with create_worker_pool(WorkerConfig(maximum=2, seconds_idle=0.0)) as worker_pool:
+            worker_pool.create_process_task(archive, 1)
+            worker_pool.create_process_task(archive, 2)
+            await asyncio.sleep(0)
+            await worker_pool.resize()
+            await asyncio.sleep(0)
+            for future in list_executor[0].list_future:
+                await finish(future)
+            await worker_pool.resize()
+            assert worker_pool.capacity == 1
+            list_executor[0].shutdown.assert_called_once_with()
+            worker_pool.create_process_task(archive, 3)
+            await asyncio.sleep(0)
+            number_executors = 2
+            assert len(list_executor) == number_executors
+            assert len(list_executor[1].list_future) == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_not_shrink_within_number_process(
+        create_worker_pool: CreateWorkerPool,
+        list_executor: list[FakeExecutor],
+    ) -> None:
+        """Executor should be kept when worker processes don't exceed number_process."""
+        async with create_worker_pool(WorkerConfig(maximum=2, seconds_idle=0.0)) as worker_pool:
+            await finish(worker_pool.create_process_task(archive, 1))
+            await worker_pool.resize()
+            list_executor[0].shutdown.assert_not_called()
+
+    @staticmethod
+    def test_measure() -> None:
+        """Throughput should be 0 at the first measurement since nothing to compare."""
+        worker_pool = WorkerPool(lambda _: None, 1, WorkerConfig())  # type: ignore[arg-type,return-value]
+        host_load = worker_pool.measure()
+        assert host_load.bytes_written_per_second == 0.0
+        assert host_load.memory_available > 0
+        assert worker_pool.measure().bytes_written_per_second >= 0.0